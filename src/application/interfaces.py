@@ -3,6 +3,7 @@ from collections.abc import Iterator
 from contextlib import AbstractAsyncContextManager
 from typing import Any, Protocol
 
+from core.config import SourceArchives
 from core.interfaces import StringKeyMapping
 from domain.models import ChunkRange
 
@@ -24,13 +25,99 @@ class UniprotLifecycleProtocol(Protocol):
         pass
 
     @abstractmethod
-    async def execute_database_operations_after_copy(self, pool: Any) -> None:
+    async def execute_taxonomy_operations_after_copy(self, pool: Any) -> None:
+        """
+        Execute queries that will create required constraints and indexes
+        for NCBI tables after their data was copied.
+        """
+        pass
+
+    @abstractmethod
+    async def execute_uniprot_operations_after_copy(self, pool: Any) -> None:
         """
         Execute queries that will create required constraints and indexes
         after all data was copied.
         """
         pass
 
+    @abstractmethod
+    async def execute_release_swap_operations(self, pool: Any) -> None:
+        """
+        Execute queries that will replace current release with the built one
+        and remove outdated releases.
+        """
+        pass
+
+    @abstractmethod
+    async def execute_taxonomy_refresh_operations_before_copy(self, pool: Any) -> None:
+        """Execute queries that will prepare staging tables for new NCBI data."""
+        pass
+
+    @abstractmethod
+    async def execute_taxonomy_refresh_operations_after_copy(self, pool: Any) -> None:
+        """
+        Execute queries that will replace NCBI tables with staging ones
+        without reloading UniProt data.
+        """
+        pass
+
+    @abstractmethod
+    async def execute_incremental_update_operations_before_copy(
+        self, pool: Any
+    ) -> None:
+        """Execute queries that will prepare staging tables for new release."""
+        pass
+
+    @abstractmethod
+    async def execute_incremental_update_operations_after_copy(self, pool: Any) -> None:
+        """Execute queries that will merge changes of new release into tables."""
+        pass
+
+    @abstractmethod
+    async def remove_staging_tables(self, pool: Any) -> None:
+        """Remove staging tables after unsuccessful refresh or update attempt."""
+        pass
+
+    @abstractmethod
+    async def get_completed_stages(self, pool: Any) -> list[str]:
+        """Get stages of the release build that were completed before."""
+        pass
+
+    @abstractmethod
+    async def complete_stage(self, pool: Any, stage: str) -> None:
+        """Note stage of the release build as completed."""
+        pass
+
+    @abstractmethod
+    async def note_source_release(self, pool: Any, release: str | None) -> None:
+        """Note release of the source files the new release is built from."""
+        pass
+
+    @abstractmethod
+    async def is_built_from_release(self, pool: Any, release: str | None) -> bool:
+        """Check that release build noted the same release of the source files."""
+        pass
+
+    @abstractmethod
+    async def has_checkpoints(self, pool: Any) -> bool:
+        """Check that release build committed any copied data."""
+        pass
+
+    @abstractmethod
+    async def owns_database(self, pool: Any) -> bool:
+        """Check that current user may change settings of the database."""
+        pass
+
+    @abstractmethod
+    async def is_release_layout_supported(self, pool: Any) -> bool:
+        """Check that current release is stored in the layout rows are written in."""
+        pass
+
+    @abstractmethod
+    async def count_quarantined_records(self, pool: Any) -> int:
+        """Count invalid records put aside by the last load."""
+        pass
+
     @abstractmethod
     async def reset_database(self, pool: Any) -> None:
         """
@@ -40,7 +127,16 @@ class UniprotLifecycleProtocol(Protocol):
 
     @abstractmethod
     async def remove_database(self, pool: Any) -> None:
-        """Remove database after unsuccessful setup attempt."""
+        """Remove release being built after unsuccessful setup attempt."""
+        pass
+
+
+class ProgressMonitorProtocol(Protocol):
+    """Report progress of long database statements."""
+
+    @abstractmethod
+    async def monitor(self, pool_config: StringKeyMapping) -> None:
+        """Report progress of the running statements until cancelled."""
         pass
 
 
@@ -56,8 +152,8 @@ class ChunkRangeIteratorProtocol(Protocol):
 
 class DownloaderProtocol(Protocol):
     @abstractmethod
-    async def download_files(self) -> None:
-        """Download all the required files."""
+    async def download_archive(self, archive: SourceArchives) -> None:
+        """Download single source archive."""
         pass
 
 
@@ -74,13 +170,21 @@ class UpdateCheckerProtocol(Protocol):
         """Saves update time locally."""
         pass
 
+    @property
+    @abstractmethod
+    def current_modification_date(self) -> str | None:
+        """Modification date of UniProt files found by update check."""
+        pass
+
 
 class FilePreparerProtocol(Protocol):
     """Prepare all required files to start operate on them."""
 
     @abstractmethod
-    async def prepare_required_files(self, *args: Any, **kwargs: Any) -> None:
-        """Execute all the required operations on files to work with them."""
+    async def prepare_archive(
+        self, archive: SourceArchives, *args: Any, **kwargs: Any
+    ) -> None:
+        """Execute all the required operations on archive files to work with them."""
         pass
 
 
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 
+from core.config import SourceArchives
 from domain.entities import Tables
 from domain.interfaces import NCBIIteratorProtocol, SequenceIteratorProtocol
 
@@ -9,7 +10,9 @@ class IteratorToTable:
     """
     Iterators that go through the data
     and tables that will be populated with this data.
+    Archive is the source of the data, so the copy starts once it is prepared.
     """
 
     iterator: SequenceIteratorProtocol | NCBIIteratorProtocol
     table: Tables
+    archive: SourceArchives
@@ -1,29 +1,69 @@
 from asyncio import AbstractEventLoop
 from asyncio.futures import Future
-from collections.abc import Callable, Iterable
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Sequence
 from concurrent.futures.process import ProcessPoolExecutor
 from functools import partial
-from itertools import chain
 from threading import Event
 
 from application.interfaces import ChunkRangeIteratorProtocol
 from application.models import IteratorToTable
+from core.config import SourceArchives
 from core.interfaces import StringKeyMapping
 from core.utils import process_futures
 from domain.entities import Tables
 from domain.exceptions import CopyToUniprotDBError
 from domain.interfaces import (
+    CheckpointedIteratorProtocol,
     DatabaseCopyAdapterProtocol,
+    QuarantiningIteratorProtocol,
+    RecordSpillProtocol,
     SequenceIteratorProtocol,
 )
-from domain.services.batch_copier import BatchCopier
+from domain.models import ChunkRange
+from domain.services.batch_copier import (
+    BatchCopier,
+    ChangedRecordsCopier,
+    CheckpointedCopier,
+    FrozenCopier,
+    NormalizingCopier,
+    SpillingCopier,
+)
 from domain.services.queue_manager import QueueConfig
 
+# Sequences of incremental update are compared with the current ones first.
+_COPIERS: dict[Tables, type[BatchCopier]] = {
+    Tables.UNIPROT_STAGING: ChangedRecordsCopier,
+}
+
+# Sequences copy notes the committed parts of the files, so failed copy
+# is resumed from them. NCBI files are small, so they are copied anew.
+# Spilled records are copied anew as well, so their build is not resumable.
+_RESUMABLE_COPIERS: dict[Tables, type[BatchCopier]] = {
+    Tables.UNIPROT: CheckpointedCopier,
+    Tables.UNIPROT_SP: CheckpointedCopier,
+    Tables.UNIPROT_SP_ISO: CheckpointedCopier,
+}
+
+# Names and sequences of the sequence records are replaced with ids
+# of the dictionary tables.
+_NORMALIZED_TABLES: frozenset[Tables] = frozenset(
+    (Tables.UNIPROT, Tables.UNIPROT_SP, Tables.UNIPROT_SP_ISO)
+)
+
+
+# Tables dropped once the release is built are not worth freezing.
+_NOT_FROZEN_TABLES: frozenset[Tables] = frozenset((Tables.MERGED,))
+
 
 class DatabaseFileCopier:
     """
-    Manage data copy to database using BatchCopier.
+    Manage data copy to database using BatchCopier, archive by archive.
     Prepares TrEMBL iterators right before copy.
+    TrEMBL records can be spilled to disk first and copied back
+    in the order of the spill, e.g. clustered by organism.
+    Parts of the spill are copied back to their own tables,
+    e.g. hash partitions of 'uniprot_kb'.
     """
 
     def __init__(
@@ -35,50 +75,212 @@ class DatabaseFileCopier:
         trembl_iterator: partial[SequenceIteratorProtocol],
         chunk_range_iterator: ChunkRangeIteratorProtocol,
         batch_size: int = 10_000,
+        sequence_table: Tables = Tables.UNIPROT,
+        resume: bool = False,
+        error_budget: int = 0,
+        record_spill: RecordSpillProtocol | None = None,
+        spilled_tables: Sequence[str] = (),
+        normalize_names: bool = False,
+        deduplicate_sequences: bool = False,
+        freeze: bool = False,
     ):
         self._db_adapter = db_adapter
         self._connection_pool_config = connection_pool_config
         self._queue_config = queue_config
-        self._iterators_to_tables = iterators_to_tables
+        self._iterators_to_tables = list(iterators_to_tables)
         self._trembl_iterator = trembl_iterator
         self._chunk_range_iterator = chunk_range_iterator
         self._batch_size = batch_size
+        self._sequence_table = sequence_table
+        self._resume = resume
+        self._error_budget = error_budget
+        self._record_spill = record_spill
+        self._spilled_tables = list(spilled_tables) or [sequence_table]
+        self._normalize_names = normalize_names
+        self._deduplicate_sequences = deduplicate_sequences
+        self._freeze = freeze
 
-    async def copy(
+    async def copy_archive(
         self,
+        archive: SourceArchives,
         loop: AbstractEventLoop,
         process_pool: ProcessPoolExecutor,
         event: Event,
     ) -> None:
+        """Copy data of a single archive, so it starts as soon as it is prepared."""
         tasks: list[Future] = []
-        callables = self._prepare_copy_file_callables()
+        committed_ranges = (
+            await self._prepare_resumed_copy(archive) if self._resume else {}
+        )
+        callables = self._prepare_copy_file_callables(archive, committed_ranges)
+
+        if self._is_spilled(archive):
+            self._record_spill.clear()  # type: ignore
 
         for callable in callables:
             tasks.append(loop.run_in_executor(process_pool, callable))
 
         await process_futures(tasks, event, CopyToUniprotDBError())
 
-    def _prepare_copy_file_callables(self) -> list[Callable]:
-        trembl_iterators_to_tables = self._get_trembl_sequence_iterators_to_table()
-        all_iterators_to_tables = list(
-            chain(self._iterators_to_tables, trembl_iterators_to_tables)
-        )
+        if self._is_spilled(archive):
+            await self._copy_spilled_records(loop, process_pool, event)
+
+    def _is_spilled(self, archive: SourceArchives) -> bool:
+        return self._record_spill is not None and archive == SourceArchives.TREMBL
+
+    async def _copy_spilled_records(
+        self,
+        loop: AbstractEventLoop,
+        process_pool: ProcessPoolExecutor,
+        event: Event,
+    ) -> None:
+        """
+        Every part of the spill is read by a single process to keep its order,
+        concurrent batches of the process hold neighbouring records.
+        Parts are copied at the same time, each to its own table.
+        """
+        db_copiers = [
+            self._get_spilled_copier_type(table)(
+                db_adapter=self._db_adapter,
+                batch_size=self._batch_size,
+                connection_pool_config=self._connection_pool_config,
+                record_gen=spill_part,
+                queue_config=self._queue_config,
+                table_name=table,
+                error_budget=self._error_budget,
+            )
+            for spill_part, table in zip(
+                self._record_spill.get_parts(),  # type: ignore
+                self._spilled_tables,
+                strict=True,
+            )
+        ]
+        tasks = [
+            loop.run_in_executor(process_pool, db_copier.copy_file_in_new_loop)
+            for db_copier in db_copiers
+        ]
+        await process_futures(tasks, event, CopyToUniprotDBError())
 
+    async def _prepare_resumed_copy(
+        self, archive: SourceArchives
+    ) -> dict[str, list[ChunkRange]]:
+        """
+        Get committed ranges of the files copied by interrupted setup.
+        Records of the tables that can not be resumed are removed.
+        """
+        tables = {
+            iterator_to_table.table
+            for iterator_to_table in self._iterators_to_tables
+            if iterator_to_table.archive == archive
+            and iterator_to_table.table not in _RESUMABLE_COPIERS
+        }
+
+        async with self._db_adapter.open_pool(self._connection_pool_config) as pool:
+            if tables:
+                await self._db_adapter.truncate_tables(pool, tables)
+
+            checkpoints = await self._db_adapter.get_checkpoints(pool)
+
+        committed_ranges = defaultdict(list)
+
+        for checkpoint in checkpoints:
+            committed_ranges[checkpoint.source].append(checkpoint.segment)
+
+        return committed_ranges
+
+    def _prepare_copy_file_callables(
+        self,
+        archive: SourceArchives,
+        committed_ranges: dict[str, list[ChunkRange]],
+    ) -> list[Callable]:
         copy_callables = []
 
-        for iterator_to_table in all_iterators_to_tables:
-            db_copier = BatchCopier(
+        for iterator_to_table in self._get_iterators_to_tables(archive):
+            copier_type = self._get_copier_type(iterator_to_table.table, archive)
+
+            if copier_type is CheckpointedCopier:
+                iterator: CheckpointedIteratorProtocol = iterator_to_table.iterator  # type: ignore
+                iterator.skip(committed_ranges.get(iterator.source, []))
+
+            self._allow_invalid_records(iterator_to_table.iterator)
+            db_copier = copier_type(
                 db_adapter=self._db_adapter,
                 batch_size=self._batch_size,
                 connection_pool_config=self._connection_pool_config,
                 record_gen=iterator_to_table.iterator,
                 queue_config=self._queue_config,
                 table_name=iterator_to_table.table,
+                error_budget=self._error_budget,
             )
             copy_callables.append(db_copier.copy_file_in_new_loop)
 
         return copy_callables
 
+    def _allow_invalid_records(self, iterator: object) -> None:
+        """Invalid records are put aside only if there is error budget for them."""
+        if self._error_budget and isinstance(iterator, QuarantiningIteratorProtocol):
+            iterator.quarantine_invalid_records()
+
+    def _get_copier_type(
+        self, table: Tables, archive: SourceArchives
+    ) -> Callable[..., BatchCopier]:
+        if self._is_spilled(archive):
+            return partial(SpillingCopier, record_spill=self._record_spill)
+
+        if self._is_normalized() and table in _NORMALIZED_TABLES:
+            return self._get_normalizing_copier_type()
+
+        if self._record_spill is None and table in _RESUMABLE_COPIERS:
+            return _RESUMABLE_COPIERS[table]
+
+        return self._get_plain_copier_type(table)
+
+    def _get_spilled_copier_type(self, table: str) -> Callable[..., BatchCopier]:
+        if self._is_normalized():
+            return self._get_normalizing_copier_type()
+
+        return self._get_plain_copier_type(table)
+
+    def _get_plain_copier_type(self, table: str) -> type[BatchCopier]:
+        if self._freeze and self._has_single_writer(table):
+            return FrozenCopier
+
+        return _COPIERS.get(table, BatchCopier)  # type: ignore
+
+    def _has_single_writer(self, table: str) -> bool:
+        """
+        Rows can be frozen only by the transaction that emptied the table,
+        so it must be the only one writing to it. TrEMBL records are written
+        to the sequence table or to the tables of the spill parts.
+        """
+        writers = Counter(
+            iterator_to_table.table for iterator_to_table in self._iterators_to_tables
+        )
+        writers.update(self._spilled_tables)
+        return writers[table] == 1 and table not in _NOT_FROZEN_TABLES
+
+    def _is_normalized(self) -> bool:
+        return self._normalize_names or self._deduplicate_sequences
+
+    def _get_normalizing_copier_type(self) -> Callable[..., BatchCopier]:
+        return partial(
+            NormalizingCopier,
+            normalize_names=self._normalize_names,
+            deduplicate_sequences=self._deduplicate_sequences,
+        )
+
+    def _get_iterators_to_tables(
+        self, archive: SourceArchives
+    ) -> list[IteratorToTable]:
+        if archive == SourceArchives.TREMBL:
+            return self._get_trembl_sequence_iterators_to_table()
+
+        return [
+            iterator_to_table
+            for iterator_to_table in self._iterators_to_tables
+            if iterator_to_table.archive == archive
+        ]
+
     def _get_trembl_sequence_iterators_to_table(self) -> list[IteratorToTable]:
         """
         Get appropriate iterators that will go through partial TrEMBL data
@@ -94,7 +296,8 @@ class DatabaseFileCopier:
             trembl_iterators_to_table.append(
                 IteratorToTable(
                     self._trembl_iterator(chunk_range=chunk_range),
-                    Tables.UNIPROT,
+                    self._sequence_table,
+                    SourceArchives.TREMBL,
                 )
             )
 
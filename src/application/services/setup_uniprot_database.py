@@ -1,8 +1,13 @@
 import asyncio
 import contextlib
-from collections.abc import Coroutine
+import logging
+from asyncio import AbstractEventLoop
+from collections.abc import Awaitable, Callable, Coroutine
 from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from functools import partial
 from multiprocessing import Manager
+from threading import Event
 
 from application.interfaces import (
     DownloaderProtocol,
@@ -13,8 +18,33 @@ from application.interfaces import (
 from application.services.copy_files import DatabaseFileCopier
 from application.services.exceptions import NoUpdateRequired, UniprotSetupError
 from application.services.uniprot_operator import UniprotOperator
+from core.config import SourceArchives
 from core.interfaces import StringKeyMapping
-from core.utils import create_tasks, init_shutdown_event, process_tasks
+from core.utils import (
+    Stage,
+    StageGraph,
+    create_tasks,
+    init_shutdown_event,
+    log_critical_path,
+    process_tasks,
+)
+from domain.entities import Tables
+
+logger = logging.getLogger(__name__)
+
+type PoolArgs = tuple[AbstractEventLoop, ProcessPoolExecutor, Event]
+
+_RESET_DATABASE: str = "reset database"
+_PREPARE_ENVIRONMENT: str = "prepare environment"
+_PREPARE_DATABASE: str = "prepare database"
+_DOWNLOAD: str = "download"
+_PREPARE: str = "prepare"
+_COPY: str = "copy"
+_FINALIZE_TAXONOMY: str = "finalize taxonomy"
+_FINALIZE_UNIPROT: str = "finalize uniprot"
+_PUBLISH_RELEASE: str = "publish release"
+_DELETE_SOURCE_FILES: str = "delete source files"
+_MERGE_CHANGES: str = "merge changes"
 
 
 class UniprotDatabaseSetup:
@@ -35,9 +65,13 @@ class UniprotDatabaseSetup:
         self._system_preparer = system_preparer
         self._downloader = downloader
         self._update_checker = update_checker
+        self._interrupted_stages: list[str] = []
 
     async def remove_on_failure(self, files_were_downloaded: bool) -> None:
-        """Remove database and source files after unsuccessful setup attempt."""
+        """
+        Remove release being built and source files after unsuccessful setup attempt,
+        current release stays intact.
+        """
         coroutines: list[Coroutine] = [
             self._uniprot_operator.remove_database(self._db_pool_config)
         ]
@@ -48,16 +82,57 @@ class UniprotDatabaseSetup:
         tasks = create_tasks(coroutines)
         await process_tasks(tasks)
 
+    async def has_checkpoints(self) -> bool:
+        """Release being built is kept after failure if it committed copied data."""
+        return await self._uniprot_operator.has_checkpoints(self._db_pool_config)
+
     async def setup(
         self,
         workers_number: int,
         download_is_required: bool = True,
+        resume: bool = False,
+    ) -> None:
+        """
+        Orchestrate UniProt database setup. Resumed setup continues
+        the release build interrupted by the previous one.
+        """
+        await self._check_database_ownership()
+        await self._install_release(
+            workers_number,
+            download_is_required,
+            self._compose_resumed_stages if resume else self._compose_stages,
+        )
+
+    async def update_incrementally(
+        self,
+        workers_number: int,
+        download_is_required: bool = True,
+    ) -> None:
+        """
+        Apply only the changes of new release to the database set up earlier.
+        Database stays queryable until the changes are merged in one transaction.
+        """
+        await self._check_release_layout()
+        await self._install_release(
+            workers_number,
+            download_is_required,
+            self._compose_incremental_update_stages,
+        )
+
+    async def _install_release(
+        self,
+        workers_number: int,
+        download_is_required: bool,
+        compose_stages: Callable[..., list[Stage]],
     ) -> None:
-        """Orchestrate UniProt database setup."""
         try:
-            await self._prepare(download_is_required)
-            await self._copy_data(workers_number, download_is_required)
-            await self._uniprot_operator.finalize_database_setup(self._db_pool_config)
+            if download_is_required:
+                await self._update_checker.need_update()
+
+            await self._run_stages(
+                workers_number,
+                partial(compose_stages, download_is_required=download_is_required),
+            )
 
             self._update_checker.save_database_update_time()
 
@@ -67,44 +142,69 @@ class UniprotDatabaseSetup:
         except Exception as e:
             raise UniprotSetupError from e
 
-    async def _prepare(self, download_is_required: bool) -> None:
-        """Execute database reset and then preparation queries."""
-        if not download_is_required:
-            await self._prepare_without_download()
+    async def refresh_taxonomy(
+        self,
+        workers_number: int,
+        download_is_required: bool = True,
+    ) -> None:
+        """
+        Reload only NCBI tables, UniProt data stays in place.
+        New data is copied to staging tables that replace current ones at once.
+        """
+        await self._check_release_layout()
 
-        elif await self._update_checker.need_update():
-            await self._prepare_with_download()
+        try:
+            await self._run_stages(
+                workers_number,
+                partial(
+                    self._compose_taxonomy_refresh_stages,
+                    download_is_required=download_is_required,
+                ),
+            )
 
-    async def _prepare_without_download(self):
-        with contextlib.suppress(Exception):
-            await self._uniprot_operator.reset_database(self._db_pool_config)
+        except Exception as e:
+            raise UniprotSetupError from e
 
-        await self._system_preparer.prepare_environment()
-        await self._uniprot_operator.prepare_database_environment(self._db_pool_config)
+    async def _check_database_ownership(self) -> None:
+        """
+        New release is found by search_path of the database, only its owner
+        can set it, so the setup is not started otherwise.
+        """
+        if not await self._uniprot_operator.owns_database(self._db_pool_config):
+            raise UniprotSetupError(
+                "New release can be set up only by owner of the database, "
+                "it sets search_path of the database to the release schema"
+            )
 
-    async def _prepare_with_download(self):
-        with contextlib.suppress(Exception):
-            await self._uniprot_operator.reset_database(self._db_pool_config)
+    async def _check_release_layout(self) -> None:
+        """Current release is updated in place only if it is built in the same layout."""
+        if not await self._uniprot_operator.is_release_layout_supported(
+            self._db_pool_config
+        ):
+            raise UniprotSetupError(
+                "Current release was built in another layout, build new release"
+            )
 
-        await self._system_preparer.prepare_environment()
-        await self._downloader.download_files()
-        await self._uniprot_operator.prepare_database_environment(self._db_pool_config)
+    async def remove_staging_on_failure(self, files_were_downloaded: bool) -> None:
+        """Remove staging tables and source files, current tables stay intact."""
+        coroutines: list[Coroutine] = [
+            self._uniprot_operator.remove_staging_tables(self._db_pool_config)
+        ]
 
-    async def _copy_data(
-        self,
-        workers_number: int,
-        download_is_required: bool,
+        if not files_were_downloaded:
+            coroutines.append(self._system_preparer.delete_unnecessary_files())
+
+        tasks = create_tasks(coroutines)
+        await process_tasks(tasks)
+
+    async def _run_stages(
+        self, workers_number: int, compose_stages: Callable[[PoolArgs], list[Stage]]
     ) -> None:
         """
-        Copy data from required files to database in parallel processes
-        and then delete used files.
+        Run download, preparation and copy of every archive as a separate chain,
+        so small archives are copied while TrEMBL is still being downloaded.
+        All the chains share the same process pool.
         """
-        await self._copy_data_in_separate_processes(workers_number)
-
-        if download_is_required:
-            await self._system_preparer.delete_unnecessary_files()
-
-    async def _copy_data_in_separate_processes(self, workers_number: int) -> None:
         with Manager() as manager:
             event = manager.Event()
 
@@ -114,13 +214,315 @@ class UniprotDatabaseSetup:
                 initargs=(event,),
             ) as process_pool:
                 loop = asyncio.get_running_loop()
+                stages = compose_stages((loop, process_pool, event))
+                timings = await StageGraph(stages).run()
 
-                await self._file_preparer.prepare_required_files(
-                    loop=loop, process_pool=process_pool, event=event
-                )
+        log_critical_path(timings)
+        await self._report_quarantined_records()
 
-                await self._db_copier.copy(
-                    loop=loop,
-                    process_pool=process_pool,
-                    event=event,
+    async def _report_quarantined_records(self) -> None:
+        quarantined_records = await self._uniprot_operator.count_quarantined_records(
+            self._db_pool_config
+        )
+
+        if quarantined_records:
+            logger.warning(
+                "%s invalid records were not loaded, they are kept in '%s' table",
+                quarantined_records,
+                Tables.QUARANTINE,
+            )
+
+    def _compose_stages(
+        self, pool_args: PoolArgs, download_is_required: bool
+    ) -> list[Stage]:
+        """Completed database stages are noted, so failed setup can be resumed."""
+        stages = [
+            Stage(_RESET_DATABASE, self._reset_database),
+            Stage(
+                _PREPARE_ENVIRONMENT,
+                self._system_preparer.prepare_environment,
+                (_RESET_DATABASE,),
+            ),
+            Stage(_PREPARE_DATABASE, self._prepare_database, (_PREPARE_ENVIRONMENT,)),
+        ]
+
+        for archive in SourceArchives:
+            stages.extend(
+                self._compose_archive_stages(archive, pool_args, download_is_required)
+            )
+
+        stages.extend(self._compose_final_stages(download_is_required))
+        return [
+            replace(stage, run=partial(self._run_stage_once, stage))
+            if _is_database_stage(stage.name)
+            else stage
+            for stage in stages
+        ]
+
+    def _compose_resumed_stages(
+        self, pool_args: PoolArgs, download_is_required: bool
+    ) -> list[Stage]:
+        """
+        Release being built is not reset, it is checked to be built from
+        the same release of the source files instead. Database stages completed
+        by the interrupted setup are skipped, files that were prepared completely
+        are neither downloaded nor prepared again.
+        """
+        prepare_stages = {
+            _get_stage_name(action, archive): _get_stage_name(_PREPARE, archive)
+            for archive in SourceArchives
+            for action in (_DOWNLOAD, _PREPARE)
+        }
+        return [
+            self._resume_stage(stage, prepare_stages)
+            for stage in self._compose_stages(pool_args, download_is_required)
+        ]
+
+    def _resume_stage(self, stage: Stage, prepare_stages: dict[str, str]) -> Stage:
+        if stage.name == _RESET_DATABASE:
+            return replace(stage, run=self._load_interrupted_build)
+
+        if stage.name in prepare_stages:
+            return replace(
+                stage,
+                run=partial(
+                    self._run_unless_completed, stage, prepare_stages[stage.name]
+                ),
+            )
+
+        return stage
+
+    async def _run_stage_once(self, stage: Stage) -> None:
+        """
+        Files the stage reads were prepared completely once it starts,
+        so they are noted as well to be reused by resumed setup.
+        """
+        if await self._is_stage_completed(stage.name):
+            logger.info("Stage '%s' was completed before", stage.name)
+            return
+
+        if prepared_files := tuple(
+            filter(_is_files_preparation_stage, stage.dependencies)
+        ):
+            await self._uniprot_operator.complete_stages(
+                self._db_pool_config, prepared_files
+            )
+
+        await stage.run()
+        await self._uniprot_operator.complete_stages(
+            self._db_pool_config, (stage.name,)
+        )
+
+    async def _run_unless_completed(self, stage: Stage, completed_stage: str) -> None:
+        if completed_stage in self._interrupted_stages:
+            logger.info(
+                "Stage '%s' is skipped, '%s' was completed before",
+                stage.name,
+                completed_stage,
+            )
+            return
+
+        await stage.run()
+
+    async def _is_stage_completed(self, stage_name: str) -> bool:
+        completed_stages = await self._uniprot_operator.get_completed_stages(
+            self._db_pool_config
+        )
+        return stage_name in completed_stages
+
+    async def _prepare_database(self) -> None:
+        """Release of the source files is noted to resume the build with them only."""
+        await self._uniprot_operator.prepare_database_environment(self._db_pool_config)
+        await self._uniprot_operator.note_source_release(
+            self._db_pool_config, self._update_checker.current_modification_date
+        )
+
+    async def _load_interrupted_build(self) -> None:
+        """Stages completed by the interrupted setup are read once it is resumed."""
+        if not await self._uniprot_operator.is_built_from_release(
+            self._db_pool_config, self._update_checker.current_modification_date
+        ):
+            raise UniprotSetupError(
+                "Interrupted release was built from another release of source files, "
+                "it can not be resumed, run setup without --resume"
+            )
+
+        self._interrupted_stages = await self._uniprot_operator.get_completed_stages(
+            self._db_pool_config
+        )
+
+    def _compose_taxonomy_refresh_stages(
+        self, pool_args: PoolArgs, download_is_required: bool
+    ) -> list[Stage]:
+        """Staging tables are created instead of the database preparation."""
+        taxonomy_copy = _get_stage_name(_COPY, SourceArchives.TAXDUMP)
+
+        return [
+            *self._compose_staging_stages(
+                self._uniprot_operator.prepare_taxonomy_refresh
+            ),
+            *self._compose_archive_stages(
+                SourceArchives.TAXDUMP, pool_args, download_is_required
+            ),
+            Stage(
+                _FINALIZE_TAXONOMY,
+                partial(
+                    self._uniprot_operator.finalize_taxonomy_refresh,
+                    self._db_pool_config,
+                ),
+                (taxonomy_copy,),
+            ),
+            *self._compose_clean_up_stages((taxonomy_copy,), download_is_required),
+        ]
+
+    def _compose_incremental_update_stages(
+        self, pool_args: PoolArgs, download_is_required: bool
+    ) -> list[Stage]:
+        """Changes of all the archives are copied to staging and merged at once."""
+        copies = tuple(_get_stage_name(_COPY, archive) for archive in SourceArchives)
+        stages = self._compose_staging_stages(
+            self._uniprot_operator.prepare_incremental_update
+        )
+
+        for archive in SourceArchives:
+            stages.extend(
+                self._compose_archive_stages(archive, pool_args, download_is_required)
+            )
+
+        return [
+            *stages,
+            Stage(
+                _MERGE_CHANGES,
+                partial(
+                    self._uniprot_operator.finalize_incremental_update,
+                    self._db_pool_config,
+                ),
+                copies,
+            ),
+            *self._compose_clean_up_stages(copies, download_is_required),
+        ]
+
+    def _compose_staging_stages(
+        self, prepare_staging: Callable[[StringKeyMapping], Awaitable[None]]
+    ) -> list[Stage]:
+        """Current tables are kept, so they are neither reset nor recreated."""
+        return [
+            Stage(_PREPARE_ENVIRONMENT, self._system_preparer.prepare_environment),
+            Stage(
+                _PREPARE_DATABASE,
+                partial(prepare_staging, self._db_pool_config),
+                (_PREPARE_ENVIRONMENT,),
+            ),
+        ]
+
+    def _compose_clean_up_stages(
+        self, copies: tuple[str, ...], download_is_required: bool
+    ) -> list[Stage]:
+        if not download_is_required:
+            return []
+
+        return [
+            Stage(
+                _DELETE_SOURCE_FILES,
+                self._system_preparer.delete_unnecessary_files,
+                copies,
+            )
+        ]
+
+    def _compose_archive_stages(
+        self, archive: SourceArchives, pool_args: PoolArgs, download_is_required: bool
+    ) -> list[Stage]:
+        """Download -> preparation -> copy chain of a single archive."""
+        download = partial(self._download_archive, archive, download_is_required)
+        prepare = partial(self._file_preparer.prepare_archive, archive, *pool_args)
+        copy = partial(self._db_copier.copy_archive, archive, *pool_args)
+
+        return [
+            Stage(
+                _get_stage_name(_DOWNLOAD, archive), download, (_PREPARE_ENVIRONMENT,)
+            ),
+            Stage(
+                _get_stage_name(_PREPARE, archive),
+                prepare,
+                (_get_stage_name(_DOWNLOAD, archive),),
+            ),
+            Stage(
+                _get_stage_name(_COPY, archive),
+                copy,
+                (_get_stage_name(_PREPARE, archive), _PREPARE_DATABASE),
+            ),
+        ]
+
+    def _compose_final_stages(self, download_is_required: bool) -> list[Stage]:
+        """
+        Taxonomy is finalized as soon as NCBI data is copied,
+        UniProt table is finalized after all the sequences are copied.
+        Finalized release replaces the current one.
+        """
+        uniprot_copies = tuple(
+            _get_stage_name(_COPY, archive)
+            for archive in SourceArchives
+            if archive != SourceArchives.TAXDUMP
+        )
+        taxonomy_copy = _get_stage_name(_COPY, SourceArchives.TAXDUMP)
+        stages = [
+            Stage(
+                _FINALIZE_TAXONOMY,
+                partial(
+                    self._uniprot_operator.finalize_taxonomy_setup, self._db_pool_config
+                ),
+                (taxonomy_copy,),
+            ),
+            Stage(
+                _FINALIZE_UNIPROT,
+                partial(
+                    self._uniprot_operator.finalize_uniprot_setup, self._db_pool_config
+                ),
+                (*uniprot_copies, _FINALIZE_TAXONOMY),
+            ),
+            Stage(
+                _PUBLISH_RELEASE,
+                partial(self._uniprot_operator.publish_release, self._db_pool_config),
+                (_FINALIZE_UNIPROT,),
+            ),
+        ]
+
+        if download_is_required:
+            stages.append(
+                Stage(
+                    _DELETE_SOURCE_FILES,
+                    self._system_preparer.delete_unnecessary_files,
+                    (*uniprot_copies, taxonomy_copy),
                 )
+            )
+
+        return stages
+
+    async def _reset_database(self) -> None:
+        with contextlib.suppress(Exception):
+            await self._uniprot_operator.reset_database(self._db_pool_config)
+
+    async def _download_archive(
+        self, archive: SourceArchives, download_is_required: bool
+    ) -> None:
+        if download_is_required:
+            await self._downloader.download_archive(archive)
+
+
+def _get_stage_name(action: str, archive: SourceArchives) -> str:
+    return f"{action} {archive}"
+
+
+def _is_database_stage(stage_name: str) -> bool:
+    """Progress is noted only for stages that run after database was prepared."""
+    return stage_name in (
+        _PREPARE_DATABASE,
+        _FINALIZE_TAXONOMY,
+        _FINALIZE_UNIPROT,
+    ) or stage_name.startswith(_COPY)
+
+
+def _is_files_preparation_stage(stage_name: str) -> bool:
+    return any(
+        stage_name == _get_stage_name(_PREPARE, archive) for archive in SourceArchives
+    )
@@ -1,5 +1,10 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager, suppress
+
 from application.interfaces import (
     DatabaseConnectorProtocol,
+    ProgressMonitorProtocol,
     UniprotLifecycleProtocol,
 )
 from core.interfaces import StringKeyMapping
@@ -12,12 +17,14 @@ class UniprotOperator:
         self,
         db_connector: DatabaseConnectorProtocol,
         uniprot_lifecycle: UniprotLifecycleProtocol,
+        progress_monitor: ProgressMonitorProtocol | None = None,
     ):
         self._db_connector = db_connector
         self._uniprot_lifecycle = uniprot_lifecycle
+        self._progress_monitor = progress_monitor
 
     async def remove_database(self, pool_config: StringKeyMapping) -> None:
-        """Remove database after unsuccessful setup attempt."""
+        """Remove release being built after unsuccessful setup attempt."""
         async with self._db_connector.open_pool(pool_config) as pool:
             await self._uniprot_lifecycle.remove_database(pool)
 
@@ -31,7 +38,130 @@ class UniprotOperator:
         async with self._db_connector.open_pool(pool_config) as conn:
             await self._uniprot_lifecycle.reset_database(conn)
 
-    async def finalize_database_setup(self, pool_config: StringKeyMapping) -> None:
+    async def finalize_taxonomy_setup(self, pool_config: StringKeyMapping) -> None:
+        """Execute final queries for NCBI tables after their data was copied."""
+        async with (
+            self._db_connector.open_pool(pool_config) as pool,
+            self._monitor_progress(pool_config),
+        ):
+            await self._uniprot_lifecycle.execute_taxonomy_operations_after_copy(pool)
+
+    async def finalize_uniprot_setup(self, pool_config: StringKeyMapping) -> None:
         """Execute final queries after all data was copied."""
+        async with (
+            self._db_connector.open_pool(pool_config) as pool,
+            self._monitor_progress(pool_config),
+        ):
+            await self._uniprot_lifecycle.execute_uniprot_operations_after_copy(pool)
+
+    async def publish_release(self, pool_config: StringKeyMapping) -> None:
+        """Replace current release with the built one."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            await self._uniprot_lifecycle.execute_release_swap_operations(pool)
+
+    async def prepare_taxonomy_refresh(self, pool_config: StringKeyMapping) -> None:
+        """Prepare staging tables for new NCBI data."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            await (
+                self._uniprot_lifecycle.execute_taxonomy_refresh_operations_before_copy(
+                    pool
+                )
+            )
+
+    async def finalize_taxonomy_refresh(self, pool_config: StringKeyMapping) -> None:
+        """Replace NCBI tables with staging ones after their data was copied."""
+        async with (
+            self._db_connector.open_pool(pool_config) as pool,
+            self._monitor_progress(pool_config),
+        ):
+            await (
+                self._uniprot_lifecycle.execute_taxonomy_refresh_operations_after_copy(
+                    pool
+                )
+            )
+
+    async def prepare_incremental_update(self, pool_config: StringKeyMapping) -> None:
+        """Prepare staging tables for changes of new release."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            await self._uniprot_lifecycle.execute_incremental_update_operations_before_copy(
+                pool
+            )
+
+    async def finalize_incremental_update(self, pool_config: StringKeyMapping) -> None:
+        """Merge changes of new release after they were copied."""
+        async with (
+            self._db_connector.open_pool(pool_config) as pool,
+            self._monitor_progress(pool_config),
+        ):
+            await self._uniprot_lifecycle.execute_incremental_update_operations_after_copy(
+                pool
+            )
+
+    async def remove_staging_tables(self, pool_config: StringKeyMapping) -> None:
+        """Remove staging tables after unsuccessful refresh or update attempt."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            await self._uniprot_lifecycle.remove_staging_tables(pool)
+
+    async def get_completed_stages(self, pool_config: StringKeyMapping) -> list[str]:
+        """Stages of the interrupted setup that are not executed again."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            return await self._uniprot_lifecycle.get_completed_stages(pool)
+
+    async def complete_stages(
+        self, pool_config: StringKeyMapping, stages: Iterable[str]
+    ) -> None:
+        async with self._db_connector.open_pool(pool_config) as pool:
+            for stage in stages:
+                await self._uniprot_lifecycle.complete_stage(pool, stage)
+
+    async def note_source_release(
+        self, pool_config: StringKeyMapping, release: str | None
+    ) -> None:
+        async with self._db_connector.open_pool(pool_config) as pool:
+            await self._uniprot_lifecycle.note_source_release(pool, release)
+
+    async def is_built_from_release(
+        self, pool_config: StringKeyMapping, release: str | None
+    ) -> bool:
+        """Interrupted build is continued with the files of the same release only."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            return await self._uniprot_lifecycle.is_built_from_release(pool, release)
+
+    async def has_checkpoints(self, pool_config: StringKeyMapping) -> bool:
+        """Failed setup that committed copied data can be resumed."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            return await self._uniprot_lifecycle.has_checkpoints(pool)
+
+    async def owns_database(self, pool_config: StringKeyMapping) -> bool:
+        """New release can be published only by owner of the database."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            return await self._uniprot_lifecycle.owns_database(pool)
+
+    async def is_release_layout_supported(self, pool_config: StringKeyMapping) -> bool:
+        """Current release can be updated in place if rows keep its layout."""
+        async with self._db_connector.open_pool(pool_config) as pool:
+            return await self._uniprot_lifecycle.is_release_layout_supported(pool)
+
+    async def count_quarantined_records(self, pool_config: StringKeyMapping) -> int:
         async with self._db_connector.open_pool(pool_config) as pool:
-            await self._uniprot_lifecycle.execute_database_operations_after_copy(pool)
+            return await self._uniprot_lifecycle.count_quarantined_records(pool)
+
+    @asynccontextmanager
+    async def _monitor_progress(
+        self, pool_config: StringKeyMapping
+    ) -> AsyncIterator[None]:
+        """Index builds and constraint checks may run silently for hours."""
+        if self._progress_monitor is None:
+            yield
+            return
+
+        monitor_task = asyncio.create_task(self._progress_monitor.monitor(pool_config))
+
+        try:
+            yield
+
+        finally:
+            monitor_task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await monitor_task
@@ -0,0 +1,210 @@
+"""
+Compare storage profiles of 'uniprot_kb' on synthetic sequences:
+load time, table size and latency of the query that slices every sequence.
+
+Run from the repository root:
+PYTHONPATH=src python -m benchmarks.storage_profiles --dbname db --dbuser user
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+
+import infrastructure.database.postgresql.queries as q
+from core.interfaces import StringKeyMapping
+from domain.entities import SequenceRecord, SequenceSource, Tables
+from infrastructure.database.postgresql import (
+    ConnectionConfig,
+    PostgreSQLAdapter,
+    StorageProfile,
+)
+
+BENCHMARK_SCHEMA: str = "storage_profile_benchmark"
+
+_AMINO_ACIDS: str = "ACDEFGHIKLMNPQRSTVWY"
+_SLICE_LENGTH: int = 10
+
+_SLICE_QUERY: str = f"""
+    SELECT count(*) FROM {Tables.UNIPROT}
+    WHERE substr(sequence, $1, {_SLICE_LENGTH}) = $2
+    """
+
+_SELECT_TABLE_SIZE_QUERY: str = f"""SELECT pg_total_relation_size('{Tables.UNIPROT}')"""
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileMeasurement:
+    profile: StorageProfile
+    load_seconds: float
+    table_bytes: int
+    slice_query_ms: float
+
+
+async def benchmark_storage_profiles(
+    connection_config: StringKeyMapping,
+    profiles: Iterable[StorageProfile],
+    rows: int = 10_000,
+    sequence_length: int = 3_000,
+    repeats: int = 5,
+) -> list[ProfileMeasurement]:
+    """
+    Every profile gets the same records in a fresh schema that is removed
+    afterwards. Slice is taken near the end of the sequences, so prefix
+    decompression does not shortcut it.
+    """
+    records = _generate_records(rows, sequence_length)
+    db_adapter = PostgreSQLAdapter()
+    pool_config = {
+        **connection_config,
+        "min_size": 1,
+        "max_size": 1,
+        "server_settings": {"search_path": BENCHMARK_SCHEMA},
+    }
+    measurements = []
+
+    for profile in profiles:
+        await _recreate_schema(db_adapter, connection_config)
+
+        async with db_adapter.open_pool(pool_config) as pool:
+            await db_adapter.execute_queries_sync(
+                pool,
+                (
+                    q.CREATE_SOURCE_ENUM_QUERY,
+                    profile.format_query(
+                        q.CREATE_UNIPROT_KB_QUERY,
+                        **q.NAME_COLUMNS,
+                        **q.SEQUENCE_COLUMNS,
+                    ),
+                ),
+            )
+            load_start = time.perf_counter()
+            await db_adapter.copy(pool, Tables.UNIPROT, records)
+            load_seconds = time.perf_counter() - load_start
+
+            [table_bytes] = await db_adapter.fetch_values(
+                pool, _SELECT_TABLE_SIZE_QUERY
+            )
+            slice_query_ms = await _measure_slice_query(
+                db_adapter, pool, sequence_length, repeats
+            )
+
+        measurements.append(
+            ProfileMeasurement(profile, load_seconds, table_bytes, slice_query_ms)
+        )
+
+    await _drop_schema(db_adapter, connection_config)
+    return measurements
+
+
+def _generate_records(rows: int, sequence_length: int) -> list[tuple]:
+    """Random sequences compress about as badly as the real ones."""
+    db_adapter = PostgreSQLAdapter()
+    randomizer = random.Random(0)
+
+    return [
+        db_adapter.prepare_record_for_copy(
+            SequenceRecord(
+                source=SequenceSource.TREMBL,
+                is_reviewed=False,
+                accession=f"B{number:09d}",
+                entry_name=f"B{number:09d}_BENCH",
+                peptide_name="Benchmark protein",
+                ncbi_id=9606,
+                organism_name="Homo sapiens",
+                sequence="".join(randomizer.choices(_AMINO_ACIDS, k=sequence_length)),
+            )
+        )
+        for number in range(rows)
+    ]
+
+
+async def _measure_slice_query(
+    db_adapter: PostgreSQLAdapter, pool: object, sequence_length: int, repeats: int
+) -> float:
+    """Median of the repeats, the first one warms up the cache."""
+    slice_start = max(sequence_length - 2 * _SLICE_LENGTH, 1)
+    durations = []
+
+    for _ in range(repeats + 1):
+        start = time.perf_counter()
+        await db_adapter.fetch_values(pool, _SLICE_QUERY, slice_start, "W" * 10)
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(durations[1:])
+
+
+async def _recreate_schema(
+    db_adapter: PostgreSQLAdapter, connection_config: StringKeyMapping
+) -> None:
+    await _drop_schema(db_adapter, connection_config)
+
+    async with db_adapter.open_pool(
+        {**connection_config, "min_size": 1, "max_size": 1}
+    ) as pool:
+        await db_adapter.execute_query(pool, f"CREATE SCHEMA {BENCHMARK_SCHEMA}")
+
+
+async def _drop_schema(
+    db_adapter: PostgreSQLAdapter, connection_config: StringKeyMapping
+) -> None:
+    async with db_adapter.open_pool(
+        {**connection_config, "min_size": 1, "max_size": 1}
+    ) as pool:
+        await db_adapter.execute_query(
+            pool, f"DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE"
+        )
+
+
+def _report(measurements: list[ProfileMeasurement]) -> str:
+    lines = [f"{'profile':<10} {'load, s':>9} {'size, MB':>9} {'slice, ms':>10}"]
+    lines += [
+        f"{measurement.profile:<10} "
+        f"{measurement.load_seconds:>9.2f} "
+        f"{measurement.table_bytes / 1024**2:>9.1f} "
+        f"{measurement.slice_query_ms:>10.1f}"
+        for measurement in measurements
+    ]
+    return "\n".join(lines)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="uniprot_kb storage profiles")
+    parser.add_argument("--dbname", "-d", required=True, type=str)
+    parser.add_argument("--dbuser", "-U", required=True, type=str)
+    parser.add_argument("--password", "-p", type=str)
+    parser.add_argument("--port", "-P", default=5432, type=int)
+    parser.add_argument("--host", "-u", default="localhost", type=str)
+    parser.add_argument("--rows", default=10_000, type=int)
+    parser.add_argument("--sequence-length", default=3_000, type=int)
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        type=StorageProfile,
+        choices=list(StorageProfile),
+        default=list(StorageProfile),
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    connection_config = ConnectionConfig(
+        database=args.dbname,
+        user=args.dbuser,
+        port=args.port,
+        host=args.host,
+        password=args.password,
+    )
+    measurements = asyncio.run(
+        benchmark_storage_profiles(
+            asdict(connection_config),
+            args.profiles,
+            rows=args.rows,
+            sequence_length=args.sequence_length,
+        )
+    )
+    print(_report(measurements))
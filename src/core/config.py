@@ -2,6 +2,7 @@ import asyncio
 from asyncio import Semaphore
 from enum import StrEnum
 from pathlib import Path
+from urllib.error import URLError
 
 import aiohttp
 from aiohttp import ClientTimeout
@@ -40,6 +41,9 @@ SEMAPHORE: Semaphore = Semaphore(MAX_CONNECTIONS)
 # Delay to close SSL connections.
 GRACEFUL_SHUTDOWN_DELAY: float = 0.250
 
+# Socket timeout for files that are streamed straight to the database (seconds).
+STREAM_TIMEOUT: float = 300
+
 UNIPROT_SP_LINK: Link = Link(
     "https://ftp.uniprot.org/pub/databases/uniprot/"
     "current_release/knowledgebase/complete/"
@@ -68,6 +72,46 @@ NETWORK_ERRORS = (
     aiohttp.ClientConnectionError,
 )
 
+# Errors of the blocking HTTP client that streams files inside worker processes.
+STREAM_NETWORK_ERRORS = (
+    URLError,
+    TimeoutError,
+    ConnectionError,
+)
+
+# Preparation config
+
+# Distance between access points of gzip random access index
+# (bytes of decompressed data).
+GZIP_INDEX_SPAN: int = 2**26
+
+# Distance between FASTA record starts saved while decompressing files (bytes).
+CHUNK_PLAN_INTERVAL: int = 2**24
+
+# Size of the data read and decompressed at once (bytes).
+DECOMPRESSION_BUFFER_SIZE: int = 2**22
+
+# Size of the compressed sample used to pick the fastest decompression backend.
+DECOMPRESSION_BENCHMARK_SIZE: int = 2**23
+
+# Decompressed size of seekable zstd frames in source cache (bytes).
+SOURCE_CACHE_FRAME_SIZE: int = 2**25
+
+# Zstd level of source cache, close to gzip ratio but much faster to decompress.
+SOURCE_CACHE_COMPRESSION_LEVEL: int = 9
+
+# TrEMBL is split on more chunks than workers, so the workers that
+# finished earlier take the rest of the chunks.
+TREMBL_CHUNKS_PER_WORKER: int = 4
+
+
+# Archives that are downloaded, each one is prepared and copied on its own.
+class SourceArchives(StrEnum):
+    TAXDUMP = "new_taxdump.tar.gz"
+    SWISS_PROT = "uniprot_sprot.fasta.gz"
+    SP_ISOFORMS = "uniprot_sprot_varsplic.fasta.gz"
+    TREMBL = "uniprot_trembl.fasta.gz"
+
 
 # File names that must be extracted / prepared.
 class NCBIFiles(StrEnum):
@@ -1,3 +1,7 @@
 class NeighbouringProcessError(Exception):
     def __init__(self, message: str = "Error occured in neighbouring process."):
         super().__init__(f"{message}")
+
+
+class StageGraphError(Exception):
+    """Stages can not be ordered by their dependencies."""
@@ -10,6 +10,13 @@ from .process_globals import (
     is_shutdown_event_set,
     set_shutdown_event,
 )
+from .stage_graph import (
+    Stage,
+    StageGraph,
+    StageTiming,
+    get_critical_path,
+    log_critical_path,
+)
 
 __all__ = (
     "init_shutdown_event",
@@ -20,4 +27,9 @@ __all__ = (
     "process_futures",
     "process_tasks",
     "run_futures",
+    "Stage",
+    "StageGraph",
+    "StageTiming",
+    "get_critical_path",
+    "log_critical_path",
 )
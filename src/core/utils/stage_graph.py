@@ -0,0 +1,168 @@
+import logging
+from asyncio import Task, create_task, gather, wait
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from time import perf_counter
+
+from core.exceptions import StageGraphError
+from core.utils.process_awaitables import process_tasks
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """Named step of the pipeline that starts once all its dependencies finished."""
+
+    name: str
+    run: Callable[[], Awaitable[None]]
+    dependencies: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class StageTiming:
+    """Time (seconds) since the graph start when the stage started and finished."""
+
+    name: str
+    started: float
+    finished: float
+    dependencies: tuple[str, ...]
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class StageGraph:
+    """
+    Run stages concurrently, every stage waits only for its own dependencies.
+    Stages share the resources (process pool, connections) passed to them,
+    so independent stages overlap instead of waiting for the slowest phase.
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        self._stages = {stage.name: stage for stage in stages}
+        self._check_dependencies()
+        self._tasks: dict[str, Task] = {}
+        self._timings: dict[str, StageTiming] = {}
+        self._start = 0.0
+
+    def _check_dependencies(self) -> None:
+        for stage in self._stages.values():
+            unknown = set(stage.dependencies) - self._stages.keys()
+
+            if unknown:
+                raise StageGraphError(f"Stage {stage.name} depends on {unknown}")
+
+        self._check_cycles()
+
+    def _check_cycles(self) -> None:
+        """Stages without unfinished dependencies are removed until none is left."""
+        remaining = {
+            name: set(stage.dependencies) for name, stage in self._stages.items()
+        }
+
+        while remaining:
+            ready = {name for name, deps in remaining.items() if not deps}
+
+            if not ready:
+                raise StageGraphError(f"Stages {set(remaining)} depend on each other")
+
+            remaining = {
+                name: deps - ready
+                for name, deps in remaining.items()
+                if name not in ready
+            }
+
+    async def run(self) -> list[StageTiming]:
+        """
+        Run all the stages, the first failure cancels the rest.
+        Stages are awaited to the end, so none of them is left running
+        and the only raised exception is the first failure.
+        """
+        self._start = perf_counter()
+
+        for name in self._stages:
+            self._get_task(name)
+
+        tasks = list(self._tasks.values())
+
+        try:
+            await process_tasks(tasks)
+
+        finally:
+            [task.cancel() for task in tasks]
+            await gather(*tasks, return_exceptions=True)
+
+        return sorted(self._timings.values(), key=lambda timing: timing.started)
+
+    def _get_task(self, name: str) -> Task:
+        """Dependencies are scheduled first, so every stage can await their tasks."""
+        if name not in self._tasks:
+            stage = self._stages[name]
+            dependencies = [self._get_task(dep) for dep in stage.dependencies]
+            self._tasks[name] = create_task(self._run_stage(stage, dependencies))
+
+        return self._tasks[name]
+
+    async def _run_stage(self, stage: Stage, dependencies: list[Task]) -> None:
+        """
+        Stage is skipped if any of its dependencies did not finish,
+        failure of the dependency is raised by the dependency alone.
+        """
+        if dependencies:
+            await wait(dependencies)
+
+        if not all(dependency in self._timings for dependency in stage.dependencies):
+            logger.debug("Stage '%s' skipped, its dependencies failed", stage.name)
+            return
+
+        started = perf_counter() - self._start
+        logger.debug("Stage '%s' started", stage.name)
+        await stage.run()
+
+        self._timings[stage.name] = StageTiming(
+            name=stage.name,
+            started=started,
+            finished=perf_counter() - self._start,
+            dependencies=stage.dependencies,
+        )
+        logger.debug("Stage '%s' finished", stage.name)
+
+
+def get_critical_path(timings: Iterable[StageTiming]) -> list[StageTiming]:
+    """
+    Chain of stages that determined total time: starting from the last finished
+    stage, step back to the dependency that finished the latest.
+    """
+    timings_by_name = {timing.name: timing for timing in timings}
+
+    if not timings_by_name:
+        return []
+
+    path = [max(timings_by_name.values(), key=lambda timing: timing.finished)]
+
+    while path[-1].dependencies:
+        path.append(
+            max(
+                (timings_by_name[dep] for dep in path[-1].dependencies),
+                key=lambda timing: timing.finished,
+            )
+        )
+
+    return path[::-1]
+
+
+def log_critical_path(timings: Iterable[StageTiming]) -> None:
+    critical_path = get_critical_path(timings)
+
+    if not critical_path:
+        return
+
+    logger.info(
+        "Critical path (%.1f s): %s",
+        critical_path[-1].finished,
+        " -> ".join(
+            f"{timing.name} ({timing.duration:.1f} s)" for timing in critical_path
+        ),
+    )
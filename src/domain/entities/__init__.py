@@ -1,6 +1,13 @@
 from .constants import BASE_DIR, DEFAULT_SOURCE_FILES_FOLDER
-from .sequence import SequenceBioInfo, SequenceMetaInfo, SequenceRecord, SequenceSource
-from .tables import Tables
+from .sequence import (
+    NormalizedSequenceRecord,
+    SequenceBioInfo,
+    SequenceMetaInfo,
+    SequenceRecord,
+    SequenceSource,
+    get_sequence_id,
+)
+from .tables import Schemas, Tables
 from .taxonomy import LineagePair, MergedPair, Taxonomy
 
 __all__ = (
@@ -10,8 +17,11 @@ __all__ = (
     "MergedPair",
     "LineagePair",
     "Tables",
+    "Schemas",
     "SequenceRecord",
+    "NormalizedSequenceRecord",
     "SequenceMetaInfo",
     "SequenceBioInfo",
     "SequenceSource",
+    "get_sequence_id",
 )
@@ -1,6 +1,9 @@
+import hashlib
 import reprlib
+from collections.abc import Mapping
 from dataclasses import dataclass, fields
 from enum import StrEnum
+from uuid import UUID
 
 
 class SequenceSource(StrEnum):
@@ -59,6 +62,47 @@ class SequenceRecord:
     organism_name: str
     sequence: str
 
+    def get_fingerprint(self) -> int:
+        """
+        Signed 64-bit digest of all the record fields,
+        so changed entry of the next release can be found without comparing them.
+        """
+        content = "\x1f".join(
+            (
+                self.source,
+                str(self.is_reviewed),
+                self.accession,
+                self.entry_name,
+                self.peptide_name,
+                str(self.ncbi_id),
+                self.organism_name,
+                self.sequence,
+            )
+        )
+        return _get_digest(content)
+
+    def normalize(
+        self,
+        peptide_name_ids: Mapping[str, int] | None = None,
+        organism_name_ids: Mapping[str, int] | None = None,
+        sequence_id: bool = False,
+    ) -> "NormalizedSequenceRecord":
+        """
+        Names are replaced with the ids their dictionary tables gave them
+        and sequence with its id if required, fingerprint is the same.
+        """
+        return NormalizedSequenceRecord(
+            source=self.source,
+            is_reviewed=self.is_reviewed,
+            accession=self.accession,
+            entry_name=self.entry_name,
+            peptide_name=_get_name_id(self.peptide_name, peptide_name_ids),
+            ncbi_id=self.ncbi_id,
+            organism_name=_get_name_id(self.organism_name, organism_name_ids),
+            sequence=get_sequence_id(self.sequence) if sequence_id else self.sequence,
+            fingerprint=self.get_fingerprint(),
+        )
+
     def __repr__(self) -> str:
         cls = self.__class__
         cls_name = cls.__name__
@@ -74,3 +118,38 @@ class SequenceRecord:
             field_repr.append(f"{indent + field.name}={value!r}")
 
         return f"{cls_name}(\n{',\n'.join(field_repr)}\n)"
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedSequenceRecord:
+    """
+    Sequence record which repeated names and sequences may be stored once
+    in dictionary tables and referenced by their ids.
+    """
+
+    source: SequenceSource
+    is_reviewed: bool
+    accession: str
+    entry_name: str
+    peptide_name: str | int
+    ncbi_id: int
+    organism_name: str | int
+    sequence: str | UUID
+    fingerprint: int
+
+
+def get_sequence_id(sequence: str) -> UUID:
+    """
+    Id of the sequence is its 128-bit digest, identical sequences of
+    different entries get the same id and collisions are not expected.
+    """
+    return UUID(bytes=hashlib.blake2b(sequence.encode(), digest_size=16).digest())
+
+
+def _get_name_id(name: str, name_ids: Mapping[str, int] | None) -> str | int:
+    return name if name_ids is None else name_ids[name]
+
+
+def _get_digest(content: str) -> int:
+    digest = hashlib.blake2b(content.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="big", signed=True)
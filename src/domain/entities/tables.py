@@ -9,3 +9,41 @@ class Tables(StrEnum):
     LINEAGE = "lineage"
     UNIPROT = "uniprot_kb"
     MERGED = "merged_id"
+
+    # How the release was built, e.g. foreign keys that were validated.
+    BUILD_METADATA = "build_metadata"
+
+    # Names and sequences repeated by 'uniprot_kb' rows stored once,
+    # the view shows normalized 'uniprot_kb' with them.
+    PEPTIDE_NAME = "peptide_name"
+    ORGANISM_NAME = "organism_name"
+    SEQUENCE = "sequence"
+    UNIPROT_NAMED = "uniprot_kb_named"
+
+    # Partitions of 'uniprot_kb' by sequence source.
+    UNIPROT_SP = "uniprot_kb_sp"
+    UNIPROT_SP_ISO = "uniprot_kb_sp_iso"
+    UNIPROT_TR = "uniprot_kb_tr"
+
+    # New NCBI data is loaded here while the current tables are still in use.
+    TAXONOMY_STAGING = "taxonomy_staging"
+    LINEAGE_STAGING = "lineage_staging"
+    MERGED_STAGING = "merged_id_staging"
+    UNIPROT_STAGING = "uniprot_kb_staging"
+    ACCESSION_STAGING = "uniprot_accession_staging"
+
+    # Progress of the release build, so interrupted setup can be resumed.
+    STAGE_PROGRESS = "stage_progress"
+    COPY_PROGRESS = "copy_progress"
+
+    # Invalid records put aside by the last load.
+    QUARANTINE = "quarantine"
+
+
+class Schemas(StrEnum):
+    """Schemas the UniProt database releases are kept in."""
+
+    # Readers query the current release here.
+    LIVE = "uniprot"
+    # New release is built here while the current one is still in use.
+    BUILD = "uniprot_build"
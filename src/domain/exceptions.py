@@ -4,3 +4,7 @@ class DomainError(Exception):
 
 class CopyToUniprotDBError(DomainError):
     """Copy to uniprot database exception."""
+
+
+class ErrorBudgetExceededError(DomainError):
+    """Too many invalid records were put aside during copy."""
@@ -1,7 +1,7 @@
 from abc import abstractmethod
-from collections.abc import Iterable, Iterator
-from contextlib import AbstractAsyncContextManager
-from typing import Any, Protocol
+from collections.abc import AsyncIterable, Iterable, Iterator, Mapping, Sequence
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import Any, Protocol, runtime_checkable
 
 from core.interfaces import StringKeyMapping
 from domain.entities import (
@@ -11,6 +11,7 @@ from domain.entities import (
     Tables,
     Taxonomy,
 )
+from domain.models import ChunkRange, CopyCheckpoint, QuarantinedRecord
 
 
 class DatabaseCopyAdapterProtocol(Protocol):
@@ -28,6 +29,74 @@ class DatabaseCopyAdapterProtocol(Protocol):
     ) -> None:
         pass
 
+    @abstractmethod
+    async def copy_changed_sequences(
+        self,
+        pool: Any,
+        table_name: Tables,
+        records: list[Any],
+        timeout: float | None = None,
+    ) -> None:
+        """Copy only sequences that differ from the ones already in database."""
+        pass
+
+    @abstractmethod
+    async def copy_with_dictionaries(
+        self,
+        pool: Any,
+        table_name: Tables,
+        records: list[Any],
+        dictionaries: Mapping[Tables, Mapping[Any, str]],
+        timeout: float | None = None,
+    ) -> None:
+        """Add new values to dictionary tables and copy records referencing them."""
+        pass
+
+    @abstractmethod
+    async def merge_names(
+        self,
+        pool: Any,
+        table_name: Tables,
+        names: list[str],
+        timeout: float | None = None,
+    ) -> dict[str, int]:
+        """Add names missing from dictionary table, get ids of all the names."""
+        pass
+
+    @abstractmethod
+    async def copy_with_checkpoint(
+        self,
+        pool: Any,
+        table_name: Tables,
+        records: list[Any],
+        checkpoint: CopyCheckpoint,
+        timeout: float | None = None,
+    ) -> None:
+        """Copy records and note the part of the source they come from at once."""
+        pass
+
+    @abstractmethod
+    async def copy_frozen(
+        self, pool: Any, table_name: Tables, batches: AsyncIterable[list[Any]]
+    ) -> None:
+        """Empty the table and copy all the batches as frozen rows at once."""
+        pass
+
+    @abstractmethod
+    async def get_checkpoints(self, pool: Any) -> list[CopyCheckpoint]:
+        """Get parts of the source files that were copied before."""
+        pass
+
+    @abstractmethod
+    async def truncate_tables(self, pool: Any, table_names: Iterable[Tables]) -> None:
+        """Remove records copied to the tables before."""
+        pass
+
+    @abstractmethod
+    async def quarantine(self, pool: Any, record: QuarantinedRecord) -> int:
+        """Put invalid record aside, return number of the records put aside."""
+        pass
+
     @abstractmethod
     def prepare_record_for_copy(self, record: object) -> Any:
         """
@@ -47,3 +116,64 @@ class NCBIIteratorProtocol(Protocol):
     @abstractmethod
     def __iter__(self) -> Iterator[Taxonomy | LineagePair | MergedPair]:
         pass
+
+
+class CheckpointedIteratorProtocol(SequenceIteratorProtocol, Protocol):
+    """Sequence iterator which copy can be resumed from the last committed record."""
+
+    @property
+    @abstractmethod
+    def source(self) -> str:
+        """Name of the file records are read from."""
+        pass
+
+    @property
+    @abstractmethod
+    def chunk_range(self) -> ChunkRange:
+        """Part of the file records are read from."""
+        pass
+
+    @property
+    @abstractmethod
+    def position(self) -> int:
+        """Offset of the first record that was not yielded yet."""
+        pass
+
+    @abstractmethod
+    def skip(self, committed_ranges: list[ChunkRange]) -> None:
+        """Do not read records of the ranges that were copied before."""
+        pass
+
+
+class RecordSpillWriterProtocol(Protocol):
+    @abstractmethod
+    def write(self, records: list[SequenceRecord]) -> None:
+        pass
+
+
+class RecordSpillProtocol(SequenceIteratorProtocol, Protocol):
+    """Records put aside on disk to be copied back in another order."""
+
+    @abstractmethod
+    def open_writer(self) -> AbstractContextManager[RecordSpillWriterProtocol]:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove records spilled before."""
+        pass
+
+    @abstractmethod
+    def get_parts(self) -> Sequence["RecordSpillProtocol"]:
+        """Parts of the spill that are copied back by separate processes."""
+        pass
+
+
+@runtime_checkable
+class QuarantiningIteratorProtocol(Protocol):
+    """Iterator which can put invalid records aside and go on."""
+
+    @abstractmethod
+    def quarantine_invalid_records(self) -> None:
+        """Yield invalid records as 'QuarantinedRecord' instead of failing."""
+        pass
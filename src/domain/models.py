@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
@@ -5,3 +6,44 @@ from dataclasses import dataclass
 class ChunkRange:
     start: int
     end: int
+
+    def without(self, ranges: Iterable["ChunkRange"]) -> list["ChunkRange"]:
+        """Parts of the range that are not covered by any of the ranges."""
+        remaining = []
+        start = self.start
+
+        for other in sorted(ranges, key=lambda chunk_range: chunk_range.start):
+            if other.start > self.end:
+                break
+
+            if other.start > start:
+                remaining.append(ChunkRange(start, other.start - 1))
+
+            start = max(start, other.end + 1)
+
+        if start <= self.end:
+            remaining.append(ChunkRange(start, self.end))
+
+        return remaining
+
+
+@dataclass(frozen=True, slots=True)
+class CopyCheckpoint:
+    """
+    Part of the source file which records were committed to database.
+    Segment ends at the start of the first record that was not committed.
+    """
+
+    source: str
+    chunk_range: ChunkRange
+    segment: ChunkRange
+    row_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class QuarantinedRecord:
+    """Invalid record that was put aside instead of failing the copy."""
+
+    source: str
+    position: int
+    reason: str
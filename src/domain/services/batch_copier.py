@@ -1,18 +1,22 @@
 import asyncio
 import logging
 import os
+from collections.abc import AsyncIterator
 from typing import Any
 
 from core.exceptions import NeighbouringProcessError
 from core.interfaces import StringKeyMapping
 from core.utils import is_shutdown_event_set, set_shutdown_event
-from domain.entities import Tables
-from domain.exceptions import CopyToUniprotDBError
+from domain.entities import NormalizedSequenceRecord, Tables
+from domain.exceptions import CopyToUniprotDBError, ErrorBudgetExceededError
 from domain.interfaces import (
+    CheckpointedIteratorProtocol,
     DatabaseCopyAdapterProtocol,
     NCBIIteratorProtocol,
+    RecordSpillProtocol,
     SequenceIteratorProtocol,
 )
+from domain.models import ChunkRange, CopyCheckpoint, QuarantinedRecord
 from domain.services.queue_manager import AsyncQueueManager, QueueConfig
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,7 @@ class BatchCopier:
         queue_config: QueueConfig,
         table_name: Tables,
         timeout: float = 30.0,
+        error_budget: int = 0,
     ):
         self._db_adapter = db_adapter
         self._batch_size = batch_size
@@ -41,6 +46,7 @@ class BatchCopier:
         self._queue_manager = AsyncQueueManager(queue_config)
         self._table_name = table_name
         self._timeout = timeout
+        self._error_budget = error_budget
 
     def copy_file_in_new_loop(self) -> None:
         """Copy file chunk records to the database in separate loop."""
@@ -57,21 +63,48 @@ class BatchCopier:
         asyncio.run(copy_file())
 
     async def _enqueue_record_batches(self) -> None:
-        records: list[object] = []
-
         async with (
             self._db_adapter.open_pool(self._connection_pool_config) as db_pool,
             self._queue_manager,
         ):
-            for record in self._record_gen:
-                records.append(self._db_adapter.prepare_record_for_copy(record))
+            async for records in self._batch_gen(db_pool):
+                await self._safe_append_copy_task_to_queue(db_pool, records)
+
+    async def _batch_gen(self, db_pool: Any) -> AsyncIterator[list[object]]:
+        """Generate batches of records prepared for copy, the last one may be empty."""
+        records: list[object] = []
+
+        for record in self._record_gen:
+            if isinstance(record, QuarantinedRecord):
+                await self._quarantine(db_pool, record)
+                continue
+
+            records.append(self._prepare_record(record))
 
-                if self._appropriate_records_count_reached(records):
-                    await self._safe_append_copy_task_to_queue(db_pool, records)
-                    records.clear()
+            if self._appropriate_records_count_reached(records):
+                yield records
+                records = []
 
-            await self._safe_append_copy_task_to_queue(db_pool, records)
-            records.clear()
+        yield records
+
+    def _prepare_record(self, record: object) -> object:
+        return self._db_adapter.prepare_record_for_copy(record)
+
+    async def _quarantine(self, db_pool: Any, record: QuarantinedRecord) -> None:
+        """Invalid records are put aside until they exceed error budget."""
+        logger.warning(
+            "Invalid record of %s at %s is quarantined: %s",
+            record.source,
+            record.position,
+            record.reason,
+        )
+        quarantined_records = await self._db_adapter.quarantine(db_pool, record)
+
+        if quarantined_records > self._error_budget:
+            raise ErrorBudgetExceededError(
+                f"{quarantined_records} invalid records exceed "
+                f"error budget of {self._error_budget}"
+            )
 
     async def _safe_append_copy_task_to_queue(
         self,
@@ -103,18 +136,26 @@ class BatchCopier:
         records: list[object],
     ) -> None:
         if records:
+            checkpoint = self._create_checkpoint(len(records))
             await asyncio.wait_for(
                 self._queue_manager.enqueue_task(
-                    self._copy_records(db_pool, records.copy())
+                    self._copy_records(db_pool, records.copy(), checkpoint)
                 ),
                 timeout=self._timeout,
             )
 
-    async def _copy_records(self, db_pool: Any, records: list[object]) -> None:
+    def _create_checkpoint(self, row_count: int) -> CopyCheckpoint | None:
+        """Batches are not checkpointed unless copy can be resumed."""
+        return None
+
+    async def _copy_records(
+        self,
+        db_pool: Any,
+        records: list[object],
+        checkpoint: CopyCheckpoint | None = None,
+    ) -> None:
         try:
-            await self._db_adapter.copy(
-                db_pool, self._table_name, records, self._timeout
-            )
+            await self._copy(db_pool, records, checkpoint)
 
         except Exception as e:
             sample = records[0] if records else "N/A"
@@ -130,5 +171,213 @@ class BatchCopier:
                 f"Record sample: {sample}"
             ) from e
 
+    async def _copy(
+        self,
+        db_pool: Any,
+        records: list[object],
+        checkpoint: CopyCheckpoint | None = None,
+    ) -> None:
+        await self._db_adapter.copy(db_pool, self._table_name, records, self._timeout)
+
     def _appropriate_records_count_reached(self, records: list[object]) -> bool:
         return len(records) >= self._batch_size
+
+
+class ChangedRecordsCopier(BatchCopier):
+    """
+    Copy only sequences that differ from the ones of the current release,
+    so incremental update costs as much as the release changes.
+    """
+
+    async def _copy(
+        self,
+        db_pool: Any,
+        records: list[object],
+        checkpoint: CopyCheckpoint | None = None,
+    ) -> None:
+        await self._db_adapter.copy_changed_sequences(
+            db_pool, self._table_name, records, self._timeout
+        )
+
+
+class SpillingCopier(BatchCopier):
+    """
+    Spill records to disk instead of the table, so they are copied back
+    in another order once all the chunks are spilled.
+    Database is used only to quarantine invalid records.
+    """
+
+    def __init__(self, *args: Any, record_spill: RecordSpillProtocol, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._record_spill = record_spill
+
+    async def _enqueue_record_batches(self) -> None:
+        async with self._db_adapter.open_pool(self._connection_pool_config) as db_pool:
+            with self._record_spill.open_writer() as writer:
+                async for records in self._batch_gen(db_pool):
+                    if is_shutdown_event_set():
+                        raise NeighbouringProcessError()
+
+                    writer.write(records)  # type: ignore
+
+    def _prepare_record(self, record: object) -> object:
+        """Records are prepared for copy when they are copied back."""
+        return record
+
+
+class NormalizingCopier(BatchCopier):
+    """
+    Replace repeated peptide and organism names of sequences with their ids
+    and sequences with their digests. Every process remembers the ids of
+    the names it has met, so a name is merged into the dictionary tables
+    once per process instead of once per record. Sequences are too many
+    to remember, they are sent once per batch and merged into the table
+    by their ids.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        normalize_names: bool = True,
+        deduplicate_sequences: bool = False,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._deduplicate_sequences = deduplicate_sequences
+        # Dictionary tables are named after the record fields they store.
+        self._name_ids: dict[Tables, dict[str, int]] = (
+            {Tables.PEPTIDE_NAME: {}, Tables.ORGANISM_NAME: {}}
+            if normalize_names
+            else {}
+        )
+
+    def _prepare_record(self, record: object) -> object:
+        """Records are normalized once the ids of their names are known."""
+        return record
+
+    async def _copy(
+        self,
+        db_pool: Any,
+        records: list[object],
+        checkpoint: CopyCheckpoint | None = None,
+    ) -> None:
+        """
+        Names of the batch are merged before the records that reference them,
+        sequences are written together with the records.
+        """
+        await self._merge_new_names(db_pool, records)
+        normalized_records = [
+            record.normalize(  # type: ignore
+                peptide_name_ids=self._name_ids.get(Tables.PEPTIDE_NAME),
+                organism_name_ids=self._name_ids.get(Tables.ORGANISM_NAME),
+                sequence_id=self._deduplicate_sequences,
+            )
+            for record in records
+        ]
+        await self._db_adapter.copy_with_dictionaries(
+            db_pool,
+            self._table_name,
+            [
+                self._db_adapter.prepare_record_for_copy(record)
+                for record in normalized_records
+            ],
+            self._get_sequences(records, normalized_records),
+            self._timeout,
+        )
+
+    async def _merge_new_names(self, db_pool: Any, records: list[object]) -> None:
+        """Ids of the names are given by the dictionary tables."""
+        for table, name_ids in self._name_ids.items():
+            new_names = {getattr(record, table) for record in records} - name_ids.keys()
+
+            if new_names:
+                name_ids.update(
+                    await self._db_adapter.merge_names(
+                        db_pool, table, sorted(new_names), self._timeout
+                    )
+                )
+
+    def _get_sequences(
+        self, records: list[object], normalized_records: list[NormalizedSequenceRecord]
+    ) -> dict[Tables, dict[Any, str]]:
+        if not self._deduplicate_sequences:
+            return {}
+
+        return {
+            Tables.SEQUENCE: {
+                normalized_record.sequence: record.sequence  # type: ignore
+                for record, normalized_record in zip(
+                    records, normalized_records, strict=True
+                )
+            }
+        }
+
+
+class FrozenCopier(BatchCopier):
+    """
+    Copy all the records in a single transaction that empties the table first,
+    so rows are loaded frozen and the table is not vacuumed after setup.
+    Table must have no other writers.
+    """
+
+    async def _enqueue_record_batches(self) -> None:
+        # One connection copies, the other one quarantines invalid records.
+        pool_config = {**self._connection_pool_config, "min_size": 1, "max_size": 2}
+
+        async with self._db_adapter.open_pool(pool_config) as db_pool:
+            await self._db_adapter.copy_frozen(
+                db_pool, self._table_name, self._checked_batch_gen(db_pool)
+            )
+
+    async def _checked_batch_gen(self, db_pool: Any) -> AsyncIterator[list[object]]:
+        async for records in self._batch_gen(db_pool):
+            if is_shutdown_event_set():
+                raise NeighbouringProcessError()
+
+            if records:
+                yield records
+
+
+class CheckpointedCopier(BatchCopier):
+    """
+    Note the part of the source file every batch comes from together with
+    the batch, so interrupted copy is resumed without the committed records.
+    """
+
+    _record_gen: CheckpointedIteratorProtocol
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._segment_start: int = 0
+
+    async def _enqueue_record_batches(self) -> None:
+        """Resumed copy starts right after the last committed segment."""
+        self._segment_start = self._record_gen.position
+        await super()._enqueue_record_batches()
+
+    def _create_checkpoint(self, row_count: int) -> CopyCheckpoint:
+        """
+        Batch segment starts where the previous one ended. Batches are copied
+        concurrently, so segments are committed in any order.
+        """
+        segment_start = self._segment_start
+        segment_end = self._record_gen.position
+        self._segment_start = segment_end
+
+        return CopyCheckpoint(
+            source=self._record_gen.source,
+            chunk_range=self._record_gen.chunk_range,
+            segment=ChunkRange(segment_start, segment_end - 1),
+            row_count=row_count,
+        )
+
+    async def _copy(
+        self,
+        db_pool: Any,
+        records: list[object],
+        checkpoint: CopyCheckpoint | None = None,
+    ) -> None:
+        assert checkpoint is not None
+        await self._db_adapter.copy_with_checkpoint(
+            db_pool, self._table_name, records, checkpoint, self._timeout
+        )
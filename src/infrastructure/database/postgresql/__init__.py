@@ -1,5 +1,13 @@
 from .adapter import PostgreSQLAdapter
-from .config import ConnectionConfig, ConnectionPoolConfig
+from .config import (
+    BulkLoad,
+    ConnectionConfig,
+    ConnectionPoolConfig,
+    MaintenanceBudget,
+    StorageProfile,
+)
+from .progress_monitor import PostgreSQLProgressMonitor
+from .queries import TREMBL_PARTITION_NAME
 from .setup_config import (
     adjust_workers_by_db_connection_limit,
     get_available_connections_amount,
@@ -11,8 +19,13 @@ from .uniprot_lifecycle import PostgreSQLUniprotLifecycle
 __all__ = [
     "PostgreSQLUniprotLifecycle",
     "PostgreSQLAdapter",
+    "PostgreSQLProgressMonitor",
     "ConnectionPoolConfig",
     "ConnectionConfig",
+    "BulkLoad",
+    "MaintenanceBudget",
+    "StorageProfile",
+    "TREMBL_PARTITION_NAME",
     "adjust_workers_by_db_connection_limit",
     "setup_queue_config",
     "setup_connection_pool_config",
@@ -1,6 +1,15 @@
 import asyncio
+import csv
+import io
 import logging
-from collections.abc import AsyncGenerator, Coroutine, Iterable, Iterator
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+)
 from contextlib import asynccontextmanager
 from dataclasses import astuple
 from typing import Any
@@ -8,9 +17,11 @@ from typing import Any
 import asyncpg
 from asyncpg import Connection, Pool
 
+import infrastructure.database.postgresql.queries as q
 from core.interfaces import StringKeyMapping
 from core.utils import create_tasks, process_tasks
-from domain.entities import Tables
+from domain.entities import SequenceRecord, Tables
+from domain.models import ChunkRange, CopyCheckpoint, QuarantinedRecord
 from infrastructure.database.common_types import QueryNested
 from infrastructure.database.exceptions import (
     ConnectionDatabaseError,
@@ -19,6 +30,68 @@ from infrastructure.database.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Position of the fields in sequence record prepared for copy.
+_ACCESSION_POSITION: int = 2
+_FINGERPRINT_POSITION: int = -1
+
+_SELECT_FINGERPRINTS_QUERY: str = f"""
+    SELECT accession, fingerprint
+    FROM {Tables.UNIPROT}
+    WHERE accession = ANY($1::varchar[])
+    """
+
+_INSERT_CHECKPOINT_QUERY: str = f"""
+    INSERT INTO {Tables.COPY_PROGRESS}
+    (source, chunk_start, chunk_end, segment_start, segment_end, row_count)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    """
+
+_SELECT_CHECKPOINTS_QUERY: str = f"""
+    SELECT source, chunk_start, chunk_end, segment_start, segment_end, row_count
+    FROM {Tables.COPY_PROGRESS}
+    """
+
+_SET_LOCAL_SETTING_QUERY: str = """SELECT set_config($1, $2, true)"""
+
+# Record put aside again by resumed copy is noted once.
+_INSERT_QUARANTINED_RECORD_QUERY: str = f"""
+    INSERT INTO {Tables.QUARANTINE} (source, position, reason)
+    VALUES ($1, $2, $3)
+    ON CONFLICT DO NOTHING
+    """
+
+# Values are inserted in the order of ids, so processes inserting
+# the same values do not deadlock. Processes merge their values
+# into the dictionary by conflicts of the ids.
+_INSERT_DICTIONARY_VALUES_QUERY: str = """
+    INSERT INTO {table}
+    SELECT * FROM unnest($1::{id_type}[], $2::text[])
+    ON CONFLICT DO NOTHING
+    """
+
+_DICTIONARY_ID_TYPES: dict[Tables, str] = {
+    Tables.SEQUENCE: "uuid",
+}
+
+# Name tables assign the ids, names they already have are not inserted,
+# so the ids are not spent on conflicts. Names are inserted in order,
+# so processes inserting the same names do not deadlock.
+_INSERT_NAMES_QUERY: str = """
+    INSERT INTO {table} ({table})
+    SELECT name FROM unnest($1::text[]) AS name
+    WHERE NOT EXISTS (SELECT FROM {table} t WHERE t.{table} = name)
+    ORDER BY name
+    ON CONFLICT DO NOTHING
+    """
+
+_SELECT_NAME_IDS_QUERY: str = """
+    SELECT {table}, id FROM {table} WHERE {table} = ANY($1::text[])
+    """
+
+_SELECT_QUARANTINED_RECORDS_COUNT_QUERY: str = (
+    f"""SELECT count(*) FROM {Tables.QUARANTINE}"""
+)
+
 
 class PostgreSQLAdapter:
     """Adapter to perform operations in PostgreSQL."""
@@ -46,6 +119,42 @@ class PostgreSQLAdapter:
         """Execute queries sequentially to preserve order."""
         [await self._execute_query(pool, query) for query in self._query_gen(queries)]
 
+    async def execute_queries_in_transaction(
+        self,
+        pool: Pool,
+        queries: QueryNested,
+        settings: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Execute queries sequentially in a single transaction,
+        other connections see either none or all of the changes.
+        Settings are applied to the transaction only.
+        """
+        async with pool.acquire() as conn, conn.transaction():
+            for name, value in (settings or {}).items():
+                await conn.execute(_SET_LOCAL_SETTING_QUERY, name, value)
+
+            for query in self._query_gen(queries):
+                logger.debug("Executing %s", query)
+                await conn.execute(query)
+
+    async def execute_query(self, pool: Pool, query: str, *args: Any) -> None:
+        """Execute single query with arguments."""
+        async with pool.acquire() as conn:
+            logger.debug("Executing %s", query)
+            await conn.execute(query, *args)
+
+    async def fetch_values(self, pool: Pool, query: str, *args: Any) -> list[Any]:
+        """Fetch first column of every row the query returns."""
+        async with pool.acquire() as conn:
+            logger.debug("Fetching %s", query)
+            return [record[0] for record in await conn.fetch(query, *args)]
+
+    async def fetch_rows(self, pool: Pool, query: str, *args: Any) -> list[tuple]:
+        async with pool.acquire() as conn:
+            logger.debug("Fetching %s", query)
+            return [tuple(record) for record in await conn.fetch(query, *args)]
+
     async def copy(
         self,
         pool: Pool,
@@ -62,8 +171,190 @@ class PostgreSQLAdapter:
                 logger.exception("Failed to copy to table %s.", table_name)
                 raise
 
+    async def copy_changed_sequences(
+        self,
+        pool: Pool,
+        table_name: Tables,
+        records: list[tuple],
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Copy only new and changed sequences, they are found by fingerprints
+        of the current ones. All accessions are noted to find removed sequences.
+        """
+        accessions = [record[_ACCESSION_POSITION] for record in records]
+
+        async with pool.acquire(timeout=timeout) as conn:
+            try:
+                current_fingerprints = dict(
+                    await conn.fetch(_SELECT_FINGERPRINTS_QUERY, accessions)
+                )
+                changed_records = [
+                    record
+                    for record in records
+                    if current_fingerprints.get(record[_ACCESSION_POSITION])
+                    != record[_FINGERPRINT_POSITION]
+                ]
+                await conn.copy_records_to_table(table_name, records=changed_records)
+                await conn.copy_records_to_table(
+                    Tables.ACCESSION_STAGING,
+                    records=[(accession,) for accession in accessions],
+                )
+
+            except Exception:
+                logger.exception("Failed to copy changes to table %s.", table_name)
+                raise
+
+    async def copy_with_dictionaries(
+        self,
+        pool: Pool,
+        table_name: Tables,
+        records: list[tuple],
+        dictionaries: Mapping[Tables, Mapping[Any, str]],
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Add new values to dictionary tables and copy records that reference them.
+        Values are committed apart from the records to hold their locks briefly.
+        """
+        async with pool.acquire(timeout=timeout) as conn:
+            try:
+                for dictionary_table, values in dictionaries.items():
+                    ids = sorted(values)
+                    await conn.execute(
+                        _INSERT_DICTIONARY_VALUES_QUERY.format(
+                            table=dictionary_table,
+                            id_type=_DICTIONARY_ID_TYPES[dictionary_table],
+                        ),
+                        ids,
+                        [values[value_id] for value_id in ids],
+                    )
+
+                await conn.copy_records_to_table(table_name, records=records)
+
+            except Exception:
+                logger.exception("Failed to copy to table %s.", table_name)
+                raise
+
+    async def merge_names(
+        self,
+        pool: Pool,
+        table_name: Tables,
+        names: list[str],
+        timeout: float | None = None,
+    ) -> dict[str, int]:
+        """
+        Add names missing from dictionary table and get ids of all the names.
+        Insert waits for the same names inserted by other processes,
+        so the select that follows it sees them committed.
+        """
+        async with pool.acquire(timeout=timeout) as conn:
+            try:
+                await conn.execute(_INSERT_NAMES_QUERY.format(table=table_name), names)
+                return dict(
+                    await conn.fetch(
+                        _SELECT_NAME_IDS_QUERY.format(table=table_name), names
+                    )
+                )
+
+            except Exception:
+                logger.exception("Failed to merge names into table %s.", table_name)
+                raise
+
+    async def copy_with_checkpoint(
+        self,
+        pool: Pool,
+        table_name: Tables,
+        records: list[tuple],
+        checkpoint: CopyCheckpoint,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Copy records and note the part of the source file they come from
+        in a single transaction, so resumed copy neither loses nor duplicates them.
+        """
+        async with pool.acquire(timeout=timeout) as conn:
+            try:
+                async with conn.transaction():
+                    await conn.copy_records_to_table(table_name, records=records)
+                    await conn.execute(
+                        _INSERT_CHECKPOINT_QUERY,
+                        checkpoint.source,
+                        checkpoint.chunk_range.start,
+                        checkpoint.chunk_range.end,
+                        checkpoint.segment.start,
+                        checkpoint.segment.end,
+                        checkpoint.row_count,
+                    )
+
+            except Exception:
+                logger.exception("Failed to copy to table %s.", table_name)
+                raise
+
+    async def copy_frozen(
+        self, pool: Pool, table_name: Tables, batches: AsyncIterable[list[tuple]]
+    ) -> None:
+        """
+        COPY FREEZE requires the table to be emptied in the same transaction,
+        rows are written frozen and all-visible right away.
+        Table is noted as copied frozen together with its rows.
+        """
+        async with pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    await conn.execute(f"TRUNCATE TABLE {table_name}")
+
+                    async for records in batches:
+                        await conn.copy_to_table(
+                            table_name,
+                            source=_encode_csv(records),
+                            format="csv",
+                            freeze=True,
+                        )
+
+                    await conn.execute(q.NOTE_FROZEN_COPY_QUERY, table_name)
+
+            except Exception:
+                logger.exception("Failed to copy frozen rows to table %s.", table_name)
+                raise
+
+    async def get_checkpoints(self, pool: Pool) -> list[CopyCheckpoint]:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(_SELECT_CHECKPOINTS_QUERY)
+
+        return [
+            CopyCheckpoint(
+                source=row["source"],
+                chunk_range=ChunkRange(row["chunk_start"], row["chunk_end"]),
+                segment=ChunkRange(row["segment_start"], row["segment_end"]),
+                row_count=row["row_count"],
+            )
+            for row in rows
+        ]
+
+    async def truncate_tables(self, pool: Pool, table_names: Iterable[Tables]) -> None:
+        async with pool.acquire() as conn:
+            await conn.execute(f"TRUNCATE TABLE {', '.join(table_names)}")
+
+    async def quarantine(self, pool: Pool, record: QuarantinedRecord) -> int:
+        """Put invalid record aside, return number of the records put aside."""
+        async with pool.acquire() as conn:
+            await conn.execute(
+                _INSERT_QUARANTINED_RECORD_QUERY,
+                record.source,
+                record.position,
+                record.reason,
+            )
+            return await conn.fetchval(_SELECT_QUARANTINED_RECORDS_COUNT_QUERY)
+
     def prepare_record_for_copy(self, record: Any) -> tuple:
-        """Turn record to the form appropriate for database copy."""
+        """
+        Turn record to the form appropriate for database copy.
+        Sequence record is stored with its fingerprint.
+        """
+        if isinstance(record, SequenceRecord):
+            return (*astuple(record), record.get_fingerprint())
+
         return astuple(record)
 
     async def _execute_single_query_async(
@@ -91,3 +382,15 @@ class PostgreSQLAdapter:
         async with pool.acquire() as conn:
             logger.debug("Executing %s", query)
             return await conn.execute(query)
+
+
+def _encode_csv(records: list[tuple]) -> io.BytesIO:
+    """
+    Only COPY with textual formats can freeze rows. Strings are quoted
+    to tell empty ones from NULL.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n").writerows(
+        records
+    )
+    return io.BytesIO(buffer.getvalue().encode())
@@ -1,4 +1,86 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+
+class BulkLoad(StrEnum):
+    """
+    Tables are loaded without writing WAL. Loaded tables are either made
+    durable or are kept unlogged, e.g. for disposable replicas.
+    """
+
+    LOGGED = "logged"
+    UNLOGGED = "unlogged"
+
+
+class StorageProfile(StrEnum):
+    """
+    Storage of 'uniprot_kb' or deduplicated sequences. 'lz4' compresses
+    and decompresses long sequences faster than the default pglz, 'external'
+    keeps them uncompressed out of line, so their slices are read
+    without decompression.
+    """
+
+    DEFAULT = "default"
+    LZ4 = "lz4"
+    EXTERNAL = "external"
+
+    def format_query(self, query: str, **kwargs: object) -> str:
+        """Fill in sequence column and table options of the profile, unless given."""
+        options = {
+            "sequence_options": _SEQUENCE_STORAGE_OPTIONS[self],
+            "table_options": self._get_table_options(),
+        }
+        return query.format(**{**options, **kwargs})
+
+    def _get_table_options(self) -> str:
+        """Rows are written once, so pages are filled up."""
+        if self == StorageProfile.DEFAULT:
+            return ""
+
+        return "WITH (fillfactor = 100)"
+
+
+_SEQUENCE_STORAGE_OPTIONS: dict[StorageProfile, str] = {
+    StorageProfile.DEFAULT: "",
+    StorageProfile.LZ4: "COMPRESSION lz4",
+    StorageProfile.EXTERNAL: "STORAGE EXTERNAL",
+}
+
+
+# Copy does not wait for WAL flush, indexes are built in memory.
+BULK_LOAD_SERVER_SETTINGS: dict[str, str] = {
+    "synchronous_commit": "off",
+    "maintenance_work_mem": "1GB",
+}
+
+
+# Every process of parallel index build needs this much memory (MB) at least.
+_INDEX_BUILD_PARTICIPANT_MEMORY_MB: int = 32
+
+
+@dataclass(frozen=True, slots=True)
+class MaintenanceBudget:
+    """
+    Memory (MB) and processes shared by index builds and constraint checks
+    that run at the same time after the data was copied.
+    """
+
+    memory_mb: int
+    processes: int
+
+    def get_server_settings(self, concurrent_steps: int) -> dict[str, str]:
+        """Settings of a single step, the leader process counts as well."""
+        memory_mb = max(
+            self.memory_mb // concurrent_steps, _INDEX_BUILD_PARTICIPANT_MEMORY_MB
+        )
+        parallel_workers = min(
+            self.processes // concurrent_steps - 1,
+            memory_mb // _INDEX_BUILD_PARTICIPANT_MEMORY_MB - 1,
+        )
+        return {
+            "maintenance_work_mem": f"{memory_mb}MB",
+            "max_parallel_maintenance_workers": str(max(parallel_workers, 0)),
+        }
 
 
 @dataclass(frozen=True, slots=True)
@@ -33,7 +115,9 @@ class ConnectionPoolConfig(ConnectionConfig):
     password: Password for database authentication
     min_size: Minimum number of database connections in the connection pool
     max_size: Maximum number of database connections in the connection pool
+    server_settings: Settings of every connection, e.g. its search_path
     """
 
     min_size: int
     max_size: int
+    server_settings: dict[str, str] = field(default_factory=dict)
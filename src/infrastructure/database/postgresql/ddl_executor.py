@@ -0,0 +1,86 @@
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import partial
+
+from asyncpg import Pool
+
+from core.utils import Stage, StageGraph
+from infrastructure.database.common_types import QueryNested
+from infrastructure.database.postgresql.adapter import PostgreSQLAdapter
+from infrastructure.database.postgresql.config import MaintenanceBudget
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DDLStep:
+    """Queries executed in a single transaction once the dependencies are done."""
+
+    name: str
+    queries: QueryNested
+    dependencies: tuple[str, ...] = ()
+
+
+class DDLExecutor:
+    """
+    Execute DDL steps as a dependency graph. Independent steps, e.g. index
+    builds of different tables, run at the same time on separate connections
+    and share the maintenance budget.
+    """
+
+    def __init__(
+        self,
+        db_adapter: PostgreSQLAdapter,
+        maintenance_budget: MaintenanceBudget | None = None,
+    ):
+        self._db_adapter = db_adapter
+        self._maintenance_budget = maintenance_budget
+
+    async def execute(self, pool: Pool, steps: Iterable[DDLStep]) -> None:
+        steps = list(steps)
+        # Steps wait for connections, if there are more of them than connections.
+        concurrent_steps = min(_count_concurrent_steps(steps), pool.get_max_size())
+        settings = self._get_step_settings(concurrent_steps)
+        stages = [
+            Stage(
+                name=step.name,
+                run=partial(
+                    self._db_adapter.execute_queries_in_transaction,
+                    pool,
+                    step.queries,
+                    settings,
+                ),
+                dependencies=step.dependencies,
+            )
+            for step in steps
+        ]
+
+        for timing in await StageGraph(stages).run():
+            logger.info("'%s' took %.1f s", timing.name, timing.duration)
+
+    def _get_step_settings(self, concurrent_steps: int) -> dict[str, str]:
+        if self._maintenance_budget is None:
+            return {}
+
+        return self._maintenance_budget.get_server_settings(concurrent_steps)
+
+
+def _count_concurrent_steps(steps: Iterable[DDLStep]) -> int:
+    """Steps are taken off the graph level by level, a level may run at once."""
+    remaining = {step.name: set(step.dependencies) for step in steps}
+    concurrent_steps = 1
+
+    while remaining:
+        ready = {name for name, deps in remaining.items() if not deps}
+
+        # Stage graph reports steps that depend on each other.
+        if not ready:
+            break
+
+        concurrent_steps = max(concurrent_steps, len(ready))
+        remaining = {
+            name: deps - ready for name, deps in remaining.items() if name not in ready
+        }
+
+    return concurrent_steps
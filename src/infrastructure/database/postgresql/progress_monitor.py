@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from asyncpg import Pool
+
+import infrastructure.database.postgresql.queries as q
+from core.interfaces import StringKeyMapping
+from infrastructure.database.postgresql.adapter import PostgreSQLAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL: float = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class StatementProgress:
+    """Progress of a running statement as the server reports it."""
+
+    pid: int
+    command: str
+    relation: str | None
+    phase: str
+    blocks_done: int | None
+    blocks_total: int | None
+    tuples_done: int | None
+    tuples_total: int | None
+
+    def get_work(self) -> tuple[int, int] | None:
+        """Done and total work, blocks are preferred to tuples."""
+        for done, total in (
+            (self.blocks_done, self.blocks_total),
+            (self.tuples_done, self.tuples_total),
+        ):
+            if done is not None and total:
+                return done, total
+
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ProgressSample:
+    """Work done by the statement by the time of the poll."""
+
+    time: float
+    done: int
+
+
+class PostgreSQLProgressMonitor:
+    """
+    Report progress of index builds, copies and vacuums that run longer
+    than the poll interval, which are otherwise silent for a long time.
+    Progress views are polled on a side connection, so the monitor does
+    not wait for the connections that are busy with the statements.
+    """
+
+    def __init__(self, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self._poll_interval = poll_interval
+        self._db_adapter = PostgreSQLAdapter()
+
+    async def monitor(self, pool_config: StringKeyMapping) -> None:
+        """Report progress until cancelled, failed monitor does not fail setup."""
+        side_pool_config = {**pool_config, "min_size": 1, "max_size": 1}
+
+        try:
+            async with self._db_adapter.open_pool(side_pool_config) as pool:
+                await self._poll(pool)
+
+        except Exception:
+            logger.warning("Progress of the statements is not reported anymore")
+
+    async def _poll(self, pool: Pool) -> None:
+        previous_samples: dict[tuple[int, str], ProgressSample] = {}
+
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            rows = await self._db_adapter.fetch_rows(
+                pool, q.SELECT_STATEMENTS_PROGRESS_QUERY, self._poll_interval
+            )
+            previous_samples = self._report(
+                [StatementProgress(*row) for row in rows], previous_samples
+            )
+
+    def _report(
+        self,
+        statements: list[StatementProgress],
+        previous_samples: dict[tuple[int, str], ProgressSample],
+    ) -> dict[tuple[int, str], ProgressSample]:
+        """Report every statement, samples of the poll are kept to find rates."""
+        samples = {}
+
+        for statement in statements:
+            key = (statement.pid, statement.phase)
+            work = statement.get_work()
+            remaining_time = None
+
+            if work is not None:
+                samples[key] = ProgressSample(time.monotonic(), work[0])
+                remaining_time = estimate_remaining_time(
+                    previous_samples.get(key), samples[key], work[1]
+                )
+
+            logger.info(
+                "...%s %s: %s, blocks %s/%s, tuples %s/%s, ETA %s",
+                statement.command,
+                statement.relation,
+                statement.phase,
+                _format_amount(statement.blocks_done),
+                _format_amount(statement.blocks_total),
+                _format_amount(statement.tuples_done),
+                _format_amount(statement.tuples_total),
+                remaining_time or "unknown",
+            )
+
+        return samples
+
+
+def estimate_remaining_time(
+    previous: ProgressSample | None, current: ProgressSample, total: int
+) -> timedelta | None:
+    """Remaining work is done at the rate since the previous poll."""
+    if previous is None or current.done <= previous.done:
+        return None
+
+    rate = (current.done - previous.done) / (current.time - previous.time)
+    return timedelta(seconds=round((total - current.done) / rate))
+
+
+def _format_amount(amount: int | None) -> str:
+    return "-" if amount is None else str(amount)
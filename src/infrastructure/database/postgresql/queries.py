@@ -1,344 +1,1149 @@
-from domain.entities import Tables
-
-# Clean memory from table data and indexes.
-_TRUNCATE_ALL_TABLES_QUERY: str = f"""
-                                 TRUNCATE TABLE
-                                 {Tables.METADATA},
-                                 {Tables.TAXONOMY},
-                                 {Tables.LINEAGE},
-                                 {Tables.UNIPROT}
-                                 CASCADE
-                                 """
-
-_DROP_TYPE_SOURCE_QUERY: str = """DROP TYPE IF EXISTS sequence_source CASCADE"""
-
-_DROP_IDXS_QUERY: tuple = (
-    f"""DROP INDEX IF EXISTS ncbi_organism_id_{Tables.UNIPROT}_idx""",
-    f"""DROP INDEX IF EXISTS {Tables.UNIPROT}_source_idx""",
-    """DROP INDEX IF EXISTS trgm_sequence_idx""",
-    f"""DROP INDEX IF EXISTS {Tables.UNIPROT}_pkey_idx""",
-    f"""DROP INDEX IF EXISTS {Tables.TAXONOMY}_pkey_idx""",
-    """DROP INDEX IF EXISTS unique_tax_name_idx""",
-    f"""DROP INDEX IF EXISTS taxon_{Tables.LINEAGE}_idpair_pkey_idx""",
-    f"""DROP INDEX IF EXISTS unique_taxon_{Tables.LINEAGE}_idpair_idx""",
-)
-
-# Create extension to create gin index on sequence later.
-_CREATE_TRGM_EXTENSION_QUERY: str = """CREATE EXTENSION IF NOT EXISTS pg_trgm"""
-
-# If uniprot_kb exist already and we need to update -
-# drop all constraints and clean all the tables.
-_DROP_CONSTRAINTS_UNIPROT_KB_QUERY: str = f"""
-                                         ALTER TABLE IF EXISTS {Tables.UNIPROT}
-                                         DROP CONSTRAINT IF EXISTS {Tables.UNIPROT}_pkey
-                                         """
-
-_DROP_CONSTRAINTS_TAXONOMY_QUERY: str = f"""
-                               ALTER TABLE IF EXISTS {Tables.TAXONOMY}
-                               DROP CONSTRAINT IF EXISTS {Tables.TAXONOMY}_pkey CASCADE,
-                               DROP CONSTRAINT IF EXISTS unique_tax_name
-                               """
-
-_DROP_CONSTRAINTS_LINEAGE_QUERY: str = f"""
-    ALTER TABLE IF EXISTS {Tables.LINEAGE}
-    DROP CONSTRAINT IF EXISTS taxon_{Tables.LINEAGE}_idpair_pkey,
-    DROP CONSTRAINT IF EXISTS unique_taxon_{Tables.LINEAGE}_idpair
-    """
-
-# Create all tables without constraints to load data faster.
-_DROP_METADATA_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.METADATA} CASCADE"""
-
-_CREATE_METADATA_QUERY: str = f"""
-                             CREATE TABLE IF NOT EXISTS {Tables.METADATA}(
-                             data_source VARCHAR(100),
-                             data_license VARCHAR(100),
-                             license_url VARCHAR(250),
-                             attribution_required VARCHAR(3)
-                             )
-                             """
-_DROP_TAXONOMY_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.TAXONOMY} CASCADE"""
-
-_CREATE_TAXONOMY_QUERY: str = f"""
-                             CREATE TABLE IF NOT EXISTS {Tables.TAXONOMY}(
-                             rank VARCHAR(60),
-                             ncbi_taxon_id INT,
-                             tax_name VARCHAR(1000))
-                             """
-
-_DROP_LINEAGE_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.LINEAGE} CASCADE"""
-
-_CREATE_LINEAGE_QUERY: str = f"""
-                            CREATE TABLE IF NOT EXISTS {Tables.LINEAGE}(
-                            ncbi_taxon_id INT,
-                            ncbi_lineage_id INT)
-                            """
-
-_DROP_MERGED_ID_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.MERGED} CASCADE"""
-
-_CREATE_MERGED_ID_QUERY: str = f"""
-                              CREATE TABLE IF NOT EXISTS {Tables.MERGED}(
-                              deprecated_ncbi_taxon_id INT,
-                              current_ncbi_taxon_id INT
-                              )
-                              """
-
-_CREATE_SOURCE_ENUM_QUERY: str = """
-                                CREATE TYPE sequence_source AS ENUM(
-                                 'sp',
-                                 'tr',
-                                 'sp_iso',
-                                 'tr_iso'
-                                )
-                                """
-
-_DROP_UNIPROT_KB_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.UNIPROT} CASCADE"""
-
-_CREATE_UNIPROT_KB_QUERY: str = f"""
-                               CREATE TABLE IF NOT EXISTS {Tables.UNIPROT}(
-                               source sequence_source,
-                               is_reviewed bool,
-                               accession VARCHAR(13),
-                               entry_name VARCHAR(20),
-                               peptide_name VARCHAR(500),
-                               ncbi_organism_id INT,
-                               organism_name VARCHAR(500),
-                               sequence TEXT)
-                               """
-
-_CREATE_TAXONOMY_TAX_NAME_IDX_QUERY: str = f"""
-                                            CREATE UNIQUE INDEX unique_tax_name_idx
-                                            ON {Tables.TAXONOMY} (tax_name)
-                                            """
-
-_ADD_CONSTRAINTS_TAXONOMY_QUERY: str = f"""
-                                      ALTER TABLE {Tables.TAXONOMY}
-                                      ADD CONSTRAINT taxonomy_pkey
-                                      PRIMARY KEY (ncbi_taxon_id),
-                                      ADD CONSTRAINT unique_tax_name
-                                      UNIQUE USING INDEX unique_tax_name_idx
-                                      """
-
-_ADD_NOT_NULL_CONSTRAINT_TAXONOMY_QUERY: str = f"""
-                                              ALTER TABLE {Tables.TAXONOMY}
-                                              ALTER COLUMN rank SET NOT NULL,
-                                              ALTER COLUMN tax_name SET NOT NULL
-                                              """
-
-# Create indexes temporarily for faster performance.
-_CREATE_TMP_IDXS_QUERY: tuple = (
-    f"""CREATE INDEX IF NOT EXISTS {Tables.MERGED}_tmp_current_ncbi_taxon_id
-        ON {Tables.MERGED} (current_ncbi_taxon_id)""",
-    f"""CREATE INDEX IF NOT EXISTS {Tables.MERGED}_tmp_deprecated_ncbi_taxon_id
-        ON {Tables.MERGED} (deprecated_ncbi_taxon_id)""",
-    f"""CREATE INDEX IF NOT EXISTS {Tables.UNIPROT}_tmp_ncbi_organism_id
-        ON {Tables.UNIPROT} (ncbi_organism_id)""",
-)
-
-# Find all deprecated ncbi IDs from uniprot tables and substitute them with current ones
-# using table 'merged_id'.
-_SUBSTITUTE_OUTDATED_NCBI_IDS_IN_UNIPROT_KB_QUERY: str = f"""
-        UPDATE {Tables.UNIPROT}
-        SET ncbi_organism_id = current_ncbi_taxon_id
-        FROM {Tables.MERGED}
-        WHERE deprecated_ncbi_taxon_id in
-            (SELECT ncbi_organism_id
-             FROM {Tables.UNIPROT}
-             INTERSECT
-             SELECT deprecated_ncbi_taxon_id
-             FROM {Tables.MERGED})
-        AND ncbi_organism_id = deprecated_ncbi_taxon_id
-        """
-
-# Since ncbi ids in uniprot tables and ids from 'taxonomy' table are the same now -
-# create foreign keys.
-_CREATE_NCBI_ID_FKEY_UNIPROT_KB: str = f"""
-    ALTER TABLE {Tables.UNIPROT}
-    ADD CONSTRAINT {Tables.UNIPROT}_ncbi_organism_id_fkey
-    FOREIGN KEY (ncbi_organism_id)
-    REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
-    ON UPDATE CASCADE
-    """
-
-# Add not null constraints to uniprot_kb.
-_ADD_NOT_NULL_UNIPROT_KB_QUERY: str = f"""
-                                ALTER TABLE {Tables.UNIPROT}
-                                ALTER COLUMN source SET NOT NULL,
-                                ALTER COLUMN is_reviewed SET NOT NULL,
-                                ALTER COLUMN entry_name SET NOT NULL,
-                                ALTER COLUMN peptide_name SET NOT NULL,
-                                ALTER COLUMN ncbi_organism_id SET NOT NULL,
-                                ALTER COLUMN organism_name SET NOT NULL,
-                                ALTER COLUMN sequence SET NOT NULL
-                                """
-
-# Drop indexes that we don't need anymore.
-_DROP_UNUSED_IDXS_QUERY: tuple = (
-    f"""DROP INDEX IF EXISTS {Tables.MERGED}_tmp_current_ncbi_taxon_id""",
-    f"""DROP INDEX IF EXISTS {Tables.MERGED}_tmp_deprecated_ncbi_taxon_id""",
-    f"""DROP INDEX IF EXISTS {Tables.UNIPROT}_tmp_ncbi_organism_id""",
-)
-
-_ADD_PK_CONSTRAINT_UNIPROT_KB_QUERY: str = f"""
-                                     ALTER TABLE {Tables.UNIPROT}
-                                     ADD CONSTRAINT {Tables.UNIPROT}_pkey
-                                     PRIMARY KEY (accession)
-                                     """
-
-_CREATE_IDXS_UNIPROT_KB_QUERY: tuple = (
-    f"""CREATE INDEX IF NOT EXISTS ncbi_organism_id_{Tables.UNIPROT}_idx
-        ON {Tables.UNIPROT} (ncbi_organism_id)""",
-    f"""CREATE INDEX IF NOT EXISTS {Tables.UNIPROT}_source ON {Tables.UNIPROT} (source)
-        WHERE source != 'tr'""",
-)
-
-_CREATE_LINEAGE_IDXS_QUERY: str = f"""
-                             CREATE UNIQUE INDEX unique_taxon_{Tables.LINEAGE}_idpair
-                             ON {Tables.LINEAGE} (ncbi_lineage_id, ncbi_taxon_id)
-                             """
-
-_ADD_CONSTRAINTS_LINEAGE_QUERY: str = f"""
-                              ALTER TABLE {Tables.LINEAGE}
-                              ADD CONSTRAINT {Tables.LINEAGE}_ncbi_taxon_id_fkey
-                              FOREIGN KEY (ncbi_taxon_id)
-                              REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
-                              ON DELETE CASCADE
-                              ON UPDATE CASCADE,
-                              ADD CONSTRAINT {Tables.LINEAGE}_ncbi_lineage_id_fkey
-                              FOREIGN KEY (ncbi_lineage_id)
-                              REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
-                              ON DELETE CASCADE
-                              ON UPDATE CASCADE,
-                              ADD CONSTRAINT taxon_{Tables.LINEAGE}_idpair_pkey
-                              PRIMARY KEY (ncbi_taxon_id, ncbi_lineage_id),
-                              ADD CONSTRAINT unique_taxon_{Tables.LINEAGE}_idpair
-                              UNIQUE USING INDEX unique_taxon_{Tables.LINEAGE}_idpair
-                              """
-
-_ADD_NOT_NULL_CONSTRAINTS_LINEAGE_QUERY: str = f"""
-                                              ALTER TABLE {Tables.LINEAGE}
-                                              ALTER COLUMN ncbi_taxon_id SET NOT NULL,
-                                              ALTER COLUMN ncbi_lineage_id SET NOT NULL
-                                              """
-
-# Database comments.
-_UNIPROT_KB_COMMENTS_QUERY: tuple = (
-    f"COMMENT ON TABLE {Tables.UNIPROT} is "
-    "'All peptide records (Swiss-Prot, TrEMBL, reviewed isoforms).'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.source is "
-    "'Source sequence was added from (Swiss-Prot/TrEMBL/reviewed isoforms).'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.is_reviewed is "
-    "'Was sequences reviewed manually.'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.accession is 'Sequence ID, PK.'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.entry_name is "
-    "'Former sequence ID with biological info.'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.peptide_name is 'Peptide name.'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.ncbi_organism_id is "
-    "'ID of the organism that possess this peptide, FK.'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.organism_name is "
-    "'Organism name that possess this peptide.'",
-    f"COMMENT ON COLUMN {Tables.UNIPROT}.sequence is 'Peptide sequence itself.'",
-)
-
-_TAXONOMY_COMMENTS_QUERY: tuple = (
-    f"COMMENT ON TABLE {Tables.TAXONOMY} is 'Taxonomy info.'",
-    f"COMMENT ON COLUMN {Tables.TAXONOMY}.ncbi_taxon_id is 'NCBI taxon ID, PK.'",
-    f"COMMENT ON COLUMN {Tables.TAXONOMY}.tax_name is 'Taxon name with NCBI taxon ID.'",
-    f"COMMENT ON COLUMN {Tables.TAXONOMY}.rank is 'Rank of the taxon.'",
-)
-
-_LINEAGE_COMMENTS_QUERY: tuple = (
-    f"COMMENT ON TABLE {Tables.LINEAGE} is 'Lineage taxons that correspond organism.'",
-    f"COMMENT ON COLUMN {Tables.LINEAGE}.ncbi_taxon_id is "
-    "'NCBI taxon ID of the organism that posess lineage taxons FK.'",
-    f"COMMENT ON COLUMN {Tables.LINEAGE}.ncbi_lineage_id is "
-    "'NCBI lineage taxon ID that are possessed by organism FK.'",
-)
-
-_INSERT_INFO_INTO_METADATA: str = f"""
-               INSERT INTO {Tables.METADATA}(data_source,
-                                             data_license,
-                                             license_url,
-                                             attribution_required) VALUES
-               ('UniProt Knowledgebase FTP', 'CC BY 4.0',
-                'https://creativecommons.org/licenses/by/4.0/', 'Yes'),
-
-               ('NCBI FTP', 'Public unrestricted scientific data',
-                'https://www.ncbi.nlm.nih.gov/home/about/policies/', 'Yes')
-               """
-
-# WARNING! This index will have very large size.
-CREATE_TRGM_IDX_ON_UNIPROT_KB: str = f"""CREATE INDEX trgm_sequence_idx ON
-                                           {Tables.UNIPROT}
-                                           USING GIN(sequence gin_trgm_ops)
-                                       """
-
-_CREATE_TRGM_IDX_ON_TAXONOMY: str = f"""CREATE INDEX trgm_tax_name_idx ON
-                                         {Tables.TAXONOMY}
-                                         USING GIN(tax_name gin_trgm_ops)
-                                     """
-
-REMOVE_DATABASE_QUERIES: tuple = (
-    _DROP_TYPE_SOURCE_QUERY,
-    _DROP_IDXS_QUERY,
-    _DROP_CONSTRAINTS_UNIPROT_KB_QUERY,
-    _DROP_CONSTRAINTS_TAXONOMY_QUERY,
-    _DROP_CONSTRAINTS_LINEAGE_QUERY,
-    _DROP_METADATA_QUERY,
-    _DROP_UNIPROT_KB_QUERY,
-    _DROP_TAXONOMY_QUERY,
-    _DROP_LINEAGE_QUERY,
-    _DROP_MERGED_ID_QUERY,
-)
-
-RESET_DATABASE_QUERIES: tuple = (
-    _TRUNCATE_ALL_TABLES_QUERY,
-    REMOVE_DATABASE_QUERIES,
-)
-
-PREPARATION_QUERIES: tuple = (
-    _CREATE_TRGM_EXTENSION_QUERY,
-    _CREATE_SOURCE_ENUM_QUERY,
-)
-
-TABLE_CREATION_QUERIES: tuple = (
-    _CREATE_METADATA_QUERY,
-    _CREATE_UNIPROT_KB_QUERY,
-    _CREATE_MERGED_ID_QUERY,
-    _CREATE_TAXONOMY_QUERY,
-    _CREATE_LINEAGE_QUERY,
-)
-
-COMMENT_QUERIES: tuple = (
-    _UNIPROT_KB_COMMENTS_QUERY,
-    _TAXONOMY_COMMENTS_QUERY,
-    _LINEAGE_COMMENTS_QUERY,
-    _INSERT_INFO_INTO_METADATA,
-)
-
-_TAXONOMY_CREATE_CONSTRAINTS_AND_IDXS_QUERIES: tuple = (
-    _CREATE_TAXONOMY_TAX_NAME_IDX_QUERY,
-    _ADD_CONSTRAINTS_TAXONOMY_QUERY,
-    _ADD_NOT_NULL_CONSTRAINT_TAXONOMY_QUERY,
-    _CREATE_TRGM_IDX_ON_TAXONOMY,
-)
-
-_LINEAGE_CREATE_CONSTRAINTS_AND_IDXS_QUERIES: tuple = (
-    _CREATE_LINEAGE_IDXS_QUERY,
-    _ADD_CONSTRAINTS_LINEAGE_QUERY,
-    _ADD_NOT_NULL_CONSTRAINTS_LINEAGE_QUERY,
-)
-
-CREATE_CONSTRAINTS_AND_IDXS_FOR_TAXONOMY_AND_LINEAGE_QUERIES: tuple = (
-    _TAXONOMY_CREATE_CONSTRAINTS_AND_IDXS_QUERIES,
-    _LINEAGE_CREATE_CONSTRAINTS_AND_IDXS_QUERIES,
-)
-
-UNIPROT_KB_AND_TAXONOMY_VALIDATION_QUERIES: tuple = (
-    _SUBSTITUTE_OUTDATED_NCBI_IDS_IN_UNIPROT_KB_QUERY,
-    _CREATE_NCBI_ID_FKEY_UNIPROT_KB,
-    _ADD_NOT_NULL_UNIPROT_KB_QUERY,
-    _DROP_UNUSED_IDXS_QUERY,
-    _DROP_MERGED_ID_QUERY,
-    _ADD_PK_CONSTRAINT_UNIPROT_KB_QUERY,
-    _CREATE_IDXS_UNIPROT_KB_QUERY,
-)
+from domain.entities import Schemas, Tables
+
+# Every release is built in its own schema while the current one is still in use.
+# Unqualified names are resolved in the schema by connection search_path.
+_DROP_BUILD_SCHEMA_QUERY: str = f"""DROP SCHEMA IF EXISTS {Schemas.BUILD} CASCADE"""
+
+_CREATE_BUILD_SCHEMA_QUERY: str = f"""CREATE SCHEMA {Schemas.BUILD}"""
+
+# Name the release gets once it is replaced by the next one.
+COMMENT_ON_BUILD_SCHEMA_QUERY: str = (
+    f"""COMMENT ON SCHEMA {Schemas.BUILD} IS '{{release}}'"""
+)
+
+# Readers find tables of the current release by unqualified names.
+_SET_DATABASE_SEARCH_PATH_QUERY: str = f"""
+    DO $$
+    BEGIN
+        EXECUTE format(
+            'ALTER DATABASE %I SET search_path TO "$user", {Schemas.LIVE}, public',
+            current_database()
+        );
+    END
+    $$
+    """
+
+# Only owner of the database (or superuser) can set its search_path.
+SELECT_DATABASE_OWNERSHIP_QUERY: str = """
+    SELECT pg_has_role(datdba, 'MEMBER')
+    FROM pg_database
+    WHERE datname = current_database()
+    """
+
+# Create extension to create gin index on sequence later.
+# It is kept in public schema, so releases can be removed without it.
+_CREATE_TRGM_EXTENSION_QUERY: str = (
+    """CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public"""
+)
+
+# Create all tables without constraints to load data faster.
+_CREATE_METADATA_QUERY: str = f"""
+                             CREATE TABLE IF NOT EXISTS {Tables.METADATA}(
+                             data_source VARCHAR(100),
+                             data_license VARCHAR(100),
+                             license_url VARCHAR(250),
+                             attribution_required VARCHAR(3)
+                             )
+                             """
+
+_CREATE_BUILD_METADATA_QUERY: str = f"""
+    CREATE TABLE IF NOT EXISTS {Tables.BUILD_METADATA}(
+    name VARCHAR(100) PRIMARY KEY,
+    value TEXT)
+    """
+
+NOTE_BUILD_METADATA_QUERY: str = f"""
+    INSERT INTO {Tables.BUILD_METADATA} (name, value) VALUES ('{{name}}', '{{value}}')
+    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value
+    """
+
+# Modification date of UniProt files the release is built from,
+# interrupted build is resumed with the files of the same release only.
+SOURCE_RELEASE: str = "source release"
+
+NOTE_SOURCE_RELEASE_QUERY: str = f"""
+    INSERT INTO {Tables.BUILD_METADATA} (name, value) VALUES ('{SOURCE_RELEASE}', $1)
+    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value
+    """
+
+# Tables copied with COPY FREEZE are noted by their names,
+# they are not vacuumed after setup.
+FROZEN_COPY: str = "copied frozen"
+
+NOTE_FROZEN_COPY_QUERY: str = f"""
+    INSERT INTO {Tables.BUILD_METADATA} (name, value) VALUES ($1, '{FROZEN_COPY}')
+    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value
+    """
+
+# Table made logged is rewritten, its rows are no longer all-visible.
+FORGET_FROZEN_COPY_QUERY: str = f"""
+    DELETE FROM {Tables.BUILD_METADATA}
+    WHERE name = '{{table}}' AND value = '{FROZEN_COPY}'
+    """
+
+SELECT_BUILD_METADATA_EXISTENCE_QUERY: str = (
+    f"""SELECT to_regclass('{Tables.BUILD_METADATA}') IS NOT NULL"""
+)
+
+SELECT_SOURCE_RELEASE_QUERY: str = f"""
+    SELECT value FROM {Tables.BUILD_METADATA} WHERE name = '{SOURCE_RELEASE}'
+    """
+
+# Foreign keys are noted with the state of their validation.
+FKEY_VALIDATED: str = "validated"
+FKEY_NOT_VALIDATED: str = "not validated"
+
+# Layout of 'uniprot_kb' rows is noted, incremental update and taxonomy refresh
+# write rows of the layout they were started with only.
+RELEASE_LAYOUT: str = "layout"
+PLAIN_LAYOUT: str = "plain"
+NORMALIZED_NAMES_LAYOUT: str = "normalized names"
+DEDUPLICATED_SEQUENCES_LAYOUT: str = "deduplicated sequences"
+
+# Releases built before the layout was noted are plain.
+SELECT_RELEASE_LAYOUT_QUERY: str = f"""
+    SELECT coalesce(
+        (SELECT value FROM {Tables.BUILD_METADATA} WHERE name = '{RELEASE_LAYOUT}'),
+        '{PLAIN_LAYOUT}'
+    )
+    """
+
+_DROP_TAXONOMY_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.TAXONOMY} CASCADE"""
+
+_CREATE_TAXONOMY_QUERY: str = f"""
+                             CREATE TABLE IF NOT EXISTS {Tables.TAXONOMY}(
+                             rank VARCHAR(60),
+                             ncbi_taxon_id INT,
+                             tax_name VARCHAR(1000))
+                             """
+
+_DROP_LINEAGE_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.LINEAGE} CASCADE"""
+
+_CREATE_LINEAGE_QUERY: str = f"""
+                            CREATE TABLE IF NOT EXISTS {Tables.LINEAGE}(
+                            ncbi_taxon_id INT,
+                            ncbi_lineage_id INT)
+                            """
+
+_DROP_MERGED_ID_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.MERGED} CASCADE"""
+
+_CREATE_MERGED_ID_QUERY: str = f"""
+                              CREATE TABLE IF NOT EXISTS {Tables.MERGED}(
+                              deprecated_ncbi_taxon_id INT,
+                              current_ncbi_taxon_id INT
+                              )
+                              """
+
+CREATE_SOURCE_ENUM_QUERY: str = """
+                                CREATE TYPE sequence_source AS ENUM(
+                                 'sp',
+                                 'tr',
+                                 'sp_iso',
+                                 'tr_iso'
+                                )
+                                """
+
+# Names and sequences are either stored in 'uniprot_kb' or are referenced
+# by ids of the dictionary tables. Columns keep their positions for COPY,
+# the view joins the referenced values.
+NAME_COLUMNS: dict[str, str] = {
+    "peptide_name": "peptide_name",
+    "peptide_name_type": "VARCHAR(500)",
+    "peptide_name_comment": "Peptide name.",
+    "peptide_name_value": "u.peptide_name",
+    "peptide_name_join": "",
+    "organism_name": "organism_name",
+    "organism_name_type": "VARCHAR(500)",
+    "organism_name_comment": "Organism name that possess this peptide.",
+    "organism_name_value": "u.organism_name",
+    "organism_name_join": "",
+}
+
+NAME_ID_COLUMNS: dict[str, str] = {
+    "peptide_name": "peptide_name_id",
+    "peptide_name_type": "INT",
+    "peptide_name_comment": f"ID of the peptide name in {Tables.PEPTIDE_NAME} table.",
+    "peptide_name_value": "p.peptide_name",
+    "peptide_name_join": (
+        f"LEFT JOIN {Tables.PEPTIDE_NAME} p ON p.id = u.peptide_name_id"
+    ),
+    "organism_name": "organism_name_id",
+    "organism_name_type": "INT",
+    "organism_name_comment": (
+        f"ID of the organism name in {Tables.ORGANISM_NAME} table."
+    ),
+    "organism_name_value": "o.organism_name",
+    "organism_name_join": (
+        f"LEFT JOIN {Tables.ORGANISM_NAME} o ON o.id = u.organism_name_id"
+    ),
+}
+
+SEQUENCE_COLUMNS: dict[str, str] = {
+    "sequence": "sequence",
+    "sequence_type": "TEXT",
+    "sequence_comment": "Peptide sequence itself.",
+    "sequence_value": "u.sequence",
+    "sequence_join": "",
+}
+
+SEQUENCE_ID_COLUMNS: dict[str, str] = {
+    "sequence": "sequence_id",
+    "sequence_type": "UUID",
+    "sequence_comment": f"Digest of the sequence, ID in {Tables.SEQUENCE} table.",
+    "sequence_value": "s.sequence",
+    "sequence_join": f"LEFT JOIN {Tables.SEQUENCE} s ON s.id = u.sequence_id",
+}
+
+# Options of the storage profile, name and sequence columns are filled in
+# by the lifecycle, sequence options are inherited by the partitions,
+# table options are set for the partitions that store rows.
+_CREATE_UNIPROT_KB_QUERY: str = f"""
+                               CREATE TABLE IF NOT EXISTS {Tables.UNIPROT}(
+                               source sequence_source,
+                               is_reviewed bool,
+                               accession VARCHAR(13),
+                               entry_name VARCHAR(20),
+                               {{peptide_name}} {{peptide_name_type}},
+                               ncbi_organism_id INT,
+                               {{organism_name}} {{organism_name_type}},
+                               {{sequence}} {{sequence_type}} {{sequence_options}},
+                               fingerprint BIGINT)
+                               """
+
+CREATE_UNIPROT_KB_QUERY: str = f"""{_CREATE_UNIPROT_KB_QUERY} {{table_options}}"""
+
+# Partitions are loaded and indexed in parallel, TrEMBL partition is split
+# by accession hash, so lookups by accession read a single partition.
+CREATE_PARTITIONED_UNIPROT_KB_QUERY: str = (
+    f"""{_CREATE_UNIPROT_KB_QUERY} PARTITION BY LIST (source)"""
+)
+
+CREATE_SOURCE_PARTITIONS_QUERIES: tuple = (
+    f"""CREATE TABLE IF NOT EXISTS {Tables.UNIPROT_SP}
+        PARTITION OF {Tables.UNIPROT} FOR VALUES IN ('sp') {{table_options}}""",
+    f"""CREATE TABLE IF NOT EXISTS {Tables.UNIPROT_SP_ISO}
+        PARTITION OF {Tables.UNIPROT} FOR VALUES IN ('sp_iso') {{table_options}}""",
+    f"""CREATE TABLE IF NOT EXISTS {Tables.UNIPROT_TR}
+        PARTITION OF {Tables.UNIPROT} FOR VALUES IN ('tr', 'tr_iso')
+        PARTITION BY HASH (accession)""",
+)
+
+# Ids are assigned in sequence by the tables, processes merge their names
+# by the unique key, so every name gets a single id.
+CREATE_NAME_TABLES_QUERIES: tuple = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {Tables.PEPTIDE_NAME}(
+    id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    peptide_name VARCHAR(500) NOT NULL UNIQUE)
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {Tables.ORGANISM_NAME}(
+    id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    organism_name VARCHAR(500) NOT NULL UNIQUE)
+    """,
+)
+
+# Sequences shared by entries are stored once, so are their trigrams.
+# Key is needed during the copy, processes merge their sequences by it.
+CREATE_SEQUENCE_TABLE_QUERY: str = f"""
+    CREATE TABLE IF NOT EXISTS {Tables.SEQUENCE}(
+    id UUID PRIMARY KEY,
+    sequence TEXT {{sequence_options}} NOT NULL)
+    {{table_options}}
+    """
+
+# Normalized 'uniprot_kb' with the columns of the not normalized one.
+# Joins of the values that are not selected are removed by the planner.
+CREATE_UNIPROT_KB_NAMED_VIEW_QUERY: str = f"""
+    CREATE OR REPLACE VIEW {Tables.UNIPROT_NAMED} AS
+    SELECT u.source,
+           u.is_reviewed,
+           u.accession,
+           u.entry_name,
+           {{peptide_name_value}} AS peptide_name,
+           u.ncbi_organism_id,
+           {{organism_name_value}} AS organism_name,
+           {{sequence_value}} AS sequence,
+           u.fingerprint
+    FROM {Tables.UNIPROT} u
+    {{peptide_name_join}}
+    {{organism_name_join}}
+    {{sequence_join}}
+    """
+
+TREMBL_PARTITION_NAME: str = f"{Tables.UNIPROT_TR}_{{remainder}}"
+
+CREATE_TREMBL_PARTITION_QUERY: str = f"""
+    CREATE TABLE IF NOT EXISTS {{partition}} PARTITION OF {Tables.UNIPROT_TR}
+    FOR VALUES WITH (MODULUS {{modulus}}, REMAINDER {{remainder}})
+    {{table_options}}
+    """
+
+# Build progress is written together with the data it describes.
+_CREATE_PROGRESS_TABLES_QUERY: tuple = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {Tables.STAGE_PROGRESS}(
+    stage VARCHAR(100) PRIMARY KEY)
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {Tables.COPY_PROGRESS}(
+    source VARCHAR(100),
+    chunk_start BIGINT,
+    chunk_end BIGINT,
+    segment_start BIGINT,
+    segment_end BIGINT,
+    row_count INT)
+    """,
+)
+
+_CREATE_QUARANTINE_QUERY: str = f"""
+    CREATE TABLE IF NOT EXISTS {Tables.QUARANTINE}(
+    source VARCHAR(100),
+    position BIGINT,
+    reason TEXT,
+    PRIMARY KEY (source, position))
+    """
+
+_DROP_QUARANTINE_QUERY: str = f"""DROP TABLE IF EXISTS {Tables.QUARANTINE}"""
+
+SELECT_QUARANTINED_RECORDS_COUNT_QUERY: str = (
+    f"""SELECT count(*) FROM {Schemas.LIVE}.{Tables.QUARANTINE}"""
+)
+
+SELECT_PROGRESS_EXISTENCE_QUERY: str = (
+    f"""SELECT to_regclass('{Tables.STAGE_PROGRESS}') IS NOT NULL"""
+)
+
+SELECT_COMPLETED_STAGES_QUERY: str = f"""SELECT stage FROM {Tables.STAGE_PROGRESS}"""
+
+SELECT_COPY_PROGRESS_EXISTENCE_QUERY: str = (
+    f"""SELECT to_regclass('{Tables.COPY_PROGRESS}') IS NOT NULL"""
+)
+
+SELECT_CHECKPOINTS_EXISTENCE_QUERY: str = (
+    f"""SELECT EXISTS (SELECT FROM {Tables.COPY_PROGRESS})"""
+)
+
+INSERT_COMPLETED_STAGE_QUERY: str = f"""
+    INSERT INTO {Tables.STAGE_PROGRESS} (stage) VALUES ($1)
+    ON CONFLICT DO NOTHING
+    """
+
+_CREATE_TAXONOMY_TAX_NAME_IDX_QUERY: str = f"""
+                                            CREATE UNIQUE INDEX unique_tax_name_idx
+                                            ON {Tables.TAXONOMY} (tax_name)
+                                            """
+
+_CREATE_TAXONOMY_PK_IDX_QUERY: str = f"""
+    CREATE UNIQUE INDEX {Tables.TAXONOMY}_pkey
+    ON {Tables.TAXONOMY} (ncbi_taxon_id)
+    """
+
+# Constraints are added using indexes built beforehand.
+_ADD_CONSTRAINTS_TAXONOMY_QUERY: str = f"""
+                                      ALTER TABLE {Tables.TAXONOMY}
+                                      ADD CONSTRAINT taxonomy_pkey
+                                      PRIMARY KEY USING INDEX taxonomy_pkey,
+                                      ADD CONSTRAINT unique_tax_name
+                                      UNIQUE USING INDEX unique_tax_name_idx
+                                      """
+
+_ADD_NOT_NULL_CONSTRAINT_TAXONOMY_QUERY: str = f"""
+                                              ALTER TABLE {Tables.TAXONOMY}
+                                              ALTER COLUMN ncbi_taxon_id SET NOT NULL,
+                                              ALTER COLUMN rank SET NOT NULL,
+                                              ALTER COLUMN tax_name SET NOT NULL
+                                              """
+
+# Create indexes temporarily for faster performance.
+_CREATE_TMP_IDXS_QUERY: tuple = (
+    f"""CREATE INDEX IF NOT EXISTS {Tables.MERGED}_tmp_current_ncbi_taxon_id
+        ON {Tables.MERGED} (current_ncbi_taxon_id)""",
+    f"""CREATE INDEX IF NOT EXISTS {Tables.MERGED}_tmp_deprecated_ncbi_taxon_id
+        ON {Tables.MERGED} (deprecated_ncbi_taxon_id)""",
+    f"""CREATE INDEX IF NOT EXISTS {Tables.UNIPROT}_tmp_ncbi_organism_id
+        ON {Tables.UNIPROT} (ncbi_organism_id)""",
+)
+
+# Find all deprecated ncbi IDs from uniprot tables and substitute them with current ones
+# using table 'merged_id'.
+SUBSTITUTE_OUTDATED_NCBI_IDS_IN_UNIPROT_KB_QUERY: str = f"""
+        UPDATE {Tables.UNIPROT}
+        SET ncbi_organism_id = current_ncbi_taxon_id
+        FROM {Tables.MERGED}
+        WHERE deprecated_ncbi_taxon_id in
+            (SELECT ncbi_organism_id
+             FROM {Tables.UNIPROT}
+             INTERSECT
+             SELECT deprecated_ncbi_taxon_id
+             FROM {Tables.MERGED})
+        AND ncbi_organism_id = deprecated_ncbi_taxon_id
+        """
+
+UNIPROT_KB_FKEY: str = f"{Tables.UNIPROT}_ncbi_organism_id_fkey"
+
+# Since ncbi ids in uniprot tables and ids from 'taxonomy' table are the same now -
+# create foreign keys. Key added NOT VALID takes a brief lock only, existing rows
+# are checked by validation that keeps the table writable.
+ADD_NCBI_ID_FKEY_QUERY: str = f"""
+    ALTER TABLE {{table}}
+    ADD CONSTRAINT {UNIPROT_KB_FKEY}
+    FOREIGN KEY (ncbi_organism_id)
+    REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
+    ON UPDATE CASCADE
+    NOT VALID
+    """
+
+VALIDATE_NCBI_ID_FKEY_QUERY: str = (
+    f"""ALTER TABLE {{table}} VALIDATE CONSTRAINT {UNIPROT_KB_FKEY}"""
+)
+
+# Partitioned table can not have NOT VALID foreign key, validated keys
+# of the partitions are attached without checking the rows again.
+CREATE_NCBI_ID_FKEY_UNIPROT_KB: str = f"""
+    ALTER TABLE {Tables.UNIPROT}
+    ADD CONSTRAINT {UNIPROT_KB_FKEY}
+    FOREIGN KEY (ncbi_organism_id)
+    REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
+    ON UPDATE CASCADE
+    """
+
+# Add not null constraints to uniprot_kb, name and sequence columns are filled in.
+ADD_NOT_NULL_UNIPROT_KB_QUERY: str = f"""
+                                ALTER TABLE {Tables.UNIPROT}
+                                ALTER COLUMN source SET NOT NULL,
+                                ALTER COLUMN is_reviewed SET NOT NULL,
+                                ALTER COLUMN accession SET NOT NULL,
+                                ALTER COLUMN entry_name SET NOT NULL,
+                                ALTER COLUMN {{peptide_name}} SET NOT NULL,
+                                ALTER COLUMN ncbi_organism_id SET NOT NULL,
+                                ALTER COLUMN {{organism_name}} SET NOT NULL,
+                                ALTER COLUMN {{sequence}} SET NOT NULL
+                                """
+
+# Drop indexes that we don't need anymore.
+_DROP_UNUSED_IDXS_QUERY: tuple = (
+    f"""DROP INDEX IF EXISTS {Tables.MERGED}_tmp_current_ncbi_taxon_id""",
+    f"""DROP INDEX IF EXISTS {Tables.MERGED}_tmp_deprecated_ncbi_taxon_id""",
+    f"""DROP INDEX IF EXISTS {Tables.UNIPROT}_tmp_ncbi_organism_id""",
+)
+
+# Primary key of partitioned 'uniprot_kb' has to include partition keys.
+_ADD_PK_CONSTRAINT_PARTITIONED_UNIPROT_KB_QUERY: str = f"""
+    ALTER TABLE {Tables.UNIPROT}
+    ADD CONSTRAINT {Tables.UNIPROT}_pkey
+    PRIMARY KEY (accession, source)
+    """
+
+_CREATE_UNIPROT_KB_PK_IDX_QUERY: str = f"""
+    CREATE UNIQUE INDEX IF NOT EXISTS {Tables.UNIPROT}_pkey
+    ON {Tables.UNIPROT} (accession)
+    """
+
+ADD_PK_CONSTRAINT_UNIPROT_KB_QUERY: str = f"""
+                                     ALTER TABLE {Tables.UNIPROT}
+                                     ADD CONSTRAINT {Tables.UNIPROT}_pkey
+                                     PRIMARY KEY USING INDEX {Tables.UNIPROT}_pkey
+                                     """
+
+CREATE_NCBI_ORGANISM_ID_IDX_UNIPROT_KB_QUERY: str = f"""
+    CREATE INDEX IF NOT EXISTS ncbi_organism_id_{Tables.UNIPROT}_idx
+    ON {Tables.UNIPROT} (ncbi_organism_id)
+    """
+
+# Rows clustered by organism are found by block ranges,
+# the index takes a tiny fraction of the btree size.
+CREATE_NCBI_ORGANISM_ID_BRIN_IDX_UNIPROT_KB_QUERY: str = f"""
+    CREATE INDEX IF NOT EXISTS ncbi_organism_id_{Tables.UNIPROT}_idx
+    ON {Tables.UNIPROT} USING BRIN (ncbi_organism_id)
+    """
+
+_CREATE_SOURCE_IDX_UNIPROT_KB_QUERY: str = f"""
+    CREATE INDEX IF NOT EXISTS {Tables.UNIPROT}_source ON {Tables.UNIPROT} (source)
+    WHERE source != 'tr'
+    """
+
+# Partition indexes are built before the ones of 'uniprot_kb', matching
+# indexes of the partitions are attached instead of being built again.
+_CREATE_UNIPROT_KB_PARTITION_PK_IDX_QUERY: str = """
+    CREATE UNIQUE INDEX IF NOT EXISTS {partition}_pkey
+    ON {partition} (accession, source)
+    """
+
+_CREATE_NCBI_ORGANISM_ID_IDX_UNIPROT_KB_PARTITION_QUERY: str = """
+    CREATE INDEX IF NOT EXISTS {partition}_ncbi_organism_id_idx
+    ON {partition} (ncbi_organism_id)
+    """
+
+CREATE_NCBI_ORGANISM_ID_BRIN_IDX_UNIPROT_KB_PARTITION_QUERY: str = """
+    CREATE INDEX IF NOT EXISTS {partition}_ncbi_organism_id_idx
+    ON {partition} USING BRIN (ncbi_organism_id)
+    """
+
+_CREATE_SOURCE_IDX_UNIPROT_KB_PARTITION_QUERY: str = """
+    CREATE INDEX IF NOT EXISTS {partition}_source ON {partition} (source)
+    WHERE source != 'tr'
+    """
+
+CREATE_TRGM_IDX_ON_UNIPROT_KB_PARTITION: str = """
+    CREATE INDEX IF NOT EXISTS {partition}_trgm_sequence_idx
+    ON {partition} USING GIN(sequence gin_trgm_ops)
+    """
+
+ADD_PK_CONSTRAINT_UNIPROT_KB_PARTITION_QUERY: str = """
+    ALTER TABLE {partition}
+    ADD CONSTRAINT {partition}_pkey
+    PRIMARY KEY USING INDEX {partition}_pkey
+    """
+
+_CREATE_LINEAGE_IDXS_QUERY: str = f"""
+                             CREATE UNIQUE INDEX unique_taxon_{Tables.LINEAGE}_idpair
+                             ON {Tables.LINEAGE} (ncbi_lineage_id, ncbi_taxon_id)
+                             """
+
+_CREATE_LINEAGE_PK_IDX_QUERY: str = f"""
+    CREATE UNIQUE INDEX {Tables.LINEAGE}_pkey
+    ON {Tables.LINEAGE} (ncbi_taxon_id, ncbi_lineage_id)
+    """
+
+LINEAGE_FKEYS: tuple[str, ...] = (
+    f"{Tables.LINEAGE}_ncbi_taxon_id_fkey",
+    f"{Tables.LINEAGE}_ncbi_lineage_id_fkey",
+)
+
+_ADD_CONSTRAINTS_LINEAGE_QUERY: str = f"""
+                              ALTER TABLE {Tables.LINEAGE}
+                              ADD CONSTRAINT {LINEAGE_FKEYS[0]}
+                              FOREIGN KEY (ncbi_taxon_id)
+                              REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
+                              ON DELETE CASCADE
+                              ON UPDATE CASCADE
+                              NOT VALID,
+                              ADD CONSTRAINT {LINEAGE_FKEYS[1]}
+                              FOREIGN KEY (ncbi_lineage_id)
+                              REFERENCES {Tables.TAXONOMY} (ncbi_taxon_id)
+                              ON DELETE CASCADE
+                              ON UPDATE CASCADE
+                              NOT VALID,
+                              ADD CONSTRAINT {Tables.LINEAGE}_pkey
+                              PRIMARY KEY USING INDEX {Tables.LINEAGE}_pkey,
+                              ADD CONSTRAINT unique_taxon_{Tables.LINEAGE}_idpair
+                              UNIQUE USING INDEX unique_taxon_{Tables.LINEAGE}_idpair
+                              """
+
+VALIDATE_LINEAGE_FKEYS_QUERIES: tuple = tuple(
+    f"""ALTER TABLE {Tables.LINEAGE} VALIDATE CONSTRAINT {fkey}"""
+    for fkey in LINEAGE_FKEYS
+)
+
+_ADD_NOT_NULL_CONSTRAINTS_LINEAGE_QUERY: str = f"""
+                                              ALTER TABLE {Tables.LINEAGE}
+                                              ALTER COLUMN ncbi_taxon_id SET NOT NULL,
+                                              ALTER COLUMN ncbi_lineage_id SET NOT NULL
+                                              """
+
+# Database comments.
+_UNIPROT_KB_COMMENTS_QUERY: tuple = (
+    f"COMMENT ON TABLE {Tables.UNIPROT} is "
+    "'All peptide records (Swiss-Prot, TrEMBL, reviewed isoforms).'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.source is "
+    "'Source sequence was added from (Swiss-Prot/TrEMBL/reviewed isoforms).'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.is_reviewed is "
+    "'Was sequences reviewed manually.'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.accession is 'Sequence ID, PK.'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.entry_name is "
+    "'Former sequence ID with biological info.'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.ncbi_organism_id is "
+    "'ID of the organism that possess this peptide, FK.'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.fingerprint is "
+    "'Digest of the record used to find changes of the next release.'",
+)
+
+UNIPROT_KB_NORMALIZED_COLUMNS_COMMENTS_QUERIES: tuple = (
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.{{peptide_name}} is "
+    "'{peptide_name_comment}'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.{{organism_name}} is "
+    "'{organism_name_comment}'",
+    f"COMMENT ON COLUMN {Tables.UNIPROT}.{{sequence}} is '{{sequence_comment}}'",
+)
+
+NAME_TABLES_COMMENTS_QUERIES: tuple = (
+    f"COMMENT ON TABLE {Tables.PEPTIDE_NAME} is "
+    "'Peptide names referenced by normalized uniprot_kb.'",
+    f"COMMENT ON TABLE {Tables.ORGANISM_NAME} is "
+    "'Organism names referenced by normalized uniprot_kb.'",
+)
+
+SEQUENCE_TABLE_COMMENTS_QUERIES: tuple = (
+    f"COMMENT ON TABLE {Tables.SEQUENCE} is "
+    "'Unique sequences referenced by normalized uniprot_kb.'",
+    f"COMMENT ON COLUMN {Tables.SEQUENCE}.id is '128-bit digest of the sequence, PK.'",
+)
+
+COMMENT_ON_UNIPROT_KB_NAMED_VIEW_QUERY: str = (
+    f"COMMENT ON VIEW {Tables.UNIPROT_NAMED} is "
+    "'Normalized uniprot_kb with peptide and organism names and sequences.'"
+)
+
+_TAXONOMY_COMMENTS_QUERY: tuple = (
+    f"COMMENT ON TABLE {Tables.TAXONOMY} is 'Taxonomy info.'",
+    f"COMMENT ON COLUMN {Tables.TAXONOMY}.ncbi_taxon_id is 'NCBI taxon ID, PK.'",
+    f"COMMENT ON COLUMN {Tables.TAXONOMY}.tax_name is 'Taxon name with NCBI taxon ID.'",
+    f"COMMENT ON COLUMN {Tables.TAXONOMY}.rank is 'Rank of the taxon.'",
+)
+
+_LINEAGE_COMMENTS_QUERY: tuple = (
+    f"COMMENT ON TABLE {Tables.LINEAGE} is 'Lineage taxons that correspond organism.'",
+    f"COMMENT ON COLUMN {Tables.LINEAGE}.ncbi_taxon_id is "
+    "'NCBI taxon ID of the organism that posess lineage taxons FK.'",
+    f"COMMENT ON COLUMN {Tables.LINEAGE}.ncbi_lineage_id is "
+    "'NCBI lineage taxon ID that are possessed by organism FK.'",
+)
+
+_INSERT_INFO_INTO_METADATA: str = f"""
+               INSERT INTO {Tables.METADATA}(data_source,
+                                             data_license,
+                                             license_url,
+                                             attribution_required) VALUES
+               ('UniProt Knowledgebase FTP', 'CC BY 4.0',
+                'https://creativecommons.org/licenses/by/4.0/', 'Yes'),
+
+               ('NCBI FTP', 'Public unrestricted scientific data',
+                'https://www.ncbi.nlm.nih.gov/home/about/policies/', 'Yes')
+               """
+
+# WARNING! This index will have very large size.
+CREATE_TRGM_IDX_ON_UNIPROT_KB: str = f"""CREATE INDEX trgm_sequence_idx ON
+                                           {Tables.UNIPROT}
+                                           USING GIN(sequence gin_trgm_ops)
+                                       """
+
+CREATE_TRGM_IDX_ON_SEQUENCE: str = f"""
+    CREATE INDEX IF NOT EXISTS {Tables.SEQUENCE}_trgm_sequence_idx
+    ON {Tables.SEQUENCE} USING GIN(sequence gin_trgm_ops)
+    """
+
+_CREATE_TRGM_IDX_ON_TAXONOMY: str = f"""CREATE INDEX trgm_tax_name_idx ON
+                                         {Tables.TAXONOMY}
+                                         USING GIN(tax_name gin_trgm_ops)
+                                     """
+
+REMOVE_DATABASE_QUERIES: tuple = (_DROP_BUILD_SCHEMA_QUERY,)
+
+RESET_DATABASE_QUERIES: tuple = REMOVE_DATABASE_QUERIES
+
+CREATE_BUILD_SCHEMA_QUERIES: tuple = (
+    _CREATE_BUILD_SCHEMA_QUERY,
+    _SET_DATABASE_SEARCH_PATH_QUERY,
+)
+
+PREPARATION_QUERIES: tuple = (
+    _CREATE_TRGM_EXTENSION_QUERY,
+    CREATE_SOURCE_ENUM_QUERY,
+)
+
+# 'uniprot_kb' is created together with them in the storage profile.
+NCBI_AND_PROGRESS_TABLES_CREATION_QUERIES: tuple = (
+    _CREATE_METADATA_QUERY,
+    _CREATE_BUILD_METADATA_QUERY,
+    _CREATE_MERGED_ID_QUERY,
+    _CREATE_TAXONOMY_QUERY,
+    _CREATE_LINEAGE_QUERY,
+    _CREATE_PROGRESS_TABLES_QUERY,
+    _CREATE_QUARANTINE_QUERY,
+)
+
+# Referenced tables are made durable first, durable table can not
+# reference the unlogged one. 'taxonomy' and 'uniprot_kb' tables
+# are bulk loaded unless 'uniprot_kb' is partitioned.
+BULK_LOADED_TABLES: tuple[Tables, ...] = (
+    Tables.LINEAGE,
+    Tables.METADATA,
+    Tables.BUILD_METADATA,
+    Tables.QUARANTINE,
+)
+
+SET_TABLE_UNLOGGED_QUERY: str = """ALTER TABLE {table} SET UNLOGGED"""
+
+SET_TABLE_LOGGED_QUERY: str = """ALTER TABLE {table} SET LOGGED"""
+
+# Tables that are not kept by the release.
+SET_BUILD_TABLES_UNLOGGED_QUERIES: tuple = tuple(
+    SET_TABLE_UNLOGGED_QUERY.format(table=table)
+    for table in (Tables.MERGED, Tables.STAGE_PROGRESS, Tables.COPY_PROGRESS)
+)
+
+# Post-load optimization. Skewed columns get more detailed statistics,
+# so the planner estimates organisms and sources with few entries right.
+_SKEWED_COLUMNS_STATISTICS_TARGET: int = 1000
+
+SET_STATISTICS_TARGETS_QUERY: str = f"""
+    ALTER TABLE {Tables.UNIPROT}
+    ALTER COLUMN ncbi_organism_id SET STATISTICS {_SKEWED_COLUMNS_STATISTICS_TARGET},
+    ALTER COLUMN source SET STATISTICS {_SKEWED_COLUMNS_STATISTICS_TARGET}
+    """
+
+_RELEASE_RELATIONS_CONDITION: str = f"""
+    relnamespace = current_schema()::regnamespace
+    AND relname NOT IN ('{Tables.STAGE_PROGRESS}', '{Tables.COPY_PROGRESS}')
+    """
+
+# Partitioned table is analyzed together with its partitions.
+SELECT_ANALYZED_TABLES_QUERY: str = f"""
+    SELECT relname FROM pg_class
+    WHERE {_RELEASE_RELATIONS_CONDITION}
+    AND relkind IN ('r', 'p') AND NOT relispartition
+    """
+
+ANALYZE_TABLE_QUERY: str = """ANALYZE {table}"""
+
+# Tables that are all visible already are not vacuumed. Tables copied
+# frozen are not either: pages that COPY continued from the previous batch
+# are not marked all-visible, they are left to autovacuum.
+SELECT_NOT_ALL_VISIBLE_TABLES_QUERY: str = f"""
+    SELECT relname FROM pg_class
+    WHERE {_RELEASE_RELATIONS_CONDITION}
+    AND relkind = 'r' AND relallvisible < relpages
+    AND relname NOT IN (
+        SELECT name FROM {Tables.BUILD_METADATA} WHERE value = '{FROZEN_COPY}')
+    """
+
+VACUUM_FREEZE_TABLE_QUERY: str = """VACUUM (FREEZE) {table}"""
+
+NOTE_RELATION_SIZES_QUERY: str = f"""
+    INSERT INTO {Tables.BUILD_METADATA} (name, value)
+    SELECT c.relname || ' size',
+           pg_size_pretty(CASE c.relkind
+                          WHEN 'r' THEN pg_table_size(c.oid)
+                          ELSE pg_relation_size(c.oid) END)
+    FROM pg_class c
+    LEFT JOIN pg_index i ON i.indexrelid = c.oid
+    LEFT JOIN pg_class t ON t.oid = i.indrelid
+    WHERE c.relnamespace = current_schema()::regnamespace
+    AND c.relkind IN ('r', 'i')
+    AND coalesce(t.relname, c.relname)
+        NOT IN ('{Tables.STAGE_PROGRESS}', '{Tables.COPY_PROGRESS}')
+    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value
+    """
+
+# Statements that run longer than the given number of seconds,
+# COPY reports neither blocks nor the total number of tuples.
+SELECT_STATEMENTS_PROGRESS_QUERY: str = """
+    SELECT p.pid, p.command, p.relid::regclass::text, p.phase,
+           p.blocks_done, p.blocks_total, p.tuples_done, p.tuples_total
+    FROM (
+        SELECT pid, datid, command, relid, phase,
+               blocks_done, blocks_total, tuples_done, tuples_total
+        FROM pg_stat_progress_create_index
+        UNION ALL
+        SELECT pid, datid, command, relid, type,
+               NULL, NULL, tuples_processed, NULL
+        FROM pg_stat_progress_copy
+        UNION ALL
+        SELECT pid, datid, 'VACUUM', relid, phase,
+               heap_blks_scanned, heap_blks_total, NULL, NULL
+        FROM pg_stat_progress_vacuum
+    ) p
+    JOIN pg_stat_activity a USING (pid)
+    WHERE p.datid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    AND a.query_start < now() - make_interval(secs => $1)
+    """
+
+SELECT_CURRENT_WAL_LSN_QUERY: str = """SELECT pg_current_wal_lsn()::text"""
+
+SELECT_WAL_BYTES_SINCE_QUERY: str = """
+    SELECT pg_size_pretty(pg_wal_lsn_diff(pg_current_wal_lsn(), $1::text::pg_lsn))
+    """
+
+SELECT_UNLOGGED_TABLES_SIZE_QUERY: str = """
+    SELECT pg_size_pretty(coalesce(sum(pg_total_relation_size(oid)), 0))
+    FROM pg_class
+    WHERE relpersistence = 'u'
+    AND relkind = 'r'
+    AND relnamespace = current_schema()::regnamespace
+    """
+
+COMMENT_QUERIES: tuple = (
+    _UNIPROT_KB_COMMENTS_QUERY,
+    _TAXONOMY_COMMENTS_QUERY,
+    _LINEAGE_COMMENTS_QUERY,
+    _INSERT_INFO_INTO_METADATA,
+)
+
+# Indexes of the table are built at the same time, each in its own transaction,
+# then constraints are added using them. Not null constraints are added first,
+# so primary keys do not check the columns again.
+TAXONOMY_IDXS_QUERIES: dict[str, str] = {
+    "primary key index": _CREATE_TAXONOMY_PK_IDX_QUERY,
+    "name index": _CREATE_TAXONOMY_TAX_NAME_IDX_QUERY,
+    "trgm index": _CREATE_TRGM_IDX_ON_TAXONOMY,
+}
+
+ADD_CONSTRAINTS_TAXONOMY_QUERIES: tuple = (
+    _ADD_NOT_NULL_CONSTRAINT_TAXONOMY_QUERY,
+    _ADD_CONSTRAINTS_TAXONOMY_QUERY,
+)
+
+LINEAGE_IDXS_QUERIES: dict[str, str] = {
+    "primary key index": _CREATE_LINEAGE_PK_IDX_QUERY,
+    "idpair index": _CREATE_LINEAGE_IDXS_QUERY,
+}
+
+ADD_CONSTRAINTS_LINEAGE_QUERIES: tuple = (
+    _ADD_NOT_NULL_CONSTRAINTS_LINEAGE_QUERY,
+    _ADD_CONSTRAINTS_LINEAGE_QUERY,
+)
+
+CREATE_CONSTRAINTS_AND_IDXS_FOR_TAXONOMY_AND_LINEAGE_QUERIES: tuple = (
+    tuple(TAXONOMY_IDXS_QUERIES.values()),
+    ADD_CONSTRAINTS_TAXONOMY_QUERIES,
+    tuple(LINEAGE_IDXS_QUERIES.values()),
+    ADD_CONSTRAINTS_LINEAGE_QUERIES,
+)
+
+UNIPROT_KB_IDXS_QUERIES: dict[str, str] = {
+    "primary key index": _CREATE_UNIPROT_KB_PK_IDX_QUERY,
+    "organism index": CREATE_NCBI_ORGANISM_ID_IDX_UNIPROT_KB_QUERY,
+    "source index": _CREATE_SOURCE_IDX_UNIPROT_KB_QUERY,
+}
+
+UNIPROT_KB_PARTITION_IDXS_QUERIES: dict[str, str] = {
+    "primary key index": _CREATE_UNIPROT_KB_PARTITION_PK_IDX_QUERY,
+    "organism index": _CREATE_NCBI_ORGANISM_ID_IDX_UNIPROT_KB_PARTITION_QUERY,
+    "source index": _CREATE_SOURCE_IDX_UNIPROT_KB_PARTITION_QUERY,
+}
+
+VALIDATE_UNIPROT_KB_QUERIES: tuple = (
+    _DROP_UNUSED_IDXS_QUERY,
+    _DROP_MERGED_ID_QUERY,
+)
+
+# Partition primary keys are added first to be attached, indexes of
+# 'uniprot_kb' attach the partition ones. Organism index is built
+# with the same method as the partition ones.
+PARTITIONED_UNIPROT_KB_CONSTRAINTS_AND_IDXS_QUERIES: tuple = (
+    _ADD_PK_CONSTRAINT_PARTITIONED_UNIPROT_KB_QUERY,
+    _CREATE_SOURCE_IDX_UNIPROT_KB_QUERY,
+)
+
+INSERT_COMPLETED_DDL_STEP_QUERY: str = f"""
+    INSERT INTO {Tables.STAGE_PROGRESS} (stage) VALUES ('{{step}}')
+    ON CONFLICT DO NOTHING
+    """
+
+# Taxonomy refresh. New NCBI data is loaded into staging tables,
+# then the tables are swapped in a single transaction, 'uniprot_kb' is not reloaded.
+_DROP_TAXONOMY_STAGING_TABLES_QUERY: tuple = (
+    f"""DROP TABLE IF EXISTS {Tables.TAXONOMY_STAGING} CASCADE""",
+    f"""DROP TABLE IF EXISTS {Tables.LINEAGE_STAGING} CASCADE""",
+    f"""DROP TABLE IF EXISTS {Tables.MERGED_STAGING} CASCADE""",
+)
+
+_DROP_UNIPROT_STAGING_TABLES_QUERY: tuple = (
+    f"""DROP TABLE IF EXISTS {Tables.UNIPROT_STAGING} CASCADE""",
+    f"""DROP TABLE IF EXISTS {Tables.ACCESSION_STAGING} CASCADE""",
+)
+
+# Staging tables have the same columns and not null constraints as current ones.
+_CREATE_TAXONOMY_STAGING_TABLES_QUERY: tuple = (
+    f"""CREATE TABLE {Tables.TAXONOMY_STAGING} (LIKE {Tables.TAXONOMY})""",
+    f"""CREATE TABLE {Tables.LINEAGE_STAGING} (LIKE {Tables.LINEAGE})""",
+    f"""
+    CREATE TABLE {Tables.MERGED_STAGING}(
+    deprecated_ncbi_taxon_id INT,
+    current_ncbi_taxon_id INT
+    )
+    """,
+)
+
+# Staging tables get their indexes and constraints before the swap, while
+# current tables are still in use, so the swap only renames them.
+_CREATE_TAXONOMY_STAGING_IDXS_QUERY: tuple = (
+    f"""
+    CREATE UNIQUE INDEX {Tables.TAXONOMY_STAGING}_pkey
+    ON {Tables.TAXONOMY_STAGING} (ncbi_taxon_id)
+    """,
+    f"""
+    CREATE UNIQUE INDEX unique_tax_name_staging_idx
+    ON {Tables.TAXONOMY_STAGING} (tax_name)
+    """,
+    f"""
+    CREATE INDEX trgm_tax_name_staging_idx
+    ON {Tables.TAXONOMY_STAGING} USING GIN(tax_name gin_trgm_ops)
+    """,
+    f"""
+    CREATE UNIQUE INDEX {Tables.LINEAGE_STAGING}_pkey
+    ON {Tables.LINEAGE_STAGING} (ncbi_taxon_id, ncbi_lineage_id)
+    """,
+    f"""
+    CREATE UNIQUE INDEX unique_taxon_{Tables.LINEAGE_STAGING}_idpair
+    ON {Tables.LINEAGE_STAGING} (ncbi_lineage_id, ncbi_taxon_id)
+    """,
+    f"""
+    CREATE INDEX {Tables.MERGED_STAGING}_deprecated_ncbi_taxon_id
+    ON {Tables.MERGED_STAGING} (deprecated_ncbi_taxon_id)
+    """,
+)
+
+# Nothing references staging tables yet, so lineage keys are validated at once.
+_ADD_CONSTRAINTS_TAXONOMY_STAGING_QUERIES: tuple = (
+    f"""
+    ALTER TABLE {Tables.TAXONOMY_STAGING}
+    ADD CONSTRAINT {Tables.TAXONOMY_STAGING}_pkey
+    PRIMARY KEY USING INDEX {Tables.TAXONOMY_STAGING}_pkey,
+    ADD CONSTRAINT unique_tax_name_staging
+    UNIQUE USING INDEX unique_tax_name_staging_idx
+    """,
+    f"""
+    ALTER TABLE {Tables.LINEAGE_STAGING}
+    ADD CONSTRAINT {Tables.LINEAGE_STAGING}_ncbi_taxon_id_fkey
+    FOREIGN KEY (ncbi_taxon_id)
+    REFERENCES {Tables.TAXONOMY_STAGING} (ncbi_taxon_id)
+    ON DELETE CASCADE
+    ON UPDATE CASCADE,
+    ADD CONSTRAINT {Tables.LINEAGE_STAGING}_ncbi_lineage_id_fkey
+    FOREIGN KEY (ncbi_lineage_id)
+    REFERENCES {Tables.TAXONOMY_STAGING} (ncbi_taxon_id)
+    ON DELETE CASCADE
+    ON UPDATE CASCADE,
+    ADD CONSTRAINT {Tables.LINEAGE_STAGING}_pkey
+    PRIMARY KEY USING INDEX {Tables.LINEAGE_STAGING}_pkey,
+    ADD CONSTRAINT unique_taxon_{Tables.LINEAGE_STAGING}_idpair
+    UNIQUE USING INDEX unique_taxon_{Tables.LINEAGE_STAGING}_idpair
+    """,
+)
+
+# Constraints of the swapped tables get the names of the current ones,
+# constraint is renamed together with the index it uses.
+_STAGING_CONSTRAINTS_NAMES: dict[str, dict[str, str]] = {
+    Tables.TAXONOMY: {
+        f"{Tables.TAXONOMY_STAGING}_pkey": f"{Tables.TAXONOMY}_pkey",
+        "unique_tax_name_staging": "unique_tax_name",
+    },
+    Tables.LINEAGE: {
+        f"{Tables.LINEAGE_STAGING}_ncbi_taxon_id_fkey": LINEAGE_FKEYS[0],
+        f"{Tables.LINEAGE_STAGING}_ncbi_lineage_id_fkey": LINEAGE_FKEYS[1],
+        f"{Tables.LINEAGE_STAGING}_pkey": f"{Tables.LINEAGE}_pkey",
+        f"unique_taxon_{Tables.LINEAGE_STAGING}_idpair": (
+            f"unique_taxon_{Tables.LINEAGE}_idpair"
+        ),
+    },
+}
+
+_RENAME_STAGING_CONSTRAINTS_QUERIES: tuple = (
+    *(
+        f"""ALTER TABLE {table} RENAME CONSTRAINT {constraint} TO {name}"""
+        for table, names in _STAGING_CONSTRAINTS_NAMES.items()
+        for constraint, name in names.items()
+    ),
+    """ALTER INDEX trgm_tax_name_staging_idx RENAME TO trgm_tax_name_idx""",
+)
+
+_DROP_NCBI_ID_FKEY_UNIPROT_KB: str = f"""
+    ALTER TABLE {Tables.UNIPROT}
+    DROP CONSTRAINT IF EXISTS {UNIPROT_KB_FKEY}
+    """
+
+_RENAME_STAGING_TABLES_QUERY: tuple = (
+    f"""ALTER TABLE {Tables.TAXONOMY_STAGING} RENAME TO {Tables.TAXONOMY}""",
+    f"""ALTER TABLE {Tables.LINEAGE_STAGING} RENAME TO {Tables.LINEAGE}""",
+    f"""ALTER TABLE {Tables.MERGED_STAGING} RENAME TO {Tables.MERGED}""",
+)
+
+# Tables holding 'uniprot_kb' rows get foreign key NOT VALID during the swap,
+# these are either 'uniprot_kb' itself or its partitions.
+SELECT_UNIPROT_KB_LEAVES_QUERY: str = f"""
+    SELECT relname
+    FROM pg_class
+    WHERE oid = '{Tables.UNIPROT}'::regclass AND relkind = 'r'
+    OR oid IN
+        (SELECT relid FROM pg_partition_tree('{Tables.UNIPROT}') WHERE isleaf)
+    """
+
+# Only rows with newly deprecated ids are updated, they are found by
+# the index on 'ncbi_organism_id' instead of scanning the whole table.
+_SUBSTITUTE_MERGED_NCBI_IDS_IN_UNIPROT_KB_QUERY: str = f"""
+    UPDATE {Tables.UNIPROT}
+    SET ncbi_organism_id = current_ncbi_taxon_id
+    FROM {Tables.MERGED}
+    WHERE ncbi_organism_id = deprecated_ncbi_taxon_id
+    """
+
+# Incremental update. Only new and changed sequences are copied to staging table,
+# accessions of the new release are noted to find removed ones.
+_CREATE_UNIPROT_STAGING_TABLES_QUERY: tuple = (
+    f"""CREATE TABLE {Tables.UNIPROT_STAGING} (LIKE {Tables.UNIPROT})""",
+    f"""CREATE TABLE {Tables.ACCESSION_STAGING}(accession VARCHAR(13))""",
+)
+
+_SUBSTITUTE_MERGED_NCBI_IDS_IN_UNIPROT_STAGING_QUERY: str = f"""
+    UPDATE {Tables.UNIPROT_STAGING}
+    SET ncbi_organism_id = current_ncbi_taxon_id
+    FROM {Tables.MERGED_STAGING}
+    WHERE ncbi_organism_id = deprecated_ncbi_taxon_id
+    """
+
+_ANALYZE_UNIPROT_STAGING_TABLES_QUERY: tuple = (
+    f"""ANALYZE {Tables.UNIPROT_STAGING}""",
+    f"""ANALYZE {Tables.ACCESSION_STAGING}""",
+)
+
+_DELETE_REMOVED_UNIPROT_KB_ENTRIES_QUERY: str = f"""
+    DELETE FROM {Tables.UNIPROT} u
+    WHERE NOT EXISTS
+        (SELECT FROM {Tables.ACCESSION_STAGING} s
+         WHERE s.accession = u.accession)
+    """
+
+# Changed entries are replaced rather than upserted, entry of partitioned
+# 'uniprot_kb' moves to another partition once it is reviewed.
+_DELETE_CHANGED_UNIPROT_KB_ENTRIES_QUERY: str = f"""
+    DELETE FROM {Tables.UNIPROT} u
+    USING {Tables.UNIPROT_STAGING} s
+    WHERE s.accession = u.accession
+    """
+
+_INSERT_CHANGED_UNIPROT_KB_ENTRIES_QUERY: str = f"""
+    INSERT INTO {Tables.UNIPROT}
+    SELECT * FROM {Tables.UNIPROT_STAGING}
+    """
+
+# Quarantine keeps invalid records of the last load only.
+CREATE_TAXONOMY_STAGING_QUERIES: tuple = (
+    _CREATE_BUILD_METADATA_QUERY,
+    _DROP_TAXONOMY_STAGING_TABLES_QUERY,
+    _CREATE_TAXONOMY_STAGING_TABLES_QUERY,
+    _DROP_QUARANTINE_QUERY,
+    _CREATE_QUARANTINE_QUERY,
+)
+
+CREATE_INCREMENTAL_UPDATE_STAGING_QUERIES: tuple = (
+    CREATE_TAXONOMY_STAGING_QUERIES,
+    _DROP_UNIPROT_STAGING_TABLES_QUERY,
+    _CREATE_UNIPROT_STAGING_TABLES_QUERY,
+)
+
+REMOVE_STAGING_QUERIES: tuple = (
+    _DROP_TAXONOMY_STAGING_TABLES_QUERY,
+    _DROP_UNIPROT_STAGING_TABLES_QUERY,
+)
+
+PREPARE_TAXONOMY_STAGING_QUERIES: tuple = (
+    _CREATE_TAXONOMY_STAGING_IDXS_QUERY,
+    _ADD_CONSTRAINTS_TAXONOMY_STAGING_QUERIES,
+)
+
+PREPARE_INCREMENTAL_UPDATE_STAGING_QUERIES: tuple = (
+    PREPARE_TAXONOMY_STAGING_QUERIES,
+    _SUBSTITUTE_MERGED_NCBI_IDS_IN_UNIPROT_STAGING_QUERY,
+    _ANALYZE_UNIPROT_STAGING_TABLES_QUERY,
+)
+
+# Swap holds the lock of current tables, it only renames prepared staging tables
+# and remaps merged NCBI ids. Merged NCBI ids are still needed after the swap
+# by incremental update.
+_SWAP_TAXONOMY_TABLES_QUERIES: tuple = (
+    _DROP_NCBI_ID_FKEY_UNIPROT_KB,
+    _DROP_LINEAGE_QUERY,
+    _DROP_TAXONOMY_QUERY,
+    _DROP_MERGED_ID_QUERY,
+    _RENAME_STAGING_TABLES_QUERY,
+    _RENAME_STAGING_CONSTRAINTS_QUERIES,
+    _SUBSTITUTE_MERGED_NCBI_IDS_IN_UNIPROT_KB_QUERY,
+)
+
+# Foreign key of 'uniprot_kb' is added NOT VALID by the swap,
+# it is noted validated only once it is validated after the swap.
+_NOTE_SWAPPED_FKEYS_QUERIES: tuple = (
+    *(
+        NOTE_BUILD_METADATA_QUERY.format(name=fkey, value=FKEY_VALIDATED)
+        for fkey in LINEAGE_FKEYS
+    ),
+    NOTE_BUILD_METADATA_QUERY.format(name=UNIPROT_KB_FKEY, value=FKEY_NOT_VALIDATED),
+)
+
+_FINISH_TAXONOMY_SWAP_QUERIES: tuple = (
+    _DROP_MERGED_ID_QUERY,
+    _NOTE_SWAPPED_FKEYS_QUERIES,
+    _TAXONOMY_COMMENTS_QUERY,
+    _LINEAGE_COMMENTS_QUERY,
+)
+
+SWAP_TAXONOMY_STAGING_QUERIES: tuple = (
+    _SWAP_TAXONOMY_TABLES_QUERIES,
+    _FINISH_TAXONOMY_SWAP_QUERIES,
+)
+
+# Entries are deleted before the swap, readers still see them until commit,
+# only the swap and the insert of changed entries are done under its lock.
+MERGE_INCREMENTAL_UPDATE_STAGING_QUERIES: tuple = (
+    _DELETE_REMOVED_UNIPROT_KB_ENTRIES_QUERY,
+    _DELETE_CHANGED_UNIPROT_KB_ENTRIES_QUERY,
+    _SWAP_TAXONOMY_TABLES_QUERIES,
+    _INSERT_CHANGED_UNIPROT_KB_ENTRIES_QUERY,
+    _DROP_UNIPROT_STAGING_TABLES_QUERY,
+    _FINISH_TAXONOMY_SWAP_QUERIES,
+)
+
+# Release swap. Built release replaces the current one in a single short transaction,
+# the current one is kept under its release name for rollback.
+SELECT_LIVE_RELEASE_QUERY: str = f"""
+    SELECT coalesce(
+        obj_description(oid, 'pg_namespace'),
+        nspname || to_char(now(), '_YYYY_MM_DD_HH24MISS_US')
+    )
+    FROM pg_namespace
+    WHERE nspname = '{Schemas.LIVE}'
+    """
+
+ARCHIVE_LIVE_RELEASE_QUERY: str = (
+    f"""ALTER SCHEMA {Schemas.LIVE} RENAME TO {{release}}"""
+)
+
+_PUBLISH_BUILD_SCHEMA_QUERY: str = (
+    f"""ALTER SCHEMA {Schemas.BUILD} RENAME TO {Schemas.LIVE}"""
+)
+
+# Database set up before releases were built in schemas keeps its tables
+# in public schema. It is archived as the oldest release on the first publish,
+# so it is kept for rollback and removed as outdated like the other releases.
+LEGACY_RELEASE: str = f"{Schemas.LIVE}_0000_legacy"
+
+_ARCHIVE_LEGACY_RELEASE_QUERY: str = f"""
+    DO $$
+    BEGIN
+        IF to_regtype('public.sequence_source') IS NOT NULL THEN
+            CREATE SCHEMA {LEGACY_RELEASE};
+            ALTER TABLE IF EXISTS public.{Tables.METADATA} SET SCHEMA {LEGACY_RELEASE};
+            ALTER TABLE IF EXISTS public.{Tables.UNIPROT} SET SCHEMA {LEGACY_RELEASE};
+            ALTER TABLE IF EXISTS public.{Tables.LINEAGE} SET SCHEMA {LEGACY_RELEASE};
+            ALTER TABLE IF EXISTS public.{Tables.TAXONOMY} SET SCHEMA {LEGACY_RELEASE};
+            ALTER TABLE IF EXISTS public.{Tables.MERGED} SET SCHEMA {LEGACY_RELEASE};
+            ALTER TYPE public.sequence_source SET SCHEMA {LEGACY_RELEASE};
+        END IF;
+    END
+    $$
+    """
+
+# Build progress is not needed once the release is finished.
+_DROP_PROGRESS_TABLES_QUERY: tuple = (
+    f"""DROP TABLE IF EXISTS {Schemas.BUILD}.{Tables.STAGE_PROGRESS}""",
+    f"""DROP TABLE IF EXISTS {Schemas.BUILD}.{Tables.COPY_PROGRESS}""",
+)
+
+PUBLISH_BUILD_RELEASE_QUERIES: tuple = (
+    _ARCHIVE_LEGACY_RELEASE_QUERY,
+    _DROP_PROGRESS_TABLES_QUERY,
+    _PUBLISH_BUILD_SCHEMA_QUERY,
+)
+
+# Release names start with the date they were built, so they are sorted by age.
+SELECT_OUTDATED_RELEASES_QUERY: str = f"""
+    SELECT nspname
+    FROM pg_namespace
+    WHERE nspname ~ '^{Schemas.LIVE}_\\d{{4}}_'
+    ORDER BY nspname DESC
+    OFFSET $1
+    """
+
+DROP_RELEASE_QUERY: str = """DROP SCHEMA IF EXISTS {release} CASCADE"""
@@ -3,8 +3,12 @@ import os
 import asyncpg
 
 from core.interfaces import StringKeyMapping
+from domain.entities import Schemas
 from domain.services.queue_manager import QueueConfig
-from infrastructure.database.postgresql.config import ConnectionPoolConfig
+from infrastructure.database.postgresql.config import (
+    BULK_LOAD_SERVER_SETTINGS,
+    ConnectionPoolConfig,
+)
 
 
 async def get_available_connections_amount(config: StringKeyMapping) -> int:
@@ -64,8 +68,14 @@ def setup_connection_pool_config(
     password: str,
     workers_number: int,
     available_connections: int,
+    schema: Schemas = Schemas.BUILD,
+    bulk_load: bool = False,
 ) -> ConnectionPoolConfig:
-    """Setup database config depending on number of workers provided."""
+    """
+    Setup database config depending on number of workers provided.
+    Unqualified table names are resolved in the schema, public schema
+    keeps the extensions. Bulk load sessions are tuned for throughput.
+    """
     min_pool_size, max_pool_size = _adjust_pool_number_by_number_of_workers(
         workers_number, available_connections
     )
@@ -77,6 +87,10 @@ def setup_connection_pool_config(
         password=password,
         min_size=min_pool_size,
         max_size=max_pool_size,
+        server_settings={
+            "search_path": f"{schema}, public",
+            **(BULK_LOAD_SERVER_SETTINGS if bulk_load else {}),
+        },
     )
 
 
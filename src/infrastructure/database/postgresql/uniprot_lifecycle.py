@@ -1,14 +1,31 @@
 import logging
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Iterable
+from dataclasses import replace
+from datetime import datetime
 
 from asyncpg import Pool
 
 import infrastructure.database.postgresql.queries as q
-from core.utils import create_tasks, process_tasks
+from domain.entities import Schemas, Tables
+from infrastructure.database.common_types import QueryNested
 from infrastructure.database.postgresql.adapter import PostgreSQLAdapter
+from infrastructure.database.postgresql.config import (
+    BulkLoad,
+    MaintenanceBudget,
+    StorageProfile,
+)
+from infrastructure.database.postgresql.ddl_executor import DDLExecutor, DDLStep
 
 logger = logging.getLogger(__name__)
 
+# Release names sort by build time.
+RELEASE_NAME_FORMAT: str = f"{Schemas.LIVE}_%Y_%m_%d_%H%M%S_%f"
+
+_TAXONOMY_CONSTRAINTS_STEP: str = "taxonomy constraints"
+_SUBSTITUTE_OUTDATED_NCBI_IDS_STEP: str = "uniprot_kb outdated ncbi ids"
+_UNIPROT_KB_CONSTRAINTS_STEP: str = "uniprot_kb constraints"
+_LINEAGE_CONSTRAINTS_STEP: str = "lineage constraints"
+
 
 class PostgreSQLUniprotLifecycle:
     """
@@ -16,14 +33,38 @@ class PostgreSQLUniprotLifecycle:
     which together constitute its lifecycle.
     """
 
-    def __init__(self, trgm_required: bool):
+    def __init__(
+        self,
+        trgm_required: bool,
+        kept_releases: int = 1,
+        bulk_load: BulkLoad | None = None,
+        trembl_partitions: int = 0,
+        maintenance_budget: MaintenanceBudget | None = None,
+        organism_brin: bool = False,
+        storage_profile: StorageProfile = StorageProfile.DEFAULT,
+        normalize_names: bool = False,
+        deduplicate_sequences: bool = False,
+    ):
         self._trgm_required = trgm_required
+        self._kept_releases = kept_releases
+        self._bulk_load = bulk_load
+        self._trembl_partitions = trembl_partitions
+        self._organism_brin = organism_brin
+        self._storage_profile = storage_profile
+        self._normalize_names = normalize_names
+        self._deduplicate_sequences = deduplicate_sequences
         self._db_adapter = PostgreSQLAdapter()
+        self._ddl_executor = DDLExecutor(self._db_adapter, maintenance_budget)
+        self._bulk_load_start_lsn: str | None = None
 
     async def execute_database_operations_before_copy(self, pool: Pool) -> None:
-        """Execute queries that will prepare database environment for data copy."""
+        """
+        Execute queries that will prepare database environment for data copy.
+        New release is built in a separate schema, the current one stays in use.
+        """
         operations: list[Callable] = [
             self.remove_database,
+            self._create_build_schema,
             self._prepare_database,
             self._create_tables,
             self._add_comments,
@@ -31,31 +72,483 @@ class PostgreSQLUniprotLifecycle:
 
         [await operation(pool) for operation in operations]
 
-    async def execute_database_operations_after_copy(self, pool: Pool) -> None:
-        """Create required constraints and indexes after all data was copied."""
-        operations: list[Callable] = [
-            self._create_constraints_and_indexes_for_taxonomy_and_lineage,
-            self._validate_uniprot_kb_ncbi_ids,
+    async def execute_taxonomy_operations_after_copy(self, pool: Pool) -> None:
+        """
+        Create constraints and indexes for taxonomy and lineage tables
+        once NCBI data was copied, UniProt data may still be copying.
+        """
+        await self._execute_ddl_steps(pool, _get_taxonomy_ddl_steps())
+
+    async def execute_uniprot_operations_after_copy(self, pool: Pool) -> None:
+        """
+        Create required constraints and indexes for UniProt table
+        after all the data was copied and taxonomy was finalized.
+        """
+        if self._bulk_load:
+            await self._report_bulk_load(pool)
+
+        await self._execute_ddl_steps(pool, self._get_uniprot_kb_ddl_steps())
+        await self._optimize_tables(pool)
+
+    async def _optimize_tables(self, pool: Pool) -> None:
+        """
+        Gather planner statistics and set visibility map, so the first queries
+        neither get bad plans nor fetch heap pages until autovacuum comes.
+        Tables are processed at the same time, VACUUM can not run in transaction.
+        """
+        await self._db_adapter.execute_query(pool, q.SET_STATISTICS_TARGETS_QUERY)
+
+        logger.info("...analyzing tables")
+        analyzed_tables = await self._db_adapter.fetch_values(
+            pool, q.SELECT_ANALYZED_TABLES_QUERY
+        )
+        await self._db_adapter.execute_queries_async(
+            pool,
+            [q.ANALYZE_TABLE_QUERY.format(table=table) for table in analyzed_tables],
+        )
+
+        # Visibility map of the tables is known once they are analyzed.
+        not_all_visible_tables = await self._db_adapter.fetch_values(
+            pool, q.SELECT_NOT_ALL_VISIBLE_TABLES_QUERY
+        )
+        logger.info("...freezing tables %s", ", ".join(not_all_visible_tables))
+        await self._db_adapter.execute_queries_async(
+            pool,
+            [
+                q.VACUUM_FREEZE_TABLE_QUERY.format(table=table)
+                for table in not_all_visible_tables
+            ],
+        )
+
+        await self._db_adapter.execute_query(pool, q.NOTE_RELATION_SIZES_QUERY)
+
+    async def _execute_ddl_steps(self, pool: Pool, steps: Iterable[DDLStep]) -> None:
+        """
+        Failed step is rolled back, completed one is noted together with its
+        changes, so resumed setup executes only the steps that were not completed.
+        """
+        completed_steps = set(await self.get_completed_stages(pool))
+        await self._ddl_executor.execute(
+            pool, [_note_completion(step, completed_steps) for step in steps]
+        )
+
+    def _get_uniprot_kb_ddl_steps(self) -> list[DDLStep]:
+        """
+        Outdated ids are substituted first, so the indexes are not updated.
+        Indexes are built at the same time, constraints are added using them.
+        """
+        index_steps = [
+            step
+            for table, idxs_queries in self._get_uniprot_kb_idxs_queries().items()
+            for step in _get_index_steps(
+                table, idxs_queries, (_SUBSTITUTE_OUTDATED_NCBI_IDS_STEP,)
+            )
+        ]
+        steps = [
+            DDLStep(
+                _SUBSTITUTE_OUTDATED_NCBI_IDS_STEP,
+                q.SUBSTITUTE_OUTDATED_NCBI_IDS_IN_UNIPROT_KB_QUERY,
+            ),
+            *index_steps,
+            _get_constraints_step(
+                _UNIPROT_KB_CONSTRAINTS_STEP,
+                self._get_uniprot_kb_constraints_queries(),
+                index_steps,
+            ),
+            *self._get_uniprot_kb_fkey_steps(),
         ]
 
-        if self._trgm_required:
-            operations.append(self._create_trgm_index_for_sequence_column)
+        if self._bulk_load == BulkLoad.LOGGED:
+            steps.append(
+                DDLStep(
+                    "durable tables",
+                    self._get_set_logged_queries(),
+                    dependencies=(steps[-1].name,),
+                )
+            )
 
-        [await operation(pool) for operation in operations]
+        return steps
+
+    def _get_uniprot_kb_idxs_queries(self) -> dict[str, dict[str, str]]:
+        """
+        Index queries by table, partitions are indexed instead of 'uniprot_kb'.
+        Deduplicated sequences are indexed by trigrams in their own table.
+        """
+        idxs_queries = self._get_uniprot_kb_table_idxs_queries()
+
+        if self._deduplicate_sequences and self._trgm_required:
+            idxs_queries[Tables.SEQUENCE] = {
+                "trgm index": q.CREATE_TRGM_IDX_ON_SEQUENCE
+            }
+
+        return idxs_queries
+
+    def _get_uniprot_kb_table_idxs_queries(self) -> dict[str, dict[str, str]]:
+        if not self._trembl_partitions:
+            idxs_queries = self._use_organism_brin(
+                q.UNIPROT_KB_IDXS_QUERIES,
+                q.CREATE_NCBI_ORGANISM_ID_BRIN_IDX_UNIPROT_KB_QUERY,
+            )
+            return {
+                Tables.UNIPROT: self._add_trgm_idx(
+                    idxs_queries, q.CREATE_TRGM_IDX_ON_UNIPROT_KB
+                )
+            }
+
+        partition_idxs_queries = self._add_trgm_idx(
+            self._use_organism_brin(
+                q.UNIPROT_KB_PARTITION_IDXS_QUERIES,
+                q.CREATE_NCBI_ORGANISM_ID_BRIN_IDX_UNIPROT_KB_PARTITION_QUERY,
+            ),
+            q.CREATE_TRGM_IDX_ON_UNIPROT_KB_PARTITION,
+        )
+        return {
+            partition: {
+                index: query.format(partition=partition)
+                for index, query in partition_idxs_queries.items()
+            }
+            for partition in self._get_uniprot_kb_partitions()
+        }
+
+    def _use_organism_brin(
+        self, idxs_queries: dict[str, str], brin_idx_query: str
+    ) -> dict[str, str]:
+        """Rows clustered by organism are indexed by block ranges."""
+        if not self._organism_brin:
+            return idxs_queries
+
+        return {**idxs_queries, "organism index": brin_idx_query}
+
+    def _add_trgm_idx(
+        self, idxs_queries: dict[str, str], trgm_idx_query: str
+    ) -> dict[str, str]:
+        if not self._is_uniprot_kb_trgm_required():
+            return idxs_queries
+
+        return {**idxs_queries, "trgm index": trgm_idx_query}
+
+    def _get_uniprot_kb_constraints_queries(self) -> list[QueryNested]:
+        """Indexes of partitioned 'uniprot_kb' attach the partition ones."""
+        queries = [
+            q.ADD_NOT_NULL_UNIPROT_KB_QUERY.format(**self._get_normalized_columns()),
+            q.VALIDATE_UNIPROT_KB_QUERIES,
+            self._get_add_fkey_queries(),
+        ]
+
+        if not self._trembl_partitions:
+            return [*queries, q.ADD_PK_CONSTRAINT_UNIPROT_KB_QUERY]
+
+        queries += [
+            self._format_for_partitions(q.ADD_PK_CONSTRAINT_UNIPROT_KB_PARTITION_QUERY),
+            q.PARTITIONED_UNIPROT_KB_CONSTRAINTS_AND_IDXS_QUERIES,
+            q.CREATE_NCBI_ORGANISM_ID_BRIN_IDX_UNIPROT_KB_QUERY
+            if self._organism_brin
+            else q.CREATE_NCBI_ORGANISM_ID_IDX_UNIPROT_KB_QUERY,
+        ]
+
+        if self._is_uniprot_kb_trgm_required():
+            queries.append(q.CREATE_TRGM_IDX_ON_UNIPROT_KB)
+
+        return queries
+
+    def _is_uniprot_kb_trgm_required(self) -> bool:
+        return self._trgm_required and not self._deduplicate_sequences
+
+    def _get_add_fkey_queries(self) -> list[str]:
+        return [
+            q.ADD_NCBI_ID_FKEY_QUERY.format(table=table)
+            for table in self._get_fkey_tables()
+        ]
+
+    def _get_uniprot_kb_fkey_steps(self) -> list[DDLStep]:
+        """
+        Tables are validated at the same time. Key of partitioned 'uniprot_kb'
+        is added once the keys of all its partitions are validated.
+        """
+        validation_steps = [
+            DDLStep(
+                f"{table} foreign key validation",
+                q.VALIDATE_NCBI_ID_FKEY_QUERY.format(table=table),
+                dependencies=(_UNIPROT_KB_CONSTRAINTS_STEP,),
+            )
+            for table in self._get_fkey_tables()
+        ]
+        fkey_queries = (
+            [q.CREATE_NCBI_ID_FKEY_UNIPROT_KB] if self._trembl_partitions else []
+        )
+
+        return [
+            *validation_steps,
+            DDLStep(
+                "uniprot_kb foreign key",
+                (fkey_queries, _note_fkeys((q.UNIPROT_KB_FKEY,), q.FKEY_VALIDATED)),
+                dependencies=tuple(step.name for step in validation_steps),
+            ),
+        ]
+
+    def _get_fkey_tables(self) -> list[str]:
+        """Partitioned table can not have NOT VALID foreign key, partitions can."""
+        if not self._trembl_partitions:
+            return [Tables.UNIPROT]
+
+        return self._get_uniprot_kb_partitions()
+
+    def _format_for_partitions(self, query: str) -> list[str]:
+        return [
+            query.format(partition=partition)
+            for partition in self._get_uniprot_kb_partitions()
+        ]
+
+    def _get_uniprot_kb_partitions(self) -> list[str]:
+        trembl_partitions = [
+            q.TREMBL_PARTITION_NAME.format(remainder=remainder)
+            for remainder in range(self._trembl_partitions)
+        ]
+        return [Tables.UNIPROT_SP, Tables.UNIPROT_SP_ISO, *trembl_partitions]
+
+    def _get_bulk_loaded_tables(self) -> list[str]:
+        """
+        Partitioned table is always logged, so the table it references
+        stays logged as well. Only partitions of 'uniprot_kb' are bulk loaded.
+        """
+        sequence_tables = [Tables.SEQUENCE] if self._deduplicate_sequences else []
+
+        if not self._trembl_partitions:
+            return [
+                Tables.TAXONOMY,
+                *q.BULK_LOADED_TABLES,
+                Tables.UNIPROT,
+                *sequence_tables,
+            ]
+
+        return [
+            *q.BULK_LOADED_TABLES,
+            *self._get_uniprot_kb_partitions(),
+            *sequence_tables,
+        ]
+
+    def _get_set_logged_queries(self) -> list[str]:
+        return [
+            query.format(table=table)
+            for table in self._get_bulk_loaded_tables()
+            for query in (q.SET_TABLE_LOGGED_QUERY, q.FORGET_FROZEN_COPY_QUERY)
+        ]
+
+    async def _report_bulk_load(self, pool: Pool) -> None:
+        [unlogged_size] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_UNLOGGED_TABLES_SIZE_QUERY
+        )
+        logger.info("%s of data was loaded without WAL", unlogged_size)
+
+        # Resumed setup does not know where its load started.
+        if self._bulk_load_start_lsn is not None:
+            [wal_size] = await self._db_adapter.fetch_values(
+                pool, q.SELECT_WAL_BYTES_SINCE_QUERY, self._bulk_load_start_lsn
+            )
+            logger.info("%s of WAL was written during the load", wal_size)
+
+    async def execute_release_swap_operations(self, pool: Pool) -> None:
+        """
+        Replace current release with the built one in a single short transaction,
+        readers see either of them. Current release is kept for rollback.
+        """
+        live_releases = await self._db_adapter.fetch_values(
+            pool, q.SELECT_LIVE_RELEASE_QUERY
+        )
+        archive_queries = [
+            q.ARCHIVE_LIVE_RELEASE_QUERY.format(release=release)
+            for release in live_releases
+        ]
+        await self._db_adapter.execute_queries_in_transaction(
+            pool, (archive_queries, q.PUBLISH_BUILD_RELEASE_QUERIES)
+        )
+        await self._remove_outdated_releases(pool)
+
+    async def execute_taxonomy_refresh_operations_before_copy(self, pool: Pool) -> None:
+        """Create empty staging tables for new NCBI data."""
+        await self._db_adapter.execute_queries_sync(
+            pool, q.CREATE_TAXONOMY_STAGING_QUERIES
+        )
+
+    async def execute_taxonomy_refresh_operations_after_copy(self, pool: Pool) -> None:
+        """
+        Swap prepared staging tables in and remap merged NCBI ids
+        of affected 'uniprot_kb' rows.
+        """
+        await self._swap_taxonomy_staging(
+            pool, q.PREPARE_TAXONOMY_STAGING_QUERIES, q.SWAP_TAXONOMY_STAGING_QUERIES
+        )
+
+    async def execute_incremental_update_operations_before_copy(
+        self, pool: Pool
+    ) -> None:
+        """Create empty staging tables for new NCBI data and changed sequences."""
+        await self._db_adapter.execute_queries_sync(
+            pool, q.CREATE_INCREMENTAL_UPDATE_STAGING_QUERIES
+        )
+
+    async def execute_incremental_update_operations_after_copy(
+        self, pool: Pool
+    ) -> None:
+        """
+        Remove sequences missing from the new release, replace changed ones
+        and swap taxonomy staging tables in. Readers see either old or new release,
+        they wait only for the swap and the insert of changed sequences.
+        """
+        await self._swap_taxonomy_staging(
+            pool,
+            q.PREPARE_INCREMENTAL_UPDATE_STAGING_QUERIES,
+            q.MERGE_INCREMENTAL_UPDATE_STAGING_QUERIES,
+        )
+
+    async def _swap_taxonomy_staging(
+        self, pool: Pool, preparation_queries: QueryNested, swap_queries: QueryNested
+    ) -> None:
+        """
+        Staging tables are indexed and constrained while current ones are in use,
+        readers wait only for the swap. Foreign key of 'uniprot_kb' is added
+        NOT VALID by the swap and validated after it without blocking readers.
+        """
+        await self._db_adapter.execute_queries_sync(pool, preparation_queries)
+        fkey_tables = await self._db_adapter.fetch_values(
+            pool, q.SELECT_UNIPROT_KB_LEAVES_QUERY
+        )
+        await self._db_adapter.execute_queries_in_transaction(
+            pool,
+            (
+                swap_queries,
+                [q.ADD_NCBI_ID_FKEY_QUERY.format(table=table) for table in fkey_tables],
+            ),
+        )
+        await self._db_adapter.execute_queries_async(
+            pool,
+            [
+                q.VALIDATE_NCBI_ID_FKEY_QUERY.format(table=table)
+                for table in fkey_tables
+            ],
+        )
+        fkey_queries = (
+            [q.CREATE_NCBI_ID_FKEY_UNIPROT_KB]
+            if fkey_tables != [Tables.UNIPROT]
+            else []
+        )
+        await self._db_adapter.execute_queries_sync(
+            pool, (fkey_queries, _note_fkeys((q.UNIPROT_KB_FKEY,), q.FKEY_VALIDATED))
+        )
+
+    async def remove_staging_tables(self, pool: Pool) -> None:
+        """Remove staging tables after unsuccessful refresh or update attempt."""
+        await self._db_adapter.execute_queries_sync(pool, q.REMOVE_STAGING_QUERIES)
+
+    async def get_completed_stages(self, pool: Pool) -> list[str]:
+        """Stages of the release build that were completed before interruption."""
+        [progress_exists] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_PROGRESS_EXISTENCE_QUERY
+        )
+
+        if not progress_exists:
+            return []
+
+        return await self._db_adapter.fetch_values(
+            pool, q.SELECT_COMPLETED_STAGES_QUERY
+        )
+
+    async def complete_stage(self, pool: Pool, stage: str) -> None:
+        await self._db_adapter.execute_query(
+            pool, q.INSERT_COMPLETED_STAGE_QUERY, stage
+        )
+
+    async def note_source_release(self, pool: Pool, release: str | None) -> None:
+        """Release is unknown if source files were not downloaded by the setup."""
+        await self._db_adapter.execute_query(pool, q.NOTE_SOURCE_RELEASE_QUERY, release)
+
+    async def is_built_from_release(self, pool: Pool, release: str | None) -> bool:
+        """Build that has not noted its release yet has copied nothing."""
+        [metadata_exists] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_BUILD_METADATA_EXISTENCE_QUERY
+        )
+
+        if not metadata_exists:
+            return True
+
+        noted_releases = await self._db_adapter.fetch_values(
+            pool, q.SELECT_SOURCE_RELEASE_QUERY
+        )
+        return noted_releases in ([], [release])
+
+    async def has_checkpoints(self, pool: Pool) -> bool:
+        """Release build is resumed from the committed parts of the source files."""
+        [progress_exists] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_COPY_PROGRESS_EXISTENCE_QUERY
+        )
+
+        if not progress_exists:
+            return False
+
+        [checkpoints_exist] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_CHECKPOINTS_EXISTENCE_QUERY
+        )
+        return checkpoints_exist
+
+    async def owns_database(self, pool: Pool) -> bool:
+        """Releases are published by setting search_path of the database."""
+        [is_owner] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_DATABASE_OWNERSHIP_QUERY
+        )
+        return is_owner
+
+    async def is_release_layout_supported(self, pool: Pool) -> bool:
+        """Rows are written in the layout of the current release only."""
+        [release_layout] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_RELEASE_LAYOUT_QUERY
+        )
+        logger.info("Current release layout is '%s'", release_layout)
+        return release_layout == self._get_layout()
+
+    async def count_quarantined_records(self, pool: Pool) -> int:
+        """Invalid records of the last load are kept with the current release."""
+        [quarantined_records] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_QUARANTINED_RECORDS_COUNT_QUERY
+        )
+        return quarantined_records
 
     async def reset_database(self, pool: Pool) -> None:
-        """Clean uniprot database if it was set up before"""
+        """Remove release left unfinished by interrupted setup."""
         try:
-            # Truncate tables if database is being updated.
             await self._execute_reset_operation(pool)
-            logger.info("Clear existing tables")
+            logger.info("Clear unfinished release")
 
         except Exception:
-            logger.error("Failed to clear tables %s", q.RESET_DATABASE_QUERIES)
+            logger.error("Failed to clear release %s", q.RESET_DATABASE_QUERIES)
             pass
 
     async def remove_database(self, pool: Pool) -> None:
-        await self._db_adapter.execute_queries_async(pool, q.REMOVE_DATABASE_QUERIES)
+        """Remove the release being built, current one stays intact."""
+        await self._db_adapter.execute_queries_sync(pool, q.REMOVE_DATABASE_QUERIES)
+
+    async def _create_build_schema(self, pool: Pool) -> None:
+        """Create schema for the new release, it is named by the build date."""
+        release = datetime.now().strftime(RELEASE_NAME_FORMAT)
+        await self._db_adapter.execute_queries_sync(
+            pool,
+            (
+                q.CREATE_BUILD_SCHEMA_QUERIES,
+                q.COMMENT_ON_BUILD_SCHEMA_QUERY.format(release=release),
+            ),
+        )
+
+    async def _remove_outdated_releases(self, pool: Pool) -> None:
+        """Keep only the latest previous releases, the older ones are removed."""
+        outdated_releases = await self._db_adapter.fetch_values(
+            pool, q.SELECT_OUTDATED_RELEASES_QUERY, self._kept_releases
+        )
+        await self._db_adapter.execute_queries_sync(
+            pool,
+            [
+                q.DROP_RELEASE_QUERY.format(release=release)
+                for release in outdated_releases
+            ],
+        )
 
     async def _prepare_database(self, pool: Pool) -> None:
         """
@@ -65,40 +558,223 @@ class PostgreSQLUniprotLifecycle:
         await self._db_adapter.execute_queries_async(pool, q.PREPARATION_QUERIES)
 
     async def _create_tables(self, pool: Pool) -> None:
-        """Create required tables."""
-        await self._db_adapter.execute_queries_async(pool, q.TABLE_CREATION_QUERIES)
+        """Create required tables, bulk loaded tables do not write WAL."""
+        if self._trembl_partitions:
+            await self._create_partitioned_tables(pool)
 
-    async def _add_comments(self, pool: Pool) -> None:
-        """Add comments to tables and columns."""
-        await self._db_adapter.execute_queries_async(pool, q.COMMENT_QUERIES)
+        else:
+            await self._db_adapter.execute_queries_async(
+                pool,
+                (
+                    q.NCBI_AND_PROGRESS_TABLES_CREATION_QUERIES,
+                    self._format_uniprot_kb_query(q.CREATE_UNIPROT_KB_QUERY),
+                ),
+            )
 
-    async def _create_constraints_and_indexes_for_taxonomy_and_lineage(
-        self, pool: Pool
-    ) -> None:
-        """Create constraints and indexes for taxonomy and lineage tables."""
-        queries = q.CREATE_CONSTRAINTS_AND_IDXS_FOR_TAXONOMY_AND_LINEAGE_QUERIES
-        coroutines: list[Coroutine] = [
-            self._db_adapter.execute_queries_sync(pool, queries)
-        ]
+        if self._is_normalized():
+            await self._create_normalized_tables(pool)
+
+        await self._db_adapter.execute_query(
+            pool,
+            q.NOTE_BUILD_METADATA_QUERY.format(
+                name=q.RELEASE_LAYOUT, value=self._get_layout()
+            ),
+        )
 
-        tasks = create_tasks(coroutines)
-        await process_tasks(tasks)
+        if self._bulk_load:
+            await self._set_tables_unlogged(pool)
 
-    async def _validate_uniprot_kb_ncbi_ids(self, pool: Pool) -> None:
-        """Validate that 'uniprot_kb' and 'taxonomy' tables have the same NCBI ID's."""
-        coroutines: list[Coroutine] = [
-            self._db_adapter.execute_queries_sync(
-                pool, q.UNIPROT_KB_AND_TAXONOMY_VALIDATION_QUERIES
+    async def _create_normalized_tables(self, pool: Pool) -> None:
+        """Dictionary tables are created before the view that joins them."""
+        queries: list[QueryNested] = []
+
+        if self._normalize_names:
+            queries.append(q.CREATE_NAME_TABLES_QUERIES)
+
+        if self._deduplicate_sequences:
+            queries.append(
+                self._storage_profile.format_query(q.CREATE_SEQUENCE_TABLE_QUERY)
             )
-        ]
 
-        tasks = create_tasks(coroutines)
-        await process_tasks(tasks)
+        queries.append(
+            q.CREATE_UNIPROT_KB_NAMED_VIEW_QUERY.format(
+                **self._get_normalized_columns()
+            )
+        )
+        await self._db_adapter.execute_queries_sync(pool, queries)
+
+    def _format_uniprot_kb_query(self, query: str, **kwargs: object) -> str:
+        """Deduplicated sequences get the options of the profile in their table."""
+        if self._deduplicate_sequences:
+            kwargs["sequence_options"] = ""
 
-    async def _create_trgm_index_for_sequence_column(self, pool: Pool) -> None:
+        return self._storage_profile.format_query(
+            query, **self._get_normalized_columns(), **kwargs
+        )
+
+    def _is_normalized(self) -> bool:
+        return self._normalize_names or self._deduplicate_sequences
+
+    def _get_layout(self) -> str:
+        layouts = {
+            q.NORMALIZED_NAMES_LAYOUT: self._normalize_names,
+            q.DEDUPLICATED_SEQUENCES_LAYOUT: self._deduplicate_sequences,
+        }
+        return (
+            ", ".join(layout for layout, used in layouts.items() if used)
+            or q.PLAIN_LAYOUT
+        )
+
+    def _get_normalized_columns(self) -> dict[str, str]:
+        """Normalized 'uniprot_kb' references names and sequences by ids."""
+        return {
+            **(q.NAME_ID_COLUMNS if self._normalize_names else q.NAME_COLUMNS),
+            **(
+                q.SEQUENCE_ID_COLUMNS
+                if self._deduplicate_sequences
+                else q.SEQUENCE_COLUMNS
+            ),
+        }
+
+    async def _create_partitioned_tables(self, pool: Pool) -> None:
+        """
+        'uniprot_kb' is partitioned by sequence source,
+        TrEMBL partition is split further by accession hash.
+        """
+        await self._db_adapter.execute_queries_async(
+            pool,
+            (
+                q.NCBI_AND_PROGRESS_TABLES_CREATION_QUERIES,
+                self._format_uniprot_kb_query(q.CREATE_PARTITIONED_UNIPROT_KB_QUERY),
+            ),
+        )
         await self._db_adapter.execute_queries_sync(
-            pool, q.CREATE_TRGM_IDX_ON_UNIPROT_KB
+            pool,
+            (
+                [
+                    self._format_uniprot_kb_query(query)
+                    for query in q.CREATE_SOURCE_PARTITIONS_QUERIES
+                ],
+                [
+                    self._format_uniprot_kb_query(
+                        q.CREATE_TREMBL_PARTITION_QUERY,
+                        partition=q.TREMBL_PARTITION_NAME.format(remainder=remainder),
+                        modulus=self._trembl_partitions,
+                        remainder=remainder,
+                    )
+                    for remainder in range(self._trembl_partitions)
+                ],
+            ),
+        )
+
+    async def _set_tables_unlogged(self, pool: Pool) -> None:
+        bulk_loaded_tables_queries = [
+            q.SET_TABLE_UNLOGGED_QUERY.format(table=table)
+            for table in self._get_bulk_loaded_tables()
+        ]
+        await self._db_adapter.execute_queries_async(
+            pool, (q.SET_BUILD_TABLES_UNLOGGED_QUERIES, bulk_loaded_tables_queries)
+        )
+        [self._bulk_load_start_lsn] = await self._db_adapter.fetch_values(
+            pool, q.SELECT_CURRENT_WAL_LSN_QUERY
+        )
+
+    async def _add_comments(self, pool: Pool) -> None:
+        """Add comments to tables and columns."""
+        normalized_comments_queries = [
+            query.format(**self._get_normalized_columns())
+            for query in q.UNIPROT_KB_NORMALIZED_COLUMNS_COMMENTS_QUERIES
+        ]
+
+        if self._normalize_names:
+            normalized_comments_queries += q.NAME_TABLES_COMMENTS_QUERIES
+
+        if self._deduplicate_sequences:
+            normalized_comments_queries += q.SEQUENCE_TABLE_COMMENTS_QUERIES
+
+        if self._is_normalized():
+            normalized_comments_queries.append(q.COMMENT_ON_UNIPROT_KB_NAMED_VIEW_QUERY)
+
+        await self._db_adapter.execute_queries_async(
+            pool, (q.COMMENT_QUERIES, normalized_comments_queries)
         )
 
     async def _execute_reset_operation(self, pool) -> None:
         await self._db_adapter.execute_queries_sync(pool, q.RESET_DATABASE_QUERIES)
+
+
+def _note_completion(step: DDLStep, completed_steps: set[str]) -> DDLStep:
+    if step.name in completed_steps:
+        return replace(step, queries=())
+
+    return replace(
+        step,
+        queries=(
+            step.queries,
+            q.INSERT_COMPLETED_DDL_STEP_QUERY.format(step=step.name),
+        ),
+    )
+
+
+def _get_taxonomy_ddl_steps() -> list[DDLStep]:
+    """Indexes of both tables are built at the same time, lineage references taxonomy."""
+    taxonomy_index_steps = _get_index_steps(Tables.TAXONOMY, q.TAXONOMY_IDXS_QUERIES)
+    lineage_index_steps = _get_index_steps(Tables.LINEAGE, q.LINEAGE_IDXS_QUERIES)
+    lineage_constraints_step = _get_constraints_step(
+        _LINEAGE_CONSTRAINTS_STEP,
+        q.ADD_CONSTRAINTS_LINEAGE_QUERIES,
+        lineage_index_steps,
+        (_TAXONOMY_CONSTRAINTS_STEP,),
+    )
+
+    return [
+        *taxonomy_index_steps,
+        _get_constraints_step(
+            _TAXONOMY_CONSTRAINTS_STEP,
+            q.ADD_CONSTRAINTS_TAXONOMY_QUERIES,
+            taxonomy_index_steps,
+        ),
+        *lineage_index_steps,
+        *_get_lineage_fkey_steps(lineage_constraints_step),
+    ]
+
+
+def _get_lineage_fkey_steps(constraints_step: DDLStep) -> list[DDLStep]:
+    """Keys added NOT VALID are validated afterwards."""
+    return [
+        constraints_step,
+        DDLStep(
+            "lineage foreign keys validation",
+            (
+                q.VALIDATE_LINEAGE_FKEYS_QUERIES,
+                _note_fkeys(q.LINEAGE_FKEYS, q.FKEY_VALIDATED),
+            ),
+            dependencies=(constraints_step.name,),
+        ),
+    ]
+
+
+def _get_index_steps(
+    table: str, idxs_queries: dict[str, str], dependencies: tuple[str, ...] = ()
+) -> list[DDLStep]:
+    return [
+        DDLStep(f"{table} {index}", query, dependencies)
+        for index, query in idxs_queries.items()
+    ]
+
+
+def _get_constraints_step(
+    name: str,
+    queries: QueryNested,
+    index_steps: list[DDLStep],
+    dependencies: tuple[str, ...] = (),
+) -> DDLStep:
+    """Constraints are added once the indexes they use are built."""
+    return DDLStep(name, queries, (*dependencies, *(step.name for step in index_steps)))
+
+
+def _note_fkeys(fkeys: Iterable[str], validation_state: str) -> list[str]:
+    return [
+        q.NOTE_BUILD_METADATA_QUERY.format(name=fkey, value=validation_state)
+        for fkey in fkeys
+    ]
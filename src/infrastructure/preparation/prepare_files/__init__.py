@@ -1,11 +1,21 @@
-from .file_operations import concatenate_files, decompress_gz, extract_from_tar
+from .file_operations import (
+    concatenate_files,
+    decompress_gz,
+    extract_from_tar,
+    index_gz,
+    stream_extract_from_tar,
+)
 from .preparer import FilePreparer
+from .source_cache import SourceCache
 from .update_checker import UpdateChecker
 
 __all__ = (
     "FilePreparer",
+    "SourceCache",
     "concatenate_files",
     "extract_from_tar",
+    "stream_extract_from_tar",
     "decompress_gz",
+    "index_gz",
     "UpdateChecker",
 )
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from core.config import CHUNK_PLAN_INTERVAL
+
+CHUNK_PLAN_SUFFIX: str = ".chunks"
+
+_RECORD_DELIMITER: bytes = b"\n>"
+
+
+class ChunkPlanCollector:
+    """
+    Collect FASTA record start offsets at regular intervals
+    from the data passing through while it is being written.
+    """
+
+    def __init__(self, interval: int = CHUNK_PLAN_INTERVAL):
+        self._interval = interval
+        self._position = 0
+        self._next_threshold = 0
+        # File start is treated as a line start.
+        self._previous_byte = b"\n"
+        self.record_starts: list[int] = []
+
+    @property
+    def size(self) -> int:
+        """Number of bytes passed through the collector."""
+        return self._position
+
+    def update(self, data: bytes) -> None:
+        end = self._position + len(data)
+
+        if self._next_threshold < end:
+            self._collect_record_starts(self._previous_byte + data)
+
+        self._position = end
+        self._previous_byte = data[-1:] or self._previous_byte
+
+    def _collect_record_starts(self, data: bytes) -> None:
+        """
+        Data starts with the byte preceding the current position, so
+        delimiter index is equal to record start relative to the position.
+        """
+        while True:
+            search_start = max(self._next_threshold - self._position, 0)
+            delimiter_index = data.find(_RECORD_DELIMITER, search_start)
+
+            if delimiter_index == -1:
+                return
+
+            record_start = self._position + delimiter_index
+            self.record_starts.append(record_start)
+            self._next_threshold = record_start + self._interval
+
+
+def get_chunk_plan_path(path_to_file: Path) -> Path:
+    """Chunk plan is stored next to the file."""
+    return path_to_file.with_name(path_to_file.name + CHUNK_PLAN_SUFFIX)
+
+
+def save_chunk_plan(collector: ChunkPlanCollector, path_to_plan: Path) -> None:
+    """Save record starts one per line, the last line is the file size."""
+    offsets = [*collector.record_starts, collector.size]
+    path_to_plan.write_text("\n".join(str(offset) for offset in offsets))
+
+
+def load_chunk_plan(path_to_plan: Path) -> tuple[list[int], int]:
+    """Return record starts and size of the file the plan was made for."""
+    *record_starts, file_size = (
+        int(line) for line in path_to_plan.read_text().splitlines()
+    )
+    return record_starts, file_size
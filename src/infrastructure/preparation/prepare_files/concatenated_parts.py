@@ -0,0 +1,105 @@
+import bisect
+import glob
+import io
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+
+def get_file_parts(path_to_file: Path) -> list[Path]:
+    """Get parts of the file (file.0, file.1, ...) sorted by their numbers."""
+    parts = glob.glob(f"{glob.escape(str(path_to_file))}.*")
+    numbered_parts = [part for part in parts if part.rsplit(".", 1)[-1].isdigit()]
+    return [
+        Path(part)
+        for part in sorted(numbered_parts, key=lambda x: int(x.rsplit(".", 1)[-1]))
+    ]
+
+
+class ConcatenatedPartsReader(io.RawIOBase):
+    """
+    Read ordered file parts as a single seekable file without joining them on disk.
+    """
+
+    def __init__(self, parts: list[Path]):
+        if not parts:
+            raise FileNotFoundError("No file parts to read")
+
+        self._parts = parts
+        self._part_starts = self._get_part_starts(parts)
+        self._size = self._part_starts[-1]
+        self._position = 0
+        self._part_number = 0
+        self._file: BinaryIO = parts[0].open("rb")
+
+    @staticmethod
+    def _get_part_starts(parts: list[Path]) -> list[int]:
+        """Offsets of part starts, the last one is the total size."""
+        starts = [0]
+
+        for part in parts:
+            starts.append(starts[-1] + part.stat().st_size)
+
+        return starts
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        """Fill the buffer across part boundaries, short read means end of file."""
+        view = memoryview(buffer).cast("B")
+        bytes_read = 0
+
+        while bytes_read < len(view) and self._position < self._size:
+            part_bytes_read = self._file.readinto(view[bytes_read:])
+
+            if not part_bytes_read:
+                self._open_part(self._part_number + 1)
+                continue
+
+            bytes_read += part_bytes_read
+            self._position += part_bytes_read
+
+        return bytes_read
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self._get_absolute_position(offset, whence)
+        part_number = self._find_part_number(position)
+
+        if part_number != self._part_number:
+            self._open_part(part_number)
+
+        self._file.seek(position - self._part_starts[part_number])
+        self._position = position
+        return position
+
+    def _get_absolute_position(self, offset: int, whence: int) -> int:
+        base = {
+            os.SEEK_SET: 0,
+            os.SEEK_CUR: self._position,
+            os.SEEK_END: self._size,
+        }[whence]
+        return max(base + offset, 0)
+
+    def _find_part_number(self, position: int) -> int:
+        """Positions at the end of the file belong to the last part."""
+        return min(
+            bisect.bisect_right(self._part_starts, position) - 1, len(self._parts) - 1
+        )
+
+    def _open_part(self, part_number: int) -> None:
+        self._file.close()
+        self._file = self._parts[part_number].open("rb")
+        self._part_number = part_number
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+
+        super().close()
@@ -0,0 +1,258 @@
+import importlib
+import logging
+import os
+import shutil
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import suppress
+from functools import cached_property
+from io import BytesIO, UnsupportedOperation
+from pathlib import Path
+from threading import Thread
+from types import ModuleType
+from typing import IO, BinaryIO
+
+from core.config import DECOMPRESSION_BENCHMARK_SIZE, DECOMPRESSION_BUFFER_SIZE
+from infrastructure.preparation.prepare_files.exceptions import DecompressionError
+
+logger = logging.getLogger(__name__)
+
+# Window bits that make zlib expect gzip header.
+_GZIP_WINDOW_BITS: int = 16 + 15
+
+
+class GzipDecompressor(ABC):
+    """Backend that decompresses gzip stream into chunks of data."""
+
+    name: str
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        pass
+
+    @abstractmethod
+    def inflate(self, compressed_file: BinaryIO) -> Iterator[bytes]:
+        """
+        Generate decompressed chunks of all the members of gzip stream,
+        every member is checked against its own trailer.
+        """
+        pass
+
+
+class ZlibDecompressor(GzipDecompressor):
+    """
+    Decompress in-process with zlib compatible module
+    (zlib, isal.isal_zlib, zlib_ng.zlib_ng).
+    """
+
+    def __init__(
+        self, module_name: str = "zlib", buffer_size: int = DECOMPRESSION_BUFFER_SIZE
+    ):
+        self.name = module_name
+        self._buffer_size = buffer_size
+
+    def is_available(self) -> bool:
+        try:
+            importlib.import_module(self.name)
+
+        except ImportError:
+            return False
+
+        return True
+
+    def inflate(self, compressed_file: BinaryIO) -> Iterator[bytes]:
+        try:
+            yield from self._inflate(compressed_file)
+
+        except self._module.error as e:
+            raise DecompressionError(f"{self.name} failed: {e}") from e
+
+    def _inflate(self, compressed_file: BinaryIO) -> Iterator[bytes]:
+        members = _GzipMembers(self._module)
+
+        while data := compressed_file.read(self._buffer_size):
+            yield from members.decompress(data)
+
+        members.check_end()
+
+    @cached_property
+    def _module(self) -> ModuleType:
+        return importlib.import_module(self.name)
+
+
+class _GzipMembers:
+    """
+    Gzip stream of concatenated members. Decompressor checks the trailer
+    of every member itself, the next member starts with the data
+    that follows the previous one. Zero padding is skipped.
+    """
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+        self._decompressor = None
+        self._members = 0
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while data := self._skip_padding(data):
+            if self._decompressor is None:
+                self._decompressor = self._module.decompressobj(_GZIP_WINDOW_BITS)
+                self._members += 1
+
+            yield self._decompressor.decompress(data)
+            data = self._finish_member()
+
+    def check_end(self) -> None:
+        if self._decompressor is not None or not self._members:
+            raise DecompressionError("Compressed file is truncated")
+
+    def _skip_padding(self, data: bytes) -> bytes:
+        return data if self._decompressor is not None else data.lstrip(b"\x00")
+
+    def _finish_member(self) -> bytes:
+        """Return the data that follows the member once it ends."""
+        if self._decompressor is None or not self._decompressor.eof:
+            return b""
+
+        unused_data = self._decompressor.unused_data
+        self._decompressor = None
+        return unused_data
+
+
+class ProcessDecompressor(GzipDecompressor):
+    """
+    Decompress with external program that writes result to stdout (pigz, igzip).
+    The program checks every gzip member and fails on mismatch.
+    """
+
+    def __init__(self, executable: str, buffer_size: int = DECOMPRESSION_BUFFER_SIZE):
+        self.name = executable
+        self._buffer_size = buffer_size
+
+    def is_available(self) -> bool:
+        return shutil.which(self.name) is not None
+
+    def inflate(self, compressed_file: BinaryIO) -> Iterator[bytes]:
+        stdin = self._get_file_descriptor(compressed_file)
+
+        with subprocess.Popen(
+            [self.name, "-dc"],
+            stdin=subprocess.PIPE if stdin is None else stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as process:
+            writer = self._start_writer(process, compressed_file, stdin)
+
+            while chunk := process.stdout.read(self._buffer_size):
+                yield chunk
+
+            self._wait(process, writer)
+
+    @staticmethod
+    def _get_file_descriptor(compressed_file: BinaryIO) -> int | None:
+        """Files with descriptor are read by the process itself."""
+        try:
+            descriptor = compressed_file.fileno()
+
+        except (OSError, UnsupportedOperation):
+            return None
+
+        os.lseek(descriptor, compressed_file.tell(), os.SEEK_SET)
+        return descriptor
+
+    def _start_writer(
+        self, process: subprocess.Popen, compressed_file: BinaryIO, stdin: int | None
+    ) -> Thread | None:
+        """Feed file-like objects without descriptor to the process."""
+        if stdin is not None:
+            return None
+
+        writer = Thread(
+            target=self._write_to_process,
+            args=(compressed_file, process.stdin),
+            daemon=True,
+        )
+        writer.start()
+        return writer
+
+    def _write_to_process(self, compressed_file: BinaryIO, stdin: IO[bytes]) -> None:
+        # Process may exit earlier on corrupted data, error is reported by its code.
+        with suppress(BrokenPipeError), stdin:
+            while data := compressed_file.read(self._buffer_size):
+                stdin.write(data)
+
+    @staticmethod
+    def _wait(process: subprocess.Popen, writer: Thread | None) -> None:
+        if writer is not None:
+            writer.join()
+
+        stderr = process.stderr.read()
+
+        if process.wait() != 0:
+            raise DecompressionError(
+                f"{process.args[0]} failed with code {process.returncode}: "
+                f"{stderr.decode(errors='replace')}"
+            )
+
+
+def get_available_decompressors() -> list[GzipDecompressor]:
+    candidates: list[GzipDecompressor] = [
+        ZlibDecompressor("zlib"),
+        ZlibDecompressor("isal.isal_zlib"),
+        ZlibDecompressor("zlib_ng.zlib_ng"),
+        ProcessDecompressor("igzip"),
+        ProcessDecompressor("pigz"),
+    ]
+    return [candidate for candidate in candidates if candidate.is_available()]
+
+
+def select_decompressor(
+    path_to_file: Path, sample_size: int = DECOMPRESSION_BENCHMARK_SIZE
+) -> GzipDecompressor:
+    """
+    Pick the fastest available backend using the beginning of the file.
+    File split on parts is sampled by its first part.
+    """
+    decompressors = get_available_decompressors()
+
+    if len(decompressors) == 1:
+        return decompressors[0]
+
+    throughputs = benchmark_decompressors(path_to_file, decompressors, sample_size)
+    fastest = max(
+        decompressors, key=lambda decompressor: throughputs[decompressor.name]
+    )
+    logger.info("Decompression backend %s was selected", fastest.name)
+    return fastest
+
+
+def benchmark_decompressors(
+    path_to_file: Path,
+    decompressors: list[GzipDecompressor],
+    sample_size: int = DECOMPRESSION_BENCHMARK_SIZE,
+) -> dict[str, float]:
+    """Measure throughput of backends in bytes of decompressed data per second."""
+    with path_to_file.open("rb") as file:
+        sample = file.read(sample_size)
+
+    throughputs = {
+        decompressor.name: _measure_throughput(decompressor.inflate, sample)
+        for decompressor in decompressors
+    }
+    logger.debug("Decompression throughputs: %s", throughputs)
+    return throughputs
+
+
+def _measure_throughput(
+    inflate: Callable[[BinaryIO], Iterator[bytes]], sample: bytes
+) -> float:
+    start = time.perf_counter()
+    size = 0
+
+    # Sample is the truncated file, so backends complain about its end.
+    with suppress(DecompressionError):
+        for chunk in inflate(BytesIO(sample)):
+            size += len(chunk)
+
+    return size / (time.perf_counter() - start)
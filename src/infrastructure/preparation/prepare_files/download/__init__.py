@@ -1,13 +1,19 @@
+from .archive_cache import ArchiveCache, ArchiveValidators
 from .downloader import Downloader
 from .downloader_components import (
     FileChunkCalculator,
     FullFileDownloader,
     PartOfFileDownloader,
 )
+from .stream import open_gzip_stream, open_remote_file
 
 __all__ = (
+    "ArchiveCache",
+    "ArchiveValidators",
     "Downloader",
     "FileChunkCalculator",
     "FullFileDownloader",
     "PartOfFileDownloader",
+    "open_gzip_stream",
+    "open_remote_file",
 )
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from pathlib import Path
+
+from aiohttp import ClientSession, ClientTimeout
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+
+from core.common_types import Link
+from core.config import NETWORK_ERRORS
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_CACHE_INDEX: str = "index.json"
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveValidators:
+    """HTTP validators that tell whether remote archive has changed."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_length: int | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "ArchiveValidators":
+        content_length = headers.get("Content-Length")
+
+        return cls(
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            content_length=int(content_length) if content_length else None,
+        )
+
+    def get_conditional_headers(self) -> dict[str, str]:
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def match(self, other: "ArchiveValidators") -> bool:
+        """ETag is the strongest validator, the others are compared without it."""
+        if self.etag and other.etag:
+            return self.etag == other.etag
+
+        if not self.last_modified:
+            return False
+
+        return (self.last_modified, self.content_length) == (
+            other.last_modified,
+            other.content_length,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _CacheEntry:
+    validators: ArchiveValidators
+    files: tuple[str, ...]
+
+
+class ArchiveCache:
+    """
+    Downloaded archives kept between setups together with validators
+    of their urls. Archive that has not changed since the previous setup
+    is linked from the cache instead of being downloaded again.
+    """
+
+    def __init__(self, cache_folder: Path):
+        self.folder = cache_folder
+        self._index_path = cache_folder / ARCHIVE_CACHE_INDEX
+
+    def get_validators(self, url: Link) -> ArchiveValidators | None:
+        entry = self._get_entry(url)
+        return entry.validators if entry is not None else None
+
+    def _get_entry(self, url: Link) -> _CacheEntry | None:
+        """Cached archive, if all its files are still in place."""
+        entry = self._read_index().get(url)
+
+        if entry is None or not self._files_exist(entry.files):
+            return None
+
+        return entry
+
+    def _files_exist(self, files: Iterable[str]) -> bool:
+        return all((self.folder / file).exists() for file in files)
+
+    def restore(
+        self, url: Link, validators: ArchiveValidators, path_to_save: Path
+    ) -> bool:
+        """Link unchanged archive files to the folder, False if they are stale."""
+        entry = self._get_entry(url)
+
+        if entry is None or not entry.validators.match(validators):
+            return False
+
+        for file in entry.files:
+            _link_or_copy(self.folder / file, path_to_save / file)
+
+        logger.info("%s has not changed, it is taken from archive cache", url)
+        return True
+
+    def store(
+        self, url: Link, validators: ArchiveValidators, files: list[Path]
+    ) -> None:
+        """Replace previous version of the archive with downloaded files."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        index = self._read_index()
+
+        if url in index:
+            for file in index[url].files:
+                (self.folder / file).unlink(missing_ok=True)
+
+        file_names = tuple(file.name for file in files)
+
+        for file, file_name in zip(files, file_names, strict=True):
+            _link_or_copy(file, self.folder / file_name)
+
+        index[url] = _CacheEntry(validators=validators, files=file_names)
+        self._write_index(index)
+
+    def _read_index(self) -> dict[str, _CacheEntry]:
+        try:
+            raw_index = json.loads(self._index_path.read_text())
+
+        except FileNotFoundError:
+            return {}
+
+        except json.JSONDecodeError:
+            logger.warning("Archive cache index is damaged, it is rebuilt")
+            return {}
+
+        return {
+            url: _CacheEntry(
+                validators=ArchiveValidators(**entry["validators"]),
+                files=tuple(entry["files"]),
+            )
+            for url, entry in raw_index.items()
+        }
+
+    def _write_index(self, index: dict[str, _CacheEntry]) -> None:
+        """Index is replaced at once, so it is never left half written."""
+        raw_index = {
+            url: {"validators": asdict(entry.validators), "files": entry.files}
+            for url, entry in index.items()
+        }
+        temporary_path = self._index_path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(raw_index, indent=2))
+        temporary_path.replace(self._index_path)
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """
+    Hard link takes neither time nor disk space. Source files are removed
+    after preparation, but the cached link keeps the data.
+    """
+    destination.unlink(missing_ok=True)
+
+    try:
+        os.link(source, destination)
+
+    except OSError:
+        # Cache is on another file system.
+        shutil.copyfile(source, destination)
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_fixed(5),
+    retry=retry_if_exception_type(NETWORK_ERRORS),
+)
+async def fetch_archive_validators(
+    url: Link,
+    session: ClientSession,
+    cached_validators: ArchiveValidators | None = None,
+    timeout: ClientTimeout | None = None,
+) -> ArchiveValidators:
+    """
+    Make conditional request with validators of cached archive.
+    'Not Modified' response means cached archive is still current.
+    """
+    headers = cached_validators.get_conditional_headers() if cached_validators else {}
+
+    try:
+        async with session.head(url, headers=headers, timeout=timeout) as resp:
+            if resp.status == HTTPStatus.NOT_MODIFIED and cached_validators:
+                return cached_validators
+
+            return ArchiveValidators.from_headers(resp.headers)
+
+    except asyncio.TimeoutError:
+        logger.exception("Too much time to check %s for changes", url)
+        raise
@@ -1,9 +1,7 @@
 import asyncio
 from asyncio import Semaphore, Task
 from collections.abc import Coroutine
-from itertools import chain
 from pathlib import Path
-from typing import TypedDict
 
 from aiohttp import ClientSession
 
@@ -19,12 +17,17 @@ from core.config import (
     UNIPROT_SP_ISOFORMS_LINK,
     UNIPROT_SP_LINK,
     UNIPROT_TR_LINK,
+    SourceArchives,
 )
 from core.utils import create_tasks, process_tasks
 from domain.entities import DEFAULT_SOURCE_FILES_FOLDER
 from infrastructure.preparation.get_file_size import (
     get_file_size,
 )
+from infrastructure.preparation.prepare_files.download.archive_cache import (
+    ArchiveCache,
+    fetch_archive_validators,
+)
 from infrastructure.preparation.prepare_files.download.downloader_components import (
     FileChunkCalculator,
     FullFileDownloader,
@@ -32,65 +35,116 @@ from infrastructure.preparation.prepare_files.download.downloader_components imp
 )
 
 
-class DownloadArgs(TypedDict):
-    url: Link
-    path_to_save: Path
-
-
 class Downloader:
-    def __init__(self):
+    def __init__(
+        self, streaming: bool = False, archive_cache: ArchiveCache | None = None
+    ):
+        self._streaming = streaming
+        self._archive_cache = archive_cache
         self._large_file_timeout = LARGE_FILE_TIMEOUT
         self._graceful_shutdown_delay = GRACEFUL_SHUTDOWN_DELAY
         self._uniprot_large_files_connections = UNIPROT_LARGE_FILES_CONNECTIONS
         self._small_file_timeout = SMALL_FILE_TIMEOUT
         self._head_request_timeout = HEAD_REQUEST_TIMEOUT
         self._semaphore = SEMAPHORE
-        self._ncbi_link = NCBI_LINK
-        self._uniprot_sp_isoforms_link = UNIPROT_SP_ISOFORMS_LINK
-        self._uniprot_sp_link = UNIPROT_SP_LINK
         self._uniprot_tr_link = UNIPROT_TR_LINK
+        self._regular_file_links: dict[SourceArchives, Link] = {
+            SourceArchives.TAXDUMP: NCBI_LINK,
+            SourceArchives.SWISS_PROT: UNIPROT_SP_LINK,
+            SourceArchives.SP_ISOFORMS: UNIPROT_SP_ISOFORMS_LINK,
+        }
+
+    async def download_archive(self, archive: SourceArchives) -> None:
+        """
+        Download single archive, so it can be prepared
+        while the others are still being downloaded.
+        Connections of all the downloads are limited by the same semaphore.
+        """
+        # All regular sized files are read straight from the network in this mode.
+        if self._streaming and archive != SourceArchives.TREMBL:
+            return
 
-    async def download_files(self) -> None:
         main_timeout = self._large_file_timeout
 
         async with ClientSession(
             timeout=main_timeout, raise_for_status=True
         ) as session:
-            full_tasks = self._get_full_file_download_tasks(session)
-            part_tasks = await self._get_trembl_file_parts_download_tasks(session)
+            if self._archive_cache is None:
+                await self._download(session, archive)
 
-            tasks: list[Task] = list(chain(full_tasks, part_tasks))
-            await process_tasks(tasks)
+            else:
+                await self._download_changed_archive(
+                    session, archive, self._archive_cache
+                )
 
         # For graceful shutdown of connections with SSL.
         await asyncio.sleep(self._graceful_shutdown_delay)
 
-    def _get_full_file_download_tasks(self, session: ClientSession) -> list[Task]:
-        download_args: list[DownloadArgs] = [
-            DownloadArgs(
-                url=self._uniprot_sp_link, path_to_save=DEFAULT_SOURCE_FILES_FOLDER
-            ),
-            DownloadArgs(
-                url=self._uniprot_sp_isoforms_link,
-                path_to_save=DEFAULT_SOURCE_FILES_FOLDER,
-            ),
-            DownloadArgs(url=self._ncbi_link, path_to_save=DEFAULT_SOURCE_FILES_FOLDER),
-        ]
+    async def _download(self, session: ClientSession, archive: SourceArchives) -> None:
+        tasks = await self._get_archive_download_tasks(session, archive)
+        await process_tasks(tasks)
 
-        downloaders: list[FullFileDownloader] = [
-            FullFileDownloader(
-                session=session,
-                url=kwargs["url"],
-                path_to_save=kwargs["path_to_save"],
-                semaphore=self._semaphore,
-            )
-            for kwargs in download_args
+    async def _download_changed_archive(
+        self,
+        session: ClientSession,
+        archive: SourceArchives,
+        archive_cache: ArchiveCache,
+    ) -> None:
+        """
+        Archive is checked with conditional request first,
+        unchanged archive is taken from the cache.
+        """
+        url = self._get_archive_link(archive)
+        validators = await fetch_archive_validators(
+            url=url,
+            session=session,
+            cached_validators=archive_cache.get_validators(url),
+            timeout=self._head_request_timeout,
+        )
+
+        if archive_cache.restore(url, validators, DEFAULT_SOURCE_FILES_FOLDER):
+            return
+
+        await self._download(session, archive)
+        archive_cache.store(url, validators, self._get_downloaded_files(archive))
+
+    def _get_archive_link(self, archive: SourceArchives) -> Link:
+        if archive == SourceArchives.TREMBL:
+            return self._uniprot_tr_link
+
+        return self._regular_file_links[archive]
+
+    def _get_downloaded_files(self, archive: SourceArchives) -> list[Path]:
+        """TrEMBL archive is downloaded in numbered parts."""
+        if archive != SourceArchives.TREMBL:
+            return [DEFAULT_SOURCE_FILES_FOLDER / archive]
+
+        return [
+            DEFAULT_SOURCE_FILES_FOLDER / f"{archive}.{file_part}"
+            for file_part in range(self._uniprot_large_files_connections)
         ]
 
+    async def _get_archive_download_tasks(
+        self, session: ClientSession, archive: SourceArchives
+    ) -> list[Task]:
+        if archive == SourceArchives.TREMBL:
+            return await self._get_trembl_file_parts_download_tasks(session)
+
+        return self._get_full_file_download_tasks(session, archive)
+
+    def _get_full_file_download_tasks(
+        self, session: ClientSession, archive: SourceArchives
+    ) -> list[Task]:
+        downloader = FullFileDownloader(
+            session=session,
+            url=self._regular_file_links[archive],
+            path_to_save=DEFAULT_SOURCE_FILES_FOLDER,
+            semaphore=self._semaphore,
+        )
+
         regular_file_timeout = self._small_file_timeout
         coroutines: list[Coroutine] = [
             downloader.download_file(timeout=regular_file_timeout)
-            for downloader in downloaders
         ]
 
         tasks = create_tasks(coroutines)
@@ -208,7 +208,13 @@ class _FileDownloader:
     async def _write_chunks_to_file(
         self, response: ClientResponse, path_to_file: Path
     ) -> None:
-        """Write downloaded content to file piece by piece."""
+        """
+        Write downloaded content to file piece by piece.
+        Previous file may be linked to the archive cache, so it is replaced
+        instead of being overwritten.
+        """
+        path_to_file.unlink(missing_ok=True)
+
         async with aiofiles.open(path_to_file, mode="wb") as output_file:
             async for chunk in response.content.iter_chunked(self._chunk_size):
                 await output_file.write(chunk)
@@ -0,0 +1,56 @@
+import gzip
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.client import HTTPResponse
+from typing import BinaryIO
+from urllib.request import urlopen
+
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+
+from core.common_types import Link
+from core.config import STREAM_NETWORK_ERRORS, STREAM_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def open_remote_file(url: Link, timeout: float = STREAM_TIMEOUT) -> Iterator[BinaryIO]:
+    """
+    Open remote file for sequential reading without saving it to disk.
+    Blocking client is used because the file is consumed by synchronous iterators
+    inside worker processes.
+    """
+    response = _open_url(url, timeout)
+
+    try:
+        yield response
+
+    finally:
+        response.close()
+
+
+@contextmanager
+def open_gzip_stream(url: Link, timeout: float = STREAM_TIMEOUT) -> Iterator[BinaryIO]:
+    """Open remote gzip file and decompress its content while it is being read."""
+    with (
+        open_remote_file(url, timeout) as response,
+        gzip.GzipFile(fileobj=response) as stream,
+    ):
+        yield stream
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_fixed(5),
+    retry=retry_if_exception_type(STREAM_NETWORK_ERRORS),
+)
+def _open_url(url: Link, timeout: float) -> HTTPResponse:
+    logger.info("...streaming %s", url)
+
+    try:
+        return urlopen(url, timeout=timeout)
+
+    except STREAM_NETWORK_ERRORS:
+        logger.exception("Unable to open stream %s, check your connection", url)
+        raise
@@ -1,2 +1,14 @@
 class FilePreparationError(Exception):
     """File preparation exception."""
+
+
+class GzipIndexError(Exception):
+    """Gzip random access index exception."""
+
+
+class DecompressionError(Exception):
+    """Decompression backend failure or corrupted data."""
+
+
+class SourceCacheError(Exception):
+    """Source cache is unavailable or damaged."""
@@ -1,40 +1,70 @@
 import functools
-import glob
-import gzip
 import inspect
 import logging
-import shutil
 import subprocess
 import tarfile
-from collections.abc import Callable, Iterable
-from gzip import GzipFile
+from collections.abc import Callable, Iterable, Iterator
 from io import BufferedWriter
 from pathlib import Path
 from tarfile import TarFile, TarInfo
-from typing import Any
+from typing import Any, BinaryIO
 
+from core.common_types import Link
 from core.exceptions import NeighbouringProcessError
 from core.utils import is_shutdown_event_set, set_shutdown_event
+from infrastructure.preparation.prepare_files.chunk_plan import (
+    ChunkPlanCollector,
+    get_chunk_plan_path,
+    save_chunk_plan,
+)
+from infrastructure.preparation.prepare_files.concatenated_parts import (
+    ConcatenatedPartsReader,
+    get_file_parts,
+)
+from infrastructure.preparation.prepare_files.decompressors import (
+    select_decompressor,
+)
+from infrastructure.preparation.prepare_files.download.stream import open_remote_file
 from infrastructure.preparation.prepare_files.exceptions import FilePreparationError
+from infrastructure.preparation.prepare_files.gzip_index import (
+    GzipIndexBuilder,
+    get_index_path,
+    save_gzip_index,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def file_preparation_handler(func: Callable) -> Any:
+    """Prepare local file and remove it afterwards."""
+    return _preparation_handler(func, source_argument="path_to_file", remove=True)
+
+
+def keep_file_preparation_handler(func: Callable) -> Any:
+    """Prepare local file that must be kept after preparation."""
+    return _preparation_handler(func, source_argument="path_to_file", remove=False)
+
+
+def stream_preparation_handler(func: Callable) -> Any:
+    """Prepare file that is read straight from the network."""
+    return _preparation_handler(func, source_argument="url", remove=False)
+
+
+def _preparation_handler(func: Callable, source_argument: str, remove: bool) -> Any:
     signature = inspect.signature(func)
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         bound_args = signature.bind(*args, **kwargs)
         bound_args.apply_defaults()
-        path_to_file = bound_args.arguments["path_to_file"]
+        source_name = Path(bound_args.arguments[source_argument]).name
 
         try:
             if is_shutdown_event_set():
                 raise NeighbouringProcessError
 
             result = func(*args, **kwargs)
-            logger.info("File %s was prepared successfully", path_to_file.name)
+            logger.info("File %s was prepared successfully", source_name)
             return result
 
         except NeighbouringProcessError:
@@ -42,13 +72,12 @@ def file_preparation_handler(func: Callable) -> Any:
 
         except Exception as e:
             set_shutdown_event()
-            logger.exception(
-                "Unable to prepare file %s for processing", path_to_file.name
-            )
+            logger.exception("Unable to prepare file %s for processing", source_name)
             raise FilePreparationError from e
 
         finally:
-            _delete_file(path_to_file)
+            if remove:
+                _delete_file(bound_args.arguments[source_argument])
 
     return wrapper
 
@@ -61,28 +90,53 @@ def extract_from_tar(path_to_file: Path, files_to_extract: Iterable[str]) -> Non
 def _try_extract_from_tar(path_to_file: Path, files_to_extract: Iterable[str]) -> None:
     directory_path = _get_directory_path(path_to_file)
 
-    with tarfile.open(path_to_file) as archive:
+    # Stream mode reads the archive once, compression is detected transparently.
+    with tarfile.open(path_to_file, mode="r|*") as archive:
         logger.info("...extracting files from %s", path_to_file.name)
-        _extract_appropriate_files(files_to_extract, directory_path, archive)
+        _extract_appropriate_files_in_single_pass(
+            files_to_extract, directory_path, archive
+        )
 
 
 def _get_directory_path(path_to_file: Path) -> str:
     return str(path_to_file.parent)
 
 
-def _extract_appropriate_files(
+@stream_preparation_handler
+def stream_extract_from_tar(
+    url: Link, files_to_extract: Iterable[str], path_to_save: Path
+) -> None:
+    """
+    Extract required files from remote tar archive while it is being downloaded.
+    The archive itself is never saved to disk.
+    """
+    with (
+        open_remote_file(url) as response,
+        tarfile.open(fileobj=response, mode="r|gz") as archive,
+    ):
+        logger.info("...extracting files from %s", url)
+        _extract_appropriate_files_in_single_pass(
+            files_to_extract, str(path_to_save), archive
+        )
+
+
+def _extract_appropriate_files_in_single_pass(
     files_to_extract: Iterable[str], directory_path: str, archive: TarFile
 ) -> None:
-    members_to_extract: Iterable[TarInfo] = []
+    """
+    Extract required members one by one as they appear in the archive stream.
+    Other members are skipped without being kept in memory.
+    The rest of the archive is not read once all the required members are found.
+    """
+    remaining_files = set(files_to_extract)
 
-    for member in archive.getmembers():
-        if _member_in_files(member, files_to_extract):
-            members_to_extract.append(member)
+    for member in archive:
+        if _member_in_files(member, remaining_files):
+            archive.extract(member, path=directory_path, filter="data")
+            remaining_files.remove(member.name)
 
-    if members_to_extract:
-        archive.extractall(
-            path=directory_path, members=members_to_extract, filter="data"
-        )
+        if not remaining_files:
+            return
 
 
 def _member_in_files(member: TarInfo, files_to_extract: Iterable[str]) -> bool:
@@ -91,17 +145,50 @@ def _member_in_files(member: TarInfo, files_to_extract: Iterable[str]) -> bool:
 
 @file_preparation_handler
 def decompress_gz(path_to_file: Path) -> None:
-    """Decompress file with .gz format."""
-    _try_decompress_gz(path_to_file)
+    """
+    Decompress file with .gz format.
+    If the file is split on parts (file.gz.0, file.gz.1, ...),
+    the parts are decompressed in order without joining them first.
+    Parts are removed only when the whole file is decompressed.
+    """
+    compressed_files = _get_compressed_files(path_to_file)
+    _try_decompress_gz(path_to_file, compressed_files)
+    _delete_file_parts(compressed_files)
+
+
+def _get_compressed_files(path_to_file: Path) -> list[Path]:
+    """Whole file is preferred to its parts."""
+    file_parts = get_file_parts(path_to_file)
+
+    if path_to_file.exists() or not file_parts:
+        return [path_to_file]
+
+    logger.info("...reading %s from %s parts", path_to_file.name, len(file_parts))
+    return file_parts
+
+
+def _try_decompress_gz(path_to_file: Path, compressed_files: list[Path]) -> None:
+    decompressor = select_decompressor(compressed_files[0])
+    output_file_name = _get_output_file_name(path_to_file)
+    output_path = path_to_file.parent / output_file_name
+    logger.info(f"...decompressing file {output_file_name}")
+
+    with (
+        _open_compressed_files(compressed_files) as compressed_file,
+        open(output_path, "wb") as output_file,
+    ):
+        chunk_plan = _copy_compressed_data(
+            decompressor.inflate(compressed_file), output_file
+        )
 
+    save_chunk_plan(chunk_plan, get_chunk_plan_path(output_path))
 
-def _try_decompress_gz(path_to_file: Path) -> None:
-    with gzip.open(path_to_file, "rb") as compressed_file:
-        output_file_name = _get_output_file_name(path_to_file)
-        logger.info(f"...decompressing file {output_file_name}")
 
-        with open(path_to_file.parent / output_file_name, "wb") as output_file:
-            _copy_compressed_data(compressed_file, output_file)
+def _open_compressed_files(compressed_files: list[Path]) -> BinaryIO:
+    if len(compressed_files) == 1:
+        return compressed_files[0].open("rb")
+
+    return ConcatenatedPartsReader(compressed_files)
 
 
 def _get_output_file_name(path_to_file: Path) -> str:
@@ -109,16 +196,32 @@ def _get_output_file_name(path_to_file: Path) -> str:
 
 
 def _copy_compressed_data(
-    compressed_file: GzipFile, output_file: BufferedWriter
-) -> None:
-    shutil.copyfileobj(compressed_file, output_file)
+    decompressed_chunks: Iterator[bytes], output_file: BufferedWriter
+) -> ChunkPlanCollector:
+    """Copy decompressed data and note record starts for future file split."""
+    chunk_plan = ChunkPlanCollector()
+
+    for data in decompressed_chunks:
+        output_file.write(data)
+        chunk_plan.update(data)
+
+    return chunk_plan
+
+
+@keep_file_preparation_handler
+def index_gz(path_to_file: Path) -> None:
+    """
+    Build random access index for file with .gz format instead of decompressing it.
+    Decompressed data is never written to disk.
+    """
+    logger.info("...indexing file %s", path_to_file.name)
+    gzip_index = GzipIndexBuilder().build(path_to_file)
+    save_gzip_index(gzip_index, get_index_path(path_to_file))
 
 
 def concatenate_files(path_to_file: Path) -> None:
     """Concatenate parts of the file to a single whole."""
-    files = sorted(
-        glob.glob(f"{path_to_file}.*"), key=lambda x: int(x.split(".").pop())
-    )
+    files = get_file_parts(path_to_file)
 
     if is_shutdown_event_set():
         raise NeighbouringProcessError
@@ -138,20 +241,20 @@ def concatenate_files(path_to_file: Path) -> None:
         _delete_file_parts(files)
 
 
-def _try_concatenate_files(path_to_file: Path, file_parts: list[str]) -> None:
+def _try_concatenate_files(path_to_file: Path, file_parts: list[Path]) -> None:
     with open(path_to_file, "wb") as file:
         subprocess.run(
-            ["cat"] + file_parts,
+            ["cat", *file_parts],
             stdout=file,
             stderr=subprocess.PIPE,
             check=True,
         )
 
 
-def _delete_file_parts(files: list[str]) -> None:
+def _delete_file_parts(files: list[Path]) -> None:
     try:
         for file in files:
-            _delete_file(Path(file))
+            _delete_file(file)
 
     except Exception:
         logger.exception("Unable to delete file parts %s", files)
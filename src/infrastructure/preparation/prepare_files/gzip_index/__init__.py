@@ -0,0 +1,20 @@
+from .builder import GzipIndexBuilder
+from .models import AccessPoint, GzipIndex
+from .reader import open_gzip_at
+from .storage import (
+    GzipIndexFile,
+    get_index_path,
+    load_gzip_index,
+    save_gzip_index,
+)
+
+__all__ = (
+    "AccessPoint",
+    "GzipIndex",
+    "GzipIndexBuilder",
+    "GzipIndexFile",
+    "get_index_path",
+    "load_gzip_index",
+    "open_gzip_at",
+    "save_gzip_index",
+)
@@ -0,0 +1,141 @@
+import ctypes
+from pathlib import Path
+from typing import BinaryIO
+
+from core.config import GZIP_INDEX_SPAN
+from infrastructure.preparation.prepare_files.exceptions import GzipIndexError
+from infrastructure.preparation.prepare_files.gzip_index.models import (
+    AccessPoint,
+    GzipIndex,
+)
+from infrastructure.preparation.prepare_files.gzip_index.zlib_binding import (
+    GZIP_WINDOW_BITS,
+    WINDOW_SIZE,
+    Z_BLOCK,
+    Z_STREAM_END,
+    Inflater,
+)
+
+# Size of compressed data read at once (bytes).
+_READ_SIZE: int = 2**20
+
+_RECORD_DELIMITER: bytes = b"\n>"
+
+
+class GzipIndexBuilder:
+    """
+    Decompress gzip file once without saving the result and remember
+    access points at deflate block boundaries every 'span' bytes
+    of decompressed data.
+    Only single member gzip files are supported.
+    """
+
+    def __init__(self, span: int = GZIP_INDEX_SPAN):
+        self._span = span
+        # Circular buffer that always holds the last decompressed data.
+        self._window = ctypes.create_string_buffer(WINDOW_SIZE)
+        self._window_view = memoryview(self._window).cast("B")
+        self._window_position = 0
+        self._access_points: list[AccessPoint] = []
+        # Points that wait for the next record start to be found.
+        self._pending_points: list[tuple[int, int, int, bytes]] = []
+        self._last_point_offset = 0
+
+    def build(self, path_to_file: Path) -> GzipIndex:
+        with (
+            path_to_file.open("rb") as file,
+            Inflater(GZIP_WINDOW_BITS) as inflater,
+        ):
+            self._inflate_file(file, inflater)
+            decompressed_size = inflater.total_out
+
+        return GzipIndex(
+            decompressed_size=decompressed_size,
+            access_points=tuple(self._access_points),
+        )
+
+    def _inflate_file(self, file: BinaryIO, inflater: Inflater) -> None:
+        while data := file.read(_READ_SIZE):
+            inflater.set_input(data)
+
+            if self._inflate_input(inflater):
+                return
+
+        raise GzipIndexError(f"Unexpected end of file {file.name}")
+
+    def _inflate_input(self, inflater: Inflater) -> bool:
+        """Inflate block by block until input is over. Return True on stream end."""
+        while inflater.avail_in:
+            if self._window_position == WINDOW_SIZE:
+                self._window_position = 0
+
+            code = self._inflate_block(inflater)
+
+            if code == Z_STREAM_END:
+                return True
+
+            if self._access_point_required(inflater):
+                self._add_pending_point(inflater)
+
+        return False
+
+    def _inflate_block(self, inflater: Inflater) -> int:
+        offset_before = inflater.total_out
+        address = ctypes.addressof(self._window) + self._window_position
+
+        code, written = inflater.inflate(
+            address, WINDOW_SIZE - self._window_position, Z_BLOCK
+        )
+
+        if self._pending_points and written:
+            self._resolve_pending_points(offset_before, written)
+
+        self._window_position += written
+        return code
+
+    def _access_point_required(self, inflater: Inflater) -> bool:
+        if not inflater.is_at_block_boundary():
+            return False
+
+        offset = inflater.total_out
+        return offset == 0 or offset - self._last_point_offset > self._span
+
+    def _add_pending_point(self, inflater: Inflater) -> None:
+        # The oldest data is right after the current position.
+        window = bytes(self._window_view[self._window_position :]) + bytes(
+            self._window_view[: self._window_position]
+        )
+        self._pending_points.append(
+            (inflater.total_out, inflater.total_in, inflater.unused_bits, window)
+        )
+        self._last_point_offset = inflater.total_out
+
+    def _resolve_pending_points(self, offset_before: int, written: int) -> None:
+        """Look for the record start in just decompressed data."""
+        # Byte before new data is needed to find delimiter on the edge.
+        previous_byte = (
+            bytes(self._window_view[self._window_position - 1 :][:1])
+            if offset_before
+            else b"\n"
+        )
+        start = self._window_position
+        data = previous_byte + bytes(self._window_view[start : start + written])
+        delimiter_position = data.find(_RECORD_DELIMITER)
+
+        if delimiter_position == -1:
+            return
+
+        record_start = offset_before + delimiter_position
+        self._access_points.extend(
+            AccessPoint(
+                decompressed_offset=decompressed_offset,
+                compressed_offset=compressed_offset,
+                bits=bits,
+                record_start=record_start,
+                window=window,
+            )
+            for decompressed_offset, compressed_offset, bits, window in (
+                self._pending_points
+            )
+        )
+        self._pending_points.clear()
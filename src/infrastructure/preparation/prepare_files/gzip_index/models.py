@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class AccessPoint:
+    """
+    Position in gzip file where decompression can be started from.
+    'window' is the last 32 KiB of decompressed data before the point,
+    'record_start' is the first FASTA record start at or after the point.
+    """
+
+    decompressed_offset: int
+    compressed_offset: int
+    bits: int
+    record_start: int
+    window: bytes
+
+
+@dataclass(frozen=True, slots=True)
+class GzipIndex:
+    decompressed_size: int
+    access_points: tuple[AccessPoint, ...]
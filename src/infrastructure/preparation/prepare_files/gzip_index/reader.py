@@ -0,0 +1,102 @@
+import ctypes
+import io
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+from infrastructure.preparation.prepare_files.exceptions import GzipIndexError
+from infrastructure.preparation.prepare_files.gzip_index.models import AccessPoint
+from infrastructure.preparation.prepare_files.gzip_index.storage import GzipIndexFile
+from infrastructure.preparation.prepare_files.gzip_index.zlib_binding import (
+    RAW_WINDOW_BITS,
+    Z_NO_FLUSH,
+    Z_STREAM_END,
+    Inflater,
+)
+
+# Size of compressed data read at once (bytes).
+_READ_SIZE: int = 2**20
+
+
+class _AccessPointReader(io.RawIOBase):
+    """Decompressed data of gzip file starting from the access point."""
+
+    def __init__(self, file: BinaryIO, inflater: Inflater):
+        self._file = file
+        self._inflater = inflater
+        self._stream_is_over = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        output = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+
+        while not self._stream_is_over:
+            self._refill_input()
+            code, written = self._inflater.inflate(
+                ctypes.addressof(output), len(buffer), Z_NO_FLUSH
+            )
+            self._stream_is_over = code == Z_STREAM_END
+
+            if written:
+                return written
+
+        return 0
+
+    def _refill_input(self) -> None:
+        if self._inflater.avail_in:
+            return
+
+        data = self._file.read(_READ_SIZE)
+
+        if not data:
+            raise GzipIndexError(f"Unexpected end of file {self._file.name}")
+
+        self._inflater.set_input(data)
+
+
+@contextmanager
+def open_gzip_at(
+    path_to_file: Path, index: GzipIndexFile, offset: int
+) -> Iterator[BinaryIO]:
+    """Open gzip file for reading decompressed data from the offset."""
+    access_point = index.find_access_point(offset)
+
+    with (
+        path_to_file.open("rb") as file,
+        Inflater(RAW_WINDOW_BITS) as inflater,
+    ):
+        _prepare_inflater(file, inflater, access_point)
+        reader = io.BufferedReader(_AccessPointReader(file, inflater))
+        _skip(reader, offset - access_point.decompressed_offset)
+        yield reader
+
+
+def _prepare_inflater(
+    file: BinaryIO, inflater: Inflater, access_point: AccessPoint
+) -> None:
+    """
+    Access point may be in the middle of a byte,
+    so the rest bits of that byte are fed to the inflater first.
+    """
+    if access_point.bits:
+        file.seek(access_point.compressed_offset - 1)
+        partial_byte = file.read(1)[0]
+        inflater.prime(access_point.bits, partial_byte >> (8 - access_point.bits))
+
+    else:
+        file.seek(access_point.compressed_offset)
+
+    inflater.set_dictionary(access_point.window)
+
+
+def _skip(reader: BinaryIO, bytes_number: int) -> None:
+    while bytes_number > 0:
+        skipped = len(reader.read(min(bytes_number, _READ_SIZE)))
+
+        if not skipped:
+            raise GzipIndexError("Offset is beyond the end of file")
+
+        bytes_number -= skipped
@@ -0,0 +1,133 @@
+import bisect
+import mmap
+import struct
+import zlib
+from itertools import accumulate
+from pathlib import Path
+from typing import NamedTuple
+
+from infrastructure.preparation.prepare_files.exceptions import GzipIndexError
+from infrastructure.preparation.prepare_files.gzip_index.models import (
+    AccessPoint,
+    GzipIndex,
+)
+
+INDEX_SUFFIX: str = ".idx"
+
+_MAGIC: bytes = b"UNIDBGZI"
+_VERSION: int = 2
+
+# Magic, version, decompressed size, number of access points.
+_HEADER = struct.Struct("<8sBQQ")
+
+# Decompressed offset, compressed offset, bits, record start,
+# window position in the index file, window length.
+# Table of access points precedes windows, so it is read without them.
+_ACCESS_POINT = struct.Struct("<QQBQQI")
+
+
+class _AccessPointEntry(NamedTuple):
+    decompressed_offset: int
+    compressed_offset: int
+    bits: int
+    record_start: int
+    window_position: int
+    window_length: int
+
+
+def get_index_path(path_to_file: Path) -> Path:
+    """Index is stored next to the indexed file."""
+    return path_to_file.with_name(path_to_file.name + INDEX_SUFFIX)
+
+
+def save_gzip_index(index: GzipIndex, path_to_index: Path) -> None:
+    """Write index to a temporary file first so a broken index is never left."""
+    temporary_path = path_to_index.with_name(path_to_index.name + ".tmp")
+    # Windows are mostly text so they are compressed well.
+    windows = [zlib.compress(point.window) for point in index.access_points]
+    window_positions = accumulate(
+        map(len, windows),
+        initial=_HEADER.size + _ACCESS_POINT.size * len(windows),
+    )
+
+    with temporary_path.open("wb") as file:
+        file.write(
+            _HEADER.pack(
+                _MAGIC, _VERSION, index.decompressed_size, len(index.access_points)
+            )
+        )
+
+        # The last window position is the end of the file.
+        for point, window, window_position in zip(
+            index.access_points, windows, window_positions, strict=False
+        ):
+            file.write(_pack_access_point(point, window_position, len(window)))
+
+        file.writelines(windows)
+
+    temporary_path.replace(path_to_index)
+
+
+def _pack_access_point(
+    point: AccessPoint, window_position: int, window_length: int
+) -> bytes:
+    return _ACCESS_POINT.pack(
+        point.decompressed_offset,
+        point.compressed_offset,
+        point.bits,
+        point.record_start,
+        window_position,
+        window_length,
+    )
+
+
+class GzipIndexFile:
+    """
+    Gzip index file mapped to memory. Only the table of access points
+    is read on load, window of access point is read when decompression
+    starts from it, so every reader keeps a single window in memory.
+    """
+
+    def __init__(self, path_to_index: Path):
+        with path_to_index.open("rb") as file:
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.decompressed_size, points_number = _HEADER.unpack_from(
+            self._mapping
+        )
+
+        if magic != _MAGIC or version != _VERSION:
+            raise GzipIndexError(f"Unsupported index file {path_to_index}")
+
+        table_end = _HEADER.size + _ACCESS_POINT.size * points_number
+        self._entries = [
+            _AccessPointEntry._make(entry)
+            for entry in _ACCESS_POINT.iter_unpack(
+                self._mapping[_HEADER.size : table_end]
+            )
+        ]
+        self._decompressed_offsets = [
+            entry.decompressed_offset for entry in self._entries
+        ]
+
+    @property
+    def record_starts(self) -> list[int]:
+        return [entry.record_start for entry in self._entries]
+
+    def find_access_point(self, offset: int) -> AccessPoint:
+        """Get the closest access point before decompressed offset."""
+        entry = self._entries[
+            bisect.bisect_right(self._decompressed_offsets, offset) - 1
+        ]
+        window_end = entry.window_position + entry.window_length
+        return AccessPoint(
+            decompressed_offset=entry.decompressed_offset,
+            compressed_offset=entry.compressed_offset,
+            bits=entry.bits,
+            record_start=entry.record_start,
+            window=zlib.decompress(self._mapping[entry.window_position : window_end]),
+        )
+
+
+def load_gzip_index(path_to_index: Path) -> GzipIndexFile:
+    return GzipIndexFile(path_to_index)
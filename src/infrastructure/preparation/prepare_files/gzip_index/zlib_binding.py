@@ -0,0 +1,166 @@
+"""
+Minimal binding to the system zlib.
+Standard 'zlib' module does not expose block boundaries (Z_BLOCK)
+and bit level positioning (inflatePrime) required by random access index.
+"""
+
+import ctypes
+import ctypes.util
+from typing import Self
+
+from infrastructure.preparation.prepare_files.exceptions import GzipIndexError
+
+# Size of the sliding window of deflate (bytes).
+WINDOW_SIZE: int = 2**15
+
+# Window bits that make zlib expect gzip header and check its trailer.
+GZIP_WINDOW_BITS: int = 15 + 32
+
+# Window bits for raw deflate data without any header.
+RAW_WINDOW_BITS: int = -15
+
+Z_NO_FLUSH: int = 0
+Z_BLOCK: int = 5
+
+Z_OK: int = 0
+Z_STREAM_END: int = 1
+Z_BUF_ERROR: int = -5
+
+# Flags of 'data_type' field set by inflate with Z_BLOCK.
+_END_OF_BLOCK_FLAG: int = 128
+_LAST_BLOCK_FLAG: int = 64
+_UNUSED_BITS_MASK: int = 7
+
+
+class _ZStream(ctypes.Structure):
+    _fields_ = [
+        ("next_in", ctypes.c_void_p),
+        ("avail_in", ctypes.c_uint),
+        ("total_in", ctypes.c_ulong),
+        ("next_out", ctypes.c_void_p),
+        ("avail_out", ctypes.c_uint),
+        ("total_out", ctypes.c_ulong),
+        ("msg", ctypes.c_char_p),
+        ("state", ctypes.c_void_p),
+        ("zalloc", ctypes.c_void_p),
+        ("zfree", ctypes.c_void_p),
+        ("opaque", ctypes.c_void_p),
+        ("data_type", ctypes.c_int),
+        ("adler", ctypes.c_ulong),
+        ("reserved", ctypes.c_ulong),
+    ]
+
+
+def _load_zlib() -> ctypes.CDLL:
+    library_name = ctypes.util.find_library("z")
+
+    if library_name is None:
+        raise GzipIndexError("System zlib library is not available")
+
+    zlib = ctypes.CDLL(library_name)
+    zlib.zlibVersion.restype = ctypes.c_char_p
+    stream_pointer = ctypes.POINTER(_ZStream)
+
+    zlib.inflateInit2_.argtypes = [
+        stream_pointer,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+    ]
+    zlib.inflate.argtypes = [stream_pointer, ctypes.c_int]
+    zlib.inflateEnd.argtypes = [stream_pointer]
+    zlib.inflatePrime.argtypes = [stream_pointer, ctypes.c_int, ctypes.c_int]
+    zlib.inflateSetDictionary.argtypes = [
+        stream_pointer,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+    return zlib
+
+
+_zlib = _load_zlib()
+
+
+class Inflater:
+    """Thin wrapper around zlib inflate stream."""
+
+    def __init__(self, window_bits: int):
+        self._stream = _ZStream()
+        # Keep reference to input so its memory is not freed while inflating.
+        self._input: bytes = b""
+
+        self._check(
+            _zlib.inflateInit2_(
+                ctypes.byref(self._stream),
+                window_bits,
+                _zlib.zlibVersion(),
+                ctypes.sizeof(_ZStream),
+            )
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _zlib.inflateEnd(ctypes.byref(self._stream))
+
+    @property
+    def avail_in(self) -> int:
+        return self._stream.avail_in
+
+    @property
+    def total_in(self) -> int:
+        return self._stream.total_in
+
+    @property
+    def total_out(self) -> int:
+        return self._stream.total_out
+
+    @property
+    def unused_bits(self) -> int:
+        """Bits of the last consumed byte that belong to the next block."""
+        return self._stream.data_type & _UNUSED_BITS_MASK
+
+    def is_at_block_boundary(self) -> bool:
+        """Check if inflate stopped between two deflate blocks."""
+        data_type = self._stream.data_type
+        return bool(data_type & _END_OF_BLOCK_FLAG) and not (
+            data_type & _LAST_BLOCK_FLAG
+        )
+
+    def set_input(self, data: bytes) -> None:
+        self._input = data
+        self._stream.next_in = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p)
+        self._stream.avail_in = len(data)
+
+    def inflate(self, address: int, size: int, flush: int) -> tuple[int, int]:
+        """
+        Inflate available input to the memory at provided address.
+        Return zlib code and number of bytes written.
+        """
+        self._stream.next_out = address
+        self._stream.avail_out = size
+
+        code = _zlib.inflate(ctypes.byref(self._stream), flush)
+
+        if code != Z_BUF_ERROR:
+            self._check(code)
+
+        return code, size - self._stream.avail_out
+
+    def prime(self, bits: int, value: int) -> None:
+        """Insert bits of partially consumed byte to the stream."""
+        self._check(_zlib.inflatePrime(ctypes.byref(self._stream), bits, value))
+
+    def set_dictionary(self, window: bytes) -> None:
+        self._check(
+            _zlib.inflateSetDictionary(ctypes.byref(self._stream), window, len(window))
+        )
+
+    def _check(self, code: int) -> None:
+        if code < Z_OK:
+            message = self._stream.msg.decode() if self._stream.msg else code
+            raise GzipIndexError(f"Inflate failed: {message}")
+
+        if code > Z_STREAM_END:
+            raise GzipIndexError(f"Unexpected inflate code {code}")
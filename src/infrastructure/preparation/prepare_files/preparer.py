@@ -1,11 +1,10 @@
 import logging
 from asyncio import AbstractEventLoop
 from concurrent.futures import ProcessPoolExecutor
-from itertools import chain
 from pathlib import Path
 from threading import Event
 
-from core.config import NCBIFiles, UniprotFiles
+from core.config import NCBI_LINK, NCBIFiles, SourceArchives, UniprotFiles
 from core.models import FunctionCall
 from core.utils import process_futures, run_futures
 from domain.entities import DEFAULT_SOURCE_FILES_FOLDER
@@ -14,46 +13,102 @@ from infrastructure.preparation.prepare_files.file_operations import (
     concatenate_files,
     decompress_gz,
     extract_from_tar,
+    index_gz,
+    stream_extract_from_tar,
 )
+from infrastructure.preparation.prepare_files.source_cache import SourceCache
 
 logger = logging.getLogger(__name__)
 
+# Files that are obtained from every archive.
+PREPARED_FILES: dict[SourceArchives, tuple[str, ...]] = {
+    SourceArchives.TAXDUMP: tuple(NCBIFiles),
+    SourceArchives.SWISS_PROT: (UniprotFiles.SWISS_PROT,),
+    SourceArchives.SP_ISOFORMS: (UniprotFiles.SP_ISOFORMS,),
+    SourceArchives.TREMBL: (UniprotFiles.TREMBL,),
+}
+
 
 class FilePreparer:
     def __init__(
         self,
         source_folder: Path = DEFAULT_SOURCE_FILES_FOLDER,
         preparation_is_required: bool = True,
+        streaming: bool = False,
+        indexing: bool = False,
+        source_cache: SourceCache | None = None,
+        from_source_cache: bool = False,
     ):
         self._source_folder = source_folder
         self._preparation_is_required = preparation_is_required
-        self._path_to_tr_gz = source_folder / "uniprot_trembl.fasta.gz"
-        self._path_to_new_taxdump = source_folder / "new_taxdump.tar.gz"
-        self._path_to_sp_gz = source_folder / "uniprot_sprot.fasta.gz"
-        self._path_to_sp_iso_gz = source_folder / "uniprot_sprot_varsplic.fasta.gz"
+        self._streaming = streaming
+        self._indexing = indexing
+        self._source_cache = source_cache
+        # Cache of the current release is used as is, otherwise it is filled again.
+        self._from_source_cache = from_source_cache
+        self._path_to_tr_gz = source_folder / SourceArchives.TREMBL
+        self._path_to_new_taxdump = source_folder / SourceArchives.TAXDUMP
+        self._path_to_sp_gz = source_folder / SourceArchives.SWISS_PROT
+        self._path_to_sp_iso_gz = source_folder / SourceArchives.SP_ISOFORMS
         self._need_to_concatenate_trembl_files = True
 
-    async def prepare_required_files(
-        self, loop: AbstractEventLoop, process_pool: ProcessPoolExecutor, event: Event
+    async def prepare_archive(
+        self,
+        archive: SourceArchives,
+        loop: AbstractEventLoop,
+        process_pool: ProcessPoolExecutor,
+        event: Event,
     ) -> None:
+        """
+        Prepare files of a single archive as soon as it is downloaded,
+        while the other archives may still be downloaded or copied.
+        """
+        if self._from_source_cache:
+            logger.info("%s is taken from source cache", archive)
+            return
+
         if not self._preparation_is_required:
-            self._check_prepared_files_existence()
+            self._check_prepared_files_existence(archive)
             return
 
-        self._check_files_that_will_be_prepared_existence()
+        self._check_archive_existence(archive)
+
+        # Calls of the same archive depend on each other, so they run in order.
+        for preparation_call in self._get_preparation_calls(archive):
+            tasks = run_futures(loop, process_pool, [preparation_call])
+            await process_futures(tasks, event, FilePreparationError())
 
-        preparation_calls = self._get_preparation_calls()
-        tasks = run_futures(loop, process_pool, preparation_calls)
+        if self._source_cache is not None:
+            await self._fill_source_cache(archive, loop, process_pool, event)
+
+    async def _fill_source_cache(
+        self,
+        archive: SourceArchives,
+        loop: AbstractEventLoop,
+        process_pool: ProcessPoolExecutor,
+        event: Event,
+    ) -> None:
+        """Keep prepared files in cache for the next setups."""
+        assert self._source_cache is not None
+
+        self._source_cache.folder.mkdir(parents=True, exist_ok=True)
+        self._source_cache.forget_release()
+        caching_calls = self._source_cache.get_caching_calls(
+            self._source_folder, PREPARED_FILES[archive]
+        )
+        tasks = run_futures(loop, process_pool, caching_calls)
 
         await process_futures(tasks, event, FilePreparationError())
 
-    def _check_files_that_will_be_prepared_existence(self) -> None:
-        required_files: list[Path] = [
-            self._path_to_sp_iso_gz,
-            self._path_to_sp_gz,
-            self._path_to_new_taxdump,
-        ]
+    def _check_archive_existence(self, archive: SourceArchives) -> None:
+        if archive == SourceArchives.TREMBL:
+            self._check_trembl_files_existence()
 
+        # Streamed archives are not saved to disk.
+        elif not self._streaming:
+            self._check_file_existence(self._source_folder / archive)
+
+    def _check_trembl_files_existence(self) -> None:
         trembl_gz_files: str = "uniprot_trembl.fasta.gz*"
         matching_files: list[Path] = list(self._source_folder.glob(trembl_gz_files))
 
@@ -63,13 +118,10 @@ class FilePreparer:
         elif len(matching_files) == 1:
             self._need_to_concatenate_trembl_files = False
 
-        [self._check_file_existence(file) for file in required_files]
-
-    def _check_prepared_files_existence(self) -> None:
-        ncbi_files = [self._source_folder / file for file in NCBIFiles]
-        uniprot_files = [self._source_folder / file for file in UniprotFiles]
-
-        required_files: list[Path] = list(chain(ncbi_files, uniprot_files))
+    def _check_prepared_files_existence(self, archive: SourceArchives) -> None:
+        required_files = [
+            self._source_folder / file for file in PREPARED_FILES[archive]
+        ]
         [self._check_file_existence(file) for file in required_files]
 
     def _check_file_existence(self, file: Path) -> None:
@@ -77,14 +129,22 @@ class FilePreparer:
             logger.error("Missing required file %s", file)
             raise FileNotFoundError(f"Missing {file=}")
 
-    def _get_preparation_calls(self) -> list[FunctionCall]:
-        preparation_calls = [
-            FunctionCall(
-                func=extract_from_tar, args=(self._path_to_new_taxdump, NCBIFiles)
-            ),
-            FunctionCall(func=decompress_gz, args=(self._path_to_sp_gz,)),
-            FunctionCall(func=decompress_gz, args=(self._path_to_sp_iso_gz,)),
-        ]
+    def _get_preparation_calls(self, archive: SourceArchives) -> list[FunctionCall]:
+        if archive == SourceArchives.TREMBL:
+            return self._get_trembl_preparation_calls()
+
+        return self._get_small_files_preparation_calls(archive)
+
+    def _get_trembl_preparation_calls(self) -> list[FunctionCall]:
+        """
+        TrEMBL parts are decompressed one after another without joining them.
+        Indexed TrEMBL archive is decompressed by workers right while copying,
+        so it has to be a single file.
+        """
+        if not self._indexing:
+            return [FunctionCall(func=decompress_gz, args=(self._path_to_tr_gz,))]
+
+        preparation_calls = []
 
         if self._need_to_concatenate_trembl_files:
             preparation_calls.append(
@@ -92,7 +152,43 @@ class FilePreparer:
             )
 
         preparation_calls.append(
-            FunctionCall(func=decompress_gz, args=(self._path_to_tr_gz,))
+            FunctionCall(func=index_gz, args=(self._path_to_tr_gz,))
         )
-
         return preparation_calls
+
+    def _get_small_files_preparation_calls(
+        self, archive: SourceArchives
+    ) -> list[FunctionCall]:
+        """
+        Swiss-Prot files are not prepared in streaming mode at all,
+        they are parsed right from the network. Taxdump files are extracted
+        while the archive is being downloaded.
+        """
+        if self._streaming:
+            return self._get_streaming_preparation_calls(archive)
+
+        preparation_calls = {
+            SourceArchives.TAXDUMP: FunctionCall(
+                func=extract_from_tar, args=(self._path_to_new_taxdump, NCBIFiles)
+            ),
+            SourceArchives.SWISS_PROT: FunctionCall(
+                func=decompress_gz, args=(self._path_to_sp_gz,)
+            ),
+            SourceArchives.SP_ISOFORMS: FunctionCall(
+                func=decompress_gz, args=(self._path_to_sp_iso_gz,)
+            ),
+        }
+        return [preparation_calls[archive]]
+
+    def _get_streaming_preparation_calls(
+        self, archive: SourceArchives
+    ) -> list[FunctionCall]:
+        if archive != SourceArchives.TAXDUMP:
+            return []
+
+        return [
+            FunctionCall(
+                func=stream_extract_from_tar,
+                args=(NCBI_LINK, NCBIFiles, self._source_folder),
+            ),
+        ]
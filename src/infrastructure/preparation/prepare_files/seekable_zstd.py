@@ -0,0 +1,156 @@
+"""
+Zstandard seekable format: independent zstd frames followed by seek table
+stored in a skippable frame, so any frame can be decompressed on its own.
+https://github.com/facebook/zstd/blob/dev/contrib/seekable_format/zstd_seekable_compression_format.md
+"""
+
+import struct
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from infrastructure.preparation.prepare_files.exceptions import SourceCacheError
+
+try:
+    import zstandard
+
+except ImportError:  # Optional dependency required only for source cache.
+    zstandard = None
+
+_SKIPPABLE_MAGIC_NUMBER: int = 0x184D2A5E
+_SEEKABLE_MAGIC_NUMBER: int = 0x8F92EAB1
+
+# Skippable frame magic number and frame size.
+_SKIPPABLE_HEADER = struct.Struct("<II")
+
+# Compressed and decompressed size of the frame.
+_SEEK_TABLE_ENTRY = struct.Struct("<II")
+
+# Number of frames, seek table descriptor, seekable magic number.
+_SEEK_TABLE_FOOTER = struct.Struct("<IBI")
+
+# Seek table descriptor flag that means entries have checksums.
+_CHECKSUM_FLAG: int = 128
+
+# Size of decompressed data read at once while skipping to offset (bytes).
+_READ_SIZE: int = 2**20
+
+
+@dataclass(frozen=True, slots=True)
+class ZstdFrame:
+    compressed_offset: int
+    decompressed_offset: int
+
+
+@dataclass(frozen=True, slots=True)
+class SeekTable:
+    decompressed_size: int
+    frames: tuple[ZstdFrame, ...]
+
+    def find_frame(self, offset: int) -> ZstdFrame:
+        """Get the frame that contains decompressed offset."""
+        suitable_frames = [
+            frame for frame in self.frames if frame.decompressed_offset <= offset
+        ]
+        return suitable_frames[-1]
+
+
+def check_zstandard_availability() -> None:
+    if zstandard is None:
+        raise SourceCacheError(
+            "Package 'zstandard' is required for source cache, "
+            "install it with 'unidb[cache]' extra"
+        )
+
+
+class SeekableZstdWriter:
+    """Write every chunk of data as an independent zstd frame."""
+
+    def __init__(self, file: BinaryIO, level: int):
+        check_zstandard_availability()
+        self._file = file
+        self._compressor = zstandard.ZstdCompressor(
+            level=level, write_checksum=True, threads=-1
+        )
+        self._frame_sizes: list[tuple[int, int]] = []
+
+    def write_frame(self, data: bytes) -> None:
+        frame = self._compressor.compress(data)
+        self._file.write(frame)
+        self._frame_sizes.append((len(frame), len(data)))
+
+    def write_seek_table(self) -> None:
+        """Frames have their own checksums, so seek table entries do not."""
+        entries = b"".join(
+            _SEEK_TABLE_ENTRY.pack(compressed_size, decompressed_size)
+            for compressed_size, decompressed_size in self._frame_sizes
+        )
+        footer = _SEEK_TABLE_FOOTER.pack(
+            len(self._frame_sizes), 0, _SEEKABLE_MAGIC_NUMBER
+        )
+        self._file.write(
+            _SKIPPABLE_HEADER.pack(_SKIPPABLE_MAGIC_NUMBER, len(entries) + len(footer))
+        )
+        self._file.write(entries + footer)
+
+
+def read_seek_table(path_to_file: Path) -> SeekTable:
+    with path_to_file.open("rb") as file:
+        file.seek(-_SEEK_TABLE_FOOTER.size, 2)
+        frames_number, descriptor, magic_number = _SEEK_TABLE_FOOTER.unpack(
+            file.read(_SEEK_TABLE_FOOTER.size)
+        )
+
+        if magic_number != _SEEKABLE_MAGIC_NUMBER:
+            raise SourceCacheError(f"File {path_to_file} is not seekable zstd")
+
+        entry_size = _SEEK_TABLE_ENTRY.size + (4 if descriptor & _CHECKSUM_FLAG else 0)
+        file.seek(-_SEEK_TABLE_FOOTER.size - frames_number * entry_size, 2)
+        entries = file.read(frames_number * entry_size)
+
+    return _build_seek_table(entries, entry_size)
+
+
+def _build_seek_table(entries: bytes, entry_size: int) -> SeekTable:
+    frames = []
+    compressed_offset, decompressed_offset = 0, 0
+
+    for entry_start in range(0, len(entries), entry_size):
+        compressed_size, decompressed_size = _SEEK_TABLE_ENTRY.unpack_from(
+            entries, entry_start
+        )
+        frames.append(ZstdFrame(compressed_offset, decompressed_offset))
+        compressed_offset += compressed_size
+        decompressed_offset += decompressed_size
+
+    return SeekTable(decompressed_size=decompressed_offset, frames=tuple(frames))
+
+
+@contextmanager
+def open_zstd_at(
+    path_to_file: Path, seek_table: SeekTable, offset: int
+) -> Iterator[BinaryIO]:
+    """Open seekable zstd file for reading decompressed data from the offset."""
+    check_zstandard_availability()
+    frame = seek_table.find_frame(offset)
+
+    with path_to_file.open("rb") as file:
+        file.seek(frame.compressed_offset)
+
+        with zstandard.ZstdDecompressor().stream_reader(
+            file, read_across_frames=True, closefd=False
+        ) as reader:
+            _skip(reader, offset - frame.decompressed_offset)
+            yield reader
+
+
+def _skip(reader: BinaryIO, bytes_number: int) -> None:
+    while bytes_number > 0:
+        skipped = len(reader.read(min(bytes_number, _READ_SIZE)))
+
+        if not skipped:
+            raise SourceCacheError("Offset is beyond the end of file")
+
+        bytes_number -= skipped
@@ -0,0 +1,137 @@
+import logging
+import shutil
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from core.config import (
+    SOURCE_CACHE_COMPRESSION_LEVEL,
+    SOURCE_CACHE_FRAME_SIZE,
+    NCBIFiles,
+    UniprotFiles,
+)
+from core.models import FunctionCall
+from infrastructure.preparation.prepare_files.file_operations import (
+    keep_file_preparation_handler,
+)
+from infrastructure.preparation.prepare_files.seekable_zstd import SeekableZstdWriter
+
+logger = logging.getLogger(__name__)
+
+CACHED_FASTA_SUFFIX: str = ".zst"
+
+# Modification date of UniProt files the cache was filled with.
+SOURCE_CACHE_RELEASE: str = "release.txt"
+
+_RECORD_DELIMITER: bytes = b"\n>"
+
+
+def get_cached_fasta_path(cache_folder: Path, file_name: str) -> Path:
+    return cache_folder / f"{file_name}{CACHED_FASTA_SUFFIX}"
+
+
+class SourceCache:
+    """
+    Prepared source files kept between setups, so the same release can be
+    installed again without download and gzip decompression.
+    FASTA files are stored in seekable zstd format, NCBI files are stored as is.
+    Cache notes the release of its files, so outdated cache is not taken
+    for the current release.
+    """
+
+    def __init__(self, cache_folder: Path):
+        self.folder = cache_folder
+        self._path_to_release = cache_folder / SOURCE_CACHE_RELEASE
+
+    def is_complete(self) -> bool:
+        return all(path.exists() for path in self._get_cached_files())
+
+    def holds_release(self, modification_date: str) -> bool:
+        """Check if the cache was filled with UniProt files of the given date."""
+        try:
+            return self._path_to_release.read_text() == modification_date
+
+        except FileNotFoundError:
+            return False
+
+    def save_release(self, modification_date: str) -> None:
+        self._path_to_release.write_text(modification_date)
+
+    def forget_release(self) -> None:
+        """Cache being filled again belongs to no release until it is complete."""
+        self._path_to_release.unlink(missing_ok=True)
+
+    def _get_cached_files(self) -> list[Path]:
+        ncbi_files = [self.folder / file for file in NCBIFiles]
+        uniprot_files = [
+            get_cached_fasta_path(self.folder, file) for file in UniprotFiles
+        ]
+        return ncbi_files + uniprot_files
+
+    def get_caching_calls(
+        self, source_folder: Path, file_names: Iterable[str] | None = None
+    ) -> list[FunctionCall]:
+        """Calls that cache given prepared files, all of them by default."""
+        if file_names is None:
+            file_names = [*UniprotFiles, *NCBIFiles]
+
+        return [
+            FunctionCall(
+                func=cache_fasta_file if name in UniprotFiles else cache_plain_file,
+                args=(source_folder / name, self.folder),
+            )
+            for name in file_names
+        ]
+
+
+@keep_file_preparation_handler
+def cache_fasta_file(path_to_file: Path, cache_folder: Path) -> None:
+    """
+    Recompress FASTA file into seekable zstd frames.
+    Every frame starts with a record, so frames can be parsed independently.
+    """
+    path_to_cache = get_cached_fasta_path(cache_folder, path_to_file.name)
+    temporary_path = _get_temporary_path(path_to_cache)
+    logger.info("...caching file %s", path_to_file.name)
+
+    with path_to_file.open("rb") as source, temporary_path.open("wb") as cache:
+        writer = SeekableZstdWriter(cache, SOURCE_CACHE_COMPRESSION_LEVEL)
+
+        for frame in _record_aligned_frames_gen(source, SOURCE_CACHE_FRAME_SIZE):
+            writer.write_frame(frame)
+
+        writer.write_seek_table()
+
+    temporary_path.replace(path_to_cache)
+
+
+@keep_file_preparation_handler
+def cache_plain_file(path_to_file: Path, cache_folder: Path) -> None:
+    path_to_cache = cache_folder / path_to_file.name
+    temporary_path = _get_temporary_path(path_to_cache)
+    logger.info("...caching file %s", path_to_file.name)
+
+    shutil.copyfile(path_to_file, temporary_path)
+    temporary_path.replace(path_to_cache)
+
+
+def _get_temporary_path(path_to_file: Path) -> Path:
+    """Incomplete cache files never get their final names."""
+    return path_to_file.with_name(path_to_file.name + ".tmp")
+
+
+def _record_aligned_frames_gen(file: BinaryIO, frame_size: int) -> Iterator[bytes]:
+    """Generate parts of the file about frame size long that end before a record."""
+    pending = b""
+
+    while data := file.read(frame_size):
+        pending += data
+        frame_end = pending.rfind(_RECORD_DELIMITER) + 1
+
+        # Record longer than frame is kept whole.
+        if frame_end:
+            yield pending[:frame_end]
+            pending = pending[frame_end:]
+
+    if pending:
+        yield pending
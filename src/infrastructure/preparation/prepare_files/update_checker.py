@@ -37,6 +37,16 @@ class UpdateChecker:
             need_update = self._database_is_not_up_to_date(previous_modification_date)
             return self._manage_information_about_update(need_update)
 
+    async def get_modification_date(self) -> str:
+        """Current modification date of UniProt files, nothing is saved."""
+        async with ClientSession(raise_for_status=True) as session:
+            return await self._get_modification_date(session)
+
+    @property
+    def current_modification_date(self) -> str | None:
+        """Modification date of UniProt files found by update check."""
+        return self._current_modification_date
+
     def _manage_information_about_update(self, need_update: bool) -> bool:
         if need_update:
             logger.info(
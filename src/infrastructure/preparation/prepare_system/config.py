@@ -6,3 +6,6 @@ class SystemPreparerConfig:
     download_is_required: bool
     trgm_required: bool
     accept_setup_automatically: bool
+    streaming: bool = False
+    indexing: bool = False
+    taxonomy_only: bool = False
@@ -8,6 +8,7 @@ from pathlib import Path
 from aiofiles import os as async_os
 from aiohttp import ClientSession, ClientTimeout
 
+from core.common_types import Link
 from core.config import (
     LAST_MODIFIED_DATE,
     NCBI_LINK,
@@ -138,10 +139,7 @@ class SystemPreparer:
             raise_for_status=True, timeout=head_request_timeout
         ) as session:
             coroutines = [
-                get_file_size(self._uniprot_tr_link, session),
-                get_file_size(self._uniprot_sp_link, session),
-                get_file_size(self._ncbi_link, session),
-                get_file_size(self._uniprot_sp_isoforms_link, session),
+                get_file_size(link, session) for link in self._get_links_to_save()
             ]
 
             tasks = create_tasks(coroutines)
@@ -156,16 +154,41 @@ class SystemPreparer:
 
         return general_file_size
 
+    def _get_links_to_save(self) -> list[Link]:
+        """
+        Streamed files do not take disk space.
+        Taxonomy archive is always extracted to disk.
+        """
+        if self._config.taxonomy_only:
+            return [self._ncbi_link]
+
+        if self._config.streaming:
+            return [self._uniprot_tr_link]
+
+        return [
+            self._uniprot_tr_link,
+            self._uniprot_sp_link,
+            self._ncbi_link,
+            self._uniprot_sp_isoforms_link,
+        ]
+
     def _calculate_result_file_size(self, general_file_size: int) -> float:
         assert general_file_size > 0
 
         space_for_proper_system_work: int = 10**10
 
         result_file_size = (
-            general_file_size * self._DECOMPRESSION_COEFF
+            general_file_size * self._get_decompression_coeff()
         ) + space_for_proper_system_work
         return result_file_size
 
+    def _get_decompression_coeff(self) -> float:
+        """Indexed TrEMBL archive is never decompressed to disk."""
+        if self._config.indexing:
+            return 1
+
+        return self._DECOMPRESSION_COEFF
+
     def _estimate_required_space_for_database(self, file_size: float) -> float:
         trgm_coeff: float = 2.25
         db_coeff: float = 1.12 if not self._config.trgm_required else trgm_coeff
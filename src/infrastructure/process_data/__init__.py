@@ -1,11 +1,17 @@
 from .iterator_table_mapping import (
     calculate_workers_to_split_trembl_file,
     create_trembl_iterator_partial,
+    stick_iterators_to_partitions,
+    stick_iterators_to_staging_tables,
     stick_iterators_to_tables,
+    stick_ncbi_iterators_to_staging_tables,
 )
 
 __all__ = (
     "stick_iterators_to_tables",
+    "stick_iterators_to_partitions",
+    "stick_iterators_to_staging_tables",
+    "stick_ncbi_iterators_to_staging_tables",
     "create_trembl_iterator_partial",
     "calculate_workers_to_split_trembl_file",
 )
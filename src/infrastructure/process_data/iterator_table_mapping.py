@@ -1,18 +1,33 @@
+from dataclasses import replace
 from functools import partial
 from pathlib import Path
 
 from application.models import IteratorToTable
-from core.config import NCBIFiles, UniprotFiles
+from core.config import (
+    UNIPROT_SP_ISOFORMS_LINK,
+    UNIPROT_SP_LINK,
+    NCBIFiles,
+    SourceArchives,
+    UniprotFiles,
+)
 from domain.entities import Tables
+from infrastructure.preparation.prepare_files.source_cache import get_cached_fasta_path
 from infrastructure.process_data.ncbi import (
     NCBIIterator,
     PresenterType,
     TaxonomyIterator,
 )
-from infrastructure.process_data.uniprot.fasta import FastaIterator
+from infrastructure.process_data.uniprot.fasta import (
+    FastaIterator,
+    FastaStreamIterator,
+    IndexedGzipFastaIterator,
+    SeekableZstdFastaIterator,
+)
 
 
-def stick_iterators_to_tables(source_folder: Path) -> list[IteratorToTable]:
+def stick_iterators_to_tables(
+    source_folder: Path, streaming: bool = False, cached: bool = False
+) -> list[IteratorToTable]:
     lineage_iterator = NCBIIterator(
         path_to_file=source_folder / NCBIFiles.LINEAGE, presenter=PresenterType.LINEAGE
     )
@@ -28,24 +43,145 @@ def stick_iterators_to_tables(source_folder: Path) -> list[IteratorToTable]:
         path_to_ranks=source_folder / NCBIFiles.RANKS,
     )
 
-    swiss_prot_iterator = FastaIterator(
-        path_to_file=source_folder / UniprotFiles.SWISS_PROT
-    )
-    swiss_prot_isoforms = FastaIterator(
-        path_to_file=source_folder / UniprotFiles.SP_ISOFORMS
+    swiss_prot_iterator, swiss_prot_isoforms = _create_swiss_prot_iterators(
+        source_folder, streaming, cached
     )
     iterators_to_tables = [
-        IteratorToTable(iterator=lineage_iterator, table=Tables.LINEAGE),
-        IteratorToTable(iterator=merged_iterator, table=Tables.MERGED),
-        IteratorToTable(iterator=delnodes_iterator, table=Tables.TAXONOMY),
-        IteratorToTable(iterator=taxonomy_iterator, table=Tables.TAXONOMY),
-        IteratorToTable(iterator=swiss_prot_iterator, table=Tables.UNIPROT),
-        IteratorToTable(iterator=swiss_prot_isoforms, table=Tables.UNIPROT),
+        IteratorToTable(
+            iterator=lineage_iterator,
+            table=Tables.LINEAGE,
+            archive=SourceArchives.TAXDUMP,
+        ),
+        IteratorToTable(
+            iterator=merged_iterator,
+            table=Tables.MERGED,
+            archive=SourceArchives.TAXDUMP,
+        ),
+        IteratorToTable(
+            iterator=delnodes_iterator,
+            table=Tables.TAXONOMY,
+            archive=SourceArchives.TAXDUMP,
+        ),
+        IteratorToTable(
+            iterator=taxonomy_iterator,
+            table=Tables.TAXONOMY,
+            archive=SourceArchives.TAXDUMP,
+        ),
+        IteratorToTable(
+            iterator=swiss_prot_iterator,
+            table=Tables.UNIPROT,
+            archive=SourceArchives.SWISS_PROT,
+        ),
+        IteratorToTable(
+            iterator=swiss_prot_isoforms,
+            table=Tables.UNIPROT,
+            archive=SourceArchives.SP_ISOFORMS,
+        ),
     ]
     return iterators_to_tables
 
 
-def create_trembl_iterator_partial(source_folder: Path) -> partial[FastaIterator]:
+_STAGING_TABLES: dict[Tables, Tables] = {
+    Tables.TAXONOMY: Tables.TAXONOMY_STAGING,
+    Tables.LINEAGE: Tables.LINEAGE_STAGING,
+    Tables.MERGED: Tables.MERGED_STAGING,
+    Tables.UNIPROT: Tables.UNIPROT_STAGING,
+}
+
+
+def stick_iterators_to_staging_tables(
+    iterators_to_tables: list[IteratorToTable],
+) -> list[IteratorToTable]:
+    """Incremental update copies new release to staging tables."""
+    return [
+        replace(iterator_to_table, table=_STAGING_TABLES[iterator_to_table.table])
+        for iterator_to_table in iterators_to_tables
+    ]
+
+
+_SOURCE_PARTITIONS: dict[SourceArchives, Tables] = {
+    SourceArchives.SWISS_PROT: Tables.UNIPROT_SP,
+    SourceArchives.SP_ISOFORMS: Tables.UNIPROT_SP_ISO,
+}
+
+
+def stick_iterators_to_partitions(
+    iterators_to_tables: list[IteratorToTable],
+) -> list[IteratorToTable]:
+    """
+    Swiss-Prot files are copied straight to their partitions of 'uniprot_kb',
+    TrEMBL records are spilled apart by accession hash and copied
+    straight to their partitions afterwards.
+    """
+    return [
+        replace(
+            iterator_to_table,
+            table=_SOURCE_PARTITIONS.get(
+                iterator_to_table.archive, iterator_to_table.table
+            ),
+        )
+        for iterator_to_table in iterators_to_tables
+    ]
+
+
+def stick_ncbi_iterators_to_staging_tables(
+    iterators_to_tables: list[IteratorToTable],
+) -> list[IteratorToTable]:
+    """Taxonomy refresh copies only NCBI data and only to staging tables."""
+    return stick_iterators_to_staging_tables(
+        [
+            iterator_to_table
+            for iterator_to_table in iterators_to_tables
+            if iterator_to_table.archive == SourceArchives.TAXDUMP
+        ]
+    )
+
+
+def _create_swiss_prot_iterators(
+    source_folder: Path, streaming: bool, cached: bool
+) -> tuple[FastaIterator, FastaIterator]:
+    """Swiss-Prot files are read straight from the network in streaming mode."""
+    if streaming:
+        return (
+            FastaStreamIterator(url=UNIPROT_SP_LINK),
+            FastaStreamIterator(url=UNIPROT_SP_ISOFORMS_LINK),
+        )
+
+    if cached:
+        return (
+            SeekableZstdFastaIterator(
+                path_to_file=get_cached_fasta_path(
+                    source_folder, UniprotFiles.SWISS_PROT
+                )
+            ),
+            SeekableZstdFastaIterator(
+                path_to_file=get_cached_fasta_path(
+                    source_folder, UniprotFiles.SP_ISOFORMS
+                )
+            ),
+        )
+
+    return (
+        FastaIterator(path_to_file=source_folder / UniprotFiles.SWISS_PROT),
+        FastaIterator(path_to_file=source_folder / UniprotFiles.SP_ISOFORMS),
+    )
+
+
+def create_trembl_iterator_partial(
+    source_folder: Path, indexing: bool = False, cached: bool = False
+) -> partial[FastaIterator]:
+    """Indexed TrEMBL archive is read directly without decompression to disk."""
+    if cached:
+        return partial(
+            SeekableZstdFastaIterator,
+            get_cached_fasta_path(source_folder, UniprotFiles.TREMBL),
+        )
+
+    if indexing:
+        return partial(
+            IndexedGzipFastaIterator, source_folder / f"{UniprotFiles.TREMBL}.gz"
+        )
+
     sequence_iterator_partial = partial(
         FastaIterator, source_folder / UniprotFiles.TREMBL
     )
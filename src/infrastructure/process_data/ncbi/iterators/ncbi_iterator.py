@@ -2,9 +2,11 @@ import logging
 from collections.abc import Iterator
 from contextlib import contextmanager
 from pathlib import Path
+from typing import TextIO
 
 from domain.entities import LineagePair, MergedPair, Taxonomy
-from infrastructure.process_data.exceptions import IteratorError
+from domain.models import QuarantinedRecord
+from infrastructure.process_data.exceptions import InvalidRecordError, IteratorError
 from infrastructure.process_data.ncbi.models import PresenterType
 from infrastructure.process_data.ncbi.presenters import NCBI_PRESENTERS
 
@@ -15,6 +17,11 @@ class NCBIIterator:
     def __init__(self, path_to_file: Path, presenter: PresenterType):
         self._path_to_file = path_to_file
         self._presenter = presenter
+        self._quarantining: bool = False
+
+    def quarantine_invalid_records(self) -> None:
+        """Invalid lines are yielded to be put aside, the rest are still read."""
+        self._quarantining = True
 
     @contextmanager
     def _open_file(self, path_to_file: Path):
@@ -30,6 +37,28 @@ class NCBIIterator:
         finally:
             file.close()
 
-    def __iter__(self) -> Iterator[MergedPair | LineagePair | Taxonomy]:
+    def __iter__(
+        self,
+    ) -> Iterator[MergedPair | LineagePair | Taxonomy | QuarantinedRecord]:
         with self._open_file(self._path_to_file) as file:
-            yield from NCBI_PRESENTERS[self._presenter].present(file)
+            if not self._quarantining:
+                yield from NCBI_PRESENTERS[self._presenter].present(file)
+                return
+
+            yield from self._present_valid_lines(file)
+
+    def _present_valid_lines(
+        self, file: TextIO
+    ) -> Iterator[MergedPair | LineagePair | Taxonomy | QuarantinedRecord]:
+        """Lines are presented one by one, so invalid line is skipped alone."""
+        presenter = NCBI_PRESENTERS[self._presenter]
+        position = 0
+
+        for line in file:
+            try:
+                yield from presenter.present([line])
+
+            except InvalidRecordError as e:
+                yield QuarantinedRecord(self._path_to_file.name, position, str(e))
+
+            position += len(line)
@@ -5,7 +5,8 @@ from pathlib import Path
 from typing import IO
 
 from domain.entities import Taxonomy
-from infrastructure.process_data.exceptions import IteratorError
+from domain.models import QuarantinedRecord
+from infrastructure.process_data.exceptions import InvalidRecordError, IteratorError
 from infrastructure.process_data.ncbi.models import NameData
 from infrastructure.process_data.ncbi.parsers import NamesParser, RanksParser
 
@@ -24,6 +25,11 @@ class TaxonomyIterator:
         self._path_to_ranks = path_to_ranks
         self._names_parser = NamesParser()
         self._ranks_parser = RanksParser()
+        self._quarantining: bool = False
+
+    def quarantine_invalid_records(self) -> None:
+        """Invalid names are yielded to be put aside, the rest are still read."""
+        self._quarantining = True
 
     @contextmanager
     def _open_file(self, path_to_file: Path):
@@ -39,15 +45,34 @@ class TaxonomyIterator:
         finally:
             file.close()
 
-    def __iter__(self) -> Iterator[Taxonomy]:
+    def __iter__(self) -> Iterator[Taxonomy | QuarantinedRecord]:
         """Take 'ranks' from file 'nodes.dmp' and add them to file 'names.dmp'."""
         with (
             self._open_file(self._path_to_ranks) as ranks,
             self._open_file(self._path_to_names) as names,
         ):
+            position = 0
+
             for name_record in names:
-                name = self._names_parser.parse(name_record)
-                yield from self._taxonomy_gen_if_name_not_none(name, ranks)
+                yield from self._taxonomy_gen_from_record(name_record, position, ranks)
+                position += len(name_record)
+
+    def _taxonomy_gen_from_record(
+        self, name_record: str, position: int, ranks: IO
+    ) -> Iterator[Taxonomy | QuarantinedRecord]:
+        try:
+            name = self._names_parser.parse(name_record)
+
+        except InvalidRecordError as e:
+            if not self._quarantining:
+                raise
+
+            # Only scientific names are parsed, so the rank of the name is skipped.
+            next(ranks)
+            yield QuarantinedRecord(self._path_to_names.name, position, str(e))
+            return
+
+        yield from self._taxonomy_gen_if_name_not_none(name, ranks)
 
     def _taxonomy_gen_if_name_not_none(
         self, name: NameData, ranks: IO
@@ -1,5 +1,4 @@
-from collections.abc import Iterator
-from typing import TextIO
+from collections.abc import Iterable, Iterator
 
 from domain.entities import LineagePair, MergedPair, Taxonomy
 from infrastructure.process_data.ncbi.models import LineageTaxonomyIDs
@@ -21,7 +20,7 @@ class DelnodesPresenter:
     def __init__(self):
         self._parser = DelnodesParser()
 
-    def present(self, source: TextIO) -> Iterator[Taxonomy]:
+    def present(self, source: Iterable[str]) -> Iterator[Taxonomy]:
         for line in source:
             deleted_ncbi_id: int = self._parser.parse(line)
             yield Taxonomy("no rank", deleted_ncbi_id, f"deleted[{deleted_ncbi_id}]")
@@ -44,7 +43,7 @@ class LineagePresenter:
     def __init__(self):
         self._parser = LineageParser()
 
-    def present(self, source: TextIO) -> Iterator[LineagePair]:
+    def present(self, source: Iterable[str]) -> Iterator[LineagePair]:
         for line in source:
             taxids = self._parser.parse(line)
             yield from self._cartesian_pairs_gen(taxids)
@@ -63,7 +62,7 @@ class MergedPresenter:
     def __init__(self):
         self._parser = MergedParser()
 
-    def present(self, source: TextIO) -> Iterator[MergedPair]:
+    def present(self, source: Iterable[str]) -> Iterator[MergedPair]:
         for line in source:
             yield self._parser.parse(line)
 
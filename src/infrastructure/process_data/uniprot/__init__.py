@@ -0,0 +1,9 @@
+from .organism_spill import ORGANISM_SPILL_FOLDER, OrganismSpill
+from .partition_spill import PARTITION_SPILL_FOLDER, PartitionSpill
+
+__all__ = (
+    "ORGANISM_SPILL_FOLDER",
+    "OrganismSpill",
+    "PARTITION_SPILL_FOLDER",
+    "PartitionSpill",
+)
@@ -1,9 +1,23 @@
-from .chunk_range_iterator import ChunkRangeIterator
-from .iterator import FastaIterator
+from .chunk_range_iterator import (
+    ChunkRangeIterator,
+    IndexedGzipChunkRangeIterator,
+    SeekableZstdChunkRangeIterator,
+)
+from .iterator import (
+    FastaIterator,
+    FastaStreamIterator,
+    IndexedGzipFastaIterator,
+    SeekableZstdFastaIterator,
+)
 from .parser import FastaParser
 
 __all__ = (
     "ChunkRangeIterator",
+    "IndexedGzipChunkRangeIterator",
+    "SeekableZstdChunkRangeIterator",
     "FastaIterator",
+    "FastaStreamIterator",
+    "IndexedGzipFastaIterator",
+    "SeekableZstdFastaIterator",
     "FastaParser",
 )
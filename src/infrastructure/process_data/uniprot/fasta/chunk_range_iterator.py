@@ -3,17 +3,29 @@ from pathlib import Path
 from typing import IO
 
 from domain.models import ChunkRange
+from infrastructure.preparation.prepare_files.chunk_plan import (
+    get_chunk_plan_path,
+    load_chunk_plan,
+)
+from infrastructure.preparation.prepare_files.gzip_index import (
+    get_index_path,
+    load_gzip_index,
+)
+from infrastructure.preparation.prepare_files.seekable_zstd import read_seek_table
 
 
 class ChunkRangeIterator:
-    def __init__(self, path_to_file: Path, workers_number: int):
+    def __init__(
+        self, path_to_file: Path, workers_number: int, chunks_per_worker: int = 1
+    ):
         self._path_to_file = path_to_file
         self._workers_number = workers_number
+        self._chunks_per_worker = chunks_per_worker
 
     def __iter__(self) -> Iterator[ChunkRange]:
         """
         Generate chunk ranges that split FASTA file on parts
-        depending on number of workers.
+        depending on number of workers and chunks per worker.
         """
         chunk_boundaries = self._split_file_on_chunks()
         yield from self._ranges_from_boundaries_gen(chunk_boundaries)
@@ -29,9 +41,17 @@ class ChunkRangeIterator:
             yield ChunkRange(chunk_boundaries[index], chunk_boundaries[index + 1] - 1)
 
     def _split_file_on_chunks(self) -> list[int]:
-        """Split FASTA file on chunks depending on number of workers."""
+        """
+        Split FASTA file on chunks depending on number of workers.
+        Record starts noted during decompression are used if available,
+        otherwise the file is scanned.
+        """
         file_size = self._get_file_size()
         chunk_size = self._get_chunk_size(file_size)
+
+        if record_starts := self._get_planned_record_starts(file_size):
+            return self._select_chunk_boundaries(record_starts, chunk_size, file_size)
+
         chunk_boundaries = self._get_chunk_boundaries(chunk_size, file_size)
 
         return chunk_boundaries
@@ -40,15 +60,48 @@ class ChunkRangeIterator:
         return self._path_to_file.stat().st_size
 
     def _get_chunk_size(self, file_size: int) -> int:
-        return file_size // self._workers_number
+        return file_size // (self._workers_number * self._chunks_per_worker)
+
+    def _get_planned_record_starts(self, file_size: int) -> list[int]:
+        """Chunk plan is ignored if it was made for another file."""
+        path_to_plan = get_chunk_plan_path(self._path_to_file)
+
+        if not path_to_plan.exists():
+            return []
+
+        record_starts, planned_file_size = load_chunk_plan(path_to_plan)
+        return record_starts if planned_file_size == file_size else []
+
+    @staticmethod
+    def _select_chunk_boundaries(
+        record_starts: list[int], chunk_size: int, file_size: int
+    ) -> list[int]:
+        """Pick record starts that are at least chunk size away from each other."""
+        # The first chunk start position is 0.
+        chunk_boundaries = [0]
+        # File smaller than number of chunks gives zero chunk size,
+        # chunks must not be empty anyway.
+        chunk_size = max(chunk_size, 1)
+
+        for record_start in record_starts:
+            if record_start >= chunk_boundaries[-1] + chunk_size:
+                chunk_boundaries.append(record_start)
+
+        return ChunkRangeIterator._add_file_end(chunk_boundaries, file_size)
 
     def _get_chunk_boundaries(self, chunk_size: int, file_size: int) -> list[int]:
         """Return all chunk boundaries gathered together."""
         with self._path_to_file.open("rb") as file:
             chunk_boundaries = self._collect_chunk_offsets(file, file_size, chunk_size)
 
-        # Add end of last chunk.
-        chunk_boundaries.append(file_size)
+        return self._add_file_end(chunk_boundaries, file_size)
+
+    @staticmethod
+    def _add_file_end(chunk_boundaries: list[int], file_size: int) -> list[int]:
+        """Add end of last chunk, empty file has no chunks at all."""
+        if file_size > chunk_boundaries[-1]:
+            chunk_boundaries.append(file_size)
+
         return chunk_boundaries
 
     def _collect_chunk_offsets(
@@ -87,3 +140,35 @@ class ChunkRangeIterator:
         file.seek(position)
         # Get to the next line in case we jumped to the middle of the previous line.
         next(file)
+
+
+class IndexedGzipChunkRangeIterator(ChunkRangeIterator):
+    """
+    Split gzip FASTA file that has random access index on chunks.
+    Chunks start at record starts stored in the index,
+    so the file is not read at all.
+    """
+
+    def _split_file_on_chunks(self) -> list[int]:
+        gzip_index = load_gzip_index(get_index_path(self._path_to_file))
+        file_size = gzip_index.decompressed_size
+
+        return self._select_chunk_boundaries(
+            gzip_index.record_starts, self._get_chunk_size(file_size), file_size
+        )
+
+
+class SeekableZstdChunkRangeIterator(ChunkRangeIterator):
+    """
+    Split seekable zstd FASTA file from source cache on chunks.
+    Every frame starts with a record, so chunks start at frame starts.
+    """
+
+    def _split_file_on_chunks(self) -> list[int]:
+        seek_table = read_seek_table(self._path_to_file)
+        file_size = seek_table.decompressed_size
+        frame_starts = [frame.decompressed_offset for frame in seek_table.frames]
+
+        return self._select_chunk_boundaries(
+            frame_starts, self._get_chunk_size(file_size), file_size
+        )
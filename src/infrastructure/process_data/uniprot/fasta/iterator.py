@@ -1,11 +1,28 @@
 import logging
+import sys
+from abc import abstractmethod
 from collections.abc import Iterator
-from contextlib import contextmanager
+from contextlib import AbstractContextManager, contextmanager
+from io import TextIOWrapper
 from pathlib import Path
-from typing import IO, TextIO
+from typing import IO, BinaryIO, TextIO
+from urllib.parse import urlparse
 
+from core.common_types import Link
 from domain.entities import SequenceRecord
-from domain.models import ChunkRange
+from domain.models import ChunkRange, QuarantinedRecord
+from infrastructure.preparation.prepare_files.download import open_gzip_stream
+from infrastructure.preparation.prepare_files.gzip_index import (
+    GzipIndexFile,
+    get_index_path,
+    load_gzip_index,
+    open_gzip_at,
+)
+from infrastructure.preparation.prepare_files.seekable_zstd import (
+    SeekTable,
+    open_zstd_at,
+    read_seek_table,
+)
 from infrastructure.process_data.exceptions import (
     InvalidRecordError,
     IteratorError,
@@ -14,20 +31,65 @@ from infrastructure.process_data.uniprot.fasta.parser import FastaParser
 
 
 class FastaIterator:
-    """Iterate over sequence records and yield parsed data."""
+    """
+    Iterate over sequence records and yield parsed data.
+    Tracks position of the first record that was not yielded yet,
+    so copy of the chunk can be resumed from it.
+    """
 
     def __init__(self, path_to_file: Path, chunk_range: ChunkRange | None = None):
         self._path_to_file = path_to_file
         self._fasta_parser = FastaParser()
         self._chunk_range = chunk_range
+        self._committed_ranges: list[ChunkRange] = []
+        self._resolved_chunk_range: ChunkRange | None = None
+        self._position: int | None = None
+        self._quarantining: bool = False
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    def __iter__(self) -> Iterator[SequenceRecord]:
+    @property
+    def source(self) -> str:
+        return self._path_to_file.name
+
+    @property
+    def chunk_range(self) -> ChunkRange:
+        if self._resolved_chunk_range is None:
+            self._resolved_chunk_range = self._resolve_chunk_range()
+
+        return self._resolved_chunk_range
+
+    @property
+    def position(self) -> int:
+        """
+        Offset of the first record that was not yielded yet. Before iteration
+        it is the start of the first range that was not committed.
+        """
+        if self._position is None:
+            return self._get_start_position()
+
+        return self._position
+
+    def skip(self, committed_ranges: list[ChunkRange]) -> None:
+        """Records of the ranges were copied before, they are not read again."""
+        self._committed_ranges = committed_ranges
+
+    def quarantine_invalid_records(self) -> None:
+        """Invalid records are yielded to be put aside, the rest are still read."""
+        self._quarantining = True
+
+    def __iter__(self) -> Iterator[SequenceRecord | QuarantinedRecord]:
         """Generate sequence data structs from fasta file."""
-        resolved_chunk_range = self._resolve_chunk_range()
+        for remaining_range in self.chunk_range.without(self._committed_ranges):
+            self._position = remaining_range.start
 
-        with self._open_file(resolved_chunk_range) as file:
-            yield from self._record_gen(file, resolved_chunk_range)
+            with self._open_file(remaining_range) as file:
+                yield from self._record_gen(file, remaining_range)
+
+    def _get_start_position(self) -> int:
+        remaining_ranges = self.chunk_range.without(self._committed_ranges)
+        return (
+            remaining_ranges[0].start if remaining_ranges else self.chunk_range.end + 1
+        )
 
     def _resolve_chunk_range(self) -> ChunkRange:
         if not self._chunk_range:
@@ -68,39 +130,45 @@ class FastaIterator:
         self,
         file: TextIO,
         resolved_chunk_range: ChunkRange,
-    ) -> Iterator[SequenceRecord]:
+    ) -> Iterator[SequenceRecord | QuarantinedRecord]:
         """Generate sequence data structs depending on chunk values."""
         current_position: int = resolved_chunk_range.start
+        record_start: int = current_position
         end_position: int = resolved_chunk_range.end
 
         assert current_position >= 0
         assert end_position > 0
 
-        while not self._is_position_beyond_limit(current_position, end_position):
-            raw_sequence_info: str = ""
-            sequence_parts: list[str] = []
+        raw_sequence_info: str = ""
+        sequence_parts: list[str] = []
 
-            for line in file:
-                current_position = self._update_current_position(current_position, line)
-                line = line.strip()
+        # Chunk is read in a single pass: either its end is crossed
+        # or the file (stream) is exhausted.
+        for line in file:
+            record_position = current_position
+            current_position = self._update_current_position(current_position, line)
+            line = line.strip()
 
-                if self._is_record_start(line):
-                    yield from self._yield_parsed_record(
-                        raw_sequence_info, sequence_parts
-                    )
-                    sequence_parts.clear()
-                    raw_sequence_info = line
+            if self._is_record_start(line):
+                self._position = record_position
+                yield from self._yield_parsed_record(
+                    raw_sequence_info, sequence_parts, record_start
+                )
+                sequence_parts.clear()
+                raw_sequence_info = line
+                record_start = record_position
 
-                else:
-                    sequence_parts.append(line)
+            else:
+                sequence_parts.append(line)
 
-                # When chunk end is crossed - stop iteration through file.
-                if self._is_position_beyond_limit(current_position, end_position):
-                    break
+            # When chunk end is crossed - stop iteration through file.
+            if self._is_position_beyond_limit(current_position, end_position):
+                break
 
-            yield from self._yield_final_parsed_record(
-                raw_sequence_info, sequence_parts
-            )
+        self._position = current_position
+        yield from self._yield_final_parsed_record(
+            raw_sequence_info, sequence_parts, record_start
+        )
 
     @staticmethod
     def _is_position_beyond_limit(current_position: int, end_position: int) -> bool:
@@ -116,21 +184,18 @@ class FastaIterator:
         return line.startswith(record_delimiter)
 
     def _yield_parsed_record(
-        self, raw_sequence_info: str, sequence_parts: list[str]
-    ) -> Iterator[SequenceRecord]:
+        self, raw_sequence_info: str, sequence_parts: list[str], record_start: int
+    ) -> Iterator[SequenceRecord | QuarantinedRecord]:
         """Generate parsed record if parts of the sequence were gathered."""
         if sequence_parts:
-            result = self._fasta_parser.parse(raw_sequence_info, sequence_parts)
-            yield result
+            yield self._parse(raw_sequence_info, sequence_parts, record_start)
 
     def _yield_final_parsed_record(
-        self, raw_sequence_info: str, sequence_parts: list[str]
-    ) -> Iterator[SequenceRecord]:
+        self, raw_sequence_info: str, sequence_parts: list[str], record_start: int
+    ) -> Iterator[SequenceRecord | QuarantinedRecord]:
         """Try generate the last sequence data struct."""
         try:
-            yield from self._try_yield_final_parsed_record(
-                raw_sequence_info, sequence_parts
-            )
+            yield self._parse(raw_sequence_info, sequence_parts, record_start)
 
         except InvalidRecordError as e:
             self._logger.exception("Invalid file provided --> %s", self._path_to_file)
@@ -138,8 +203,125 @@ class FastaIterator:
                 f"Invalid file provided --> {self._path_to_file}"
             ) from e
 
-    def _try_yield_final_parsed_record(
-        self, raw_sequence_info: str, sequence_parts: list[str]
-    ) -> Iterator[SequenceRecord]:
-        """Generate the final parsed sequence data struct."""
-        yield self._fasta_parser.parse(raw_sequence_info, sequence_parts)
+    def _parse(
+        self, raw_sequence_info: str, sequence_parts: list[str], record_start: int
+    ) -> SequenceRecord | QuarantinedRecord:
+        try:
+            return self._fasta_parser.parse(raw_sequence_info, sequence_parts)
+
+        except InvalidRecordError as e:
+            if not self._quarantining:
+                raise
+
+            return QuarantinedRecord(self.source, record_start, str(e))
+
+
+class FastaStreamIterator(FastaIterator):
+    """
+    Iterate over sequence records of remote gzip FASTA file.
+    The file is decompressed and parsed while it is being downloaded
+    so it never lands on disk.
+    """
+
+    def __init__(self, url: Link):
+        super().__init__(path_to_file=Path(urlparse(url).path))
+        self._url = url
+
+    def _resolve_chunk_range(self) -> ChunkRange:
+        # Stream size is unknown beforehand so it is read till the end.
+        return ChunkRange(0, sys.maxsize)
+
+    @contextmanager
+    def _open_file(self, resolved_chunk_range: ChunkRange):
+        with open_gzip_stream(self._url) as stream:
+            try:
+                yield TextIOWrapper(stream, encoding="utf-8")
+
+            except Exception:
+                self._logger.exception("Failed to read stream %s", self._url)
+                raise
+
+
+class _RandomAccessFastaIterator(FastaIterator):
+    """
+    Iterate over sequence records of compressed FASTA file that can be
+    decompressed starting from any chunk start.
+    Chunk ranges are offsets of decompressed data.
+    """
+
+    def _resolve_chunk_range(self) -> ChunkRange:
+        if not self._chunk_range:
+            decompressed_size = self._get_decompressed_size()
+
+            if decompressed_size == 0:
+                raise IteratorError("Empty file provided")
+
+            return ChunkRange(0, decompressed_size - 1)
+
+        return self._chunk_range
+
+    @contextmanager
+    def _open_file(self, resolved_chunk_range: ChunkRange):
+        with self._open_at(resolved_chunk_range.start) as stream:
+            try:
+                yield TextIOWrapper(stream, encoding="utf-8")
+
+            except Exception:
+                self._logger.exception("Failed to read file %s", self._path_to_file)
+                raise
+
+    @abstractmethod
+    def _get_decompressed_size(self) -> int:
+        pass
+
+    @abstractmethod
+    def _open_at(self, offset: int) -> AbstractContextManager[BinaryIO]:
+        """Open file for reading decompressed data from the offset."""
+        pass
+
+
+class IndexedGzipFastaIterator(_RandomAccessFastaIterator):
+    """
+    Iterate over sequence records of gzip FASTA file that has random access index.
+    Every iterator decompresses only its own chunk starting
+    from the closest access point.
+    """
+
+    def __init__(self, path_to_file: Path, chunk_range: ChunkRange | None = None):
+        super().__init__(path_to_file=path_to_file, chunk_range=chunk_range)
+        self._gzip_index: GzipIndexFile | None = None
+
+    def _get_decompressed_size(self) -> int:
+        return self._load_gzip_index().decompressed_size
+
+    def _open_at(self, offset: int) -> AbstractContextManager[BinaryIO]:
+        return open_gzip_at(self._path_to_file, self._load_gzip_index(), offset)
+
+    def _load_gzip_index(self) -> GzipIndexFile:
+        if self._gzip_index is None:
+            self._gzip_index = load_gzip_index(get_index_path(self._path_to_file))
+
+        return self._gzip_index
+
+
+class SeekableZstdFastaIterator(_RandomAccessFastaIterator):
+    """
+    Iterate over sequence records of seekable zstd FASTA file from source cache.
+    Every iterator decompresses only the frames of its own chunk.
+    """
+
+    def __init__(self, path_to_file: Path, chunk_range: ChunkRange | None = None):
+        super().__init__(path_to_file=path_to_file, chunk_range=chunk_range)
+        self._seek_table: SeekTable | None = None
+
+    def _get_decompressed_size(self) -> int:
+        return self._load_seek_table().decompressed_size
+
+    def _open_at(self, offset: int) -> AbstractContextManager[BinaryIO]:
+        return open_zstd_at(self._path_to_file, self._load_seek_table(), offset)
+
+    def _load_seek_table(self) -> SeekTable:
+        if self._seek_table is None:
+            self._seek_table = read_seek_table(self._path_to_file)
+
+        return self._seek_table
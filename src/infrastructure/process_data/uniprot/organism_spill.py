@@ -0,0 +1,145 @@
+import heapq
+import os
+import pickle
+import shutil
+import struct
+import uuid
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from io import BytesIO
+from operator import attrgetter
+from pathlib import Path
+from typing import BinaryIO
+
+from domain.entities import SequenceRecord
+
+ORGANISM_SPILL_FOLDER: str = "organism_spill"
+
+# NCBI taxon ids are below the bound, larger ones fall into the last bucket.
+MAX_ORGANISM_ID: int = 4_000_000
+
+_SPILL_FILE_SUFFIX: str = ".spill"
+
+# Every write appends a run of records sorted by organism. Run is prefixed
+# with its size, so runs are found without reading their records.
+_RUN_SIZE: struct.Struct = struct.Struct("<Q")
+
+_get_organism_id = attrgetter("ncbi_id")
+
+
+@dataclass(frozen=True, slots=True)
+class OrganismSpill:
+    """
+    Sequence records spilled to files bucketed by intervals of organism ids.
+    Iteration yields records bucket after bucket sorted by organism,
+    so rows of an organism are copied to the neighbouring table pages.
+    Sorted runs of a bucket are merged, only the current record
+    of every run is kept in memory.
+    """
+
+    folder: Path
+    buckets: int
+    max_organism_id: int = MAX_ORGANISM_ID
+
+    def get_bucket(self, organism_id: int) -> int:
+        return min(organism_id * self.buckets // self.max_organism_id, self.buckets - 1)
+
+    def get_parts(self) -> list["OrganismSpill"]:
+        """Buckets are merged in turns by a single reader."""
+        return [self]
+
+    def clear(self) -> None:
+        """Remove records spilled by interrupted setup."""
+        shutil.rmtree(self.folder, ignore_errors=True)
+        self.folder.mkdir(parents=True)
+
+    @contextmanager
+    def open_writer(self) -> Iterator["OrganismSpillWriter"]:
+        writer = OrganismSpillWriter(self)
+
+        try:
+            yield writer
+
+        finally:
+            writer.close()
+
+    def __iter__(self) -> Iterator[SequenceRecord]:
+        """Spill files of the bucket are removed once it is read."""
+        for bucket in range(self.buckets):
+            paths = sorted(self.folder.glob(f"{bucket}_*{_SPILL_FILE_SUFFIX}"))
+
+            with ExitStack() as stack:
+                files = [stack.enter_context(path.open("rb")) for path in paths]
+                runs = [run for file in files for run in _read_runs(file)]
+                yield from heapq.merge(*runs, key=_get_organism_id)
+
+            for path in paths:
+                path.unlink()
+
+    def get_bucket_path(self, bucket: int, writer_id: str) -> Path:
+        return self.folder / f"{bucket}_{writer_id}{_SPILL_FILE_SUFFIX}"
+
+
+class OrganismSpillWriter:
+    """
+    Append record batches to the files of their buckets. Every writer has
+    its own files, so processes spill their chunks without locks.
+    """
+
+    def __init__(self, organism_spill: OrganismSpill):
+        self._organism_spill = organism_spill
+        self._writer_id = f"{os.getpid()}_{uuid.uuid4().hex}"
+        self._files: dict[int, BinaryIO] = {}
+
+    def write(self, records: list[SequenceRecord]) -> None:
+        bucketed_records = defaultdict(list)
+
+        for record in records:
+            bucket = self._organism_spill.get_bucket(record.ncbi_id)
+            bucketed_records[bucket].append(record)
+
+        for bucket, bucket_records in bucketed_records.items():
+            bucket_records.sort(key=_get_organism_id)
+            _write_run(self._get_file(bucket), bucket_records)
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+
+    def _get_file(self, bucket: int) -> BinaryIO:
+        if bucket not in self._files:
+            path = self._organism_spill.get_bucket_path(bucket, self._writer_id)
+            self._files[bucket] = path.open("ab")
+
+        return self._files[bucket]
+
+
+def _write_run(file: BinaryIO, records: list[SequenceRecord]) -> None:
+    """Records are pickled one by one, so the run is read record by record."""
+    run = BytesIO()
+
+    for record in records:
+        pickle.dump(record, run)
+
+    file.write(_RUN_SIZE.pack(run.tell()) + run.getvalue())
+
+
+def _read_runs(file: BinaryIO) -> Iterator[Iterator[SequenceRecord]]:
+    while run_size_bytes := file.read(_RUN_SIZE.size):
+        [run_size] = _RUN_SIZE.unpack(run_size_bytes)
+        run_start = file.tell()
+        yield _read_run(file, run_start, run_start + run_size)
+        file.seek(run_start + run_size)
+
+
+def _read_run(file: BinaryIO, start: int, end: int) -> Iterator[SequenceRecord]:
+    """Runs of the file are read in turns, so every record is read at its offset."""
+    position = start
+
+    while position < end:
+        file.seek(position)
+        record = pickle.load(file)
+        position = file.tell()
+        yield record
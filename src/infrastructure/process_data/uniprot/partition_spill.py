@@ -0,0 +1,156 @@
+import shutil
+import struct
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from functools import cache
+from itertools import chain
+from pathlib import Path
+
+from domain.entities import SequenceRecord
+
+from .organism_spill import OrganismSpill, OrganismSpillWriter
+
+PARTITION_SPILL_FOLDER: str = "partition_spill"
+
+# PostgreSQL hashes values of the partition key with the seed,
+# then combines the hashes of the key columns starting with zero.
+_HASH_PARTITION_SEED: int = 0x7A5B22367996DCFD
+_HASH_COMBINE_CONSTANT: int = 0x49A0F4DD15E5A8E3
+_HASH_INITIAL_STATE: int = 0x9E3779B9 + 3923095
+
+_MASK_32: int = 0xFFFFFFFF
+_MASK_64: int = 0xFFFFFFFFFFFFFFFF
+
+# Hashed data is read as little-endian 32-bit words, three per block.
+_BLOCK: struct.Struct = struct.Struct("<3I")
+
+
+def get_hash_partition(accession: str, partitions: int) -> int:
+    """
+    Remainder of the hash partition PostgreSQL routes the accession to.
+    Rows copied straight into a partition are checked against its bounds,
+    so a row of another partition fails the copy instead of being misplaced.
+    """
+    row_hash = _hash_bytes_extended(accession.encode(), _HASH_PARTITION_SEED)
+    return ((row_hash + _HASH_COMBINE_CONSTANT) & _MASK_64) % partitions
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionSpill:
+    """
+    TrEMBL records spilled apart by hash partitions of 'uniprot_kb' their
+    accessions belong to. Every partition is a spill of its own, so it is
+    copied back straight into its partition by a separate process.
+    Records of a partition are bucketed and sorted by organism as well.
+    """
+
+    folder: Path
+    partitions: int
+    organism_buckets: int = 1
+
+    def get_parts(self) -> list[OrganismSpill]:
+        return [
+            OrganismSpill(
+                folder=self.folder / f"partition_{partition}",
+                buckets=self.organism_buckets,
+            )
+            for partition in range(self.partitions)
+        ]
+
+    def clear(self) -> None:
+        """Remove records spilled by interrupted setup."""
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+        for part in self.get_parts():
+            part.clear()
+
+    @contextmanager
+    def open_writer(self) -> Iterator["PartitionSpillWriter"]:
+        with ExitStack() as stack:
+            yield PartitionSpillWriter(
+                [stack.enter_context(part.open_writer()) for part in self.get_parts()]
+            )
+
+    def __iter__(self) -> Iterator[SequenceRecord]:
+        return chain.from_iterable(self.get_parts())
+
+
+class PartitionSpillWriter:
+    """Pass records to the writers of the partitions their accessions belong to."""
+
+    def __init__(self, partition_writers: list[OrganismSpillWriter]):
+        self._partition_writers = partition_writers
+
+    def write(self, records: list[SequenceRecord]) -> None:
+        partitioned_records = defaultdict(list)
+
+        for record in records:
+            partition = get_hash_partition(
+                record.accession, len(self._partition_writers)
+            )
+            partitioned_records[partition].append(record)
+
+        for partition, partition_records in partitioned_records.items():
+            self._partition_writers[partition].write(partition_records)
+
+
+def _hash_bytes_extended(data: bytes, seed: int) -> int:
+    """
+    64-bit hash of PostgreSQL 'hash_bytes_extended' (Bob Jenkins' lookup3)
+    with non-zero seed as computed by little-endian servers. Data is consumed
+    in 12-byte blocks, the lowest byte of the last block is reserved
+    for the length.
+    """
+    a, b, c = _get_initial_state(len(data), seed)
+    tail_start = len(data) - len(data) % 12
+    tail = data[tail_start:].ljust(11, b"\0")
+    *blocks, last_block = _BLOCK.iter_unpack(
+        data[:tail_start] + tail[:8] + b"\0" + tail[8:]
+    )
+
+    for x, y, z in blocks:
+        a, b, c = _mix((a + x) & _MASK_32, (b + y) & _MASK_32, (c + z) & _MASK_32)
+
+    x, y, z = last_block
+    a, b, c = _final((a + x) & _MASK_32, (b + y) & _MASK_32, (c + z) & _MASK_32)
+    return (b << 32) | c
+
+
+@cache
+def _get_initial_state(length: int, seed: int) -> tuple[int, int, int]:
+    """State depends on the length of the data only, accessions have a few."""
+    a = b = c = (_HASH_INITIAL_STATE + length) & _MASK_32
+    return _mix((a + (seed >> 32)) & _MASK_32, (b + seed) & _MASK_32, c)
+
+
+def _rotate(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (32 - shift))) & _MASK_32
+
+
+def _mix(a: int, b: int, c: int) -> tuple[int, int, int]:
+    a = ((a - c) & _MASK_32) ^ _rotate(c, 4)
+    c = (c + b) & _MASK_32
+    b = ((b - a) & _MASK_32) ^ _rotate(a, 6)
+    a = (a + c) & _MASK_32
+    c = ((c - b) & _MASK_32) ^ _rotate(b, 8)
+    b = (b + a) & _MASK_32
+    a = ((a - c) & _MASK_32) ^ _rotate(c, 16)
+    c = (c + b) & _MASK_32
+    b = ((b - a) & _MASK_32) ^ _rotate(a, 19)
+    a = (a + c) & _MASK_32
+    c = ((c - b) & _MASK_32) ^ _rotate(b, 4)
+    b = (b + a) & _MASK_32
+    return a, b, c
+
+
+def _final(a: int, b: int, c: int) -> tuple[int, int, int]:
+    c = ((c ^ b) - _rotate(b, 14)) & _MASK_32
+    a = ((a ^ c) - _rotate(c, 11)) & _MASK_32
+    b = ((b ^ a) - _rotate(a, 25)) & _MASK_32
+    c = ((c ^ b) - _rotate(b, 16)) & _MASK_32
+    a = ((a ^ c) - _rotate(c, 4)) & _MASK_32
+    b = ((b ^ a) - _rotate(a, 14)) & _MASK_32
+    c = ((c ^ b) - _rotate(b, 24)) & _MASK_32
+    return a, b, c
@@ -3,6 +3,7 @@ from pathlib import Path
 
 from core.models import LogConfig, LogType
 from domain.entities import BASE_DIR
+from infrastructure.database.postgresql import BulkLoad, StorageProfile
 
 
 def positive_int(value: int | str) -> int:
@@ -18,6 +19,33 @@ def positive_int(value: int | str) -> int:
     return number
 
 
+def to_flag(option: str) -> str:
+    return f"--{option.replace('_', '-')}"
+
+
+def join_flags(options: tuple[str, ...]) -> str:
+    *other_flags, last_flag = map(to_flag, options)
+    return f"{', '.join(other_flags)} or {last_flag}"
+
+
+_CURRENT_RELEASE_OPTIONS: tuple[str, ...] = ("refresh_taxonomy", "incremental")
+
+# Options that build new release can not be combined with the ones that
+# change the current release. Release that is loaded without WAL
+# notes copy checkpoints as usual, so its build can be resumed.
+NEW_RELEASE_OPTIONS: dict[str, tuple[str, ...]] = {
+    "bulk_load": _CURRENT_RELEASE_OPTIONS,
+    # Frozen tables are noted in the metadata of the release being built.
+    "copy_freeze": _CURRENT_RELEASE_OPTIONS,
+    # TrEMBL records are copied back from the spill anew, without checkpoints.
+    "trembl_partitions": ("resume", *_CURRENT_RELEASE_OPTIONS),
+    "organism_buckets": ("resume", *_CURRENT_RELEASE_OPTIONS),
+    # Rows referencing dictionary tables are copied without checkpoints.
+    "normalize_names": ("resume", *_CURRENT_RELEASE_OPTIONS),
+    "deduplicate_sequences": ("resume", *_CURRENT_RELEASE_OPTIONS),
+}
+
+
 parser = argparse.ArgumentParser(description=("UniProt database setup"))
 parser.add_argument("--dbname", "-d", required=True, type=str)
 parser.add_argument("--dbuser", "-U", required=True, type=str)
@@ -45,12 +73,152 @@ parser.add_argument(
     help="If you downloaded all the source archives (tar, gz files) manually and "
     "do not want script to download them",
 )
+parser.add_argument(
+    "--source-cache",
+    "-c",
+    type=Path,
+    help="Directory to keep prepared source files in seekable zstd format. "
+    "If the cache is complete, the database is set up from it "
+    "without download and decompression",
+)
+parser.add_argument(
+    "--offline",
+    "-F",
+    action="store_true",
+    help="Set up the database from complete source cache without checking "
+    "that it holds the current UniProt release",
+)
+parser.add_argument(
+    "--archive-cache",
+    "-a",
+    type=Path,
+    help="Directory to keep downloaded archives in. Archives that have not "
+    "changed since the previous download are taken from it",
+)
 parser.add_argument(
     "-y",
     action="store_true",
     help="If you want to automatically say 'yes' "
     "to all the conditions and accept setup",
 )
+parser.add_argument(
+    "--stream",
+    "-s",
+    action="store_true",
+    help="Read Swiss-Prot, its isoforms and taxonomy archive straight "
+    "from the network instead of saving them to disk first",
+)
+parser.add_argument(
+    "--index-trembl",
+    "-x",
+    action="store_true",
+    help="Build random access index for TrEMBL archive instead of "
+    "decompressing it, workers read their parts straight from the archive",
+)
+parser.add_argument(
+    "--refresh-taxonomy",
+    "-r",
+    action="store_true",
+    help="Reload only NCBI taxonomy tables of the database that was set up "
+    "earlier. UniProt data is kept, merged NCBI ids are remapped in place",
+)
+parser.add_argument(
+    "--incremental",
+    "-n",
+    action="store_true",
+    help="Update the database that was set up earlier with changes of new "
+    "release only. Database stays queryable during the update",
+)
+parser.add_argument(
+    "--keep-releases",
+    "-R",
+    default=1,
+    type=int,
+    help="How many previous releases to keep for rollback after the new one "
+    "replaces them",
+)
+parser.add_argument(
+    "--resume",
+    "-e",
+    action="store_true",
+    help="Continue setup interrupted by the previous run. "
+    "Data committed by the interrupted setup is not copied again",
+)
+parser.add_argument(
+    "--bulk-load",
+    "-w",
+    type=BulkLoad,
+    choices=list(BulkLoad),
+    help="Load tables without writing WAL. 'logged' makes them durable "
+    "once loaded, 'unlogged' keeps them unlogged for disposable replicas",
+)
+parser.add_argument(
+    "--copy-freeze",
+    "-f",
+    action="store_true",
+    help="Copy tables written by a single process with COPY FREEZE, "
+    "so they are not vacuumed after setup",
+)
+parser.add_argument(
+    "--trembl-partitions",
+    "-o",
+    default=0,
+    type=int,
+    help="Partition uniprot_kb table by sequence source and split TrEMBL "
+    "partition into this many partitions by accession hash. "
+    "Every TrEMBL partition is copied by its own process, "
+    "partitions are indexed in parallel",
+)
+parser.add_argument(
+    "--storage-profile",
+    "-S",
+    type=StorageProfile,
+    choices=list(StorageProfile),
+    default=StorageProfile.DEFAULT,
+    help="Storage of uniprot_kb sequences. 'lz4' compresses them faster than "
+    "the default pglz, 'external' keeps them uncompressed for cheap slicing",
+)
+parser.add_argument(
+    "--normalize-names",
+    "-N",
+    action="store_true",
+    help="Store repeated peptide and organism names once in dictionary tables, "
+    "uniprot_kb references them by ids. uniprot_kb_named view shows "
+    "the names as the columns of uniprot_kb",
+)
+parser.add_argument(
+    "--deduplicate-sequences",
+    "-D",
+    action="store_true",
+    help="Store every distinct sequence once in sequence table keyed by "
+    "its 128-bit digest, uniprot_kb references it by sequence_id. "
+    "Trigram index is built on sequence table, uniprot_kb_named view shows "
+    "the sequences as the column of uniprot_kb",
+)
+parser.add_argument(
+    "--organism-buckets",
+    "-O",
+    default=0,
+    type=int,
+    help="Cluster TrEMBL rows by organism: records are spilled to this many "
+    "buckets by organism id and copied back bucket by bucket sorted by "
+    "organism, organism index becomes BRIN. Sorted runs of a bucket are merged",
+)
+parser.add_argument(
+    "--maintenance-memory",
+    "-m",
+    type=positive_int,
+    help="Memory (MB) shared by indexes and constraints that are built "
+    "at the same time after the data was copied",
+)
+parser.add_argument(
+    "--error-budget",
+    "-b",
+    default=0,
+    type=int,
+    help="How many invalid records may be put aside to 'quarantine' table "
+    "before setup fails",
+)
 parser.add_argument(
     "--trgm",
     "-i",
@@ -87,6 +255,54 @@ parser.add_argument(
 
 app_args = parser.parse_args()
 
+if app_args.source_cache is not None and (app_args.stream or app_args.index_trembl):
+    parser.error(
+        "--source-cache requires prepared files on disk, it can not be "
+        "combined with --stream or --index-trembl"
+    )
+
+if app_args.offline and app_args.source_cache is None:
+    parser.error("--offline requires --source-cache")
+
+if app_args.keep_releases < 0:
+    parser.error("--keep-releases can not be negative")
+
+if app_args.trembl_partitions < 0:
+    parser.error("--trembl-partitions can not be negative")
+
+if app_args.organism_buckets < 0:
+    parser.error("--organism-buckets can not be negative")
+
+for option, incompatible_options in NEW_RELEASE_OPTIONS.items():
+    if getattr(app_args, option) and any(
+        getattr(app_args, incompatible_option)
+        for incompatible_option in incompatible_options
+    ):
+        parser.error(
+            f"{to_flag(option)} builds new release, it can not be combined with "
+            f"{join_flags(incompatible_options)}"
+        )
+
+if app_args.error_budget < 0:
+    parser.error("--error-budget can not be negative")
+
+if app_args.error_budget and app_args.incremental:
+    parser.error(
+        "--error-budget can not be combined with --incremental, quarantined "
+        "entries would be deleted from the database as missing from new release"
+    )
+
+if app_args.incremental and app_args.refresh_taxonomy:
+    parser.error("--incremental already refreshes taxonomy, use one of them")
+
+if app_args.resume and (
+    app_args.stream or app_args.refresh_taxonomy or app_args.incremental
+):
+    parser.error(
+        "--resume continues full setup from files on disk, it can not be "
+        "combined with --stream, --refresh-taxonomy or --incremental"
+    )
+
 log_config = LogConfig(
     log_type=app_args.logtype,
     log_path=app_args.logpath,
@@ -32,12 +32,15 @@ from application.services import (
     UniprotOperator,
 )
 from application.services.exceptions import NoUpdateRequired
-from core.config import UniprotFiles
-from domain.entities import DEFAULT_SOURCE_FILES_FOLDER
+from core.config import TREMBL_CHUNKS_PER_WORKER, UniprotFiles
+from domain.entities import DEFAULT_SOURCE_FILES_FOLDER, Schemas, Tables
 from infrastructure.database.postgresql import (
+    TREMBL_PARTITION_NAME,
     ConnectionConfig,
     ConnectionPoolConfig,
+    MaintenanceBudget,
     PostgreSQLAdapter,
+    PostgreSQLProgressMonitor,
     PostgreSQLUniprotLifecycle,
     adjust_workers_by_db_connection_limit,
     get_available_connections_amount,
@@ -46,11 +49,20 @@ from infrastructure.database.postgresql import (
 )
 from infrastructure.preparation.prepare_files import (
     FilePreparer,
+    SourceCache,
     UpdateChecker,
 )
 from infrastructure.preparation.prepare_files.download import (
+    ArchiveCache,
     Downloader,
 )
+from infrastructure.preparation.prepare_files.exceptions import SourceCacheError
+from infrastructure.preparation.prepare_files.seekable_zstd import (
+    check_zstandard_availability,
+)
+from infrastructure.preparation.prepare_files.source_cache import (
+    get_cached_fasta_path,
+)
 from infrastructure.preparation.prepare_system import (
     SystemPreparer,
     SystemPreparerConfig,
@@ -58,19 +70,71 @@ from infrastructure.preparation.prepare_system import (
 from infrastructure.process_data import (
     calculate_workers_to_split_trembl_file,
     create_trembl_iterator_partial,
+    stick_iterators_to_partitions,
+    stick_iterators_to_staging_tables,
     stick_iterators_to_tables,
+    stick_ncbi_iterators_to_staging_tables,
+)
+from infrastructure.process_data.uniprot import (
+    ORGANISM_SPILL_FOLDER,
+    PARTITION_SPILL_FOLDER,
+    OrganismSpill,
+    PartitionSpill,
+)
+from infrastructure.process_data.uniprot.fasta import (
+    ChunkRangeIterator,
+    IndexedGzipChunkRangeIterator,
+    SeekableZstdChunkRangeIterator,
 )
-from infrastructure.process_data.uniprot.fasta import ChunkRangeIterator
 
 path_to_source_files: Path | None = app_args.path_to_source_files
 path_to_source_archives: Path | None = app_args.path_to_source_archives
 no_clean_up: bool = app_args.no_clean_up_on_failure
 
+source_cache: SourceCache | None = (
+    SourceCache(app_args.source_cache) if app_args.source_cache is not None else None
+)
+
+archive_cache: ArchiveCache | None = (
+    ArchiveCache(app_args.archive_cache) if app_args.archive_cache is not None else None
+)
+
 files_were_downloaded: bool = False
 download_is_required: bool = True
 preparation_is_required: bool = True
 
-if path_to_source_files is not None:
+update_checker: UpdateChecker = UpdateChecker()
+
+
+def _holds_current_release(cache: SourceCache) -> bool:
+    """Offline setup takes complete cache without checking its release."""
+    if app_args.offline:
+        return True
+
+    try:
+        modification_date = asyncio.run(update_checker.get_modification_date())
+
+    except Exception:
+        logger.error("Unable to check release of source cache, use --offline")
+        raise SystemExit(1) from None
+
+    return cache.holds_release(modification_date)
+
+
+# Complete source cache of the current release is used instead of any other source.
+cached: bool = (
+    source_cache is not None
+    and source_cache.is_complete()
+    and _holds_current_release(source_cache)
+)
+
+if source_cache is not None and cached:
+    source_folder = source_cache.folder
+    files_were_downloaded = True
+    download_is_required = False
+    preparation_is_required = False
+
+elif path_to_source_files is not None:
     source_folder = path_to_source_files
     files_were_downloaded = True
     download_is_required = False
@@ -84,9 +148,31 @@ elif path_to_source_archives is not None:
 else:
     source_folder = DEFAULT_SOURCE_FILES_FOLDER
 
+# Files can be streamed only if they are downloaded by the script.
+streaming: bool = app_args.stream and download_is_required
+
+# Only archives can be indexed.
+indexing: bool = app_args.index_trembl and preparation_is_required
+
+# Only NCBI tables are reloaded, UniProt data stays in place.
+taxonomy_refresh: bool = app_args.refresh_taxonomy
+
+# Only changes of new release are merged into the database set up earlier.
+incremental_update: bool = app_args.incremental
+
+# Failed setup is continued from the copied data it committed.
+resume: bool = app_args.resume
+
+# New release is built aside, refresh and update change the current one.
+schema: Schemas = (
+    Schemas.LIVE if taxonomy_refresh or incremental_update else Schemas.BUILD
+)
+
 
 async def main() -> None:
     hello()
+    _check_source_cache_requirements()
+    _check_archive_cache_requirements()
     await setup_uniprot_database()
 
 
@@ -98,16 +184,40 @@ def hello() -> None:
     )
 
 
+def _check_source_cache_requirements() -> None:
+    if source_cache is None:
+        return
+
+    if source_cache.folder.resolve() == DEFAULT_SOURCE_FILES_FOLDER.resolve():
+        logger.error("Source cache must not be in %s", DEFAULT_SOURCE_FILES_FOLDER)
+        raise SystemExit(1)
+
+    try:
+        check_zstandard_availability()
+
+    except SourceCacheError:
+        logger.exception("Source cache is unavailable")
+        raise SystemExit(1) from None
+
+
+def _check_archive_cache_requirements() -> None:
+    """Downloaded files are removed after setup together with their folder."""
+    if archive_cache is None:
+        return
+
+    if archive_cache.folder.resolve().is_relative_to(
+        DEFAULT_SOURCE_FILES_FOLDER.resolve()
+    ):
+        logger.error("Archive cache must not be in %s", DEFAULT_SOURCE_FILES_FOLDER)
+        raise SystemExit(1)
+
+
 async def setup_uniprot_database() -> None:
     """Download (if needed) and install UniProt database."""
     uniprot_setup, workers_number = await _compose_dependencies()
 
     try:
-        await uniprot_setup.setup(
-            workers_number=workers_number,
-            download_is_required=download_is_required,
-        )
-        logger.info("UniProt database has been set up successfully.")
+        await _run_setup(uniprot_setup, workers_number)
 
     except NoUpdateRequired:
         raise SystemExit from None
@@ -118,15 +228,69 @@ async def setup_uniprot_database() -> None:
         raise SystemExit(1) from None
 
 
+async def _run_setup(uniprot_setup: UniprotDatabaseSetup, workers_number: int) -> None:
+    if taxonomy_refresh:
+        await uniprot_setup.refresh_taxonomy(
+            workers_number=workers_number,
+            download_is_required=download_is_required,
+        )
+        logger.info("NCBI taxonomy has been refreshed successfully.")
+        return
+
+    if incremental_update:
+        await uniprot_setup.update_incrementally(
+            workers_number=workers_number,
+            download_is_required=download_is_required,
+        )
+        _save_source_cache_release()
+        logger.info("UniProt database has been updated successfully.")
+        return
+
+    await uniprot_setup.setup(
+        workers_number=workers_number,
+        download_is_required=download_is_required,
+        resume=resume,
+    )
+    _save_source_cache_release()
+    logger.info("UniProt database has been set up successfully.")
+
+
+def _save_source_cache_release() -> None:
+    """Cache filled with downloaded files holds the release found by update check."""
+    modification_date = update_checker.current_modification_date
+
+    if source_cache is not None and modification_date is not None:
+        source_cache.save_release(modification_date)
+
+
 async def _clean_up(uniprot_setup: UniprotDatabaseSetup) -> None:
-    if not no_clean_up:
-        try:
-            logger.info("Removing database and downloaded files")
-            await uniprot_setup.remove_on_failure(files_were_downloaded)
+    if no_clean_up:
+        return
 
-        except Exception:
-            logger.error("Unable to clean up database and source files")
-            raise SystemExit(1) from None
+    try:
+        await _remove_on_failure(uniprot_setup)
+
+    except Exception:
+        logger.error("Unable to clean up database and source files")
+        raise SystemExit(1) from None
+
+
+async def _remove_on_failure(uniprot_setup: UniprotDatabaseSetup) -> None:
+    """
+    Failed taxonomy refresh and incremental update leave current tables intact.
+    Unfinished release that committed copied data is kept to be resumed.
+    """
+    if taxonomy_refresh or incremental_update:
+        logger.info("Removing staging tables and downloaded files")
+        await uniprot_setup.remove_staging_on_failure(files_were_downloaded)
+        return
+
+    if await uniprot_setup.has_checkpoints():
+        logger.info("Unfinished release is kept, run setup with --resume to continue")
+        return
+
+    logger.info("Removing unfinished release and downloaded files")
+    await uniprot_setup.remove_on_failure(files_were_downloaded)
 
 
 async def _compose_dependencies():
@@ -148,9 +312,21 @@ async def _compose_dependencies():
     trgm_required = app_args.trgm
 
     postgresql_adapter = PostgreSQLAdapter()
-    uniprot_lifecycle = PostgreSQLUniprotLifecycle(trgm_required=trgm_required)
+    uniprot_lifecycle = PostgreSQLUniprotLifecycle(
+        trgm_required=trgm_required,
+        kept_releases=app_args.keep_releases,
+        bulk_load=app_args.bulk_load,
+        trembl_partitions=app_args.trembl_partitions,
+        maintenance_budget=_get_maintenance_budget(workers_number),
+        organism_brin=bool(app_args.organism_buckets),
+        storage_profile=app_args.storage_profile,
+        normalize_names=app_args.normalize_names,
+        deduplicate_sequences=app_args.deduplicate_sequences,
+    )
     uniprot_operator = UniprotOperator(
-        db_connector=postgresql_adapter, uniprot_lifecycle=uniprot_lifecycle
+        db_connector=postgresql_adapter,
+        uniprot_lifecycle=uniprot_lifecycle,
+        progress_monitor=PostgreSQLProgressMonitor(),
     )
 
     db_copier = _get_database_file_copier(
@@ -164,12 +340,19 @@ async def _compose_dependencies():
         download_is_required=download_is_required,
         trgm_required=trgm_required,
         accept_setup_automatically=app_args.y,
+        streaming=streaming,
+        indexing=indexing,
+        taxonomy_only=taxonomy_refresh,
     )
     system_preparer = SystemPreparer(system_preparer_config)
-    downloader = Downloader()
-    update_checker = UpdateChecker()
+    downloader = Downloader(streaming=streaming, archive_cache=archive_cache)
     file_preparer = FilePreparer(
-        source_folder=source_folder, preparation_is_required=preparation_is_required
+        source_folder=source_folder,
+        preparation_is_required=preparation_is_required,
+        streaming=streaming,
+        indexing=indexing,
+        source_cache=source_cache,
+        from_source_cache=cached,
     )
 
     uniprot_setup = UniprotDatabaseSetup(
@@ -206,6 +389,17 @@ def _get_connection_pool_config(
         password=app_args.password,
         workers_number=workers_number,
         available_connections=available_connections,
+        schema=schema,
+        bulk_load=app_args.bulk_load is not None,
+    )
+
+
+def _get_maintenance_budget(workers_number: int) -> MaintenanceBudget | None:
+    if app_args.maintenance_memory is None:
+        return None
+
+    return MaintenanceBudget(
+        memory_mb=app_args.maintenance_memory, processes=workers_number
     )
 
 
@@ -216,15 +410,24 @@ def _get_database_file_copier(
     postgresql_adapter: PostgreSQLAdapter,
 ) -> DatabaseFileCopier:
     trembl_workers_number = calculate_workers_to_split_trembl_file(workers_number)
-    path_to_trembl = source_folder / UniprotFiles.TREMBL
-
-    chunk_range_iterator = ChunkRangeIterator(
-        path_to_file=path_to_trembl,
-        workers_number=trembl_workers_number,
-    )
-    trembl_iterator = create_trembl_iterator_partial(source_folder)
+    chunk_range_iterator = _get_chunk_range_iterator(trembl_workers_number)
+    trembl_iterator = create_trembl_iterator_partial(source_folder, indexing, cached)
     queue_config = setup_queue_config(workers_number, available_connections)
-    iterators_to_tables = stick_iterators_to_tables(source_folder)
+    iterators_to_tables = stick_iterators_to_tables(source_folder, streaming, cached)
+
+    sequence_table = Tables.UNIPROT
+
+    if taxonomy_refresh:
+        iterators_to_tables = stick_ncbi_iterators_to_staging_tables(
+            iterators_to_tables
+        )
+
+    elif incremental_update:
+        iterators_to_tables = stick_iterators_to_staging_tables(iterators_to_tables)
+        sequence_table = Tables.UNIPROT_STAGING
+
+    elif app_args.trembl_partitions:
+        iterators_to_tables = stick_iterators_to_partitions(iterators_to_tables)
 
     db_copier = DatabaseFileCopier(
         db_adapter=postgresql_adapter,
@@ -233,10 +436,65 @@ def _get_database_file_copier(
         trembl_iterator=trembl_iterator,  # type: ignore
         chunk_range_iterator=chunk_range_iterator,
         iterators_to_tables=iterators_to_tables,
+        sequence_table=sequence_table,
+        resume=resume,
+        error_budget=app_args.error_budget,
+        record_spill=_get_record_spill(),
+        spilled_tables=_get_spilled_tables(),
+        normalize_names=app_args.normalize_names,
+        deduplicate_sequences=app_args.deduplicate_sequences,
+        freeze=app_args.copy_freeze,
     )
     return db_copier
 
 
+def _get_record_spill() -> PartitionSpill | OrganismSpill | None:
+    """TrEMBL partitions are spilled apart, so each is copied by its own process."""
+    if app_args.trembl_partitions:
+        return PartitionSpill(
+            folder=source_folder / PARTITION_SPILL_FOLDER,
+            partitions=app_args.trembl_partitions,
+            organism_buckets=app_args.organism_buckets or 1,
+        )
+
+    if not app_args.organism_buckets:
+        return None
+
+    return OrganismSpill(
+        folder=source_folder / ORGANISM_SPILL_FOLDER,
+        buckets=app_args.organism_buckets,
+    )
+
+
+def _get_spilled_tables() -> list[str]:
+    return [
+        TREMBL_PARTITION_NAME.format(remainder=remainder)
+        for remainder in range(app_args.trembl_partitions)
+    ]
+
+
+def _get_chunk_range_iterator(trembl_workers_number: int) -> ChunkRangeIterator:
+    if cached:
+        return SeekableZstdChunkRangeIterator(
+            path_to_file=get_cached_fasta_path(source_folder, UniprotFiles.TREMBL),
+            workers_number=trembl_workers_number,
+            chunks_per_worker=TREMBL_CHUNKS_PER_WORKER,
+        )
+
+    if indexing:
+        return IndexedGzipChunkRangeIterator(
+            path_to_file=source_folder / f"{UniprotFiles.TREMBL}.gz",
+            workers_number=trembl_workers_number,
+            chunks_per_worker=TREMBL_CHUNKS_PER_WORKER,
+        )
+
+    return ChunkRangeIterator(
+        path_to_file=source_folder / UniprotFiles.TREMBL,
+        workers_number=trembl_workers_number,
+        chunks_per_worker=TREMBL_CHUNKS_PER_WORKER,
+    )
+
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())
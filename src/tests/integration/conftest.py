@@ -2,7 +2,10 @@ import time
 from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import StrEnum
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from threading import Thread
 
 import docker
 import pytest
@@ -92,6 +95,20 @@ def test_fasta(tmp_path: Path) -> Iterator[Path]:
     yield path_to_file
 
 
+@pytest.fixture
+def file_server(tmp_path: Path) -> Iterator[str]:
+    """Serve files of the temporary directory over HTTP and return base url."""
+    handler = partial(SimpleHTTPRequestHandler, directory=str(tmp_path))
+    server = ThreadingHTTPServer(("localhost", 0), handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://localhost:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
 nodes_content: str = (
     "9606\t|\t9605\t|\tspecies\t|\tHS\t|\t5\t|\t1\t|"
     "\t1\t|\t1\t|\t2\t|\t1\t|\t1\t|\t0\t|\tcode compliant; specified\t|\t"
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+from aioresponses import aioresponses
+
+from core.config import NCBI_LINK, SourceArchives
+from infrastructure.preparation.prepare_files.download import (
+    ArchiveCache,
+    ArchiveValidators,
+    Downloader,
+)
+from infrastructure.preparation.prepare_files.download import (
+    downloader as downloader_module,
+)
+
+TEST_BODY: bytes = b"taxdump archive"
+
+
+@pytest.fixture
+def source_folder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    folder = tmp_path / "source_files"
+    folder.mkdir()
+    monkeypatch.setattr(downloader_module, "DEFAULT_SOURCE_FILES_FOLDER", folder)
+    return folder
+
+
+@pytest.fixture
+def archive_cache(tmp_path: Path) -> ArchiveCache:
+    return ArchiveCache(tmp_path / "archive_cache")
+
+
+@pytest.mark.asyncio
+async def test_downloaded_archive_is_cached_with_validators(
+    source_folder: Path, archive_cache: ArchiveCache
+):
+    # Arrange.
+    headers = {"ETag": '"v1"', "Content-Length": str(len(TEST_BODY))}
+    sut = Downloader(archive_cache=archive_cache)
+
+    # Act.
+    with aioresponses() as mock:
+        mock.head(NCBI_LINK, status=200, headers=headers)
+        mock.get(NCBI_LINK, status=200, body=TEST_BODY)
+        await sut.download_archive(SourceArchives.TAXDUMP)
+
+    # Assert.
+    assert (source_folder / SourceArchives.TAXDUMP).read_bytes() == TEST_BODY
+    assert (archive_cache.folder / SourceArchives.TAXDUMP).read_bytes() == TEST_BODY
+    assert archive_cache.get_validators(NCBI_LINK) == ArchiveValidators(
+        etag='"v1"', content_length=len(TEST_BODY)
+    )
+
+
+@pytest.mark.asyncio
+async def test_not_modified_archive_is_taken_from_cache(
+    source_folder: Path, archive_cache: ArchiveCache
+):
+    # Arrange.
+    cached_file = source_folder / SourceArchives.TAXDUMP
+    cached_file.write_bytes(TEST_BODY)
+    archive_cache.store(NCBI_LINK, ArchiveValidators(etag='"v1"'), [cached_file])
+    cached_file.unlink()
+    sut = Downloader(archive_cache=archive_cache)
+
+    # Act.
+    with aioresponses() as mock:
+        # Archive is not requested with GET, so the request would fail.
+        mock.head(NCBI_LINK, status=304)
+        await sut.download_archive(SourceArchives.TAXDUMP)
+
+    (method, _), [request] = next(iter(mock.requests.items()))
+
+    # Assert.
+    assert (source_folder / SourceArchives.TAXDUMP).read_bytes() == TEST_BODY
+    assert len(mock.requests) == 1
+    assert method == "HEAD"
+    assert request.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_changed_archive_replaces_cached_one(
+    source_folder: Path, archive_cache: ArchiveCache
+):
+    # Arrange.
+    new_body = b"new taxdump archive"
+    cached_file = source_folder / SourceArchives.TAXDUMP
+    cached_file.write_bytes(TEST_BODY)
+    archive_cache.store(NCBI_LINK, ArchiveValidators(etag='"v1"'), [cached_file])
+    sut = Downloader(archive_cache=archive_cache)
+
+    # Act.
+    with aioresponses() as mock:
+        mock.head(NCBI_LINK, status=200, headers={"ETag": '"v2"'})
+        mock.get(NCBI_LINK, status=200, body=new_body)
+        await sut.download_archive(SourceArchives.TAXDUMP)
+
+    # Assert.
+    assert (archive_cache.folder / SourceArchives.TAXDUMP).read_bytes() == new_body
+    assert archive_cache.get_validators(NCBI_LINK) == ArchiveValidators(etag='"v2"')
+
+
+def test_validators_without_etag_are_compared_by_date_and_size():
+    # Arrange.
+    cached = ArchiveValidators(last_modified="Wed, 01 Oct 2025", content_length=10)
+
+    # Act & Assert.
+    assert cached.match(ArchiveValidators(etag='"v1"', **_date_and_size(10)))
+    assert not cached.match(ArchiveValidators(**_date_and_size(11)))
+    assert not ArchiveValidators().match(ArchiveValidators())
+
+
+def _date_and_size(content_length: int) -> dict:
+    return {"last_modified": "Wed, 01 Oct 2025", "content_length": content_length}
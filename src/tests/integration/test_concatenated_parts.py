@@ -0,0 +1,48 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from infrastructure.preparation.prepare_files.concatenated_parts import (
+    ConcatenatedPartsReader,
+    get_file_parts,
+)
+
+CONTENT: bytes = b"This is test that will show that the order is correct"
+
+
+@pytest.fixture
+def file_parts(tmp_path: Path) -> list[Path]:
+    base_file = tmp_path / "test.txt"
+    part_size = 5
+
+    # More than 10 parts to check numeric order.
+    for index, start in enumerate(range(0, len(CONTENT), part_size)):
+        Path(f"{base_file}.{index}").write_bytes(CONTENT[start : start + part_size])
+
+    return get_file_parts(base_file)
+
+
+def test_get_file_parts_sorts_parts_by_number(file_parts: list[Path]):
+    result = [int(part.suffix[1:]) for part in file_parts]
+
+    assert result == list(range(len(file_parts)))
+
+
+def test_parts_are_read_as_single_file(file_parts: list[Path]):
+    with ConcatenatedPartsReader(file_parts) as reader:
+        result = reader.read()
+
+    assert result == CONTENT
+    assert all(part.exists() for part in file_parts)
+
+
+def test_seek_across_parts(file_parts: list[Path]):
+    with ConcatenatedPartsReader(file_parts) as reader:
+        reader.seek(-7, io.SEEK_END)
+        tail = reader.read()
+        reader.seek(3)
+        head = reader.read(9)
+
+    assert tail == CONTENT[-7:]
+    assert head == CONTENT[3:12]
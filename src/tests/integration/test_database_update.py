@@ -0,0 +1,1009 @@
+import asyncio
+from dataclasses import asdict
+from pathlib import Path
+
+import asyncpg
+import pytest
+
+from application.services import (
+    DatabaseFileCopier,
+    UniprotDatabaseSetup,
+    UniprotOperator,
+)
+from application.services.exceptions import UniprotSetupError
+from core.config import NCBIFiles, UniprotFiles
+from domain.entities import Schemas, Tables
+from domain.models import CopyCheckpoint
+from infrastructure.database.postgresql import (
+    TREMBL_PARTITION_NAME,
+    BulkLoad,
+    ConnectionConfig,
+    MaintenanceBudget,
+    PostgreSQLAdapter,
+    PostgreSQLUniprotLifecycle,
+    StorageProfile,
+    get_available_connections_amount,
+    setup_connection_pool_config,
+    setup_queue_config,
+)
+from infrastructure.preparation.prepare_files import FilePreparer, UpdateChecker
+from infrastructure.preparation.prepare_files.download import Downloader
+from infrastructure.preparation.prepare_system import (
+    SystemPreparer,
+    SystemPreparerConfig,
+)
+from infrastructure.process_data import (
+    create_trembl_iterator_partial,
+    stick_iterators_to_partitions,
+    stick_iterators_to_staging_tables,
+    stick_iterators_to_tables,
+    stick_ncbi_iterators_to_staging_tables,
+)
+from infrastructure.process_data.uniprot import (
+    ORGANISM_SPILL_FOLDER,
+    PARTITION_SPILL_FOLDER,
+    OrganismSpill,
+    PartitionSpill,
+)
+from infrastructure.process_data.uniprot.fasta import ChunkRangeIterator
+from tests.integration.conftest import (
+    DATABASE_ENV,
+    names_content,
+    uniprot_sprot_content,
+)
+
+WORKERS_NUMBER: int = 2
+
+
+def _get_connection_config() -> ConnectionConfig:
+    return ConnectionConfig(
+        host=DATABASE_ENV.host,
+        database=DATABASE_ENV.dbname,
+        password=DATABASE_ENV.password,
+        port=DATABASE_ENV.port,
+        user=DATABASE_ENV.user,
+    )
+
+
+async def _drop_releases(conn: asyncpg.Connection) -> None:
+    """Releases of the previous tests are removed, database is set up from scratch."""
+    await conn.execute(
+        """
+        DO $$
+        DECLARE release TEXT;
+        BEGIN
+            FOR release IN SELECT nspname FROM pg_namespace WHERE nspname ~ '^uniprot'
+            LOOP
+                EXECUTE format('DROP SCHEMA %I CASCADE', release);
+            END LOOP;
+        END
+        $$
+        """
+    )
+
+
+async def _compose_setup(
+    path_to_files: Path,
+    taxonomy_refresh: bool = False,
+    incremental: bool = False,
+    resume: bool = False,
+    error_budget: int = 0,
+    bulk_load: BulkLoad | None = None,
+    trembl_partitions: int = 0,
+    maintenance_budget: MaintenanceBudget | None = None,
+    organism_buckets: int = 0,
+    storage_profile: StorageProfile = StorageProfile.DEFAULT,
+    normalize_names: bool = False,
+    deduplicate_sequences: bool = False,
+    batch_size: int = 10_000,
+    freeze: bool = False,
+) -> UniprotDatabaseSetup:
+    postgresql_adapter = PostgreSQLAdapter()
+    available_connections = await get_available_connections_amount(
+        asdict(_get_connection_config())
+    )
+    connection_pool_config = asdict(
+        setup_connection_pool_config(
+            **asdict(_get_connection_config()),
+            workers_number=WORKERS_NUMBER,
+            available_connections=available_connections,
+            schema=Schemas.LIVE if taxonomy_refresh or incremental else Schemas.BUILD,
+            bulk_load=bulk_load is not None,
+        )
+    )
+    iterators_to_tables = stick_iterators_to_tables(path_to_files)
+
+    if taxonomy_refresh:
+        iterators_to_tables = stick_ncbi_iterators_to_staging_tables(
+            iterators_to_tables
+        )
+
+    if incremental:
+        iterators_to_tables = stick_iterators_to_staging_tables(iterators_to_tables)
+
+    if trembl_partitions:
+        iterators_to_tables = stick_iterators_to_partitions(iterators_to_tables)
+
+    db_copier = DatabaseFileCopier(
+        db_adapter=postgresql_adapter,
+        queue_config=setup_queue_config(WORKERS_NUMBER, available_connections),
+        connection_pool_config=connection_pool_config,
+        trembl_iterator=create_trembl_iterator_partial(path_to_files),  # type: ignore
+        chunk_range_iterator=ChunkRangeIterator(
+            path_to_file=path_to_files / UniprotFiles.TREMBL, workers_number=1
+        ),
+        iterators_to_tables=iterators_to_tables,
+        batch_size=batch_size,
+        sequence_table=Tables.UNIPROT_STAGING if incremental else Tables.UNIPROT,
+        resume=resume,
+        error_budget=error_budget,
+        record_spill=_get_record_spill(
+            path_to_files, trembl_partitions, organism_buckets
+        ),
+        spilled_tables=[
+            TREMBL_PARTITION_NAME.format(remainder=remainder)
+            for remainder in range(trembl_partitions)
+        ],
+        normalize_names=normalize_names,
+        deduplicate_sequences=deduplicate_sequences,
+        freeze=freeze,
+    )
+    system_preparer_config = SystemPreparerConfig(
+        download_is_required=False,
+        trgm_required=False,
+        accept_setup_automatically=True,
+        taxonomy_only=taxonomy_refresh,
+    )
+    return UniprotDatabaseSetup(
+        uniprot_operator=UniprotOperator(
+            db_connector=postgresql_adapter,
+            uniprot_lifecycle=PostgreSQLUniprotLifecycle(
+                trgm_required=False,
+                bulk_load=bulk_load,
+                trembl_partitions=trembl_partitions,
+                maintenance_budget=maintenance_budget,
+                organism_brin=bool(organism_buckets),
+                storage_profile=storage_profile,
+                normalize_names=normalize_names,
+                deduplicate_sequences=deduplicate_sequences,
+            ),
+        ),
+        file_preparer=FilePreparer(
+            source_folder=path_to_files, preparation_is_required=False
+        ),
+        db_copier=db_copier,
+        system_preparer=SystemPreparer(system_preparer_config),
+        db_pool_config=connection_pool_config,
+        downloader=Downloader(),
+        update_checker=UpdateChecker(),
+    )
+
+
+def _get_record_spill(
+    path_to_files: Path, trembl_partitions: int, organism_buckets: int
+) -> PartitionSpill | OrganismSpill | None:
+    if trembl_partitions:
+        return PartitionSpill(
+            path_to_files / PARTITION_SPILL_FOLDER,
+            trembl_partitions,
+            organism_buckets or 1,
+        )
+
+    if organism_buckets:
+        return OrganismSpill(path_to_files / ORGANISM_SPILL_FOLDER, organism_buckets)
+
+    return None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("trembl_partitions", [0, 2])
+async def test_taxonomy_refresh_remaps_merged_ids_without_reloading_uniprot(
+    tmp_path: Path, trembl_partitions: int
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path, trembl_partitions=trembl_partitions)
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    uniprot_rows = await conn.fetchval("SELECT count(*) FROM uniprot_kb")
+
+    # 'Bos taurus' is merged into 'Homo sapiens' in the new taxonomy release.
+    (tmp_path / NCBIFiles.MERGED).write_text("9913\t|\t9606\t|")
+    (tmp_path / NCBIFiles.NAMES).write_text(
+        names_content.replace("Homo sapiens", "Homo sapiens refreshed")
+    )
+    taxonomy_refresh = await _compose_setup(tmp_path, taxonomy_refresh=True)
+
+    # Act.
+    await taxonomy_refresh.refresh_taxonomy(
+        workers_number=WORKERS_NUMBER, download_is_required=False
+    )
+
+    organism_ids = await conn.fetch(
+        "SELECT DISTINCT ncbi_organism_id FROM uniprot_kb ORDER BY 1"
+    )
+    tax_name = await conn.fetchval(
+        "SELECT tax_name FROM taxonomy WHERE ncbi_taxon_id = 9606"
+    )
+    refreshed_uniprot_rows = await conn.fetchval("SELECT count(*) FROM uniprot_kb")
+    foreign_keys = await conn.fetchval(
+        "SELECT count(*) FROM pg_constraint "
+        "WHERE conrelid = 'uniprot_kb'::regclass AND contype = 'f'"
+    )
+    not_validated_constraints = await conn.fetchval(
+        "SELECT count(*) FROM pg_constraint WHERE NOT convalidated"
+    )
+    taxonomy_constraints = await conn.fetch(
+        "SELECT conname FROM pg_constraint "
+        "WHERE conrelid IN ('taxonomy'::regclass, 'lineage'::regclass) ORDER BY 1"
+    )
+    fkey_state = await conn.fetchval(
+        "SELECT value FROM build_metadata WHERE name = 'uniprot_kb_ncbi_organism_id_fkey'"
+    )
+    staging_objects = await conn.fetchval(
+        "SELECT count(*) FROM pg_class WHERE relname LIKE '%staging%'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert [row["ncbi_organism_id"] for row in organism_ids] == [9606]
+    assert tax_name == "Homo sapiens refreshed[9606]"
+    assert refreshed_uniprot_rows == uniprot_rows
+    assert foreign_keys == 1
+    assert not_validated_constraints == 0
+    assert [row["conname"] for row in taxonomy_constraints] == [
+        "lineage_ncbi_lineage_id_fkey",
+        "lineage_ncbi_taxon_id_fkey",
+        "lineage_pkey",
+        "taxonomy_pkey",
+        "unique_tax_name",
+        "unique_taxon_lineage_idpair",
+    ]
+    assert fkey_state == "validated"
+    assert staging_objects == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("trembl_partitions", [0, 2])
+async def test_incremental_update_writes_only_changed_entries(
+    tmp_path: Path, trembl_partitions: int
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path, trembl_partitions=trembl_partitions)
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    unchanged_row_version = await conn.fetchval(
+        "SELECT xmin::text FROM uniprot_kb WHERE accession = 'I7CLV3'"
+    )
+
+    # New release changes one sequence, removes and adds one entry.
+    removed_entry = uniprot_sprot_content[uniprot_sprot_content.index(">sp|A2RUC4") :]
+    new_release = uniprot_sprot_content.replace(removed_entry, "").replace(
+        "MAGIIKKQILKHLSRFTKNLSPDKINLSTLKGEGELKNLELDEEVLQNMLDLPTWLAINK",
+        "MAGIIKKQILKHLSRFTKNLSPDKINLSTLKGEGELKNLELDEEVLQNMLDLPTWLAINR",
+    )
+    new_entry = (
+        ">sp|P01308|INS_HUMAN Insulin OS=Homo sapiens OX=9606 GN=INS PE=1 SV=1\n"
+        "MALWMRLLPLLALLALWGPDPAAAFVNQHLCGSHLVEALYLVCGERGFFYTPKTRREAED\n"
+    )
+    (tmp_path / UniprotFiles.SWISS_PROT).write_text(new_entry + new_release)
+    incremental_update = await _compose_setup(tmp_path, incremental=True)
+
+    # Act.
+    await incremental_update.update_incrementally(
+        workers_number=WORKERS_NUMBER, download_is_required=False
+    )
+
+    changed_sequence = await conn.fetchval(
+        "SELECT sequence FROM uniprot_kb WHERE accession = 'A0JNW5'"
+    )
+    accessions = {
+        row["accession"] for row in await conn.fetch("SELECT accession FROM uniprot_kb")
+    }
+    row_version = await conn.fetchval(
+        "SELECT xmin::text FROM uniprot_kb WHERE accession = 'I7CLV3'"
+    )
+    not_validated_constraints = await conn.fetchval(
+        "SELECT count(*) FROM pg_constraint WHERE NOT convalidated"
+    )
+    staging_tables = await conn.fetchval(
+        "SELECT count(*) FROM pg_tables WHERE tablename LIKE '%staging'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert changed_sequence.endswith("LAINR")
+    assert "P01308" in accessions
+    assert "A2RUC4" not in accessions
+    assert row_version == unchanged_row_version
+    assert not_validated_constraints == 0
+    assert staging_tables == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("normalize_names", "deduplicate_sequences"),
+    [(True, False), (False, True)],
+)
+@pytest.mark.parametrize("taxonomy_refresh", [True, False])
+async def test_release_of_another_layout_is_not_updated_in_place(
+    tmp_path: Path,
+    normalize_names: bool,
+    deduplicate_sequences: bool,
+    taxonomy_refresh: bool,
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(
+        tmp_path,
+        normalize_names=normalize_names,
+        deduplicate_sequences=deduplicate_sequences,
+    )
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+    update = await _compose_setup(
+        tmp_path, taxonomy_refresh=taxonomy_refresh, incremental=not taxonomy_refresh
+    )
+    update_release = (
+        update.refresh_taxonomy if taxonomy_refresh else update.update_incrementally
+    )
+
+    # Act.
+    with pytest.raises(UniprotSetupError):
+        await update_release(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    staging_tables = await conn.fetchval(
+        "SELECT count(*) FROM pg_tables WHERE tablename LIKE '%staging'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert staging_tables == 0
+
+
+@pytest.mark.asyncio
+async def test_new_release_replaces_current_one_and_previous_is_kept(
+    tmp_path: Path,
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path)
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    # New release has a single Swiss-Prot entry.
+    (tmp_path / UniprotFiles.SWISS_PROT).write_text(
+        uniprot_sprot_content[: uniprot_sprot_content.index(">sp|A0JP26")]
+    )
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    current_entries = await conn.fetchval(
+        "SELECT count(*) FROM uniprot_kb WHERE source = 'sp'"
+    )
+    previous_releases = await conn.fetch(
+        "SELECT nspname FROM pg_namespace WHERE nspname ~ '^uniprot_\\d'"
+    )
+    previous_entries = await conn.fetchval(
+        f"SELECT count(*) FROM {previous_releases[0]['nspname']}.uniprot_kb "
+        "WHERE source = 'sp'"
+    )
+    build_schemas = await conn.fetchval(
+        f"SELECT count(*) FROM pg_namespace WHERE nspname = '{Schemas.BUILD}'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert current_entries == 1
+    assert len(previous_releases) == 1
+    assert previous_entries == 10
+    assert build_schemas == 0
+
+
+@pytest.mark.asyncio
+async def test_legacy_release_in_public_schema_is_archived_as_the_oldest_one(
+    tmp_path: Path,
+):
+    # Arrange.
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    await _drop_releases(conn)
+    await conn.execute(
+        "CREATE TYPE public.sequence_source AS ENUM('sp', 'tr', 'sp_iso', 'tr_iso')"
+    )
+    await conn.execute(
+        "CREATE TABLE public.uniprot_kb(accession VARCHAR(13), "
+        "source public.sequence_source)"
+    )
+    await conn.execute("INSERT INTO public.uniprot_kb VALUES ('P01308', 'sp')")
+    uniprot_setup = await _compose_setup(tmp_path)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    legacy_entries = await conn.fetchval(
+        "SELECT count(*) FROM uniprot_0000_legacy.uniprot_kb WHERE source = 'sp'"
+    )
+
+    # Legacy release is outdated once the next release is published.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+    legacy_objects = await conn.fetchval(
+        "SELECT to_regclass('public.uniprot_kb') IS NOT NULL "
+        "OR to_regtype('public.sequence_source') IS NOT NULL "
+        "OR to_regnamespace('uniprot_0000_legacy') IS NOT NULL"
+    )
+    await conn.close()
+
+    # Assert.
+    assert legacy_entries == 1
+    assert not legacy_objects
+
+
+@pytest.mark.asyncio
+async def test_resumed_setup_does_not_copy_committed_data_again(
+    mocker, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange.
+    async def fail(*args):
+        raise RuntimeError("Setup was interrupted")
+
+    monkeypatch.setattr(UniprotOperator, "finalize_uniprot_setup", fail)
+    interrupted_setup = await _compose_setup(tmp_path)
+
+    with pytest.raises(UniprotSetupError):
+        await interrupted_setup.setup(
+            workers_number=WORKERS_NUMBER, download_is_required=False
+        )
+
+    monkeypatch.undo()
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    copied_entries = await conn.fetchval(
+        f"SELECT count(*) FROM {Schemas.BUILD}.uniprot_kb"
+    )
+    committed_rows = await conn.fetchval(
+        f"SELECT sum(row_count) FROM {Schemas.BUILD}.copy_progress"
+    )
+    resumed_setup = await _compose_setup(tmp_path, resume=True)
+    prepare_archive = mocker.spy(FilePreparer, "prepare_archive")
+
+    # Act.
+    await resumed_setup.setup(
+        workers_number=WORKERS_NUMBER, download_is_required=False, resume=True
+    )
+
+    entries = await conn.fetchval("SELECT count(*) FROM uniprot_kb")
+    distinct_entries = await conn.fetchval(
+        "SELECT count(DISTINCT accession) FROM uniprot_kb"
+    )
+    build_schemas = await conn.fetchval(
+        f"SELECT count(*) FROM pg_namespace WHERE nspname = '{Schemas.BUILD}'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert committed_rows == copied_entries
+    assert entries == distinct_entries == copied_entries
+    assert build_schemas == 0
+    prepare_archive.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_setup_interrupted_with_another_source_release_is_not_resumed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange.
+    async def fail(*args):
+        raise RuntimeError("Setup was interrupted")
+
+    monkeypatch.setattr(UniprotOperator, "finalize_uniprot_setup", fail)
+    interrupted_setup = await _compose_setup(tmp_path)
+
+    with pytest.raises(UniprotSetupError):
+        await interrupted_setup.setup(
+            workers_number=WORKERS_NUMBER, download_is_required=False
+        )
+
+    monkeypatch.undo()
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    await conn.execute(
+        f"UPDATE {Schemas.BUILD}.build_metadata SET value = 'previous release' "
+        "WHERE name = 'source release'"
+    )
+    resumed_setup = await _compose_setup(tmp_path, resume=True)
+
+    # Act.
+    with pytest.raises(UniprotSetupError):
+        await resumed_setup.setup(
+            workers_number=WORKERS_NUMBER, download_is_required=False, resume=True
+        )
+
+    completed_stages = await conn.fetchval(
+        f"SELECT count(*) FROM {Schemas.BUILD}.stage_progress"
+    )
+    await conn.close()
+
+    # Assert.
+    assert completed_stages
+
+
+_copy_with_checkpoint = PostgreSQLAdapter.copy_with_checkpoint
+
+
+async def _commit_first_batches_only(
+    self: PostgreSQLAdapter,
+    pool: asyncpg.Pool,
+    table_name: Tables,
+    records: list[tuple],
+    checkpoint: CopyCheckpoint,
+    timeout: float | None = None,
+) -> None:
+    """Copy fails after the first batch of every chunk was committed."""
+    if checkpoint.segment.start != checkpoint.chunk_range.start:
+        await asyncio.sleep(1)
+        raise RuntimeError("Copy was interrupted")
+
+    await _copy_with_checkpoint(self, pool, table_name, records, checkpoint, timeout)
+
+
+# Every segment of a chunk starts right after the previous one.
+_SELECT_DISCONTINUOUS_SEGMENTS_QUERY: str = f"""
+    SELECT count(*)
+    FROM (
+        SELECT
+            segment_start,
+            lag(segment_end, 1, chunk_start - 1) OVER (
+                PARTITION BY source, chunk_start ORDER BY segment_start
+            ) AS previous_segment_end
+        FROM {Schemas.BUILD}.copy_progress
+    ) AS segments
+    WHERE segment_start <> previous_segment_end + 1
+    """
+
+
+@pytest.mark.asyncio
+async def test_copy_failed_mid_chunk_is_resumed_from_last_committed_segment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange.
+    async def fail(*args):
+        raise RuntimeError("Setup was interrupted")
+
+    monkeypatch.setattr(
+        PostgreSQLAdapter, "copy_with_checkpoint", _commit_first_batches_only
+    )
+    interrupted_setup = await _compose_setup(tmp_path, batch_size=4)
+
+    with pytest.raises(UniprotSetupError):
+        await interrupted_setup.setup(
+            workers_number=WORKERS_NUMBER, download_is_required=False
+        )
+
+    monkeypatch.undo()
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    committed_rows = await conn.fetchval(
+        f"SELECT sum(row_count) FROM {Schemas.BUILD}.copy_progress"
+    )
+    # Copy progress is dropped with the finished release, so it is kept unfinished.
+    monkeypatch.setattr(UniprotOperator, "finalize_uniprot_setup", fail)
+    resumed_setup = await _compose_setup(tmp_path, resume=True, batch_size=4)
+
+    # Act.
+    with pytest.raises(UniprotSetupError):
+        await resumed_setup.setup(
+            workers_number=WORKERS_NUMBER, download_is_required=False, resume=True
+        )
+
+    copied_entries = await conn.fetchval(
+        f"SELECT count(DISTINCT accession) FROM {Schemas.BUILD}.uniprot_kb"
+    )
+    resumed_rows = await conn.fetchval(
+        f"SELECT sum(row_count) FROM {Schemas.BUILD}.copy_progress"
+    )
+    discontinuous_segments = await conn.fetchval(_SELECT_DISCONTINUOUS_SEGMENTS_QUERY)
+    await conn.close()
+
+    # Assert.
+    assert 0 < committed_rows < resumed_rows == copied_entries
+    assert discontinuous_segments == 0
+
+
+_INVALID_RECORD: str = ">sp|P01309|damaged header\nMALWMRLLPL\n"
+
+
+@pytest.mark.asyncio
+async def test_invalid_records_are_quarantined_within_error_budget(tmp_path: Path):
+    # Arrange.
+    (tmp_path / UniprotFiles.SWISS_PROT).write_text(
+        _INVALID_RECORD + uniprot_sprot_content
+    )
+    uniprot_setup = await _compose_setup(tmp_path, error_budget=1)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    entries = await conn.fetchval("SELECT count(*) FROM uniprot_kb WHERE source = 'sp'")
+    quarantined_records = await conn.fetch("SELECT source, position FROM quarantine")
+    await conn.close()
+
+    # Assert.
+    assert entries == 10
+    assert [tuple(record) for record in quarantined_records] == [
+        (UniprotFiles.SWISS_PROT, 0)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_setup_fails_when_invalid_records_exceed_error_budget(tmp_path: Path):
+    # Arrange.
+    (tmp_path / UniprotFiles.SWISS_PROT).write_text(
+        _INVALID_RECORD * 2 + uniprot_sprot_content
+    )
+    uniprot_setup = await _compose_setup(tmp_path, error_budget=1)
+
+    # Act & Assert.
+    with pytest.raises(UniprotSetupError):
+        await uniprot_setup.setup(
+            workers_number=WORKERS_NUMBER, download_is_required=False
+        )
+
+    await uniprot_setup.remove_on_failure(files_were_downloaded=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("bulk_load", "expected_persistence"),
+    [(BulkLoad.LOGGED, "p"), (BulkLoad.UNLOGGED, "u")],
+)
+async def test_bulk_loaded_release_is_made_durable_if_required(
+    tmp_path: Path, bulk_load: BulkLoad, expected_persistence: str
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path, bulk_load=bulk_load)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    persistence = await conn.fetch(
+        "SELECT DISTINCT relpersistence::text FROM pg_class "
+        f"WHERE relnamespace = '{Schemas.LIVE}'::regnamespace AND relkind = 'r'"
+    )
+    entries = await conn.fetchval("SELECT count(*) FROM uniprot_kb")
+    await conn.close()
+
+    # Assert.
+    assert [row["relpersistence"] for row in persistence] == [expected_persistence]
+    assert entries > 0
+
+
+@pytest.mark.asyncio
+async def test_partitioned_uniprot_kb_is_queried_as_single_table(tmp_path: Path):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path, trembl_partitions=2)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    entries = await conn.fetch(
+        "SELECT source::text, tableoid::regclass::text AS partition, count(*) "
+        "FROM uniprot_kb GROUP BY 1, 2"
+    )
+    invalid_indexes = await conn.fetchval(
+        "SELECT count(*) FROM pg_index "
+        "WHERE indrelid = 'uniprot_kb'::regclass AND NOT indisvalid"
+    )
+    primary_key = await conn.fetchval(
+        "SELECT pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = 'uniprot_kb'::regclass AND contype = 'p'"
+    )
+    foreign_key_is_validated = await conn.fetchval(
+        "SELECT convalidated FROM pg_constraint "
+        "WHERE conrelid = 'uniprot_kb'::regclass AND contype = 'f'"
+    )
+    await conn.close()
+
+    partitions = {(row["source"], row["partition"]) for row in entries}
+
+    # Assert.
+    assert ("sp", "uniprot_kb_sp") in partitions
+    assert {partition for source, partition in partitions if source == "tr"} == {
+        "uniprot_kb_tr_0",
+        "uniprot_kb_tr_1",
+    }
+    assert invalid_indexes == 0
+    assert primary_key == "PRIMARY KEY (accession, source)"
+    assert foreign_key_is_validated
+    assert not any(
+        path.is_file() for path in (tmp_path / PARTITION_SPILL_FOLDER).rglob("*")
+    )
+
+
+@pytest.mark.asyncio
+async def test_indexes_and_constraints_are_built_within_maintenance_budget(
+    tmp_path: Path,
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(
+        tmp_path, maintenance_budget=MaintenanceBudget(memory_mb=256, processes=4)
+    )
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    constraints = await conn.fetch(
+        "SELECT conrelid::regclass::text AS table, conname FROM pg_constraint "
+        f"WHERE connamespace = '{Schemas.LIVE}'::regnamespace AND contype = 'p'"
+    )
+    invalid_indexes = await conn.fetchval(
+        "SELECT count(*) FROM pg_index "
+        f"WHERE indrelid::regclass::text IN ('{Tables.TAXONOMY}', "
+        f"'{Tables.LINEAGE}', '{Tables.UNIPROT}') AND NOT indisvalid"
+    )
+    await conn.close()
+
+    # Assert.
+    assert {(row["table"], row["conname"]) for row in constraints} >= {
+        ("taxonomy", "taxonomy_pkey"),
+        ("lineage", "lineage_pkey"),
+        ("uniprot_kb", "uniprot_kb_pkey"),
+    }
+    assert invalid_indexes == 0
+
+
+@pytest.mark.asyncio
+async def test_foreign_keys_are_validated_after_setup(tmp_path: Path):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    foreign_keys = await conn.fetch(
+        "SELECT conname, convalidated FROM pg_constraint "
+        f"WHERE connamespace = '{Schemas.LIVE}'::regnamespace AND contype = 'f'"
+    )
+    expected_foreign_keys = {
+        "lineage_ncbi_taxon_id_fkey",
+        "lineage_ncbi_lineage_id_fkey",
+        "uniprot_kb_ncbi_organism_id_fkey",
+    }
+    noted_states = await conn.fetch(
+        f"SELECT name, value FROM {Tables.BUILD_METADATA} WHERE name = ANY($1)",
+        list(expected_foreign_keys),
+    )
+    await conn.close()
+
+    # Assert.
+    assert {row["conname"] for row in foreign_keys} == expected_foreign_keys
+    assert all(row["convalidated"] for row in foreign_keys)
+    assert dict(noted_states) == dict.fromkeys(expected_foreign_keys, "validated")
+
+
+@pytest.mark.asyncio
+async def test_tables_are_analyzed_and_frozen_after_setup(tmp_path: Path):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    not_visible_pages = await conn.fetchval(
+        "SELECT relpages - relallvisible FROM pg_class "
+        f"WHERE relnamespace = '{Schemas.LIVE}'::regnamespace "
+        "AND relname = 'uniprot_kb'"
+    )
+    statistics_targets = await conn.fetch(
+        "SELECT attname::text, attstattarget FROM pg_attribute "
+        "WHERE attrelid = 'uniprot_kb'::regclass "
+        "AND attname IN ('ncbi_organism_id', 'source')"
+    )
+    noted_sizes = await conn.fetch(
+        f"SELECT name FROM {Tables.BUILD_METADATA} WHERE name LIKE '% size'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert not_visible_pages == 0
+    assert dict(statistics_targets) == {"ncbi_organism_id": 1000, "source": 1000}
+    assert {"uniprot_kb size", "uniprot_kb_pkey size", "taxonomy size"} <= {
+        row["name"] for row in noted_sizes
+    }
+
+
+@pytest.mark.asyncio
+async def test_trembl_rows_are_clustered_by_organism(tmp_path: Path):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path, organism_buckets=4)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    organism_ids = await conn.fetch(
+        "SELECT ncbi_organism_id FROM uniprot_kb WHERE source = 'tr' ORDER BY ctid"
+    )
+    organism_index = await conn.fetchval(
+        "SELECT pg_get_indexdef('ncbi_organism_id_uniprot_kb_idx'::regclass)"
+    )
+    await conn.close()
+
+    stored_organism_ids = [row["ncbi_organism_id"] for row in organism_ids]
+
+    # Assert.
+    assert stored_organism_ids
+    assert stored_organism_ids == sorted(stored_organism_ids)
+    assert "USING brin" in organism_index
+    assert not any((tmp_path / ORGANISM_SPILL_FOLDER).iterdir())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("trembl_partitions", [0, 2])
+async def test_sequences_are_stored_in_storage_profile(
+    tmp_path: Path, trembl_partitions: int
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(
+        tmp_path,
+        trembl_partitions=trembl_partitions,
+        storage_profile=StorageProfile.EXTERNAL,
+    )
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    tables = await conn.fetch(
+        "SELECT c.relname::text, a.attstorage::text, c.reloptions FROM pg_class c "
+        "JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = 'sequence' "
+        f"WHERE c.relnamespace = '{Schemas.LIVE}'::regnamespace "
+        "AND c.relname LIKE 'uniprot_kb%' AND c.relkind = 'r'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert tables
+    assert {row["attstorage"] for row in tables} == {"e"}
+    assert {tuple(row["reloptions"]) for row in tables} == {("fillfactor=100",)}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("trembl_partitions", "organism_buckets"), [(0, 0), (2, 0), (0, 4)]
+)
+async def test_normalized_names_are_shown_by_the_view(
+    tmp_path: Path, trembl_partitions: int, organism_buckets: int
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(
+        tmp_path,
+        trembl_partitions=trembl_partitions,
+        organism_buckets=organism_buckets,
+        normalize_names=True,
+    )
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    entry = await conn.fetchrow(
+        f"SELECT peptide_name, organism_name FROM {Tables.UNIPROT_NAMED} "
+        "WHERE accession = 'A0JP26'"
+    )
+    counts = await conn.fetchrow(
+        f"SELECT (SELECT count(*) FROM {Tables.UNIPROT}) AS entries, "
+        f"(SELECT count(*) FROM {Tables.UNIPROT_NAMED}) AS named_entries, "
+        f"(SELECT count(*) FROM {Tables.ORGANISM_NAME}) AS organism_names, "
+        "(SELECT count(DISTINCT organism_name) "
+        f"FROM {Tables.UNIPROT_NAMED}) AS distinct_organism_names"
+    )
+    name_columns = await conn.fetch(
+        "SELECT attname::text FROM pg_attribute "
+        "WHERE attrelid = 'uniprot_kb'::regclass AND attname LIKE '%name%'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert dict(entry) == {
+        "peptide_name": "POTE ankyrin domain family member B3",
+        "organism_name": "Homo sapiens",
+    }
+    assert counts["named_entries"] == counts["entries"]
+    assert counts["organism_names"] < counts["entries"]
+    assert counts["organism_names"] == counts["distinct_organism_names"]
+    assert {row["attname"] for row in name_columns} == {
+        "entry_name",
+        "peptide_name_id",
+        "organism_name_id",
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("trembl_partitions", "organism_buckets", "normalize_names"),
+    [(0, 0, False), (2, 0, False), (0, 4, True)],
+)
+async def test_deduplicated_sequences_are_shown_by_the_view(
+    tmp_path: Path, trembl_partitions: int, organism_buckets: int, normalize_names: bool
+):
+    # Arrange.
+    uniprot_setup = await _compose_setup(
+        tmp_path,
+        trembl_partitions=trembl_partitions,
+        organism_buckets=organism_buckets,
+        storage_profile=StorageProfile.EXTERNAL,
+        normalize_names=normalize_names,
+        deduplicate_sequences=True,
+    )
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    entry = await conn.fetchrow(
+        f"SELECT organism_name, left(sequence, 10) AS sequence_start "
+        f"FROM {Tables.UNIPROT_NAMED} WHERE accession = 'A0JP26'"
+    )
+    counts = await conn.fetchrow(
+        f"SELECT (SELECT count(*) FROM {Tables.UNIPROT}) AS entries, "
+        f"(SELECT count(*) FROM {Tables.UNIPROT_NAMED} WHERE sequence IS NOT NULL) "
+        "AS entries_with_sequence, "
+        f"(SELECT count(DISTINCT sequence_id) FROM {Tables.UNIPROT}) AS sequence_ids, "
+        f"(SELECT count(*) FROM {Tables.SEQUENCE}) AS sequences"
+    )
+    sequence_storage = await conn.fetchval(
+        "SELECT attstorage::text FROM pg_attribute "
+        f"WHERE attrelid = '{Tables.SEQUENCE}'::regclass AND attname = 'sequence'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert entry["organism_name"] == "Homo sapiens"
+    assert entry["sequence_start"] == "MGKCCHHCFP"
+    assert counts["entries_with_sequence"] == counts["entries"]
+    assert counts["sequences"] == counts["sequence_ids"]
+    assert sequence_storage == "e"
+
+
+@pytest.mark.asyncio
+async def test_tables_with_single_writer_are_copied_frozen(tmp_path: Path):
+    # Arrange.
+    uniprot_setup = await _compose_setup(tmp_path, trembl_partitions=2, freeze=True)
+
+    # Act.
+    await uniprot_setup.setup(workers_number=WORKERS_NUMBER, download_is_required=False)
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    frozen_tables = await conn.fetch(
+        f"SELECT name FROM {Tables.BUILD_METADATA} WHERE value = 'copied frozen'"
+    )
+    # Frozen rows are marked all-visible without vacuum.
+    not_vacuumed_tables = await conn.fetch(
+        "SELECT relname::text FROM pg_stat_user_tables "
+        f"WHERE schemaname = '{Schemas.LIVE}' AND vacuum_count = 0 "
+        "AND relname = ANY($1) AND n_live_tup > 0",
+        [row["name"] for row in frozen_tables],
+    )
+    all_visible_pages = await conn.fetchval(
+        "SELECT sum(relallvisible) FROM pg_class "
+        f"WHERE relnamespace = '{Schemas.LIVE}'::regnamespace "
+        "AND relname LIKE 'uniprot_kb_tr_%'"
+    )
+    await conn.close()
+
+    # Assert.
+    assert {row["name"] for row in frozen_tables} == {
+        "lineage",
+        "uniprot_kb_sp",
+        "uniprot_kb_sp_iso",
+        "uniprot_kb_tr_0",
+        "uniprot_kb_tr_1",
+    }
+    assert {row["relname"] for row in not_vacuumed_tables} == {
+        row["name"] for row in frozen_tables
+    }
+    assert all_visible_pages > 0
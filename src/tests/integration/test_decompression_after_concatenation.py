@@ -3,6 +3,11 @@ from pathlib import Path
 
 import pytest
 
+from infrastructure.preparation.prepare_files.decompressors import (
+    ProcessDecompressor,
+    ZlibDecompressor,
+)
+from infrastructure.preparation.prepare_files.exceptions import FilePreparationError
 from infrastructure.preparation.prepare_files.file_operations import (
     concatenate_files,
     decompress_gz,
@@ -35,7 +40,52 @@ def test_gz(tmp_path: Path) -> Path:
 
 def test_decompression_is_working_properly_after_concatenation(mocker, test_gz: Path):
     _mock_is_shutdown_event_set_func(mocker, False)
-    gz_parts = 18
+    _split_file_on_parts(test_gz, gz_parts=18)
+
+    # Act.
+    concatenate_files(test_gz)
+    decompress_gz(test_gz)
+    result_content = Path(f"{test_gz.parent}/test.txt").open("rb").read()
+
+    # Assert.
+    assert result_content == CONTENT
+
+
+def test_file_parts_are_decompressed_without_concatenation(mocker, test_gz: Path):
+    _mock_is_shutdown_event_set_func(mocker, False)
+    _split_file_on_parts(test_gz, gz_parts=18)
+
+    # Act.
+    decompress_gz(test_gz)
+    result_content = Path(f"{test_gz.parent}/test.txt").open("rb").read()
+
+    # Assert.
+    assert result_content == CONTENT
+    assert not list(test_gz.parent.glob(f"{test_gz.name}*"))
+
+
+def test_file_parts_are_kept_when_decompression_fails(mocker, test_gz: Path):
+    _mock_is_shutdown_event_set_func(mocker, False)
+    # Several backends make the decompressor be picked by benchmark.
+    mocker.patch(
+        "infrastructure.preparation.prepare_files.decompressors."
+        "get_available_decompressors",
+        return_value=[ZlibDecompressor(), ProcessDecompressor("gzip")],
+    )
+    mocker.patch(
+        "infrastructure.preparation.prepare_files.file_operations.set_shutdown_event"
+    )
+    _split_file_on_parts(test_gz, gz_parts=18)
+    last_part = Path(f"{test_gz}.17")
+    last_part.write_bytes(last_part.read_bytes()[:-1])
+
+    with pytest.raises(FilePreparationError):
+        decompress_gz(test_gz)
+
+    assert len(list(test_gz.parent.glob(f"{test_gz.name}.*"))) == 18
+
+
+def _split_file_on_parts(test_gz: Path, gz_parts: int) -> None:
     gz_content = Path(f"{test_gz}").open("rb").read()
     gz_size = test_gz.stat().st_size
     chunk_size = gz_size // gz_parts
@@ -49,14 +99,6 @@ def test_decompression_is_working_properly_after_concatenation(mocker, test_gz:
 
     test_gz.unlink()
 
-    # Act.
-    concatenate_files(test_gz)
-    decompress_gz(test_gz)
-    result_content = Path(f"{test_gz.parent}/test.txt").open("rb").read()
-
-    # Assert.
-    assert result_content == CONTENT
-
 
 def _mock_is_shutdown_event_set_func(mocker, flag: bool):
     return mocker.patch(
@@ -0,0 +1,117 @@
+import gzip
+import random
+from pathlib import Path
+
+import pytest
+
+from infrastructure.preparation.prepare_files.decompressors import (
+    GzipDecompressor,
+    ProcessDecompressor,
+    ZlibDecompressor,
+    benchmark_decompressors,
+    get_available_decompressors,
+    select_decompressor,
+)
+from infrastructure.preparation.prepare_files.exceptions import DecompressionError
+
+# Any program that supports '-dc' flags behaves as pigz / igzip.
+decompressors = [
+    ZlibDecompressor(buffer_size=1024),
+    ProcessDecompressor("gzip", buffer_size=1024),
+]
+
+
+@pytest.fixture
+def content() -> bytes:
+    generator = random.Random(0)
+    return "".join(generator.choices("ACDEFGHIKLMNPQRSTVWY\n", k=100_000)).encode()
+
+
+@pytest.fixture
+def test_gz(tmp_path: Path, content: bytes) -> Path:
+    path_to_file = tmp_path / "test.txt.gz"
+    path_to_file.write_bytes(gzip.compress(content))
+    return path_to_file
+
+
+@pytest.fixture
+def damaged_gz(test_gz: Path) -> Path:
+    """Gzip file with wrong CRC in the trailer."""
+    data = bytearray(test_gz.read_bytes())
+    data[-8] ^= 0xFF
+    test_gz.write_bytes(data)
+    return test_gz
+
+
+@pytest.fixture
+def multi_member_gz(tmp_path: Path, content: bytes) -> Path:
+    """Gzip file of concatenated members, e.g. written by parallel compressors."""
+    path_to_file = tmp_path / "multi_member.txt.gz"
+    middle = len(content) // 2
+    path_to_file.write_bytes(
+        gzip.compress(content[:middle]) + gzip.compress(content[middle:])
+    )
+    return path_to_file
+
+
+@pytest.fixture
+def damaged_first_member_gz(multi_member_gz: Path, content: bytes) -> Path:
+    """The first member has wrong CRC in its trailer, the last one is intact."""
+    data = bytearray(multi_member_gz.read_bytes())
+    first_member_size = len(gzip.compress(content[: len(content) // 2]))
+    data[first_member_size - 8] ^= 0xFF
+    multi_member_gz.write_bytes(data)
+    return multi_member_gz
+
+
+@pytest.mark.parametrize("decompressor", decompressors, ids=lambda d: d.name)
+def test_inflate(decompressor: GzipDecompressor, test_gz: Path, content: bytes):
+    with test_gz.open("rb") as compressed_file:
+        result = b"".join(decompressor.inflate(compressed_file))
+
+    assert result == content
+
+
+@pytest.mark.parametrize("decompressor", decompressors, ids=lambda d: d.name)
+def test_inflate_fails_on_wrong_crc(decompressor: GzipDecompressor, damaged_gz: Path):
+    with (
+        damaged_gz.open("rb") as compressed_file,
+        pytest.raises(DecompressionError),
+    ):
+        list(decompressor.inflate(compressed_file))
+
+
+@pytest.mark.parametrize("decompressor", decompressors, ids=lambda d: d.name)
+def test_inflate_of_multi_member_file(
+    decompressor: GzipDecompressor, multi_member_gz: Path, content: bytes
+):
+    with multi_member_gz.open("rb") as compressed_file:
+        result = b"".join(decompressor.inflate(compressed_file))
+
+    assert result == content
+
+
+@pytest.mark.parametrize("decompressor", decompressors, ids=lambda d: d.name)
+def test_inflate_fails_on_wrong_crc_of_any_member(
+    decompressor: GzipDecompressor, damaged_first_member_gz: Path
+):
+    with (
+        damaged_first_member_gz.open("rb") as compressed_file,
+        pytest.raises(DecompressionError),
+    ):
+        list(decompressor.inflate(compressed_file))
+
+
+def test_benchmark_decompressors(test_gz: Path):
+    result = benchmark_decompressors(test_gz, decompressors, sample_size=1024)
+
+    assert set(result) == {"zlib", "gzip"}
+    assert all(throughput > 0 for throughput in result.values())
+
+
+def test_select_decompressor_returns_available_backend(test_gz: Path):
+    available_names = [d.name for d in get_available_decompressors()]
+
+    result = select_decompressor(test_gz)
+
+    assert result.name in available_names
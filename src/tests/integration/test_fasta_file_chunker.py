@@ -1,6 +1,10 @@
+import gzip
+from functools import partial
 from pathlib import Path
 
 from domain.models import ChunkRange
+from infrastructure.preparation.prepare_files import decompress_gz
+from infrastructure.preparation.prepare_files.chunk_plan import ChunkPlanCollector
 from infrastructure.process_data.uniprot.fasta import ChunkRangeIterator
 
 
@@ -19,3 +23,35 @@ def test_chunk_range_gen(test_fasta: Path):
     result = list(sut)
 
     assert result == expected_result
+
+
+def test_chunk_range_gen_with_several_chunks_per_worker(test_fasta: Path):
+    expected_result = list(ChunkRangeIterator(test_fasta, workers_number=6))
+    sut = ChunkRangeIterator(test_fasta, workers_number=2, chunks_per_worker=3)
+
+    result = list(sut)
+
+    assert result == expected_result
+
+
+def test_chunk_range_gen_uses_chunk_plan_made_while_decompressing(
+    mocker, test_fasta: Path
+):
+    file_operations = "infrastructure.preparation.prepare_files.file_operations"
+    mocker.patch(f"{file_operations}.is_shutdown_event_set", return_value=False)
+    mocker.patch(
+        f"{file_operations}.ChunkPlanCollector",
+        partial(ChunkPlanCollector, interval=1),
+    )
+    workers_number = 10
+    expected_result = list(ChunkRangeIterator(test_fasta, workers_number))
+    path_to_gz = test_fasta.with_suffix(".fasta.gz")
+    path_to_gz.write_bytes(gzip.compress(test_fasta.read_bytes()))
+    test_fasta.unlink()
+
+    decompress_gz(path_to_file=path_to_gz)
+    mocked_scan = mocker.patch.object(ChunkRangeIterator, "_get_chunk_boundaries")
+    result = list(ChunkRangeIterator(test_fasta, workers_number))
+
+    assert result == expected_result
+    mocked_scan.assert_not_called()
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -6,6 +7,7 @@ from domain.entities import (
     SequenceRecord,
     SequenceSource,
 )
+from domain.models import ChunkRange, QuarantinedRecord
 from infrastructure.process_data.exceptions import IteratorError
 from infrastructure.process_data.uniprot.fasta import (
     ChunkRangeIterator,
@@ -121,3 +123,47 @@ def test_fasta_iterator_with_empty_file(empty_fasta: Path):
 
     with pytest.raises(IteratorError):
         list(sut)
+
+
+def test_fasta_iterator_skips_committed_ranges(test_fasta: Path):
+    # Arrange.
+    positions = [record_end.position for record_end in _iterate_positions(test_fasta)]
+    sut = FastaIterator(test_fasta)
+
+    # Second and third records were committed before.
+    sut.skip([ChunkRange(positions[0], positions[2] - 1)])
+
+    # Act.
+    records = list(sut)
+
+    # Assert.
+    assert records == [expected_result[0], *expected_result[3:]]
+
+
+def _iterate_positions(test_fasta: Path) -> Iterator[FastaIterator]:
+    """Yield iterator after every record, it points at the next one."""
+    iterator = FastaIterator(test_fasta)
+
+    for _ in iterator:
+        yield iterator
+
+
+def test_fasta_iterator_quarantines_invalid_records(tmp_path: Path):
+    # Arrange.
+    valid_record = (
+        ">sp|P01308|INS_HUMAN Insulin OS=Homo sapiens OX=9606 GN=INS PE=1 SV=1\n"
+        "MALWMRLLPLLALLALWGPDPAAAFVNQHLCGSHLVEALYLVCGERGFFYTPKTRREAED\n"
+    )
+    invalid_record = ">sp|P01309|damaged header\nMALWMRLLPL\n"
+    path_to_file = tmp_path / "uniprot.fasta"
+    path_to_file.write_text(valid_record + invalid_record + valid_record)
+    sut = FastaIterator(path_to_file)
+    sut.quarantine_invalid_records()
+
+    # Act.
+    records = list(sut)
+
+    # Assert.
+    assert [record.accession for record in records[::2]] == ["P01308", "P01308"]
+    assert isinstance(records[1], QuarantinedRecord)
+    assert records[1].position == len(valid_record)
@@ -0,0 +1,25 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from infrastructure.process_data.uniprot.fasta import FastaStreamIterator
+from tests.integration.test_fasta_iterator import expected_result
+
+
+@pytest.fixture
+def test_fasta_gz(test_fasta: Path) -> Path:
+    path_to_archive = test_fasta.with_suffix(".fasta.gz")
+
+    with gzip.open(path_to_archive, "wb") as archive:
+        archive.write(test_fasta.read_bytes())
+
+    return path_to_archive
+
+
+def test_fasta_stream_iterator(test_fasta_gz: Path, file_server: str):
+    sut = FastaStreamIterator(url=f"{file_server}/{test_fasta_gz.name}")
+
+    records = list(sut)
+
+    assert records == expected_result
@@ -6,7 +6,11 @@ from pathlib import Path
 import pytest
 
 from core.exceptions import NeighbouringProcessError
-from infrastructure.preparation.prepare_files import decompress_gz, extract_from_tar
+from infrastructure.preparation.prepare_files import (
+    decompress_gz,
+    extract_from_tar,
+    stream_extract_from_tar,
+)
 
 
 @pytest.fixture
@@ -23,6 +27,19 @@ def test_tar(tmp_path: Path) -> Path:
     return tar_path
 
 
+@pytest.fixture
+def test_tar_gz(tmp_path: Path) -> Path:
+    tar_path = tmp_path / "test.tar.gz"
+
+    with tarfile.open(tar_path, "w:gz") as archive:
+        for name, content in ((b"wanted.txt", b"wanted"), (b"other.txt", b"other")):
+            tar_info = tarfile.TarInfo(name=name.decode())
+            tar_info.size = len(content)
+            archive.addfile(tar_info, BytesIO(content))
+
+    return tar_path
+
+
 @pytest.fixture
 def test_gz(tmp_path: Path) -> Path:
     content = b"test gz"
@@ -68,6 +85,40 @@ def test_extract_from_tar_interrupted_when_shutdown_event_is_true(
         extract_from_tar(path_to_file=test_tar, files_to_extract=("test.txt",))
 
 
+def test_extract_from_tar_gz_skips_unwanted_members(
+    mocker, test_tar_gz: Path, tmp_path: Path
+):
+    _mock_is_shutdown_event_set_func(mocker, False)
+    expected_result = b"wanted"
+
+    extract_from_tar(path_to_file=test_tar_gz, files_to_extract=("wanted.txt",))
+    result = (tmp_path / "wanted.txt").open("rb").read()
+
+    assert result == expected_result
+    assert not (tmp_path / "other.txt").exists()
+    assert not test_tar_gz.exists()
+
+
+def test_stream_extract_from_tar(
+    mocker, test_tar_gz: Path, file_server: str, tmp_path: Path
+):
+    _mock_is_shutdown_event_set_func(mocker, False)
+    path_to_save = tmp_path / "extracted"
+    path_to_save.mkdir()
+    expected_result = b"wanted"
+
+    stream_extract_from_tar(
+        url=f"{file_server}/{test_tar_gz.name}",
+        files_to_extract=("wanted.txt",),
+        path_to_save=path_to_save,
+    )
+    result = (path_to_save / "wanted.txt").open("rb").read()
+
+    assert result == expected_result
+    assert not (path_to_save / "other.txt").exists()
+    assert test_tar_gz.exists()
+
+
 def test_decompress_gz(mocker, test_gz: Path, tmp_path: Path):
     _mock_is_shutdown_event_set_func(mocker, False)
     expected_result = b"test gz"
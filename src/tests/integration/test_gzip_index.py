@@ -0,0 +1,119 @@
+import gzip
+import random
+from pathlib import Path
+
+import pytest
+
+from infrastructure.preparation.prepare_files import index_gz
+from infrastructure.preparation.prepare_files.gzip_index import (
+    GzipIndexBuilder,
+    get_index_path,
+    load_gzip_index,
+    open_gzip_at,
+    save_gzip_index,
+)
+from infrastructure.process_data.uniprot.fasta import (
+    FastaIterator,
+    IndexedGzipChunkRangeIterator,
+    IndexedGzipFastaIterator,
+)
+
+SPAN: int = 2**16
+
+
+@pytest.fixture
+def fasta_content() -> bytes:
+    """Incompressible enough content to get many deflate blocks."""
+    generator = random.Random(0)
+    amino_acids = "ACDEFGHIKLMNPQRSTVWY"
+    records = []
+
+    for number in range(3000):
+        sequence = "".join(generator.choices(amino_acids, k=generator.randint(50, 400)))
+        lines = "\n".join(sequence[i : i + 60] for i in range(0, len(sequence), 60))
+        records.append(
+            f">tr|A{number}|A{number}_BOVIN Insulin "
+            f"OS=Bos taurus OX=9913 PE=2 SV=1\n{lines}\n"
+        )
+
+    return "".join(records).encode()
+
+
+@pytest.fixture
+def fasta_gz(tmp_path: Path, fasta_content: bytes) -> Path:
+    path_to_file = tmp_path / "uniprot_trembl.fasta.gz"
+    path_to_file.write_bytes(gzip.compress(fasta_content))
+    return path_to_file
+
+
+@pytest.fixture
+def indexed_fasta_gz(fasta_gz: Path) -> Path:
+    gzip_index = GzipIndexBuilder(span=SPAN).build(fasta_gz)
+    save_gzip_index(gzip_index, get_index_path(fasta_gz))
+    return fasta_gz
+
+
+def test_gzip_index_access_points_point_to_records(
+    indexed_fasta_gz: Path, fasta_content: bytes
+):
+    gzip_index = load_gzip_index(get_index_path(indexed_fasta_gz))
+
+    assert gzip_index.decompressed_size == len(fasta_content)
+    assert len(gzip_index.record_starts) > 1
+
+    for record_start in gzip_index.record_starts:
+        assert fasta_content[record_start] == ord(">")
+
+
+def test_gzip_index_file_reads_window_of_found_access_point(fasta_gz: Path):
+    gzip_index = GzipIndexBuilder(span=SPAN).build(fasta_gz)
+    save_gzip_index(gzip_index, get_index_path(fasta_gz))
+    access_point = gzip_index.access_points[len(gzip_index.access_points) // 2]
+
+    result = load_gzip_index(get_index_path(fasta_gz)).find_access_point(
+        access_point.decompressed_offset + 1
+    )
+
+    assert result == access_point
+
+
+def test_open_gzip_at_offset(indexed_fasta_gz: Path, fasta_content: bytes):
+    gzip_index = load_gzip_index(get_index_path(indexed_fasta_gz))
+    offset = len(fasta_content) // 2
+
+    with open_gzip_at(indexed_fasta_gz, gzip_index, offset) as file:
+        result = file.read()
+
+    assert result == fasta_content[offset:]
+
+
+def test_indexed_gzip_fasta_iterator(
+    indexed_fasta_gz: Path, fasta_content: bytes, tmp_path: Path
+):
+    path_to_fasta = tmp_path / "uniprot_trembl.fasta"
+    path_to_fasta.write_bytes(fasta_content)
+    expected_result = list(FastaIterator(path_to_fasta))
+    workers_number = 4
+
+    chunk_ranges = list(IndexedGzipChunkRangeIterator(indexed_fasta_gz, workers_number))
+    result = [
+        record
+        for chunk_range in chunk_ranges
+        for record in IndexedGzipFastaIterator(indexed_fasta_gz, chunk_range)
+    ]
+
+    assert len(chunk_ranges) == workers_number
+    assert result == expected_result
+
+
+def test_index_gz_keeps_archive(mocker, fasta_gz: Path):
+    mocker.patch(
+        "infrastructure.preparation.prepare_files.file_operations."
+        "is_shutdown_event_set",
+        return_value=False,
+    )
+
+    index_gz(path_to_file=fasta_gz)
+
+    assert fasta_gz.exists()
+    assert get_index_path(fasta_gz).exists()
@@ -3,6 +3,7 @@ from pathlib import Path
 import pytest
 
 from domain.entities import LineagePair, MergedPair, Taxonomy
+from domain.models import QuarantinedRecord
 from infrastructure.process_data.ncbi import (
     NCBIIterator,
     PresenterType,
@@ -88,3 +89,20 @@ def test_ncbi_iterator_with_merged_file(test_merged_dmp: Path):
     result = list(sut)
 
     assert result == expected_result
+
+
+def test_ncbi_iterator_quarantines_invalid_lines(tmp_path: Path):
+    # Arrange.
+    path_to_file = tmp_path / "merged.dmp"
+    path_to_file.write_text("12\t|\t74109\t|\ndamaged\n30\t|\t29\t|\n")
+    sut = NCBIIterator(path_to_file, PresenterType.MERGED)
+    sut.quarantine_invalid_records()
+
+    # Act.
+    result = list(sut)
+
+    # Assert.
+    assert result[0] == MergedPair(deprecated_id=12, current_id=74109)
+    assert result[2] == MergedPair(deprecated_id=30, current_id=29)
+    assert isinstance(result[1], QuarantinedRecord)
+    assert (result[1].source, result[1].position) == ("merged.dmp", 13)
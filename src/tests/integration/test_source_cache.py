@@ -0,0 +1,137 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from core.config import NCBIFiles, UniprotFiles
+from infrastructure.preparation.prepare_files import SourceCache
+from infrastructure.preparation.prepare_files.seekable_zstd import (
+    open_zstd_at,
+    read_seek_table,
+)
+from infrastructure.preparation.prepare_files.source_cache import (
+    cache_fasta_file,
+    get_cached_fasta_path,
+)
+from infrastructure.process_data.uniprot.fasta import (
+    FastaIterator,
+    SeekableZstdChunkRangeIterator,
+    SeekableZstdFastaIterator,
+)
+
+pytest.importorskip("zstandard")
+
+FRAME_SIZE: int = 2**14
+
+
+@pytest.fixture(autouse=True)
+def shutdown_event_is_not_set(mocker) -> None:
+    mocker.patch(
+        "infrastructure.preparation.prepare_files.file_operations."
+        "is_shutdown_event_set",
+        return_value=False,
+    )
+
+
+@pytest.fixture
+def fasta_content() -> bytes:
+    generator = random.Random(0)
+    amino_acids = "ACDEFGHIKLMNPQRSTVWY"
+    records = []
+
+    for number in range(1000):
+        sequence = "".join(generator.choices(amino_acids, k=generator.randint(50, 400)))
+        lines = "\n".join(sequence[i : i + 60] for i in range(0, len(sequence), 60))
+        records.append(
+            f">tr|A{number}|A{number}_BOVIN Insulin "
+            f"OS=Bos taurus OX=9913 PE=2 SV=1\n{lines}\n"
+        )
+
+    return "".join(records).encode()
+
+
+@pytest.fixture
+def cached_fasta(mocker, tmp_path: Path, fasta_content: bytes) -> Path:
+    mocker.patch(
+        "infrastructure.preparation.prepare_files.source_cache.SOURCE_CACHE_FRAME_SIZE",
+        FRAME_SIZE,
+    )
+    cache_folder = tmp_path / "cache"
+    cache_folder.mkdir()
+    path_to_fasta = tmp_path / "fasta" / UniprotFiles.TREMBL
+    path_to_fasta.parent.mkdir()
+    path_to_fasta.write_bytes(fasta_content)
+
+    cache_fasta_file(path_to_fasta, cache_folder)
+
+    return get_cached_fasta_path(cache_folder, UniprotFiles.TREMBL)
+
+
+def test_cached_fasta_frames_start_with_records(
+    cached_fasta: Path, fasta_content: bytes
+):
+    seek_table = read_seek_table(cached_fasta)
+
+    assert seek_table.decompressed_size == len(fasta_content)
+    assert len(seek_table.frames) > 1
+
+    for frame in seek_table.frames:
+        assert fasta_content[frame.decompressed_offset] == ord(">")
+
+
+def test_open_zstd_at_offset(cached_fasta: Path, fasta_content: bytes):
+    seek_table = read_seek_table(cached_fasta)
+    offset = len(fasta_content) // 2
+
+    with open_zstd_at(cached_fasta, seek_table, offset) as file:
+        result = file.read()
+
+    assert result == fasta_content[offset:]
+
+
+def test_seekable_zstd_fasta_iterator(
+    cached_fasta: Path, fasta_content: bytes, tmp_path: Path
+):
+    path_to_fasta = tmp_path / "fasta" / UniprotFiles.TREMBL
+    expected_result = list(FastaIterator(path_to_fasta))
+    workers_number = 4
+
+    chunk_ranges = list(SeekableZstdChunkRangeIterator(cached_fasta, workers_number))
+    result = [
+        record
+        for chunk_range in chunk_ranges
+        for record in SeekableZstdFastaIterator(cached_fasta, chunk_range)
+    ]
+
+    assert len(chunk_ranges) == workers_number
+    assert result == expected_result
+
+
+def test_source_cache_is_complete_after_caching(tmp_path: Path):
+    source_cache = SourceCache(tmp_path / "cache")
+    source_cache.folder.mkdir()
+
+    assert not source_cache.is_complete()
+
+    for call in source_cache.get_caching_calls(tmp_path):
+        call.func(*call.args, **call.kwargs)
+
+    assert source_cache.is_complete()
+    assert (source_cache.folder / NCBIFiles.NAMES).read_bytes() == (
+        tmp_path / NCBIFiles.NAMES
+    ).read_bytes()
+    assert (tmp_path / UniprotFiles.SWISS_PROT).exists()
+
+
+def test_source_cache_holds_release_it_was_filled_with(tmp_path: Path):
+    source_cache = SourceCache(tmp_path)
+    modification_date = "Wed, 01 Oct 2025 12:00:00 GMT"
+
+    source_cache.save_release(modification_date)
+    holds_saved_release = source_cache.holds_release(modification_date)
+    holds_next_release = source_cache.holds_release("Wed, 03 Dec 2025 12:00:00 GMT")
+    source_cache.forget_release()
+
+    assert holds_saved_release
+    assert not holds_next_release
+    assert not source_cache.holds_release(modification_date)
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import suppress
+
+import asyncpg
+import pytest
+
+from infrastructure.database.postgresql import PostgreSQLProgressMonitor
+from tests.integration.conftest import DATABASE_ENV
+
+TEST_TABLE: str = "progress_monitor_test"
+
+
+def _get_connection_config() -> dict:
+    return {
+        "host": DATABASE_ENV.host,
+        "port": DATABASE_ENV.port,
+        "database": DATABASE_ENV.dbname,
+        "user": DATABASE_ENV.user,
+        "password": DATABASE_ENV.password,
+    }
+
+
+async def _slow_records_gen() -> AsyncIterator[tuple[int]]:
+    for number in range(10):
+        await asyncio.sleep(0.1)
+        yield (number,)
+
+
+@pytest.mark.asyncio
+async def test_long_statement_progress_is_reported(caplog: pytest.LogCaptureFixture):
+    # Arrange.
+    conn = await asyncpg.connect(**_get_connection_config())
+    await conn.execute(f"CREATE TABLE IF NOT EXISTS {TEST_TABLE} (number INT)")
+    sut = PostgreSQLProgressMonitor(poll_interval=0.2)
+
+    # Act.
+    with caplog.at_level(logging.INFO):
+        monitor_task = asyncio.create_task(
+            sut.monitor({**_get_connection_config(), "min_size": 2, "max_size": 2})
+        )
+        await conn.copy_records_to_table(TEST_TABLE, records=_slow_records_gen())
+        monitor_task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await monitor_task
+
+    await conn.execute(f"DROP TABLE {TEST_TABLE}")
+    await conn.close()
+
+    # Assert.
+    assert f"...COPY FROM {TEST_TABLE}: PIPE" in caplog.text
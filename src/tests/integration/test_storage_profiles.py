@@ -0,0 +1,51 @@
+from dataclasses import asdict
+
+import asyncpg
+import pytest
+
+from benchmarks.storage_profiles import BENCHMARK_SCHEMA, benchmark_storage_profiles
+from infrastructure.database.postgresql import ConnectionConfig, StorageProfile
+from tests.integration.conftest import DATABASE_ENV
+
+
+def _get_connection_config() -> ConnectionConfig:
+    return ConnectionConfig(
+        host=DATABASE_ENV.host,
+        database=DATABASE_ENV.dbname,
+        password=DATABASE_ENV.password,
+        port=DATABASE_ENV.port,
+        user=DATABASE_ENV.user,
+    )
+
+
+@pytest.mark.asyncio
+async def test_storage_profiles_are_measured_on_the_same_records():
+    # Arrange.
+    profiles = [StorageProfile.DEFAULT, StorageProfile.EXTERNAL]
+
+    # Act.
+    measurements = await benchmark_storage_profiles(
+        asdict(_get_connection_config()),
+        profiles,
+        rows=200,
+        sequence_length=4_000,
+        repeats=1,
+    )
+
+    conn = await asyncpg.connect(**asdict(_get_connection_config()))
+    benchmark_schema_exists = await conn.fetchval(
+        "SELECT count(*) FROM pg_namespace WHERE nspname = $1", BENCHMARK_SCHEMA
+    )
+    await conn.close()
+
+    sizes = {
+        measurement.profile: measurement.table_bytes for measurement in measurements
+    }
+
+    # Assert.
+    assert [measurement.profile for measurement in measurements] == profiles
+    assert all(measurement.load_seconds > 0 for measurement in measurements)
+    assert all(measurement.slice_query_ms > 0 for measurement in measurements)
+    # Sequences that pglz compresses by less than a quarter are stored as is.
+    assert sizes[StorageProfile.EXTERNAL] >= sizes[StorageProfile.DEFAULT]
+    assert not benchmark_schema_exists
@@ -0,0 +1,31 @@
+import pytest
+
+from infrastructure.preparation.prepare_files.chunk_plan import ChunkPlanCollector
+
+content: bytes = (
+    b">sp|A|A_HUMAN first\nMAGIIKKQ\n"
+    b">sp|B|B_HUMAN second\nMGKCCHHC\nMPGWFKKA\n"
+    b">sp|C|C_HUMAN third\nPFELKKAM\n"
+    b">sp|D|D_HUMAN fourth\nMFASCHCV\n"
+)
+
+
+@pytest.mark.parametrize("piece_size", [1, 2, 7, len(content)])
+def test_chunk_plan_collector_finds_all_record_starts(piece_size: int):
+    sut = ChunkPlanCollector(interval=1)
+    expected_result = [0, 29, 68, 97]
+
+    for start in range(0, len(content), piece_size):
+        sut.update(content[start : start + piece_size])
+
+    assert sut.record_starts == expected_result
+    assert sut.size == len(content)
+
+
+def test_chunk_plan_collector_respects_interval():
+    sut = ChunkPlanCollector(interval=40)
+    expected_result = [0, 68]
+
+    sut.update(content)
+
+    assert sut.record_starts == expected_result
@@ -0,0 +1,28 @@
+import pytest
+
+from domain.models import ChunkRange
+
+
+@pytest.mark.parametrize(
+    ("ranges", "expected_result"),
+    [
+        ([], [ChunkRange(0, 99)]),
+        ([ChunkRange(0, 99)], []),
+        ([ChunkRange(0, 19)], [ChunkRange(20, 99)]),
+        (
+            [ChunkRange(50, 59), ChunkRange(10, 19)],
+            [ChunkRange(0, 9), ChunkRange(20, 49), ChunkRange(60, 99)],
+        ),
+        (
+            [ChunkRange(10, 29), ChunkRange(20, 39)],
+            [ChunkRange(0, 9), ChunkRange(40, 99)],
+        ),
+        ([ChunkRange(90, 199), ChunkRange(200, 299)], [ChunkRange(0, 89)]),
+    ],
+)
+def test_chunk_range_without_committed_ranges(
+    ranges: list[ChunkRange], expected_result: list[ChunkRange]
+):
+    sut = ChunkRange(0, 99)
+
+    assert sut.without(ranges) == expected_result
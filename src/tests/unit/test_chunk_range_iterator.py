@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from domain.models import ChunkRange
+from infrastructure.process_data.uniprot.fasta import ChunkRangeIterator
+
+
+@pytest.mark.parametrize(
+    ("record_starts", "file_size", "expected_result"),
+    [
+        ([0], 0, []),
+        ([0], 30, [ChunkRange(0, 29)]),
+        ([0, 10, 20], 30, [ChunkRange(0, 9), ChunkRange(10, 19), ChunkRange(20, 29)]),
+    ],
+)
+def test_chunk_range_gen_when_file_is_smaller_than_number_of_chunks(
+    mocker,
+    record_starts: list[int],
+    file_size: int,
+    expected_result: list[ChunkRange],
+):
+    mocker.patch.object(ChunkRangeIterator, "_get_file_size", return_value=file_size)
+    mocker.patch.object(
+        ChunkRangeIterator, "_get_planned_record_starts", return_value=record_starts
+    )
+    sut = ChunkRangeIterator(Path("uniprot.fasta"), workers_number=100)
+
+    result = list(sut)
+
+    assert result == expected_result
+
+
+def test_chunk_range_gen_when_file_is_empty(tmp_path: Path):
+    path_to_file = tmp_path / "uniprot.fasta"
+    path_to_file.touch()
+    sut = ChunkRangeIterator(path_to_file, workers_number=100)
+
+    result = list(sut)
+
+    assert result == []
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from domain.entities import SequenceRecord, SequenceSource
+from infrastructure.process_data.uniprot import OrganismSpill
+
+
+def _create_record(accession: str, ncbi_id: int) -> SequenceRecord:
+    return SequenceRecord(
+        source=SequenceSource.TREMBL,
+        is_reviewed=False,
+        accession=accession,
+        entry_name=f"{accession}_HUMAN",
+        peptide_name="Uncharacterized protein",
+        ncbi_id=ncbi_id,
+        organism_name="Homo sapiens",
+        sequence="MALWMRLLPLL",
+    )
+
+
+def test_spilled_runs_are_merged_by_organism(tmp_path: Path):
+    # Arrange.
+    sut = OrganismSpill(folder=tmp_path, buckets=2, max_organism_id=100)
+    sut.clear()
+    batches = [[(5, 70), (1, 30), (3, 90)], [(4, 10), (2, 60)], [(6, 20), (7, 60)]]
+
+    for writer_batches in (batches[:2], batches[2:]):
+        with sut.open_writer() as writer:
+            for batch in writer_batches:
+                writer.write([_create_record(f"A{i}", ncbi_id) for i, ncbi_id in batch])
+
+    # Act.
+    organism_ids = [record.ncbi_id for record in sut]
+
+    # Assert.
+    assert organism_ids == [10, 20, 30, 60, 60, 70, 90]
+    assert not any(tmp_path.iterdir())
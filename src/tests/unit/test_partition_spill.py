@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from domain.entities import SequenceRecord, SequenceSource
+from infrastructure.process_data.uniprot import PartitionSpill
+from infrastructure.process_data.uniprot.partition_spill import get_hash_partition
+
+
+def _create_record(accession: str, ncbi_id: int) -> SequenceRecord:
+    return SequenceRecord(
+        source=SequenceSource.TREMBL,
+        is_reviewed=False,
+        accession=accession,
+        entry_name=f"{accession}_HUMAN",
+        peptide_name="Uncharacterized protein",
+        ncbi_id=ncbi_id,
+        organism_name="Homo sapiens",
+        sequence="MALWMRLLPLL",
+    )
+
+
+# Remainders are given by 'satisfies_hash_partition' of PostgreSQL 16.
+@pytest.mark.parametrize(
+    ("accession", "partitions", "expected_partition"),
+    [("A0JP26", 7, 2), ("A0A000", 7, 5), ("A0A023GPI8", 2, 0), ("", 3, 2)],
+)
+def test_hash_partition_is_the_one_of_postgresql(
+    accession: str, partitions: int, expected_partition: int
+):
+    assert get_hash_partition(accession, partitions) == expected_partition
+
+
+def test_records_are_spilled_to_the_parts_of_their_partitions(tmp_path: Path):
+    # Arrange.
+    sut = PartitionSpill(folder=tmp_path, partitions=3, organism_buckets=2)
+    sut.clear()
+    records = [
+        _create_record(f"A0A{i:03}", ncbi_id)
+        for i, ncbi_id in enumerate((9606, 10090, 562, 9606, 7227, 562, 10090, 4932))
+    ]
+
+    with sut.open_writer() as writer:
+        writer.write(records[:5])
+        writer.write(records[5:])
+
+    # Act.
+    parts = [list(part) for part in sut.get_parts()]
+
+    # Assert.
+    assert sorted(record.accession for part in parts for record in part) == [
+        record.accession for record in records
+    ]
+    assert all(
+        get_hash_partition(record.accession, 3) == partition
+        for partition, part in enumerate(parts)
+        for record in part
+    )
+    assert not any(path.is_file() for path in tmp_path.rglob("*"))
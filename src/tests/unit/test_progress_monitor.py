@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pytest
+
+from infrastructure.database.postgresql.progress_monitor import (
+    ProgressSample,
+    StatementProgress,
+    estimate_remaining_time,
+)
+
+
+@pytest.mark.parametrize(
+    ("previous", "expected_result"),
+    [
+        (None, None),
+        (ProgressSample(time=0.0, done=100), None),
+        (ProgressSample(time=0.0, done=40), timedelta(seconds=100)),
+    ],
+)
+def test_remaining_time_is_estimated_by_rate_since_previous_poll(
+    previous: ProgressSample | None, expected_result: timedelta | None
+):
+    current = ProgressSample(time=30.0, done=100)
+
+    result = estimate_remaining_time(previous, current, total=300)
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ("blocks", "tuples", "expected_result"),
+    [
+        ((10, 20), (0, 0), (10, 20)),
+        ((0, 0), (5, 50), (5, 50)),
+        ((None, None), (5, None), None),
+    ],
+)
+def test_statement_work_is_counted_in_blocks_first(
+    blocks: tuple, tuples: tuple, expected_result: tuple[int, int] | None
+):
+    sut = StatementProgress(1, "CREATE INDEX", "taxonomy", "building", *blocks, *tuples)
+
+    assert sut.get_work() == expected_result
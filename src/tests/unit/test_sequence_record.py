@@ -0,0 +1,45 @@
+from uuid import UUID
+
+import pytest
+
+from domain.entities import SequenceRecord, SequenceSource, get_sequence_id
+
+
+def _create_record(accession: str, sequence: str) -> SequenceRecord:
+    return SequenceRecord(
+        source=SequenceSource.TREMBL,
+        is_reviewed=False,
+        accession=accession,
+        entry_name=f"{accession}_HUMAN",
+        peptide_name="Uncharacterized protein",
+        ncbi_id=9606,
+        organism_name="Homo sapiens",
+        sequence=sequence,
+    )
+
+
+def test_identical_sequences_get_the_same_id():
+    first = _create_record("A0A000", "MALWMRLLPLL").normalize(sequence_id=True)
+    second = _create_record("A0A001", "MALWMRLLPLL").normalize(sequence_id=True)
+    other = _create_record("A0A002", "MALWMRLLPLLA").normalize(sequence_id=True)
+
+    assert first.sequence == second.sequence == get_sequence_id("MALWMRLLPLL")
+    assert isinstance(first.sequence, UUID)
+    assert other.sequence != first.sequence
+
+
+@pytest.mark.parametrize(
+    ("name_ids", "sequence_id"), [(True, False), (False, True), (True, True)]
+)
+def test_normalized_record_keeps_fingerprint(name_ids: bool, sequence_id: bool):
+    sut = _create_record("A0A000", "MALWMRLLPLL")
+
+    normalized_record = sut.normalize(
+        peptide_name_ids={"Uncharacterized protein": 1} if name_ids else None,
+        organism_name_ids={"Homo sapiens": 1} if name_ids else None,
+        sequence_id=sequence_id,
+    )
+
+    assert normalized_record.fingerprint == sut.get_fingerprint()
+    assert (normalized_record.peptide_name == sut.peptide_name) is not name_ids
+    assert (normalized_record.sequence == sut.sequence) is not sequence_id
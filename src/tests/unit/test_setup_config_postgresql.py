@@ -5,6 +5,7 @@ import pytest
 from domain.services.queue_manager import QueueConfig
 from infrastructure.database.postgresql import (
     ConnectionPoolConfig,
+    MaintenanceBudget,
     setup_connection_pool_config,
     setup_queue_config,
 )
@@ -39,6 +40,7 @@ def test_setup_queue_config(workers_number: int, expected_result: QueueConfig):
                 password="test",
                 min_size=47,
                 max_size=95,
+                server_settings={"search_path": "uniprot_build, public"},
             ),
         ),
         (
@@ -51,6 +53,7 @@ def test_setup_queue_config(workers_number: int, expected_result: QueueConfig):
                 password="test",
                 min_size=3,
                 max_size=6,
+                server_settings={"search_path": "uniprot_build, public"},
             ),
         ),
         (
@@ -63,6 +66,7 @@ def test_setup_queue_config(workers_number: int, expected_result: QueueConfig):
                 password="test",
                 min_size=1,
                 max_size=3,
+                server_settings={"search_path": "uniprot_build, public"},
             ),
         ),
     ],
@@ -84,3 +88,43 @@ def test_setup_database_config(
     )
 
     assert result == expected_result
+
+
+def test_setup_database_config_for_bulk_load():
+    result = setup_connection_pool_config(
+        database="test",
+        user="test",
+        port=5432,
+        host="test",
+        password="test",
+        workers_number=1,
+        available_connections=95,
+        bulk_load=True,
+    )
+
+    assert result.server_settings == {
+        "search_path": "uniprot_build, public",
+        "synchronous_commit": "off",
+        "maintenance_work_mem": "1GB",
+    }
+
+
+@pytest.mark.parametrize(
+    "concurrent_steps, expected_result",
+    [
+        (
+            1,
+            {"maintenance_work_mem": "1024MB", "max_parallel_maintenance_workers": "7"},
+        ),
+        (4, {"maintenance_work_mem": "256MB", "max_parallel_maintenance_workers": "1"}),
+        (64, {"maintenance_work_mem": "32MB", "max_parallel_maintenance_workers": "0"}),
+    ],
+)
+def test_maintenance_budget_is_shared_by_concurrent_steps(
+    concurrent_steps: int, expected_result: dict[str, str]
+):
+    budget = MaintenanceBudget(memory_mb=1024, processes=8)
+
+    result = budget.get_server_settings(concurrent_steps)
+
+    assert result == expected_result
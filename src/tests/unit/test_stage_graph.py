@@ -0,0 +1,122 @@
+import asyncio
+import gc
+from functools import partial
+
+import pytest
+
+from core.exceptions import StageGraphError
+from core.utils import Stage, StageGraph, get_critical_path
+
+
+async def _record(finished: list[str], name: str, delay: float) -> None:
+    await asyncio.sleep(delay)
+    finished.append(name)
+
+
+@pytest.mark.asyncio
+async def test_stage_starts_when_its_dependencies_are_finished():
+    # Arrange.
+    finished: list[str] = []
+    stages = [
+        Stage("download small", partial(_record, finished, "download small", 0.01)),
+        Stage("download large", partial(_record, finished, "download large", 0.2)),
+        Stage(
+            "copy small",
+            partial(_record, finished, "copy small", 0.01),
+            ("download small",),
+        ),
+        Stage(
+            "finalize",
+            partial(_record, finished, "finalize", 0.01),
+            ("copy small", "download large"),
+        ),
+    ]
+
+    # Act.
+    await StageGraph(stages).run()
+
+    # Assert.
+    assert finished == ["download small", "copy small", "download large", "finalize"]
+
+
+@pytest.mark.asyncio
+async def test_critical_path_follows_the_latest_dependency():
+    # Arrange.
+    finished: list[str] = []
+    stages = [
+        Stage("short", partial(_record, finished, "short", 0.01)),
+        Stage("long", partial(_record, finished, "long", 0.1)),
+        Stage("last", partial(_record, finished, "last", 0.01), ("short", "long")),
+    ]
+
+    # Act.
+    timings = await StageGraph(stages).run()
+    result = [timing.name for timing in get_critical_path(timings)]
+
+    # Assert.
+    assert result == ["long", "last"]
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_cancels_dependent_stages():
+    # Arrange.
+    finished: list[str] = []
+
+    async def fail() -> None:
+        raise ValueError
+
+    stages = [
+        Stage("failed", fail),
+        Stage("dependent", partial(_record, finished, "dependent", 0), ("failed",)),
+    ]
+
+    # Act & Assert.
+    with pytest.raises(ValueError):
+        await StageGraph(stages).run()
+
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_failure_is_raised_once_for_the_chain_of_dependent_stages(
+    caplog: pytest.LogCaptureFixture,
+):
+    # Arrange.
+    finished: list[str] = []
+
+    async def fail() -> None:
+        raise ValueError
+
+    stages = [
+        Stage("failed", fail),
+        Stage("dependent", partial(_record, finished, "dependent", 0), ("failed",)),
+        Stage("last", partial(_record, finished, "last", 0), ("dependent",)),
+        Stage("independent", partial(_record, finished, "independent", 0.5)),
+    ]
+
+    # Act.
+    with pytest.raises(ValueError):
+        await StageGraph(stages).run()
+
+    gc.collect()
+
+    # Assert.
+    assert finished == []
+    assert "never retrieved" not in caplog.text
+
+
+@pytest.mark.parametrize(
+    "dependencies",
+    [
+        {"first": ("unknown",)},
+        {"first": ("second",), "second": ("first",)},
+    ],
+)
+def test_stage_graph_rejects_wrong_dependencies(dependencies: dict):
+    stages = [
+        Stage(name, partial(asyncio.sleep, 0), deps)
+        for name, deps in dependencies.items()
+    ]
+
+    with pytest.raises(StageGraphError):
+        StageGraph(stages)